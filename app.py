@@ -4,17 +4,13 @@ from typing import Dict, Any, List, Optional
 from db_connection import DatabaseConnection, SalaryCalculationRepository, TeacherRepository
 from salary_calculator import SalaryCalculator
 from vacation_processor import VacationProcessor
+from batch_export import BatchReportExporter
+from payroll_runner import PayrollRunner
+import teacher_import
+import instrumentation
+from logging_config import setup_logging
 
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('app.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 class SalaryApp:
@@ -25,28 +21,51 @@ class SalaryApp:
         Инициализация приложения
         
         :param db_config: конфигурация подключения к базе данных
+                          (coverage_limits - лимиты одновременных отпусков {должность: число})
         """
         logger.info("Инициализация приложения")
         self.db_connection = DatabaseConnection(db_config)
         self.teacher_repo = TeacherRepository(self.db_connection)
+        self.salary_repo = SalaryCalculationRepository(self.db_connection)
         self.salary_calculator = SalaryCalculator(self.db_connection)
-        self.vacation_processor = VacationProcessor(self.db_connection, self.salary_calculator)
+        self.vacation_processor = VacationProcessor(self.db_connection, self.salary_calculator,
+                                                    coverage_limits=db_config.get('coverage_limits'))
+        self.payroll_runner = PayrollRunner(self.db_connection, self.salary_calculator, db_config=db_config)
+        
+        # Замеры времени методов (только если включены, см. модуль instrumentation)
+        instrumentation.configure_from_environment()
+        instrumentation.instrument(self, self.salary_calculator, self.vacation_processor)
     
     def close(self):
         """Закрытие приложения и освобождение ресурсов"""
         logger.info("Закрытие соединений с базой данных")
+        instrumentation.flush()
         self.db_connection.close_all_connections()
     
+    def query_stats(self) -> List[Dict[str, Any]]:
+        """
+        Статистика выполнения SQL-запросов приложения
+        
+        :return: список запросов с числом вызовов, временем и перцентилями
+        """
+        return self.db_connection.query_stats()
+    
+    def reset_query_stats(self):
+        """Очистить статистику SQL-запросов"""
+        self.db_connection.reset_query_stats()
+    
     # Методы для работы с преподавателями
     
-    def get_all_teachers(self) -> List[Dict[str, Any]]:
+    def get_all_teachers(self, after: tuple = None, limit: int = None) -> List[Dict[str, Any]]:
         """
-        Получить список всех преподавателей
+        Получить список преподавателей (целиком или постранично)
         
+        :param after: ключ (ФИО, ID) последнего преподавателя предыдущей страницы
+        :param limit: размер страницы (None - все преподаватели)
         :return: список преподавателей
         """
         try:
-            return self.teacher_repo.get_all_teachers()
+            return self.teacher_repo.get_all_teachers(after, limit)
         except Exception as e:
             logger.error(f"Ошибка при получении списка преподавателей: {str(e)}")
             raise
@@ -96,6 +115,22 @@ class SalaryApp:
             logger.error(f"Ошибка при обновлении данных преподавателя (id={teacher_id}): {str(e)}")
             raise
     
+    def import_teachers_from_csv(self, file_path: str) -> Dict[str, Any]:
+        """
+        Массовый импорт преподавателей из CSV-файла
+        
+        Строки с ID обновляют существующих преподавателей, строки без ID
+        добавляют новых. Все изменения выполняются одной транзакцией.
+        
+        :param file_path: путь к CSV-файлу
+        :return: словарь с ключами added, updated, errors (список сообщений), rows_total
+        """
+        try:
+            return teacher_import.import_teachers_from_csv(self.teacher_repo, file_path)
+        except Exception as e:
+            logger.error(f"Ошибка при импорте преподавателей из файла {file_path}: {str(e)}")
+            raise
+    
     def delete_teacher(self, teacher_id: int) -> bool:
         """
         Удалить преподавателя
@@ -214,6 +249,92 @@ class SalaryApp:
             logger.error(f"Ошибка при получении дней отпуска для преподавателя (id={teacher_id}): {str(e)}")
             raise
     
+    def get_calculations_by_teacher(self, teacher_id: int, after: tuple = None,
+                                    limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Получить сохраненные расчеты зарплаты преподавателя (целиком или постранично)
+        
+        :param teacher_id: ID преподавателя
+        :param after: ключ (дата расчета, ID) последнего расчета предыдущей страницы
+        :param limit: размер страницы (None - все расчеты)
+        :return: список расчетов, начиная с последних
+        """
+        try:
+            return self.salary_repo.get_calculations_by_teacher(teacher_id, after, limit)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов для преподавателя (id={teacher_id}): {str(e)}")
+            raise
+    
+    def recalculate_stale(self, start_date, end_date, dry_run: bool = False,
+                          include_legacy: bool = False) -> Dict[str, Any]:
+        """
+        Пересчитать расчеты за период, затронутые изменением справочников или данных преподавателей
+        
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :param dry_run: только показать изменения, не записывая их в базу
+        :param include_legacy: пересчитывать и расчеты без сохраненных отпечатков
+                               (по умолчанию им только записываются текущие отпечатки)
+        :return: сводка пересчета и список изменений
+        """
+        try:
+            return self.salary_calculator.recalculate_stale(start_date, end_date, dry_run, include_legacy)
+        except Exception as e:
+            logger.error(f"Ошибка при пересчете расчетов за период {start_date} - {end_date}: {str(e)}")
+            raise
+    
+    def run_payroll(self, calculation_date, calc_data: Dict[str, Any] = None,
+                    teacher_calc_data: Dict[int, Dict[str, Any]] = None,
+                    teacher_ids: List[int] = None, workers: int = None) -> Dict[str, Any]:
+        """
+        Пакетный расчет зарплаты с журналом запуска (повторный вызов с теми же данными
+        продолжает незавершенный запуск и не создает дублей расчетов)
+        
+        :param calculation_date: дата расчета
+        :param calc_data: данные расчета, общие для всех преподавателей
+        :param teacher_calc_data: данные расчета отдельных преподавателей {ID: данные}
+        :param teacher_ids: преподаватели запуска (None - все)
+        :param workers: число процессов расчета (преподаватели делятся на диапазоны ID)
+        :return: итоги запуска
+        """
+        try:
+            return self.payroll_runner.run(calculation_date, calc_data, teacher_calc_data, teacher_ids,
+                                           workers=workers)
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном расчете зарплаты на {calculation_date}: {str(e)}")
+            raise
+    
+    def resume_payroll_run(self, run_id: int, workers: int = None) -> Dict[str, Any]:
+        """
+        Продолжить прерванный запуск пакетного расчета зарплаты
+        
+        :param run_id: ID запуска
+        :param workers: число процессов расчета
+        :return: итоги запуска
+        """
+        try:
+            return self.payroll_runner.resume(run_id, workers=workers)
+        except Exception as e:
+            logger.error(f"Ошибка при продолжении запуска расчета зарплаты (id={run_id}): {str(e)}")
+            raise
+    
+    def get_payroll_run(self, run_id: int, include_items: bool = False) -> Dict[str, Any]:
+        """
+        Получить запись журнала о запуске пакетного расчета зарплаты
+        
+        :param run_id: ID запуска
+        :param include_items: добавить состояние каждого преподавателя (ключ items)
+        :return: данные запуска
+        """
+        try:
+            run = self.payroll_runner.get_run(run_id)
+            if include_items:
+                run['items'] = self.payroll_runner.get_run_items(run_id)
+            return run
+        except Exception as e:
+            logger.error(f"Ошибка при получении запуска расчета зарплаты (id={run_id}): {str(e)}")
+            raise
+    
     def get_salary_data_for_period(self, teacher_id: int, start_date, end_date) -> List[Dict[str, Any]]:
         """
         Получить данные о зарплате преподавателя за указанный период
@@ -224,7 +345,7 @@ class SalaryApp:
         :return: список с данными о расчетах зарплаты
         """
         try:
-            logger.info(f"Получение данных о зарплате для преподавателя ID={teacher_id} за период {start_date} - {end_date}")
+            logger.debug(f"Получение данных о зарплате для преподавателя ID={teacher_id} за период {start_date} - {end_date}")
             
             # Используем существующий репозиторий для запроса данных
             salary_repo = SalaryCalculationRepository(self.db_connection)
@@ -251,6 +372,64 @@ class SalaryApp:
             logger.error(f"Ошибка при получении оставшихся дней отпуска для преподавателя (id={teacher_id}): {str(e)}")
             raise
     
+    def get_teacher_used_vacation_days(self, teacher_id: int, year: int = None) -> int:
+        """
+        Получить количество использованных дней отпуска
+        
+        :param teacher_id: ID преподавателя
+        :param year: год (если None, то за все годы)
+        :return: количество использованных дней отпуска
+        """
+        try:
+            return self.vacation_processor.get_teacher_used_vacation_days(teacher_id, year)
+        except Exception as e:
+            logger.error(f"Ошибка при получении использованных дней отпуска для преподавателя (id={teacher_id}): {str(e)}")
+            raise
+    
+    def get_transferred_vacation_days_in(self, teacher_id: int, year: int) -> int:
+        """
+        Получить количество дней отпуска, перенесенных на указанный год
+        
+        :param teacher_id: ID преподавателя
+        :param year: год
+        :return: количество перенесенных дней
+        """
+        try:
+            return self.vacation_processor.get_transferred_vacation_days_in(teacher_id, year)
+        except Exception as e:
+            logger.error(f"Ошибка при получении перенесенных дней отпуска (id={teacher_id}): {str(e)}")
+            raise
+    
+    def get_transferred_vacation_days_out(self, teacher_id: int, year: int) -> int:
+        """
+        Получить количество дней отпуска, перенесенных с указанного года
+        
+        :param teacher_id: ID преподавателя
+        :param year: год
+        :return: количество перенесенных дней
+        """
+        try:
+            return self.vacation_processor.get_transferred_vacation_days_out(teacher_id, year)
+        except Exception as e:
+            logger.error(f"Ошибка при получении перенесенных дней отпуска (id={teacher_id}): {str(e)}")
+            raise
+    
+    def transfer_vacation_days(self, teacher_id: int, from_year: int, to_year: int, days_count: int) -> int:
+        """
+        Перенести дни отпуска с одного года на другой
+        
+        :param teacher_id: ID преподавателя
+        :param from_year: год, с которого переносятся дни
+        :param to_year: год, на который переносятся дни
+        :param days_count: количество дней
+        :return: ID записи о переносе
+        """
+        try:
+            return self.vacation_processor.transfer_vacation_days(teacher_id, from_year, to_year, days_count)
+        except Exception as e:
+            logger.error(f"Ошибка при переносе дней отпуска (id={teacher_id}): {str(e)}")
+            raise
+    
     def schedule_vacation(self, teacher_id: int, start_date: datetime.date, 
                          end_date: datetime.date, vacation_type: str = 'основной',
                          notes: str = None) -> int:
@@ -282,7 +461,20 @@ class SalaryApp:
         except Exception as e:
             logger.error(f"Ошибка при отмене отпуска (id={vacation_id}): {str(e)}")
             raise
-    
+
+    def mark_vacation_as_used(self, vacation_id: int) -> bool:
+        """
+        Отметить запланированный отпуск как использованный
+
+        :param vacation_id: ID отпуска
+        :return: True если статус изменен, иначе False
+        """
+        try:
+            return self.vacation_processor.mark_vacation_as_used(vacation_id)
+        except Exception as e:
+            logger.error(f"Ошибка при изменении статуса отпуска (id={vacation_id}): {str(e)}")
+            raise
+
     def calculate_vacation_payment(self, vacation_id: int) -> Dict[str, Any]:
         """
         Рассчитать выплату за отпуск
@@ -296,22 +488,66 @@ class SalaryApp:
             logger.error(f"Ошибка при расчете отпускных (id={vacation_id}): {str(e)}")
             raise
     
+    def calculate_due_vacation_payments(self, as_of_date: datetime.date = None) -> Dict[str, Any]:
+        """
+        Рассчитать и записать выплаты по всем отпускам, подлежащим оплате
+        
+        :param as_of_date: дата, на которую определяются отпуска к оплате (по умолчанию сегодня)
+        :return: сводка: число отпусков, оплачено, общая сумма, выплаты и ошибки
+        """
+        try:
+            return self.vacation_processor.calculate_due_vacation_payments(as_of_date)
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном расчете отпускных: {str(e)}")
+            raise
+    
     def get_teacher_vacations(self, teacher_id: int, year: int = None, 
-                            include_cancelled: bool = False) -> List[Dict[str, Any]]:
+                            include_cancelled: bool = False, after: tuple = None,
+                            limit: int = None) -> List[Dict[str, Any]]:
         """
-        Получить список отпусков преподавателя
+        Получить список отпусков преподавателя (целиком или постранично)
         
         :param teacher_id: ID преподавателя
         :param year: год (если None, то все годы)
         :param include_cancelled: включать ли отмененные отпуска
+        :param after: ключ (дата начала, ID) последнего отпуска предыдущей страницы
+        :param limit: размер страницы (None - все отпуска)
         :return: список отпусков
         """
         try:
-            return self.vacation_processor.get_teacher_vacations(teacher_id, year, include_cancelled)
+            return self.vacation_processor.get_teacher_vacations(teacher_id, year, include_cancelled, after, limit)
         except Exception as e:
             logger.error(f"Ошибка при получении списка отпусков для преподавателя (id={teacher_id}): {str(e)}")
             raise
     
+    def get_vacation_by_id(self, vacation_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить информацию об отпуске по ID
+        
+        :param vacation_id: ID отпуска
+        :return: данные отпуска или None, если отпуск не найден
+        """
+        try:
+            return self.vacation_processor.get_vacation_by_id(vacation_id)
+        except Exception as e:
+            logger.error(f"Ошибка при получении отпуска (id={vacation_id}): {str(e)}")
+            raise
+    
+    def get_all_current_vacations(self, include_future: bool = True,
+                                  include_past_days: int = 0) -> List[Dict[str, Any]]:
+        """
+        Получить список текущих (и будущих) отпусков всех преподавателей
+        
+        :param include_future: включать ли будущие отпуска
+        :param include_past_days: за сколько прошедших дней включать завершившиеся отпуска
+        :return: список отпусков
+        """
+        try:
+            return self.vacation_processor.get_all_current_vacations(include_future, include_past_days)
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка текущих отпусков: {str(e)}")
+            raise
+    
     def suggest_optimal_vacation_distribution(self, teacher_id: int, year: int = None) -> List[Dict[str, Any]]:
         """
         Предложить оптимальное распределение отпуска
@@ -326,6 +562,85 @@ class SalaryApp:
             logger.error(f"Ошибка при формировании оптимального распределения отпуска (id={teacher_id}): {str(e)}")
             raise
     
+    def set_vacation_coverage_limit(self, position: str, max_absent: Optional[int]):
+        """
+        Задать лимит одновременно отсутствующих преподавателей должности
+        
+        :param position: должность
+        :param max_absent: максимальное число преподавателей в отпуске в один день (None - без лимита)
+        """
+        self.vacation_processor.set_coverage_limit(position, max_absent)
+    
+    def get_max_concurrent_absences(self, position: str, start_date: datetime.date,
+                                    end_date: datetime.date) -> int:
+        """
+        Максимальное число одновременно отсутствующих преподавателей должности в периоде
+        
+        :param position: должность
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: максимум по дням периода
+        """
+        try:
+            return self.vacation_processor.get_max_concurrent_absences(position, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Ошибка при получении числа одновременных отпусков: {str(e)}")
+            raise
+    
+    def get_vacation_bitmap(self, teacher_id: int, year: int) -> int:
+        """
+        Карта дней отпуска преподавателя за год
+        
+        :param teacher_id: ID преподавателя
+        :param year: год
+        :return: целое число, бит i которого соответствует i-му дню года
+        """
+        try:
+            return self.vacation_processor.get_vacation_bitmap(teacher_id, year)
+        except Exception as e:
+            logger.error(f"Ошибка при получении карты дней отпуска (id={teacher_id}): {str(e)}")
+            raise
+    
+    def get_daily_absences(self, year: int, teacher_ids: List[int] = None) -> List[int]:
+        """
+        Число преподавателей в отпуске в каждый день года
+        
+        :param year: год
+        :param teacher_ids: учитываемые преподаватели (None - все)
+        :return: список счетчиков по дням года
+        """
+        try:
+            return self.vacation_processor.get_daily_absences(year, teacher_ids)
+        except Exception as e:
+            logger.error(f"Ошибка при получении числа отсутствующих по дням: {str(e)}")
+            raise
+    
+    def get_vacation_statistics(self, year: int = None) -> Dict[str, Any]:
+        """
+        Получить статистику по отпускам за год
+        
+        :param year: год (если None, то текущий год)
+        :return: словарь со статистикой
+        """
+        try:
+            return self.vacation_processor.get_vacation_statistics(year)
+        except Exception as e:
+            logger.error(f"Ошибка при получении статистики по отпускам: {str(e)}")
+            raise
+    
+    def plan_vacations_for_staff(self, year: int = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Распределить оставшиеся дни отпуска всех преподавателей на год
+        
+        :param year: год (если None, то текущий год)
+        :return: словарь {ID преподавателя: список предлагаемых периодов отпуска}
+        """
+        try:
+            return self.vacation_processor.plan_vacations_for_staff(year)
+        except Exception as e:
+            logger.error(f"Ошибка при распределении отпусков на год: {str(e)}")
+            raise
+    
     
     # Общие методы для отчетности
     
@@ -404,13 +719,54 @@ class SalaryApp:
     def get_all_teachers_salary_data(self, start_date, end_date):
         """
         Получение данных о зарплате всех преподавателей за указанный период
-        
+
         :param start_date: Начальная дата периода
         :param end_date: Конечная дата периода
         :return: Список словарей с данными о расчетах зарплаты по преподавателям
         """
-        # Реализация запроса к базе данных
-        
+        try:
+            teachers = self.get_all_teachers()
+            salary_repo = SalaryCalculationRepository(self.db_connection)
+
+            # Один запрос на весь период вместо запроса на каждого преподавателя
+            calculations_by_teacher = {}
+            for calc in salary_repo.get_calculations_by_period(start_date, end_date):
+                calculations_by_teacher.setdefault(calc['teacher_id'], []).append(calc)
+
+            return [
+                {'teacher': teacher, 'calculations': calculations_by_teacher.get(teacher['id'], [])}
+                for teacher in teachers
+            ]
+        except Exception as e:
+            logger.error(f"Ошибка при получении данных о зарплате всех преподавателей: {str(e)}")
+            raise
+
+    def export_teacher_reports_batch(self, output_dir: str, start_date, end_date,
+                                     formats=('pdf', 'excel', 'word'), include_details: bool = True,
+                                     include_chart: bool = True, max_workers: int = None,
+                                     progress_callback=None) -> Dict[str, Any]:
+        """
+        Пакетный экспорт индивидуальных отчетов по зарплате для всех преподавателей
+
+        :param output_dir: каталог для сохранения отчетов
+        :param start_date: начальная дата периода
+        :param end_date: конечная дата периода
+        :param formats: форматы отчетов ('pdf', 'excel', 'word')
+        :param include_details: включать ли детали расчета
+        :param include_chart: включать ли графики
+        :param max_workers: число рабочих процессов (по умолчанию - число ядер)
+        :param progress_callback: функция progress_callback(выполнено, всего, результат)
+        :return: сводка по результатам экспорта
+        """
+        try:
+            exporter = BatchReportExporter(self, max_workers=max_workers)
+            return exporter.export(output_dir, start_date, end_date, formats=formats,
+                                   include_details=include_details, include_chart=include_chart,
+                                   progress_callback=progress_callback)
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном экспорте отчетов: {str(e)}")
+            raise
+
     def get_teacher_vacation_data(self, teacher_id, start_date, end_date):
         """
         Получение данных об отпусках преподавателя за указанный период
@@ -432,15 +788,20 @@ class SalaryApp:
         """
         # Реализация запроса к базе данных
         
-    def get_vacation_calendar(self, start_date, end_date):
+    def get_vacation_calendar(self, start_date, end_date, include_all_teachers=True):
         """
         Получение календарного графика отпусков за указанный период
         
         :param start_date: Начальная дата периода
         :param end_date: Конечная дата периода
-        :return: Данные для календарного графика отпусков
+        :param include_all_teachers: Включать ли преподавателей без отпусков в периоде
+        :return: Данные для календарного графика отпусков (статусы по дням для каждого преподавателя)
         """
-        # Реализация запроса к базе данных
+        try:
+            return self.vacation_processor.get_vacation_calendar(start_date, end_date, include_all_teachers)
+        except Exception as e:
+            logger.error(f"Ошибка при получении календарного графика отпусков: {str(e)}")
+            raise
 
         
     def get_all_teachers_sick_leave_data(self, start_date, end_date):
@@ -454,6 +815,8 @@ class SalaryApp:
 
 # Пример использования приложения
 if __name__ == "__main__":
+    setup_logging('app.log')
+    
     # Конфигурация подключения к базе данных
     db_config = {
         'host': 'localhost',
@@ -0,0 +1,364 @@
+"""
+Асинхронный фасад приложения
+
+AsyncSalaryApp предоставляет асинхронные аналоги методов SalaryApp для
+пакетных заданий и сервисов, обслуживающих многих клиентов из одного
+цикла событий. Независимые запросы выполняются параллельно через
+asyncio.gather, число одновременных запросов ограничивается размером пула.
+
+Пример:
+    app = await AsyncSalaryApp.create(db_config)
+    try:
+        averages = await app.get_average_daily_salaries(teacher_ids, datetime.date.today())
+    finally:
+        await app.close()
+"""
+import asyncio
+import datetime
+import logging
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+from async_db import (AsyncDatabaseConnection, AsyncTeacherRepository, AsyncSalaryCalculationRepository,
+                      AsyncReferenceDataRepository, AsyncVacationRepository)
+from salary_calculator import REFERENCE_FIELDS, reference_fingerprint, teacher_fingerprint, vacation_days_for
+from money import to_kopecks, from_kopecks, div_half_up
+from utils.date_utils import count_working_days
+
+logger = logging.getLogger(__name__)
+
+# Число одновременно выполняемых запросов в пакетных методах по умолчанию
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncSalaryApp:
+    """Асинхронный фасад приложения (чтение данных и пакетные расчеты)"""
+
+    def __init__(self, db_connection: AsyncDatabaseConnection):
+        """
+        Используйте AsyncSalaryApp.create(), который также открывает пул соединений
+
+        :param db_connection: асинхронный пул соединений
+        """
+        self.db_connection = db_connection
+        self.teacher_repo = AsyncTeacherRepository(db_connection)
+        self.salary_repo = AsyncSalaryCalculationRepository(db_connection)
+        self.reference_repo = AsyncReferenceDataRepository(db_connection)
+        self.vacation_repo = AsyncVacationRepository(db_connection)
+
+        # Справочные данные, как в SalaryCalculator (заполняются в load_reference_data)
+        self.position_coefficients = {}
+        self.degree_bonuses = {}
+        self.experience_bonuses = []
+        self.qualification_bonuses = {}
+        self.vacation_days_info = {}
+        # Версия справочников, сохраняемая с расчетами (как SalaryCalculator.reference_version)
+        self.reference_version = None
+
+    @classmethod
+    async def create(cls, db_config: Dict[str, str], min_size: int = 1,
+                     max_size: int = DEFAULT_CONCURRENCY) -> 'AsyncSalaryApp':
+        """
+        Создать приложение: открыть пул соединений и загрузить справочники
+
+        :param db_config: конфигурация подключения к базе данных
+        :param min_size: минимальное число соединений пула
+        :param max_size: максимальное число соединений пула
+        :return: готовый к работе экземпляр
+        """
+        logger.info("Инициализация асинхронного приложения")
+        db_connection = AsyncDatabaseConnection(db_config, min_size, max_size)
+        await db_connection.connect()
+        app = cls(db_connection)
+        try:
+            await app.load_reference_data()
+        except Exception:
+            await db_connection.close()
+            raise
+        return app
+
+    async def close(self):
+        """Закрытие пула соединений"""
+        logger.info("Закрытие асинхронных соединений с базой данных")
+        await self.db_connection.close()
+
+    async def load_reference_data(self):
+        """Загрузка справочных данных из базы (все справочники параллельно)"""
+        reference_data = await self.reference_repo.load_all()
+        for name, value in reference_data.items():
+            setattr(self, name, value)
+        self.reference_version = reference_fingerprint({name: reference_data[name] for name in REFERENCE_FIELDS})
+        logger.info("Справочные данные успешно загружены")
+
+    def query_stats(self) -> List[Dict[str, Any]]:
+        """
+        Статистика выполнения SQL-запросов асинхронного пула
+
+        :return: список запросов с числом вызовов, временем и перцентилями
+        """
+        return self.db_connection.stats.snapshot()
+
+    # Методы для работы с преподавателями
+
+    async def get_all_teachers(self) -> List[Dict[str, Any]]:
+        """
+        Получить список всех преподавателей
+
+        :return: список преподавателей
+        """
+        try:
+            return await self.teacher_repo.get_all_teachers()
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка преподавателей: {str(e)}")
+            raise
+
+    async def get_teacher_by_id(self, teacher_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить данные преподавателя по ID
+
+        :param teacher_id: ID преподавателя
+        :return: данные преподавателя или None
+        """
+        try:
+            return await self.teacher_repo.get_teacher_by_id(teacher_id)
+        except Exception as e:
+            logger.error(f"Ошибка при получении данных преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    async def add_teacher(self, teacher_data: Dict[str, Any]) -> int:
+        """
+        Добавить нового преподавателя
+
+        :param teacher_data: данные преподавателя
+        :return: ID нового преподавателя
+        """
+        try:
+            required_fields = ['name', 'hourly_rate', 'hire_date']
+            for field in required_fields:
+                if field not in teacher_data:
+                    raise ValueError(f"Отсутствует обязательное поле: {field}")
+
+            return await self.teacher_repo.add_teacher(teacher_data)
+        except Exception as e:
+            logger.error(f"Ошибка при добавлении преподавателя: {str(e)}")
+            raise
+
+    async def update_teacher(self, teacher_id: int, teacher_data: Dict[str, Any]) -> bool:
+        """
+        Обновить данные преподавателя
+
+        :param teacher_id: ID преподавателя
+        :param teacher_data: обновленные данные
+        :return: True если обновление успешно, иначе False
+        """
+        try:
+            return await self.teacher_repo.update_teacher(teacher_id, teacher_data)
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении данных преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    async def delete_teacher(self, teacher_id: int) -> bool:
+        """
+        Удалить преподавателя
+
+        :param teacher_id: ID преподавателя
+        :return: True если удаление успешно, иначе False
+        """
+        try:
+            return await self.teacher_repo.delete_teacher(teacher_id)
+        except Exception as e:
+            logger.error(f"Ошибка при удалении преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    # Зарплата
+
+    async def get_salary_data_for_period(self, teacher_id: int, start_date, end_date) -> List[Dict[str, Any]]:
+        """
+        Получить данные о зарплате преподавателя за указанный период
+
+        :param teacher_id: ID преподавателя
+        :param start_date: начальная дата периода
+        :param end_date: конечная дата периода
+        :return: список с данными о расчетах зарплаты
+        """
+        try:
+            return await self.salary_repo.get_calculations_by_teacher_and_period(teacher_id, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Ошибка при получении данных о зарплате за период: {str(e)}")
+            raise
+
+    async def save_salary_calculation(self, calculation_data: Dict[str, Any]) -> int:
+        """
+        Сохранить расчет зарплаты в базе данных
+
+        Вместе с расчетом сохраняются версия справочников и отпечаток данных
+        преподавателя (как в SalaryCalculator.save_calculation), иначе
+        SalaryCalculator.recalculate_stale не сможет определить, устарел ли расчет.
+
+        :param calculation_data: данные расчета
+        :return: ID сохраненного расчета
+        """
+        try:
+            calculation_data = dict(calculation_data)
+            if not calculation_data.get('reference_version'):
+                calculation_data['reference_version'] = self.reference_version
+            if not calculation_data.get('teacher_hash'):
+                teacher = await self.teacher_repo.get_teacher_by_id(calculation_data['teacher_id'])
+                if not teacher:
+                    raise ValueError(f"Преподаватель с ID {calculation_data['teacher_id']} не найден")
+                calculation_data['teacher_hash'] = teacher_fingerprint(teacher)
+            return await self.salary_repo.add_calculation(calculation_data)
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении расчета зарплаты: {str(e)}")
+            raise
+
+    async def get_all_teachers_salary_data(self, start_date, end_date) -> List[Dict[str, Any]]:
+        """
+        Получение данных о зарплате всех преподавателей за указанный период
+
+        Список преподавателей и расчеты за период запрашиваются параллельно.
+
+        :param start_date: начальная дата периода
+        :param end_date: конечная дата периода
+        :return: список словарей {'teacher': ..., 'calculations': [...]}
+        """
+        try:
+            teachers, calculations = await asyncio.gather(
+                self.teacher_repo.get_all_teachers(),
+                self.salary_repo.get_calculations_by_period(start_date, end_date),
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при получении данных о зарплате всех преподавателей: {str(e)}")
+            raise
+
+        calculations_by_teacher = {}
+        for calc in calculations:
+            calculations_by_teacher.setdefault(calc['teacher_id'], []).append(calc)
+
+        return [
+            {'teacher': teacher, 'calculations': calculations_by_teacher.get(teacher['id'], [])}
+            for teacher in teachers
+        ]
+
+    async def get_average_daily_salary(self, teacher_id: int, as_of_date: datetime.date) -> Optional[Decimal]:
+        """
+        Средняя дневная зарплата за 12 месяцев до даты (как при расчете отпускных)
+
+        :param teacher_id: ID преподавателя
+        :param as_of_date: дата, на которую выполняется расчет
+        :return: средняя дневная зарплата или None, если нет расчетов за период
+        """
+        year_ago = as_of_date - datetime.timedelta(days=365)
+        calculations = await self.salary_repo.get_calculations_by_teacher_and_period(
+            teacher_id, year_ago, as_of_date)
+        if not calculations:
+            return None
+
+        total_gross = sum(to_kopecks(calc['gross_salary']) for calc in calculations)
+        working_days = count_working_days(year_ago, as_of_date) or 250
+        return from_kopecks(div_half_up(total_gross, working_days))
+
+    async def get_average_daily_salaries(self, teacher_ids: List[int], as_of_date: datetime.date,
+                                         concurrency: int = DEFAULT_CONCURRENCY) -> Dict[int, Optional[Decimal]]:
+        """
+        Средняя дневная зарплата для многих преподавателей
+
+        Окна усреднения запрашиваются параллельно, не более concurrency
+        запросов одновременно.
+
+        :param teacher_ids: список ID преподавателей
+        :param as_of_date: дата, на которую выполняется расчет
+        :param concurrency: максимальное число одновременных запросов
+        :return: словарь {ID: средняя дневная зарплата или None}
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def average(teacher_id):
+            async with semaphore:
+                return await self.get_average_daily_salary(teacher_id, as_of_date)
+
+        try:
+            results = await asyncio.gather(*(average(teacher_id) for teacher_id in teacher_ids))
+        except Exception as e:
+            logger.error(f"Ошибка при расчете средней дневной зарплаты: {str(e)}")
+            raise
+        return dict(zip(teacher_ids, results))
+
+    # Отпуска
+
+    async def get_teacher_vacation_days(self, teacher_id: int) -> int:
+        """
+        Получить положенное количество дней отпуска для преподавателя
+
+        :param teacher_id: ID преподавателя
+        :return: количество дней отпуска
+        """
+        teacher = await self.teacher_repo.get_teacher_by_id(teacher_id)
+        if not teacher:
+            raise ValueError(f"Преподаватель с ID {teacher_id} не найден")
+        return self._get_vacation_days(teacher)
+
+    async def get_teacher_remaining_vacation_days(self, teacher_id: int, year: int = None) -> int:
+        """
+        Получить количество оставшихся дней отпуска с учетом переносов
+
+        Данные преподавателя, использованные и перенесенные дни запрашиваются параллельно.
+
+        :param teacher_id: ID преподавателя
+        :param year: год (если None, то текущий год)
+        :return: количество оставшихся дней отпуска
+        """
+        if year is None:
+            year = datetime.date.today().year
+
+        try:
+            base_days, used_days, (transferred_in, transferred_out) = await asyncio.gather(
+                self.get_teacher_vacation_days(teacher_id),
+                self.vacation_repo.get_used_vacation_days(teacher_id, year),
+                self.vacation_repo.get_transferred_days(teacher_id, year),
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при получении оставшихся дней отпуска для преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+        return max(0, base_days - used_days + transferred_in - transferred_out)
+
+    async def get_teacher_vacations(self, teacher_id: int, year: int = None,
+                                    include_cancelled: bool = False) -> List[Dict[str, Any]]:
+        """
+        Получить список отпусков преподавателя
+
+        :param teacher_id: ID преподавателя
+        :param year: год (если None, то все годы)
+        :param include_cancelled: включать ли отмененные отпуска
+        :return: список отпусков
+        """
+        try:
+            return await self.vacation_repo.get_teacher_vacations(teacher_id, year, include_cancelled)
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка отпусков для преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    async def get_vacation_by_id(self, vacation_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить информацию об отпуске по ID
+
+        :param vacation_id: ID отпуска
+        :return: данные отпуска или None
+        """
+        return await self.vacation_repo.get_vacation_by_id(vacation_id)
+
+    async def get_all_current_vacations(self, include_future: bool = True,
+                                        include_past_days: int = 0) -> List[Dict[str, Any]]:
+        """
+        Получить список всех текущих и будущих отпусков
+
+        :param include_future: включать будущие отпуска
+        :param include_past_days: сколько дней прошедших отпусков включать
+        :return: список отпусков
+        """
+        return await self.vacation_repo.get_all_current_vacations(include_future, include_past_days)
+
+    def _get_vacation_days(self, teacher_data: Dict[str, Any]) -> int:
+        """Расчет количества дней отпуска (те же правила, что в SalaryCalculator)"""
+        return vacation_days_for(teacher_data, self.vacation_days_info)
@@ -0,0 +1,549 @@
+"""
+Асинхронный слой доступа к данным на asyncpg
+
+Повторяет запросы синхронных репозиториев db_connection и VacationProcessor,
+но выполняет их через пул соединений asyncpg, поэтому независимые запросы
+(например, окна усреднения зарплаты по многим преподавателям) можно
+выполнять параллельно через asyncio.gather. Запросы учитываются в той же
+статистике QueryStats, что и синхронный курсор.
+
+Требуется пакет asyncpg (pip install asyncpg). Параметры запросов asyncpg
+задаются как $1, $2, ...
+"""
+import asyncio
+import datetime
+import logging
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from query_stats import QueryStats, DEFAULT_SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+# Столбцы преподавателя, как в TeacherRepository
+_TEACHER_COLUMNS = """
+    t.id, t.name, t.hourly_rate, t.is_young_specialist,
+    t.is_union_member, t.position, t.academic_degree,
+    t.qualification_category, t.experience_years,
+    t.hire_date, t.birth_date
+"""
+
+# Столбцы отпуска, как в VacationProcessor.get_teacher_vacations
+_VACATION_COLUMNS = """
+    v.id, v.teacher_id, t.name as teacher_name,
+    v.start_date, v.end_date, v.days_count,
+    v.vacation_type, v.status, v.payment_amount,
+    v.payment_date, v.calculation_date, v.notes,
+    v.created_at, v.updated_at
+"""
+
+
+class AsyncDatabaseConnection:
+    """Пул асинхронных соединений с базой данных"""
+
+    def __init__(self, db_config: Dict[str, str], min_size: int = 1, max_size: int = 10):
+        """
+        Параметры пула (соединения открываются в connect())
+
+        :param db_config: словарь с параметрами подключения к БД
+        :param min_size: минимальное число соединений
+        :param max_size: максимальное число соединений
+        """
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.pool = None
+        self.stats = QueryStats(float(db_config.get('slow_query_ms', DEFAULT_SLOW_QUERY_MS)))
+
+    async def connect(self):
+        """Создать пул соединений"""
+        try:
+            import asyncpg
+        except ImportError as e:
+            raise ImportError("Для асинхронного доступа к БД требуется установить пакет asyncpg:\n"
+                              "pip install asyncpg") from e
+
+        try:
+            self.pool = await asyncpg.create_pool(
+                host=self.db_config.get('host', 'localhost'),
+                database=self.db_config.get('database', 'salary_calculator2'),
+                user=self.db_config.get('user', 'postgres'),
+                password=self.db_config.get('password', '123321445'),
+                port=int(self.db_config.get('port', '5432')),
+                min_size=self.min_size,
+                max_size=self.max_size
+            )
+            logger.info("Асинхронный пул соединений с базой данных успешно создан")
+        except Exception as e:
+            logger.error(f"Ошибка при создании асинхронного пула соединений: {str(e)}")
+            raise
+
+    async def close(self):
+        """Закрыть все соединения пула"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info("Все асинхронные соединения закрыты")
+
+    def acquire(self):
+        """Получить соединение из пула (async with db.acquire() as connection)"""
+        if self.pool is None:
+            raise RuntimeError("Пул соединений не создан: вызовите connect()")
+        return self.pool.acquire()
+
+    async def fetch(self, query: str, *args, connection=None) -> List[Dict[str, Any]]:
+        """Выполнить запрос и вернуть строки в виде словарей"""
+        return [dict(row) for row in await self._run('fetch', query, args, connection)]
+
+    async def fetchrow(self, query: str, *args, connection=None) -> Optional[Dict[str, Any]]:
+        """Выполнить запрос и вернуть первую строку или None"""
+        row = await self._run('fetchrow', query, args, connection)
+        return dict(row) if row is not None else None
+
+    async def fetchval(self, query: str, *args, connection=None):
+        """Выполнить запрос и вернуть значение первого столбца первой строки"""
+        return await self._run('fetchval', query, args, connection)
+
+    async def execute(self, query: str, *args, connection=None) -> int:
+        """
+        Выполнить команду без результата
+
+        :return: число затронутых строк
+        """
+        status = await self._run('execute', query, args, connection)
+        try:
+            return int(status.split()[-1])
+        except (AttributeError, ValueError, IndexError):
+            return 0
+
+    async def _run(self, method: str, query: str, args: tuple, connection):
+        """Выполнить метод соединения asyncpg с учетом статистики запросов"""
+        started = time.perf_counter()
+        result = None
+        try:
+            if connection is not None:
+                result = await getattr(connection, method)(query, *args)
+            else:
+                async with self.acquire() as own_connection:
+                    result = await getattr(own_connection, method)(query, *args)
+            return result
+        finally:
+            rowcount = len(result) if isinstance(result, list) else (1 if result is not None else 0)
+            self.stats.record(query, time.perf_counter() - started, rowcount, f"async_db {method}")
+
+
+class AsyncTeacherRepository:
+    """Асинхронная работа с данными преподавателей"""
+
+    def __init__(self, db_connection: AsyncDatabaseConnection):
+        self.db_connection = db_connection
+
+    async def get_all_teachers(self) -> List[Dict[str, Any]]:
+        """
+        Получить список всех преподавателей
+
+        :return: список преподавателей
+        """
+        try:
+            return await self.db_connection.fetch(f"SELECT {_TEACHER_COLUMNS} FROM teachers t ORDER BY t.name")
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка преподавателей: {str(e)}")
+            raise
+
+    async def get_teacher_by_id(self, teacher_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получить данные преподавателя по ID
+
+        :param teacher_id: ID преподавателя
+        :return: данные преподавателя или None
+        """
+        try:
+            return await self.db_connection.fetchrow(
+                f"SELECT {_TEACHER_COLUMNS} FROM teachers t WHERE t.id = $1", teacher_id)
+        except Exception as e:
+            logger.error(f"Ошибка при получении данных преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    async def get_teachers_by_ids(self, teacher_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Получить данные нескольких преподавателей одним запросом
+
+        :param teacher_ids: список ID
+        :return: словарь {ID: данные преподавателя}
+        """
+        try:
+            rows = await self.db_connection.fetch(
+                f"SELECT {_TEACHER_COLUMNS} FROM teachers t WHERE t.id = ANY($1::int[])", list(teacher_ids))
+            return {row['id']: row for row in rows}
+        except Exception as e:
+            logger.error(f"Ошибка при получении данных преподавателей: {str(e)}")
+            raise
+
+    async def add_teacher(self, teacher_data: Dict[str, Any]) -> int:
+        """
+        Добавить нового преподавателя
+
+        :param teacher_data: данные преподавателя
+        :return: ID нового преподавателя
+        """
+        try:
+            teacher_id = await self.db_connection.fetchval("""
+                INSERT INTO teachers (
+                    name, hourly_rate, is_young_specialist, is_union_member,
+                    position, academic_degree, qualification_category,
+                    experience_years, hire_date, birth_date
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                RETURNING id
+            """, *self._teacher_values(teacher_data))
+            logger.info(f"Добавлен новый преподаватель с ID: {teacher_id}")
+            return teacher_id
+        except Exception as e:
+            logger.error(f"Ошибка при добавлении преподавателя: {str(e)}")
+            raise
+
+    async def update_teacher(self, teacher_id: int, teacher_data: Dict[str, Any]) -> bool:
+        """
+        Обновить данные преподавателя
+
+        :param teacher_id: ID преподавателя
+        :param teacher_data: обновленные данные
+        :return: True если обновление успешно, иначе False
+        """
+        try:
+            updated = await self.db_connection.execute("""
+                UPDATE teachers SET
+                    name = $1,
+                    hourly_rate = $2,
+                    is_young_specialist = $3,
+                    is_union_member = $4,
+                    position = $5,
+                    academic_degree = $6,
+                    qualification_category = $7,
+                    experience_years = $8,
+                    hire_date = $9,
+                    birth_date = $10
+                WHERE id = $11
+            """, *self._teacher_values(teacher_data), teacher_id) > 0
+            if updated:
+                logger.info(f"Обновлены данные преподавателя с ID: {teacher_id}")
+            return updated
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении данных преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    async def delete_teacher(self, teacher_id: int) -> bool:
+        """
+        Удалить преподавателя
+
+        :param teacher_id: ID преподавателя
+        :return: True если удаление успешно, иначе False
+        """
+        try:
+            deleted = await self.db_connection.execute("DELETE FROM teachers WHERE id = $1", teacher_id) > 0
+            if deleted:
+                logger.info(f"Удален преподаватель с ID: {teacher_id}")
+            return deleted
+        except Exception as e:
+            logger.error(f"Ошибка при удалении преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    @staticmethod
+    def _teacher_values(teacher_data: Dict[str, Any]) -> Tuple:
+        """Значения столбцов преподавателя в порядке INSERT/UPDATE"""
+        return (
+            teacher_data.get('name'),
+            teacher_data.get('hourly_rate'),
+            teacher_data.get('is_young_specialist', False),
+            teacher_data.get('is_union_member', False),
+            teacher_data.get('position'),
+            teacher_data.get('academic_degree'),
+            teacher_data.get('qualification_category'),
+            teacher_data.get('experience_years', 0),
+            teacher_data.get('hire_date'),
+            teacher_data.get('birth_date'),
+        )
+
+
+class AsyncSalaryCalculationRepository:
+    """Асинхронная работа с расчетами зарплаты"""
+
+    def __init__(self, db_connection: AsyncDatabaseConnection):
+        self.db_connection = db_connection
+
+    async def get_calculations_by_teacher(self, teacher_id: int) -> List[Dict[str, Any]]:
+        """
+        Получить все расчеты для преподавателя
+
+        :param teacher_id: ID преподавателя
+        :return: список расчетов
+        """
+        try:
+            return await self.db_connection.fetch("""
+                SELECT *
+                FROM salary_calculations
+                WHERE teacher_id = $1
+                ORDER BY calculation_date DESC
+            """, teacher_id)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов для преподавателя (id={teacher_id}): {str(e)}")
+            raise
+
+    async def get_calculations_by_teacher_and_period(self, teacher_id: int, start_date,
+                                                     end_date) -> List[Dict[str, Any]]:
+        """
+        Получить расчеты зарплаты преподавателя за период
+
+        :param teacher_id: ID преподавателя
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: список расчетов
+        """
+        try:
+            return await self.db_connection.fetch("""
+                SELECT *
+                FROM salary_calculations
+                WHERE teacher_id = $1
+                AND calculation_date BETWEEN $2 AND $3
+                ORDER BY calculation_date DESC
+            """, teacher_id, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов за период: {str(e)}")
+            raise
+
+    async def get_calculations_by_period(self, start_date, end_date) -> List[Dict[str, Any]]:
+        """
+        Получить расчеты зарплаты всех преподавателей за период
+
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: список расчетов, упорядоченный по преподавателю и дате
+        """
+        try:
+            return await self.db_connection.fetch("""
+                SELECT *
+                FROM salary_calculations
+                WHERE calculation_date BETWEEN $1 AND $2
+                ORDER BY teacher_id, calculation_date DESC
+            """, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов всех преподавателей за период: {str(e)}")
+            raise
+
+    async def add_calculation(self, calculation_data: Dict[str, Any]) -> int:
+        """
+        Добавить новый расчет зарплаты
+
+        :param calculation_data: данные расчета
+        :return: ID нового расчета
+        """
+        try:
+            calculation_id = await self.db_connection.fetchval("""
+                INSERT INTO salary_calculations (
+                    teacher_id, calculation_date, hours_worked, sick_leave_hours,
+                    absence_hours, bonus, tax_rate, gross_salary, net_salary,
+                    vacation_days, vacation_pay, position_bonus, degree_bonus,
+                    experience_bonus, category_bonus, reference_version, teacher_hash
+                ) VALUES (
+                    $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17
+                ) RETURNING id
+            """,
+                calculation_data.get('teacher_id'),
+                calculation_data.get('calculation_date'),
+                calculation_data.get('hours_worked', 0),
+                calculation_data.get('sick_leave_hours', 0),
+                calculation_data.get('absence_hours', 0),
+                calculation_data.get('bonus', 0),
+                calculation_data.get('tax_rate', 0.13),
+                calculation_data.get('gross_salary', 0),
+                calculation_data.get('net_salary', 0),
+                calculation_data.get('vacation_days', 0),
+                calculation_data.get('vacation_pay', 0),
+                calculation_data.get('position_bonus', 0),
+                calculation_data.get('degree_bonus', 0),
+                calculation_data.get('experience_bonus', 0),
+                calculation_data.get('category_bonus', 0),
+                calculation_data.get('reference_version'),
+                calculation_data.get('teacher_hash')
+            )
+            logger.info(f"Добавлен новый расчет зарплаты с ID: {calculation_id}")
+            return calculation_id
+        except Exception as e:
+            logger.error(f"Ошибка при добавлении расчета зарплаты: {str(e)}")
+            raise
+
+
+class AsyncReferenceDataRepository:
+    """Асинхронная работа со справочными данными (коэффициенты, надбавки и т.д.)"""
+
+    def __init__(self, db_connection: AsyncDatabaseConnection):
+        self.db_connection = db_connection
+
+    async def get_position_coefficients(self) -> Dict[str, float]:
+        """Коэффициенты по должностям {должность: коэффициент}"""
+        rows = await self.db_connection.fetch("SELECT position, coefficient FROM position_coefficients")
+        return {row['position']: row['coefficient'] for row in rows}
+
+    async def get_academic_degree_bonuses(self) -> Dict[str, float]:
+        """Надбавки за ученую степень {степень: процент надбавки}"""
+        rows = await self.db_connection.fetch("SELECT degree, bonus_percent FROM academic_degree_bonuses")
+        return {row['degree']: row['bonus_percent'] for row in rows}
+
+    async def get_experience_bonuses(self) -> List[Tuple[int, Optional[int], float]]:
+        """Надбавки за стаж: список кортежей (мин_лет, макс_лет, процент)"""
+        rows = await self.db_connection.fetch(
+            "SELECT min_years, max_years, bonus_percent FROM experience_bonuses ORDER BY min_years")
+        return [(row['min_years'], row['max_years'], row['bonus_percent']) for row in rows]
+
+    async def get_qualification_bonuses(self) -> Dict[str, float]:
+        """Надбавки за квалификационную категорию {категория: процент надбавки}"""
+        rows = await self.db_connection.fetch("SELECT category, bonus_percent FROM qualification_bonuses")
+        return {row['category']: row['bonus_percent'] for row in rows}
+
+    async def get_vacation_days(self) -> Dict[str, Dict[str, int]]:
+        """Дни отпуска по должностям {должность: {базовые_дни, доп_дни_степень, доп_дни_стаж}}"""
+        rows = await self.db_connection.fetch("""
+            SELECT position, base_days, additional_days_degree, additional_days_experience
+            FROM vacation_days
+        """)
+        return {
+            row['position']: {
+                'base_days': row['base_days'],
+                'additional_days_degree': row['additional_days_degree'],
+                'additional_days_experience': row['additional_days_experience'],
+            }
+            for row in rows
+        }
+
+    async def load_all(self) -> Dict[str, Any]:
+        """
+        Загрузить все справочники параллельно
+
+        :return: словарь с ключами как атрибуты SalaryCalculator
+                 (position_coefficients, degree_bonuses, experience_bonuses,
+                 qualification_bonuses, vacation_days_info)
+        """
+        try:
+            results = await asyncio.gather(
+                self.get_position_coefficients(),
+                self.get_academic_degree_bonuses(),
+                self.get_experience_bonuses(),
+                self.get_qualification_bonuses(),
+                self.get_vacation_days(),
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при загрузке справочных данных: {str(e)}")
+            raise
+        keys = ('position_coefficients', 'degree_bonuses', 'experience_bonuses',
+                'qualification_bonuses', 'vacation_days_info')
+        return dict(zip(keys, results))
+
+
+class AsyncVacationRepository:
+    """Асинхронные запросы по отпускам (чтение), как в VacationProcessor"""
+
+    def __init__(self, db_connection: AsyncDatabaseConnection):
+        self.db_connection = db_connection
+
+    async def get_teacher_vacations(self, teacher_id: int, year: int = None,
+                                    include_cancelled: bool = False) -> List[Dict[str, Any]]:
+        """Получить список отпусков преподавателя"""
+        conditions = ["teacher_id = $1"]
+        params: List[Any] = [teacher_id]
+
+        if year is not None:
+            params.append(year)
+            conditions.append(f"(EXTRACT(YEAR FROM start_date) = ${len(params)} "
+                              f"OR EXTRACT(YEAR FROM end_date) = ${len(params)})")
+
+        if not include_cancelled:
+            conditions.append("status != 'отменен'")
+
+        try:
+            return await self.db_connection.fetch(f"""
+                SELECT {_VACATION_COLUMNS}
+                FROM teacher_vacations v
+                JOIN teachers t ON v.teacher_id = t.id
+                WHERE {" AND ".join(conditions)}
+                ORDER BY v.start_date DESC
+            """, *params)
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка отпусков: {str(e)}")
+            raise
+
+    async def get_vacation_by_id(self, vacation_id: int) -> Optional[Dict[str, Any]]:
+        """Получить информацию об отпуске по ID"""
+        try:
+            return await self.db_connection.fetchrow(f"""
+                SELECT {_VACATION_COLUMNS}
+                FROM teacher_vacations v
+                JOIN teachers t ON v.teacher_id = t.id
+                WHERE v.id = $1
+            """, vacation_id)
+        except Exception as e:
+            logger.error(f"Ошибка при получении информации об отпуске: {str(e)}")
+            raise
+
+    async def get_all_current_vacations(self, include_future: bool = True,
+                                        include_past_days: int = 0) -> List[Dict[str, Any]]:
+        """Получить список всех текущих и будущих отпусков"""
+        today = datetime.date.today()
+        past_date = today - datetime.timedelta(days=include_past_days)
+
+        if include_future:
+            condition, params = "end_date >= $1", [past_date if include_past_days > 0 else today]
+        else:
+            condition, params = "start_date <= $1 AND end_date >= $2", [today, past_date]
+
+        try:
+            return await self.db_connection.fetch(f"""
+                SELECT v.id, v.teacher_id, t.name as teacher_name,
+                       v.start_date, v.end_date, v.days_count,
+                       v.vacation_type, v.status, v.payment_amount,
+                       v.payment_date, v.calculation_date, v.notes
+                FROM teacher_vacations v
+                JOIN teachers t ON v.teacher_id = t.id
+                WHERE status IN ('запланирован', 'использован', 'оплачен') AND {condition}
+                ORDER BY v.start_date
+            """, *params)
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка текущих отпусков: {str(e)}")
+            raise
+
+    async def get_used_vacation_days(self, teacher_id: int, year: int = None) -> int:
+        """Количество использованных и запланированных дней отпуска за год"""
+        params: List[Any] = [teacher_id]
+        year_condition = ""
+        if year is not None:
+            params.extend([datetime.date(year, 1, 1), datetime.date(year, 12, 31)])
+            year_condition = "AND (start_date BETWEEN $2 AND $3 OR end_date BETWEEN $2 AND $3)"
+
+        try:
+            used_days = await self.db_connection.fetchval(f"""
+                SELECT COALESCE(SUM(days_count), 0)
+                FROM teacher_vacations
+                WHERE teacher_id = $1
+                AND status IN ('запланирован', 'использован', 'оплачен')
+                {year_condition}
+            """, *params)
+            return used_days or 0
+        except Exception as e:
+            logger.error(f"Ошибка при получении использованных дней отпуска: {str(e)}")
+            raise
+
+    async def get_transferred_days(self, teacher_id: int, year: int) -> Tuple[int, int]:
+        """
+        Перенесенные дни отпуска
+
+        :return: (перенесено на год, перенесено с года)
+        """
+        try:
+            row = await self.db_connection.fetchrow("""
+                SELECT COALESCE(SUM(days_count) FILTER (WHERE to_year = $2), 0) AS days_in,
+                       COALESCE(SUM(days_count) FILTER (WHERE from_year = $2), 0) AS days_out
+                FROM vacation_days_transfer
+                WHERE teacher_id = $1 AND (to_year = $2 OR from_year = $2)
+            """, teacher_id, year)
+            return row['days_in'], row['days_out']
+        except Exception as e:
+            logger.error(f"Ошибка при получении перенесенных дней отпуска: {str(e)}")
+            raise
@@ -0,0 +1,225 @@
+"""
+Пакетный экспорт индивидуальных отчетов по зарплате
+
+Данные всех преподавателей выбираются из БД заранее в основном процессе,
+а формирование файлов (reportlab, matplotlib, openpyxl, python-docx)
+распределяется по пулу процессов. Рабочие процессы получают только
+простые данные и не открывают соединений с базой данных.
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+import report_export
+
+logger = logging.getLogger(__name__)
+
+# Расширения файлов и функции экспорта для поддерживаемых форматов
+REPORT_FORMATS = {
+    'pdf': ('.pdf', report_export.export_to_pdf),
+    'excel': ('.xlsx', report_export.export_to_excel),
+    'word': ('.docx', report_export.export_to_word),
+}
+
+# Суммируемые поля расчетов зарплаты
+_SUMMED_FIELDS = (
+    'hours_worked', 'bonus', 'gross_salary', 'net_salary', 'position_bonus',
+    'degree_bonus', 'experience_bonus', 'category_bonus', 'young_specialist_bonus',
+    'sick_leave_pay', 'vacation_pay',
+)
+
+
+def _to_float(value, default: float = 0.0) -> float:
+    """Безопасное преобразование значения из БД (Decimal, None, str) в float"""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _safe_file_name(name: str) -> str:
+    """Имя файла без символов, недопустимых в Windows и Linux"""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(name)).strip('_') or 'teacher'
+
+
+def build_teacher_report_data(teacher: Dict[str, Any], calculations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Подготовить данные отчета одного преподавателя за период
+
+    Результат содержит только простые типы (str, int, float), поэтому
+    его можно без потерь передать в рабочий процесс.
+
+    :param teacher: данные преподавателя
+    :param calculations: расчеты зарплаты преподавателя за период
+    :return: словарь в формате функций модуля report_export
+    """
+    hourly_rate = _to_float(teacher.get('hourly_rate'))
+    totals = {field: sum(_to_float(calc.get(field)) for calc in calculations) for field in _SUMMED_FIELDS}
+
+    base_salary = totals['hours_worked'] * hourly_rate
+    tax_amount = sum(_to_float(calc.get('gross_salary')) * _to_float(calc.get('tax_rate'))
+                     for calc in calculations)
+    union_contribution = max(0.0, totals['gross_salary'] - tax_amount - totals['net_salary'])
+    tax_rate = (tax_amount / totals['gross_salary'] * 100) if totals['gross_salary'] else 0.0
+
+    data = {
+        'teacher_id': teacher.get('id'),
+        'teacher_name': teacher.get('name') or '',
+        'position': teacher.get('position') or '',
+        'hourly_rate': hourly_rate,
+        'base_salary': base_salary,
+        'tax_rate': tax_rate,
+        'tax_amount': tax_amount,
+        'union_contribution': union_contribution,
+        'calculations_count': len(calculations),
+    }
+    data.update(totals)
+    return data
+
+
+def _init_worker():
+    """Инициализация рабочего процесса: графики строятся без оконной подсистемы"""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+    except ImportError:
+        pass
+
+
+def _export_teacher_reports(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Сформировать файлы отчетов одного преподавателя (выполняется в рабочем процессе)
+
+    :param task: описание задачи с подготовленными данными
+    :return: результат с путями созданных файлов и ошибками
+    """
+    data = task['data']
+    result = {
+        'teacher_id': data['teacher_id'],
+        'teacher_name': data['teacher_name'],
+        'files': [],
+        'errors': [],
+    }
+    base_name = f"{data['teacher_id']}_{_safe_file_name(data['teacher_name'])}"
+
+    for output_format in task['formats']:
+        extension, export_func = REPORT_FORMATS[output_format]
+        file_path = os.path.join(task['output_dir'], base_name + extension)
+        try:
+            export_func(data, file_path, task['title'].format(name=data['teacher_name']),
+                        include_details=task['include_details'],
+                        include_chart=task['include_chart'])
+            result['files'].append(file_path)
+        except Exception as e:
+            result['errors'].append(f"{output_format}: {str(e)}")
+
+    return result
+
+
+class BatchReportExporter:
+    """Пакетный экспорт отчетов по зарплате для всех преподавателей с использованием пула процессов"""
+
+    def __init__(self, app, max_workers: Optional[int] = None):
+        """
+        Инициализация экспортера
+
+        :param app: экземпляр SalaryApp для предварительной выборки данных
+        :param max_workers: число рабочих процессов (по умолчанию - число ядер)
+        """
+        self.app = app
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def prefetch(self, start_date, end_date) -> List[Dict[str, Any]]:
+        """
+        Выбрать из БД данные всех преподавателей за период
+
+        :param start_date: начальная дата периода
+        :param end_date: конечная дата периода
+        :return: список подготовленных данных отчетов (только преподаватели с расчетами)
+        """
+        reports = []
+        for item in self.app.get_all_teachers_salary_data(start_date, end_date):
+            if item['calculations']:
+                reports.append(build_teacher_report_data(item['teacher'], item['calculations']))
+        return reports
+
+    def export(self, output_dir: str, start_date, end_date, formats: Iterable[str] = ('pdf', 'excel', 'word'),
+               include_details: bool = True, include_chart: bool = True,
+               title: str = "Отчет по заработной плате: {name}",
+               progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Сформировать отчеты всех преподавателей в указанном каталоге
+
+        :param output_dir: каталог для сохранения отчетов
+        :param start_date: начальная дата периода
+        :param end_date: конечная дата периода
+        :param formats: форматы отчетов ('pdf', 'excel', 'word')
+        :param include_details: включать ли детали расчета
+        :param include_chart: включать ли графики
+        :param title: шаблон заголовка отчета ({name} - ФИО преподавателя)
+        :param progress_callback: функция progress_callback(выполнено, всего, результат)
+        :return: сводка по результатам экспорта
+        """
+        formats = [f.lower() for f in formats]
+        unknown = [f for f in formats if f not in REPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Неподдерживаемые форматы отчета: {', '.join(unknown)}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        started = time.perf_counter()
+
+        reports = self.prefetch(start_date, end_date)
+        logger.info(f"Пакетный экспорт: {len(reports)} преподавателей, форматы {formats}, "
+                    f"процессов: {self.max_workers}")
+
+        summary = {
+            'output_dir': output_dir,
+            'period_start': start_date,
+            'period_end': end_date,
+            'total': len(reports),
+            'succeeded': 0,
+            'failed': 0,
+            'files': [],
+            'errors': [],
+        }
+
+        if reports:
+            tasks = [{
+                'data': data,
+                'output_dir': output_dir,
+                'formats': formats,
+                'title': title,
+                'include_details': include_details,
+                'include_chart': include_chart,
+            } for data in reports]
+
+            workers = min(self.max_workers, len(tasks))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = [executor.submit(_export_teacher_reports, task) for task in tasks]
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {'teacher_id': None, 'teacher_name': '', 'files': [], 'errors': [str(e)]}
+
+                    summary['files'].extend(result['files'])
+                    if result['errors']:
+                        summary['failed'] += 1
+                        summary['errors'].extend(
+                            f"{result['teacher_name']} (ID: {result['teacher_id']}): {error}"
+                            for error in result['errors'])
+                    else:
+                        summary['succeeded'] += 1
+
+                    if progress_callback:
+                        progress_callback(completed, len(tasks), result)
+
+        summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(f"Пакетный экспорт завершен за {summary['elapsed_seconds']} с: "
+                    f"успешно {summary['succeeded']}, с ошибками {summary['failed']}")
+        return summary
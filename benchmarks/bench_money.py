@@ -0,0 +1,169 @@
+"""
+Сравнение денежной арифметики: прежние выражения Decimal и модуль money
+
+Для каждой операции замеряется прежний вариант (Decimal(str(x)), новые
+Decimal('0.01') и Decimal('100.0') при каждом вызове, округление
+quantize с ROUND_HALF_UP) и вариант через money (константы модуля,
+собственный контекст, расчет в целых копейках). Перед замером результаты
+обоих вариантов сравниваются на случайных данных. Выводится время одной
+операции в наносекундах (лучшее из --repeat повторов) и ускорение.
+
+С ключом --calculator дополнительно замеряется полный расчет
+SalaryCalculator.calculate_salary_for_teacher по снимку справочников
+(без обращений к базе данных, но с установленными зависимостями проекта).
+
+Запуск из корня проекта:
+    python benchmarks/bench_money.py --number 100000
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal, ROUND_HALF_UP
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import money  # noqa: E402
+
+# Справочники для замера полного расчета
+REFERENCE_DATA = {
+    'position_coefficients': {'преподаватель': 1.0, 'старший преподаватель': 1.1, 'доцент': 1.2},
+    'degree_bonuses': {'кандидат наук': 10.0, 'доктор наук': 20.0},
+    'experience_bonuses': [(0, 5, 0.0), (5, 10, 5.0), (10, 20, 10.0), (20, None, 15.0)],
+    'qualification_bonuses': {'первая': 5.0, 'высшая': 10.0},
+    'vacation_days_info': {'доцент': {'base_days': 56, 'additional_days_degree': 0,
+                                     'additional_days_experience': 0}},
+}
+
+
+def legacy_vacation(total_gross: Decimal, working_days: int, days: int):
+    """Отпускные прежним способом (Decimal и quantize на каждом шаге)"""
+    avg = (total_gross / Decimal(str(working_days))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    pay = (avg * Decimal(str(days))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    tax = (pay * Decimal('0.13')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    union = (pay * Decimal('0.01')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return float(avg), float(pay), float(tax), float(pay - tax - union)
+
+
+def money_vacation(total_gross: Decimal, working_days: int, days: int):
+    """Отпускные в целых копейках (как в SalaryCalculator.vacation_pay_from_history)"""
+    avg = money.div_half_up(money.to_kopecks(total_gross), working_days)
+    pay = avg * days
+    tax = money.kopecks_times(pay, Decimal('0.13'))
+    union = money.kopecks_times(pay, Decimal('0.01'))
+    return (money.kopecks_to_float(avg), money.kopecks_to_float(pay), money.kopecks_to_float(tax),
+            money.kopecks_to_float(pay - tax - union))
+
+
+def legacy_sick_leave(total_gross: Decimal, working_days: int, days: int, percentage: Decimal):
+    """Оплата больничного прежним способом"""
+    avg = (total_gross / Decimal(str(working_days))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    pay = (avg * Decimal(str(days)) * (percentage / Decimal('100.0'))).quantize(
+        Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return float(avg), float(pay)
+
+
+def money_sick_leave(total_gross: Decimal, working_days: int, days: int, percentage: Decimal):
+    """Оплата больничного в целых копейках"""
+    avg = money.div_half_up(money.to_kopecks(total_gross), working_days)
+    return money.kopecks_to_float(avg), money.kopecks_to_float(money.kopecks_percent(avg * days, percentage))
+
+
+def legacy_bonuses(base: Decimal, degree_percent: float, experience_percent: float, tax_rate: int):
+    """Надбавки и налог прежним способом (справочники во float, замыкание округления)"""
+    def round_decimal(value):
+        return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+    degree = base * (Decimal(str(degree_percent)) / Decimal('100.0'))
+    experience = base * (Decimal(str(experience_percent)) / Decimal('100.0'))
+    gross = base + degree + experience
+    tax = (gross * (Decimal(str(tax_rate)) / Decimal('100.0'))).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return round_decimal(degree), round_decimal(experience), round_decimal(gross - tax)
+
+
+def money_bonuses(base: Decimal, degree_percent: Decimal, experience_percent: Decimal, tax_rate: int):
+    """Надбавки и налог через money (справочники заранее в Decimal)"""
+    degree = money.percent_of(base, degree_percent)
+    experience = money.percent_of(base, experience_percent)
+    gross = base + degree + experience
+    tax = money.round_money(gross * (money.to_decimal(tax_rate) * money.PERCENT))
+    return money.round_money(degree), money.round_money(experience), money.round_money(gross - tax)
+
+
+def best_ns(func, number: int, repeat: int) -> float:
+    """Лучшее время одного вызова в наносекундах"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def check_equivalence(samples: int):
+    """Проверка, что оба варианта дают одинаковые результаты"""
+    rng = random.Random(1)
+    for _ in range(samples):
+        gross = Decimal(rng.randint(0, 10 ** 9)).scaleb(-2)
+        working_days, days = rng.randint(1, 400), rng.randint(1, 60)
+        percentage = rng.choice([Decimal('80.0'), Decimal('85.0'), Decimal('90.0'), Decimal('100.0')])
+        assert legacy_vacation(gross, working_days, days) == money_vacation(gross, working_days, days)
+        assert (legacy_sick_leave(gross, working_days, days, percentage)
+                == money_sick_leave(gross, working_days, days, percentage))
+        base = Decimal(rng.randint(0, 10 ** 7)).scaleb(-2)
+        degree, experience = rng.choice([0.0, 10.0, 20.0]), rng.choice([0.0, 5.0, 15.0])
+        assert (legacy_bonuses(base, degree, experience, 13)
+                == money_bonuses(base, money.to_decimal(degree), money.to_decimal(experience), 13))
+
+
+def bench_calculator(number: int, repeat: int) -> float:
+    """Время полного расчета зарплаты одного преподавателя, нс"""
+    from models import Teacher
+    from salary_calculator import SalaryCalculator
+
+    calculator = SalaryCalculator(None, reference_data=REFERENCE_DATA)
+    teacher = Teacher(id=1, name='Иванов И.И.', hourly_rate=Decimal('25.50'), is_young_specialist=False,
+                      is_union_member=True, position='доцент', academic_degree='кандидат наук',
+                      qualification_category='высшая', experience_years=12)
+    calc_data = {'hours_worked': 120, 'sick_leave_hours': 8, 'absence_hours': 0, 'bonus': 150.0,
+                 'tax_rate': 13, 'calculation_date': datetime.date.today()}
+    return best_ns(lambda: calculator.calculate_salary_for_teacher(teacher, calc_data), number, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер денежной арифметики (Decimal и money)")
+    parser.add_argument('--number', type=int, default=50000, help="вызовов в одном повторе")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--check', type=int, default=20000, help="случайных проверок совпадения результатов")
+    parser.add_argument('--calculator', action='store_true', help="замерить полный расчет зарплаты")
+    options = parser.parse_args()
+
+    check_equivalence(options.check)
+
+    amount, integer, real = Decimal('12345.67'), 250, 12345.67
+    gross = Decimal('456789.12')
+    degree, experience = money.to_decimal(10.0), money.to_decimal(15.0)
+    cases = [
+        ('Decimal -> Decimal', lambda: Decimal(str(amount)), lambda: money.to_decimal(amount)),
+        ('int -> Decimal', lambda: Decimal(str(integer)), lambda: money.to_decimal(integer)),
+        ('float -> Decimal', lambda: Decimal(str(real)), lambda: money.to_decimal(real)),
+        ('округление до копеек', lambda: amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
+         lambda: money.round_money(amount)),
+        ('надбавки и налог', lambda: legacy_bonuses(amount, 10.0, 15.0, 13),
+         lambda: money_bonuses(amount, degree, experience, 13)),
+        ('отпускные', lambda: legacy_vacation(gross, 247, 28), lambda: money_vacation(gross, 247, 28)),
+        ('больничные', lambda: legacy_sick_leave(gross, 124, 10, Decimal('85.0')),
+         lambda: money_sick_leave(gross, 124, 10, Decimal('85.0'))),
+    ]
+
+    print(f"{'операция':24} {'Decimal, нс':>12} {'money, нс':>12} {'ускорение':>10}")
+    for name, legacy, fast in cases:
+        legacy_ns = best_ns(legacy, options.number, options.repeat)
+        fast_ns = best_ns(fast, options.number, options.repeat)
+        print(f"{name:24} {legacy_ns:12.0f} {fast_ns:12.0f} {legacy_ns / fast_ns:9.2f}x")
+
+    if options.calculator:
+        calc_ns = bench_calculator(options.number // 10 or 1, options.repeat)
+        print(f"\ncalculate_salary_for_teacher: {calc_ns / 1000:.1f} мкс на расчет, "
+              f"{1e9 / calc_ns:,.0f} расчетов/с")
+
+
+if __name__ == '__main__':
+    main()
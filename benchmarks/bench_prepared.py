@@ -0,0 +1,113 @@
+"""
+Сравнение задержки частых запросов: обычное выполнение и PREPARE/EXECUTE
+
+Для каждого зарегистрированного подготовленного запроса выполняется
+--iterations вызовов с параметрами реальных преподавателей: сначала обычным
+cursor.execute (разбор и планирование при каждом вызове), затем через
+DatabaseConnection.execute_prepared. Выводятся среднее, p50 и p95 в
+микросекундах и экономия в процентах.
+
+Запуск из корня проекта:
+    python benchmarks/bench_prepared.py --iterations 2000 --database salary_calculator2
+"""
+import argparse
+import datetime
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_connection import DatabaseConnection, PREPARED_STATEMENTS  # noqa: E402
+import vacation_processor  # noqa: E402,F401  (регистрирует запросы по отпускам)
+
+_PARAMETER = re.compile(r"\$(\d+)")
+
+
+def plain_sql(sql: str) -> str:
+    """Текст запроса с параметрами psycopg2 вместо $1, $2, ..."""
+    return _PARAMETER.sub(lambda match: f"%(p{match.group(1)})s", sql)
+
+
+def sample_params(name: str, teacher_id: int, year: int):
+    """Параметры запроса для замера"""
+    year_start, year_end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    types = PREPARED_STATEMENTS[name][0]
+    if types == ('integer',):
+        return (teacher_id,)
+    if types == ('integer', 'integer'):
+        return (teacher_id, year)
+    return (teacher_id, year_start, year_end)
+
+
+def measure(run, iterations: int):
+    """Длительности вызовов в микросекундах"""
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run()
+        durations.append((time.perf_counter() - started) * 1e6)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер PREPARE/EXECUTE для частых запросов")
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--year', type=int, default=datetime.date.today().year)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--database', default='salary_calculator2')
+    parser.add_argument('--user', default='postgres')
+    parser.add_argument('--password', default='123321445')
+    parser.add_argument('--port', default='5432')
+    options = parser.parse_args()
+
+    db = DatabaseConnection({
+        'host': options.host, 'database': options.database, 'user': options.user,
+        'password': options.password, 'port': options.port,
+        # Журнал медленных запросов не нужен во время замера
+        'slow_query_ms': 10 ** 9,
+    })
+    connection = db.get_connection()
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT id FROM teachers ORDER BY id LIMIT 50")
+        teacher_ids = [row[0] for row in cursor.fetchall()] or [1]
+
+        print(f"{'запрос':40} {'обычный, мкс':>22} {'подготовленный, мкс':>22} {'экономия':>9}")
+        print(f"{'':40} {'ср.':>7} {'p50':>7} {'p95':>7} {'ср.':>7} {'p50':>7} {'p95':>7}")
+        for name, (_, sql) in sorted(PREPARED_STATEMENTS.items()):
+            params = [sample_params(name, teacher_id, options.year) for teacher_id in teacher_ids]
+            text = plain_sql(sql)
+            counter = iter(range(10 ** 9))
+
+            def run_plain():
+                values = params[next(counter) % len(params)]
+                cursor.execute(text, {f"p{index}": value for index, value in enumerate(values, start=1)})
+                cursor.fetchall()
+
+            def run_prepared():
+                db.execute_prepared(cursor, name, params[next(counter) % len(params)])
+                cursor.fetchall()
+
+            # Прогрев: кэш страниц и подготовка запроса на соединении
+            measure(run_plain, 20)
+            measure(run_prepared, 20)
+
+            plain = sorted(measure(run_plain, options.iterations))
+            prepared = sorted(measure(run_prepared, options.iterations))
+            p95 = int(len(plain) * 0.95) - 1
+            saving = (1 - statistics.mean(prepared) / statistics.mean(plain)) * 100
+            print(f"{name:40} {statistics.mean(plain):7.0f} {statistics.median(plain):7.0f} {plain[p95]:7.0f} "
+                  f"{statistics.mean(prepared):7.0f} {statistics.median(prepared):7.0f} {prepared[p95]:7.0f} "
+                  f"{saving:8.1f}%")
+        connection.rollback()
+    finally:
+        cursor.close()
+        db.release_connection(connection)
+        db.close_all_connections()
+
+
+if __name__ == '__main__':
+    main()
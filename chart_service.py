@@ -0,0 +1,214 @@
+"""
+Построение диаграмм для отчетов
+
+Диаграммы строятся через объектный API matplotlib (Figure + FigureCanvasAgg)
+без pyplot, поэтому не используют глобальное состояние и безопасны при вызове
+из любых потоков. Готовые PNG кэшируются по хэшу входных рядов данных, так что
+повторный экспорт тех же данных не перестраивает диаграммы.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _plain_number(value) -> float:
+    """Привести значение (Decimal, int, None) к float для построения и хэширования"""
+    if value is None:
+        return 0.0
+    return float(value)
+
+
+class ChartService:
+    """Сервис построения диаграмм с пулом рабочих потоков и кэшем PNG"""
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 128):
+        """
+        Инициализация сервиса
+
+        :param max_workers: число рабочих потоков для построения диаграмм
+        :param cache_size: максимальное число диаграмм в кэше
+        """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chart")
+        self._hits = 0
+        self._misses = 0
+
+    # --- Публичный API ---
+
+    def pie_chart(self, values: Sequence, labels: Sequence[str], title: str,
+                  figsize: Tuple[float, float] = (8, 6), dpi: int = 100) -> bytes:
+        """
+        Круговая диаграмма в формате PNG
+
+        :param values: значения секторов
+        :param labels: подписи секторов
+        :param title: заголовок диаграммы
+        :param figsize: размер в дюймах
+        :param dpi: разрешение
+        :return: содержимое PNG-файла
+        """
+        return self.pie_chart_async(values, labels, title, figsize, dpi).result()
+
+    def pie_chart_async(self, values: Sequence, labels: Sequence[str], title: str,
+                        figsize: Tuple[float, float] = (8, 6), dpi: int = 100) -> Future:
+        """Асинхронный вариант pie_chart: возвращает Future с содержимым PNG"""
+        params = {
+            'values': [_plain_number(v) for v in values],
+            'labels': [str(label) for label in labels],
+            'title': title,
+            'figsize': list(figsize),
+            'dpi': dpi,
+        }
+        return self._submit('pie', params)
+
+    def bar_chart(self, labels: Sequence[str], values: Sequence, title: str,
+                  xlabel: str = '', ylabel: str = '', figsize: Tuple[float, float] = (8, 4),
+                  dpi: int = 100, rotate_labels: int = 45) -> bytes:
+        """
+        Столбчатая диаграмма в формате PNG
+
+        :param labels: подписи столбцов
+        :param values: значения столбцов
+        :param title: заголовок диаграммы
+        :param xlabel: подпись оси X
+        :param ylabel: подпись оси Y
+        :param figsize: размер в дюймах
+        :param dpi: разрешение
+        :param rotate_labels: угол поворота подписей оси X
+        :return: содержимое PNG-файла
+        """
+        return self.bar_chart_async(labels, values, title, xlabel, ylabel, figsize, dpi, rotate_labels).result()
+
+    def bar_chart_async(self, labels: Sequence[str], values: Sequence, title: str,
+                        xlabel: str = '', ylabel: str = '', figsize: Tuple[float, float] = (8, 4),
+                        dpi: int = 100, rotate_labels: int = 45) -> Future:
+        """Асинхронный вариант bar_chart: возвращает Future с содержимым PNG"""
+        params = {
+            'labels': [str(label) for label in labels],
+            'values': [_plain_number(v) for v in values],
+            'title': title,
+            'xlabel': xlabel,
+            'ylabel': ylabel,
+            'figsize': list(figsize),
+            'dpi': dpi,
+            'rotate_labels': rotate_labels,
+        }
+        return self._submit('bar', params)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Статистика использования кэша"""
+        with self._lock:
+            return {
+                'size': len(self._cache),
+                'max_size': self.cache_size,
+                'hits': self._hits,
+                'misses': self._misses,
+            }
+
+    def clear_cache(self):
+        """Очистить кэш диаграмм"""
+        with self._lock:
+            self._cache.clear()
+
+    def shutdown(self):
+        """Остановить рабочие потоки"""
+        self._executor.shutdown(wait=True)
+
+    # --- Внутренние методы ---
+
+    @staticmethod
+    def _cache_key(kind: str, params: Dict[str, Any]) -> str:
+        """Ключ кэша - хэш типа диаграммы и всех входных рядов"""
+        payload = json.dumps([kind, params], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _submit(self, kind: str, params: Dict[str, Any]) -> Future:
+        """Вернуть PNG из кэша или поставить построение в очередь рабочих потоков"""
+        key = self._cache_key(kind, params)
+
+        with self._lock:
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                future = Future()
+                future.set_result(png)
+                return future
+
+            # Одинаковые диаграммы, запрошенные одновременно, строятся один раз
+            pending = self._pending.get(key)
+            if pending is not None:
+                self._hits += 1
+                return pending
+
+            self._misses += 1
+            future = self._executor.submit(self._render, kind, params)
+            self._pending[key] = future
+
+        future.add_done_callback(lambda f: self._store(key, f))
+        return future
+
+    def _store(self, key: str, future: Future):
+        """Поместить готовую диаграмму в кэш"""
+        with self._lock:
+            self._pending.pop(key, None)
+            if future.cancelled() or future.exception() is not None:
+                return
+            self._cache[key] = future.result()
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _render(self, kind: str, params: Dict[str, Any]) -> bytes:
+        """Построить диаграмму (выполняется в рабочем потоке)"""
+        try:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+        except ImportError as e:
+            raise ImportError("Для построения диаграмм требуется установить пакет matplotlib") from e
+
+        figure = Figure(figsize=tuple(params['figsize']), dpi=params['dpi'])
+        FigureCanvasAgg(figure)
+        axes = figure.add_subplot(1, 1, 1)
+        axes.set_title(params['title'])
+
+        if kind == 'pie':
+            axes.pie(params['values'], labels=params['labels'], autopct='%1.1f%%', startangle=90)
+            axes.axis('equal')
+        elif kind == 'bar':
+            axes.bar(params['labels'], params['values'])
+            axes.set_xlabel(params['xlabel'])
+            axes.set_ylabel(params['ylabel'])
+            for label in axes.get_xticklabels():
+                label.set_rotation(params['rotate_labels'])
+            figure.tight_layout()
+        else:
+            raise ValueError(f"Неизвестный тип диаграммы: {kind}")
+
+        buffer = BytesIO()
+        figure.savefig(buffer, format='png')
+        logger.debug(f"Построена диаграмма '{params['title']}' ({kind})")
+        return buffer.getvalue()
+
+
+_default_service: Optional[ChartService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_chart_service() -> ChartService:
+    """Общий экземпляр сервиса диаграмм для процесса"""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = ChartService()
+        return _default_service
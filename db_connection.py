@@ -1,15 +1,41 @@
 import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
 from psycopg2 import pool
+from psycopg2.extras import execute_values
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from query_stats import QueryStats, make_cursor_factory, DEFAULT_SLOW_QUERY_MS
+from salary_history import SalaryHistoryCache
+from models import Teacher, SalaryCalculation, fetch_row, fetch_rows
+
 logger = logging.getLogger(__name__)
 
+# Подготовленные запросы: имя -> (типы параметров, текст запроса с параметрами $1, $2, ...)
+PREPARED_STATEMENTS: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+
+
+def register_prepared_statement(name: str, param_types: Tuple[str, ...], sql: str):
+    """
+    Зарегистрировать часто выполняемый запрос для DatabaseConnection.execute_prepared
+    
+    :param name: имя подготовленного запроса (идентификатор SQL)
+    :param param_types: типы параметров PostgreSQL ('integer', 'date', ...)
+    :param sql: текст запроса с параметрами $1, $2, ...
+    """
+    PREPARED_STATEMENTS[name] = (tuple(param_types), sql)
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Соединение, запоминающее подготовленные на нем запросы"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Имя запроса -> True, если запрос подготовлен на этом соединении
+        self.prepared_statements: Dict[str, bool] = {}
+
+
 class DatabaseConnection:
     """Класс для управления подключениями к базе данных"""
     
@@ -18,20 +44,84 @@ class DatabaseConnection:
         Инициализация пула соединений с базой данных
         
         :param db_config: словарь с параметрами подключения к БД
+                          (slow_query_ms - порог журнала медленных запросов, мс;
+                          pool_min, pool_max - размер пула, по умолчанию 1 и 10;
+                          ensure_schema - проверять ли индексы и столбцы, по умолчанию True)
         """
+        # Рабочие процессы пакетного расчета не выполняют DDL (схему уже проверил основной процесс)
+        self.ensure_schema = bool(db_config.get('ensure_schema', True))
+        
+        # Статистика выполнения запросов по всем курсорам соединений пула
+        self.stats = QueryStats(float(db_config.get('slow_query_ms', DEFAULT_SLOW_QUERY_MS)))
+        
+        # История начислений по преподавателям для окон усреднения заработка
+        self.salary_history = SalaryHistoryCache(
+            lambda teacher_id: SalaryCalculationRepository(self).get_gross_series(teacher_id),
+            stamp_loader=lambda teacher_id: SalaryCalculationRepository(self).get_gross_series_stamp(teacher_id))
+        
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                1, 10,
+            # Пул допускает обращения из нескольких потоков (пакетный экспорт, служба service.py)
+            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
+                int(db_config.get('pool_min', 1)), int(db_config.get('pool_max', 10)),
                 host=db_config.get('host', 'localhost'),
                 database=db_config.get('database', 'salary_calculator2'),
                 user=db_config.get('user', 'postgres'),
                 password=db_config.get('password', '123321445'),
-                port=db_config.get('port', '5432')
+                port=db_config.get('port', '5432'),
+                cursor_factory=make_cursor_factory(self.stats),
+                connection_factory=PreparingConnection
             )
             logger.info("Пул соединений с базой данных успешно создан")
         except Exception as e:
             logger.error(f"Ошибка при создании пула соединений: {str(e)}")
             raise
+        
+        if self.ensure_schema:
+            self._create_indexes_if_not_exist()
+    
+    def _create_indexes_if_not_exist(self):
+        """Индексы для постраничной выборки преподавателей и расчетов (см. keyset_condition)"""
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_teachers_name_id ON teachers(name, id)")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_calculations_teacher_date
+                ON salary_calculations(teacher_id, calculation_date, id)
+            """)
+            connection.commit()
+        except Exception as e:
+            # Без индексов выборка работает, только медленнее (например, таблицы еще не созданы)
+            connection.rollback()
+            logger.warning(f"Не удалось создать индексы для постраничной выборки: {str(e)}")
+        finally:
+            cursor.close()
+            self.release_connection(connection)
+        
+        self._create_dependency_columns_if_not_exist()
+    
+    def _create_dependency_columns_if_not_exist(self):
+        """
+        Столбцы входных данных сохраненного расчета: версия справочников и
+        отпечаток данных преподавателя (см. SalaryCalculator.recalculate_stale)
+        """
+        connection = self.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                ALTER TABLE salary_calculations
+                ADD COLUMN IF NOT EXISTS reference_version VARCHAR(64),
+                ADD COLUMN IF NOT EXISTS teacher_hash VARCHAR(64)
+            """)
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.warning(f"Не удалось добавить столбцы зависимостей расчетов: {str(e)}")
+        finally:
+            cursor.close()
+            self.release_connection(connection)
 
     def get_connection(self):
         """Получить соединение из пула"""
@@ -46,6 +136,61 @@ class DatabaseConnection:
         self.connection_pool.closeall()
         logger.info("Все соединения закрыты")
 
+    def query_stats(self) -> List[Dict[str, Any]]:
+        """
+        Агрегированная статистика выполненных запросов
+        
+        :return: список запросов с числом вызовов, временем и перцентилями,
+                 отсортированный по суммарному времени
+        """
+        return self.stats.snapshot()
+    
+    def reset_query_stats(self):
+        """Очистить статистику запросов"""
+        self.stats.reset()
+
+    def execute_prepared(self, cursor, name: str, params: Tuple = ()):
+        """
+        Выполнить зарегистрированный запрос через PREPARE/EXECUTE
+        
+        Запрос подготавливается один раз на каждом соединении пула, далее
+        выполняется только EXECUTE без повторного разбора и планирования.
+        Если подготовленный запрос удален на сервере или его план устарел
+        после изменения таблиц, транзакция откатывается, запрос
+        подготавливается заново и EXECUTE повторяется один раз. Поэтому
+        метод предназначен для запросов чтения в начале транзакции.
+        
+        :param cursor: курсор соединения из пула
+        :param name: имя запроса (см. register_prepared_statement)
+        :param params: значения параметров $1, $2, ...
+        """
+        connection = cursor.connection
+        if not connection.prepared_statements.get(name):
+            self._prepare(cursor, name)
+        
+        placeholders = f" ({', '.join(['%s'] * len(params))})" if params else ""
+        try:
+            cursor.execute(f"EXECUTE {name}{placeholders}", tuple(params))
+        except (psycopg2.errors.InvalidSqlStatementName, psycopg2.errors.FeatureNotSupported) as e:
+            # Запрос удален (DISCARD/DEALLOCATE) или изменилась структура таблицы
+            # (cached plan must not change result type): ошибка прервала транзакцию
+            logger.info(f"Повторная подготовка запроса {name}: {str(e).strip()}")
+            connection.rollback()
+            connection.prepared_statements.pop(name, None)
+            cursor.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+            if cursor.fetchone():
+                cursor.execute(f"DEALLOCATE {name}")
+            self._prepare(cursor, name)
+            cursor.execute(f"EXECUTE {name}{placeholders}", tuple(params))
+    
+    @staticmethod
+    def _prepare(cursor, name: str):
+        """Подготовить зарегистрированный запрос на соединении курсора"""
+        param_types, sql = PREPARED_STATEMENTS[name]
+        types = f" ({', '.join(param_types)})" if param_types else ""
+        cursor.execute(f"PREPARE {name}{types} AS {sql}")
+        cursor.connection.prepared_statements[name] = True
+
     def get_repository(self, repo_type: str):
         """
         Получить репозиторий определенного типа
@@ -62,38 +207,83 @@ class DatabaseConnection:
         else:
             raise ValueError(f"Неизвестный тип репозитория: {repo_type}")
         
+register_prepared_statement('teacher_by_id', ('integer',), """
+    SELECT t.id, t.name, t.hourly_rate, t.is_young_specialist, 
+           t.is_union_member, t.position, t.academic_degree, 
+           t.qualification_category, t.experience_years, 
+           t.hire_date, t.birth_date
+    FROM teachers t
+    WHERE t.id = $1
+""")
+
+register_prepared_statement('calculations_by_teacher_and_period', ('integer', 'date', 'date'), """
+    SELECT id, teacher_id, calculation_date, hours_worked, sick_leave_hours,
+           absence_hours, bonus, tax_rate, gross_salary, net_salary,
+           vacation_days, vacation_pay, position_bonus, degree_bonus,
+           experience_bonus, category_bonus
+    FROM salary_calculations
+    WHERE teacher_id = $1
+    AND calculation_date BETWEEN $2 AND $3
+    ORDER BY calculation_date DESC
+""")
+
+
+def keyset_condition(columns: Tuple[str, str], after, limit: Optional[int] = None,
+                     descending: bool = False) -> Tuple[str, list]:
+    """
+    Условие постраничной выборки по ключу (значение сортировки, ID)
+
+    Следующая страница начинается строго после последней строки предыдущей,
+    поэтому запрос читает только limit строк по индексу независимо от номера
+    страницы.
+
+    :param columns: столбцы ключа, например ('t.name', 't.id')
+    :param after: ключ последней строки предыдущей страницы или None для первой
+    :param limit: размер страницы (None - без ограничения)
+    :param descending: порядок сортировки по убыванию
+    :return: (условие SQL или пустая строка, параметры условия)
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("Размер страницы должен быть положительным")
+    if after is None:
+        return '', []
+    if len(after) != 2:
+        raise ValueError("Ключ страницы должен содержать значение сортировки и ID")
+    operator = '<' if descending else '>'
+    return f"({columns[0]}, {columns[1]}) {operator} (%s, %s)", list(after)
+
+
 class TeacherRepository:
     """Класс для работы с данными преподавателей"""
     
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
     
-    def get_all_teachers(self) -> List[Dict[str, Any]]:
+    def get_all_teachers(self, after: Tuple[str, int] = None, limit: int = None) -> List[Teacher]:
         """
-        Получить список всех преподавателей
+        Получить список преподавателей (целиком или постранично)
         
-        :return: список преподавателей
+        :param after: ключ (ФИО, ID) последнего преподавателя предыдущей страницы
+        :param limit: размер страницы (None - все преподаватели)
+        :return: список преподавателей в порядке ФИО
         """
+        condition, params = keyset_condition(('t.name', 't.id'), after, limit)
         connection = self.db_connection.get_connection()
         cursor = connection.cursor()
-        teachers = []
         
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT t.id, t.name, t.hourly_rate, t.is_young_specialist, 
                        t.is_union_member, t.position, t.academic_degree, 
                        t.qualification_category, t.experience_years, 
                        t.hire_date, t.birth_date
                 FROM teachers t
-                ORDER BY t.name
-            """)
+                {'WHERE ' + condition if condition else ''}
+                ORDER BY t.name, t.id
+                LIMIT %s
+            """, params + [limit])
             
-            columns = [desc[0] for desc in cursor.description]
-            for row in cursor.fetchall():
-                teacher = dict(zip(columns, row))
-                teachers.append(teacher)
-                
-            return teachers
+            return fetch_rows(cursor, Teacher)
         except Exception as e:
             logger.error(f"Ошибка при получении списка преподавателей: {str(e)}")
             raise
@@ -101,7 +291,7 @@ class TeacherRepository:
             cursor.close()
             self.db_connection.release_connection(connection)
     
-    def get_teacher_by_id(self, teacher_id: int) -> Optional[Dict[str, Any]]:
+    def get_teacher_by_id(self, teacher_id: int) -> Optional[Teacher]:
         """
         Получить данные преподавателя по ID
         
@@ -112,21 +302,9 @@ class TeacherRepository:
         cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT t.id, t.name, t.hourly_rate, t.is_young_specialist, 
-                       t.is_union_member, t.position, t.academic_degree, 
-                       t.qualification_category, t.experience_years, 
-                       t.hire_date, t.birth_date
-                FROM teachers t
-                WHERE t.id = %s
-            """, (teacher_id,))
+            self.db_connection.execute_prepared(cursor, 'teacher_by_id', (teacher_id,))
             
-            result = cursor.fetchone()
-            if not result:
-                return None
-                
-            columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, result))
+            return fetch_row(cursor, Teacher)
         except Exception as e:
             logger.error(f"Ошибка при получении данных преподавателя (id={teacher_id}): {str(e)}")
             raise
@@ -245,6 +423,7 @@ class TeacherRepository:
             deleted = cursor.rowcount > 0
             connection.commit()
             if deleted:
+                self.db_connection.salary_history.invalidate(teacher_id)
                 logger.info(f"Удален преподаватель с ID: {teacher_id}")
             return deleted
         except Exception as e:
@@ -255,37 +434,137 @@ class TeacherRepository:
             cursor.close()
             self.db_connection.release_connection(connection)
 
+    def bulk_upsert_teachers(self, copy_stream, columns) -> Dict[str, Any]:
+        """
+        Массовое добавление и обновление преподавателей одной транзакцией
+        
+        Данные загружаются командой COPY во временную таблицу, затем строки с ID
+        обновляют таблицу teachers одним UPDATE ... FROM, а строки без ID
+        добавляются одним INSERT ... SELECT.
+        
+        :param copy_stream: файлоподобный объект с данными в формате COPY csv
+                            (номер строки файла, затем столбцы columns; NULL - \\N)
+        :param columns: порядок столбцов данных преподавателя в потоке
+        :return: словарь с ключами added, updated и missing_ids
+                 (список (номер строки, ID) для несуществующих ID)
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                CREATE TEMP TABLE teachers_import_staging (
+                    line_no INTEGER NOT NULL,
+                    id INTEGER,
+                    name TEXT NOT NULL,
+                    hourly_rate NUMERIC NOT NULL,
+                    is_young_specialist BOOLEAN NOT NULL DEFAULT FALSE,
+                    is_union_member BOOLEAN NOT NULL DEFAULT FALSE,
+                    position TEXT,
+                    academic_degree TEXT,
+                    qualification_category TEXT,
+                    experience_years INTEGER NOT NULL DEFAULT 0,
+                    hire_date DATE NOT NULL,
+                    birth_date DATE
+                ) ON COMMIT DROP
+            """)
+            
+            cursor.copy_expert(
+                f"COPY teachers_import_staging (line_no, {', '.join(columns)}) "
+                f"FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                copy_stream
+            )
+            
+            # ID, которых нет в таблице teachers, возвращаются как ошибки строк
+            cursor.execute("""
+                SELECT s.line_no, s.id
+                FROM teachers_import_staging s
+                LEFT JOIN teachers t ON t.id = s.id
+                WHERE s.id IS NOT NULL AND t.id IS NULL
+                ORDER BY s.line_no
+            """)
+            missing_ids = cursor.fetchall()
+            
+            # При повторе ID в файле применяется последняя строка
+            cursor.execute("""
+                UPDATE teachers t SET
+                    name = s.name,
+                    hourly_rate = s.hourly_rate,
+                    is_young_specialist = s.is_young_specialist,
+                    is_union_member = s.is_union_member,
+                    position = s.position,
+                    academic_degree = s.academic_degree,
+                    qualification_category = s.qualification_category,
+                    experience_years = s.experience_years,
+                    hire_date = s.hire_date,
+                    birth_date = s.birth_date
+                FROM (
+                    SELECT DISTINCT ON (id) *
+                    FROM teachers_import_staging
+                    WHERE id IS NOT NULL
+                    ORDER BY id, line_no DESC
+                ) s
+                WHERE t.id = s.id
+            """)
+            updated = cursor.rowcount
+            
+            cursor.execute("""
+                INSERT INTO teachers (
+                    name, hourly_rate, is_young_specialist, is_union_member,
+                    position, academic_degree, qualification_category,
+                    experience_years, hire_date, birth_date
+                )
+                SELECT name, hourly_rate, is_young_specialist, is_union_member,
+                       position, academic_degree, qualification_category,
+                       experience_years, hire_date, birth_date
+                FROM teachers_import_staging
+                WHERE id IS NULL
+                ORDER BY line_no
+            """)
+            added = cursor.rowcount
+            
+            connection.commit()
+            logger.info(f"Массовый импорт преподавателей: добавлено {added}, обновлено {updated}")
+            return {'added': added, 'updated': updated, 'missing_ids': missing_ids}
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при массовом импорте преподавателей: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
 class SalaryCalculationRepository:
     """Класс для работы с расчетами зарплаты"""
     
     def __init__(self, db_connection: DatabaseConnection):
         self.db_connection = db_connection
     
-    def get_calculations_by_teacher(self, teacher_id: int) -> List[Dict[str, Any]]:
+    def get_calculations_by_teacher(self, teacher_id: int, after: Tuple[Any, int] = None,
+                                    limit: int = None) -> List[SalaryCalculation]:
         """
-        Получить все расчеты для преподавателя
+        Получить расчеты для преподавателя (целиком или постранично)
         
         :param teacher_id: ID преподавателя
-        :return: список расчетов
+        :param after: ключ (дата расчета, ID) последнего расчета предыдущей страницы
+        :param limit: размер страницы (None - все расчеты)
+        :return: список расчетов, начиная с последних
         """
+        condition, params = keyset_condition(('calculation_date', 'id'), after, limit, descending=True)
         connection = self.db_connection.get_connection()
         cursor = connection.cursor()
         
         try:
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT *
                 FROM salary_calculations
                 WHERE teacher_id = %s
-                ORDER BY calculation_date DESC
-            """, (teacher_id,))
+                {'AND ' + condition if condition else ''}
+                ORDER BY calculation_date DESC, id DESC
+                LIMIT %s
+            """, [teacher_id] + params + [limit])
             
-            columns = [desc[0] for desc in cursor.description]
-            calculations = []
-            for row in cursor.fetchall():
-                calculation = dict(zip(columns, row))
-                calculations.append(calculation)
-                
-            return calculations
+            return fetch_rows(cursor, SalaryCalculation)
         except Exception as e:
             logger.error(f"Ошибка при получении расчетов для препо��авателя (id={teacher_id}): {str(e)}")
             raise
@@ -293,7 +572,7 @@ class SalaryCalculationRepository:
             cursor.close()
             self.db_connection.release_connection(connection)
 
-    def get_calculations_by_teacher_and_period(self, teacher_id: int, start_date, end_date) -> List[Dict[str, Any]]:
+    def get_calculations_by_teacher_and_period(self, teacher_id: int, start_date, end_date) -> List[SalaryCalculation]:
         """
         Получить расчёты зарплат преподавателя за указанный период дат.
         
@@ -305,28 +584,123 @@ class SalaryCalculationRepository:
         connection = self.db_connection.get_connection()
         cursor = connection.cursor()
         
+        try:
+            self.db_connection.execute_prepared(
+                cursor, 'calculations_by_teacher_and_period', (teacher_id, start_date, end_date))
+            
+            return fetch_rows(cursor, SalaryCalculation)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов за период: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
+    def get_gross_series(self, teacher_id: int) -> List[Tuple[Any, Any]]:
+        """
+        Получить все начисления преподавателя для кэша истории (см. salary_history)
+        
+        :param teacher_id: ID преподавателя
+        :return: список пар (дата расчета, начислено) по возрастанию даты
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
         try:
             cursor.execute("""
-                SELECT *
+                SELECT calculation_date, gross_salary
                 FROM salary_calculations
-                WHERE teacher_id = %s
-                AND calculation_date BETWEEN %s AND %s
-                ORDER BY calculation_date DESC
-            """, (teacher_id, start_date, end_date))
+                WHERE teacher_id = %s AND gross_salary IS NOT NULL
+                ORDER BY calculation_date
+            """, (teacher_id,))
+            return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Ошибка при получении истории начислений (id={teacher_id}): {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
+    def get_gross_series_stamp(self, teacher_id: int) -> Tuple[Any, Any, Any]:
+        """
+        Отметка актуальности истории начислений преподавателя для кэша (см. salary_history)
+        
+        :param teacher_id: ID преподавателя
+        :return: (число расчетов, наибольший ID расчета, сумма начислений)
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT COUNT(*), MAX(id), SUM(gross_salary)
+                FROM salary_calculations
+                WHERE teacher_id = %s AND gross_salary IS NOT NULL
+            """, (teacher_id,))
+            return cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Ошибка при проверке истории начислений (id={teacher_id}): {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
+    def get_gross_series_for_teachers(self, teacher_ids: List[int]) -> Dict[int, List[Tuple[Any, Any]]]:
+        """
+        Получить начисления нескольких преподавателей одним запросом
+        
+        :param teacher_ids: список ID преподавателей
+        :return: словарь {ID: список пар (дата расчета, начислено)}; ключи есть для всех ID
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT teacher_id, calculation_date, gross_salary
+                FROM salary_calculations
+                WHERE teacher_id = ANY(%s) AND gross_salary IS NOT NULL
+                ORDER BY teacher_id, calculation_date
+            """, (list(teacher_ids),))
             
-            columns = [desc[0] for desc in cursor.description]
-            calculations = []
-            for row in cursor.fetchall():
-                calculation = dict(zip(columns, row))
-                calculations.append(calculation)
-            return calculations
+            result = {teacher_id: [] for teacher_id in teacher_ids}
+            for teacher_id, calculation_date, gross_salary in cursor.fetchall():
+                result[teacher_id].append((calculation_date, gross_salary))
+            return result
         except Exception as e:
-            logger.error(f"Ошибка при получении расчетов за период: {str(e)}")
+            logger.error(f"Ошибка при получении истории начислений преподавателей: {str(e)}")
             raise
         finally:
             cursor.close()
             self.db_connection.release_connection(connection)
-    
+
+    def get_calculations_by_period(self, start_date, end_date) -> List[SalaryCalculation]:
+        """
+        Получить расчёты зарплат всех преподавателей за период одним запросом
+
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: список расчётов, упорядоченный по преподавателю и дате
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT *
+                FROM salary_calculations
+                WHERE calculation_date BETWEEN %s AND %s
+                ORDER BY teacher_id, calculation_date DESC
+            """, (start_date, end_date))
+
+            return fetch_rows(cursor, SalaryCalculation)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов всех преподавателей за период: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
     def add_calculation(self, calculation_data: Dict[str, Any]) -> int:
         """
         Добавить новый расчет зарплаты
@@ -343,9 +717,9 @@ class SalaryCalculationRepository:
                     teacher_id, calculation_date, hours_worked, sick_leave_hours,
                     absence_hours, bonus, tax_rate, gross_salary, net_salary,
                     vacation_days, vacation_pay, position_bonus, degree_bonus,
-                    experience_bonus, category_bonus
+                    experience_bonus, category_bonus, reference_version, teacher_hash
                 ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
                 ) RETURNING id
             """, (
                 calculation_data.get('teacher_id'),
@@ -362,12 +736,15 @@ class SalaryCalculationRepository:
                 calculation_data.get('position_bonus', 0),
                 calculation_data.get('degree_bonus', 0),
                 calculation_data.get('experience_bonus', 0),
-                calculation_data.get('category_bonus', 0)
+                calculation_data.get('category_bonus', 0),
+                calculation_data.get('reference_version'),
+                calculation_data.get('teacher_hash')
             ))
             
             calculation_id = cursor.fetchone()[0]
             connection.commit()
-            logger.info(f"Добавлен новый расчет зарплаты с ID: {calculation_id}")
+            self.db_connection.salary_history.invalidate(calculation_data.get('teacher_id'))
+            logger.debug(f"Добавлен новый расчет зарплаты с ID: {calculation_id}")
             return calculation_id
         except Exception as e:
             connection.rollback()
@@ -377,6 +754,123 @@ class SalaryCalculationRepository:
             cursor.close()
             self.db_connection.release_connection(connection)
 
+    def get_calculations_for_recheck(self, start_date, end_date) -> List[SalaryCalculation]:
+        """
+        Расчеты за период вместе с текущими данными преподавателей
+        
+        Поля преподавателя (teacher_name, hourly_rate, position и т.д.) и
+        сохраненные отпечатки входных данных попадают в extra.
+        
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: список расчетов
+        """
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT c.id, c.teacher_id, c.calculation_date, c.hours_worked,
+                       c.sick_leave_hours, c.absence_hours, c.bonus, c.tax_rate,
+                       c.gross_salary, c.net_salary, c.vacation_days, c.vacation_pay,
+                       c.position_bonus, c.degree_bonus, c.experience_bonus, c.category_bonus,
+                       c.reference_version, c.teacher_hash,
+                       t.name AS teacher_name, t.hourly_rate, t.is_young_specialist,
+                       t.is_union_member, t.position, t.academic_degree,
+                       t.qualification_category, t.experience_years
+                FROM salary_calculations c
+                JOIN teachers t ON c.teacher_id = t.id
+                WHERE c.calculation_date BETWEEN %s AND %s
+                ORDER BY c.teacher_id, c.calculation_date, c.id
+            """, (start_date, end_date))
+            
+            return fetch_rows(cursor, SalaryCalculation)
+        except Exception as e:
+            logger.error(f"Ошибка при получении расчетов для проверки актуальности: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
+    def update_recalculated(self, rows: List[Tuple]) -> int:
+        """
+        Записать пересчитанные значения одним запросом
+        
+        :param rows: кортежи (ID расчета, gross_salary, net_salary, vacation_days,
+                     position_bonus, degree_bonus, experience_bonus, category_bonus,
+                     reference_version, teacher_hash)
+        :return: число обновленных строк
+        """
+        if not rows:
+            return 0
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            updated = execute_values(cursor, """
+                UPDATE salary_calculations AS c
+                SET gross_salary = data.gross_salary,
+                    net_salary = data.net_salary,
+                    vacation_days = data.vacation_days,
+                    position_bonus = data.position_bonus,
+                    degree_bonus = data.degree_bonus,
+                    experience_bonus = data.experience_bonus,
+                    category_bonus = data.category_bonus,
+                    reference_version = data.reference_version,
+                    teacher_hash = data.teacher_hash
+                FROM (VALUES %s) AS data (id, gross_salary, net_salary, vacation_days, position_bonus,
+                                          degree_bonus, experience_bonus, category_bonus,
+                                          reference_version, teacher_hash)
+                WHERE c.id = data.id
+                RETURNING c.teacher_id
+            """, rows, template="(%s, %s::numeric, %s::numeric, %s::integer, %s::numeric, "
+                                "%s::numeric, %s::numeric, %s::numeric, %s, %s)", page_size=len(rows), fetch=True)
+            connection.commit()
+            for teacher_id in {row[0] for row in updated}:
+                self.db_connection.salary_history.invalidate(teacher_id)
+            return len(updated)
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при записи пересчитанных расчетов: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
+    def set_fingerprints(self, rows: List[Tuple]) -> int:
+        """
+        Записать отпечатки входных данных расчетам, у которых они не сохранены
+        
+        Суммы расчетов не изменяются, уже сохраненные отпечатки не перезаписываются.
+        
+        :param rows: кортежи (ID расчета, reference_version, teacher_hash)
+        :return: число обновленных строк
+        """
+        if not rows:
+            return 0
+        connection = self.db_connection.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            updated = execute_values(cursor, """
+                UPDATE salary_calculations AS c
+                SET reference_version = COALESCE(c.reference_version, data.reference_version),
+                    teacher_hash = COALESCE(c.teacher_hash, data.teacher_hash)
+                FROM (VALUES %s) AS data (id, reference_version, teacher_hash)
+                WHERE c.id = data.id
+                AND (c.reference_version IS NULL OR c.teacher_hash IS NULL)
+                RETURNING c.id
+            """, rows, page_size=len(rows), fetch=True)
+            connection.commit()
+            return len(updated)
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при записи отпечатков расчетов: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_connection.release_connection(connection)
+
 class ReferenceDataRepository:
     """Класс для работы со справочными данными (коэффициенты, надбавки и т.д.)"""
     
@@ -0,0 +1,171 @@
+"""
+Диагностика производительности по запросу пользователя
+
+Запись включается на следующие N операций (экспорт, отчет, расчет, импорт).
+Для каждой операции сохраняются профиль cProfile (.pstats) и снимок самых
+крупных выделений памяти tracemalloc (.txt), а также описание (.json) с
+названием операции, объемами данных и итоговым временем.
+"""
+import cProfile
+import datetime
+import json
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Каталог для файлов диагностики по умолчанию
+DEFAULT_DIAGNOSTICS_DIR = 'diagnostics'
+
+# Число строк в снимке выделений памяти
+TOP_ALLOCATIONS = 30
+
+
+def _safe_name(name: str) -> str:
+    """Часть имени файла из названия операции"""
+    return re.sub(r'[^\w\-]+', '_', name).strip('_') or 'operation'
+
+
+class DiagnosticsRecorder:
+    """Запись профиля и выделений памяти для ограниченного числа операций"""
+
+    def __init__(self, output_dir: str = DEFAULT_DIAGNOSTICS_DIR):
+        """
+        :param output_dir: каталог для файлов диагностики
+        """
+        self.output_dir = output_dir
+        self._remaining = 0
+        self._lock = threading.Lock()
+        # cProfile не допускает одновременной работы нескольких профилировщиков
+        self._busy = False
+        self.captures: List[Dict[str, Any]] = []
+
+    @property
+    def remaining(self) -> int:
+        """Сколько операций еще будет записано"""
+        return self._remaining
+
+    def arm(self, operations: int, output_dir: Optional[str] = None):
+        """
+        Включить запись для следующих operations операций
+
+        :param operations: число операций
+        :param output_dir: каталог для файлов диагностики
+        """
+        if operations < 0:
+            raise ValueError("Число операций не может быть отрицательным")
+        with self._lock:
+            self._remaining = operations
+            if output_dir:
+                self.output_dir = output_dir
+        logger.info(f"Диагностика включена для {operations} операций, каталог: {self.output_dir}")
+
+    def disarm(self):
+        """Выключить запись"""
+        with self._lock:
+            self._remaining = 0
+
+    @contextmanager
+    def operation(self, name: str, **volumes):
+        """
+        Выполнить операцию с записью диагностики, если запись включена
+
+        Объемы данных можно дополнить внутри блока: with ... as volumes: volumes['rows'] = n
+
+        :param name: название операции
+        :param volumes: объемы данных (число строк, преподавателей и т.п.)
+        """
+        with self._lock:
+            capture = self._remaining > 0 and not self._busy
+            if capture:
+                self._remaining -= 1
+                self._busy = True
+
+        if not capture:
+            yield volumes
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(10)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        error = None
+        profiler.enable()
+        try:
+            yield volumes
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - started
+            try:
+                snapshot = tracemalloc.take_snapshot()
+                peak = tracemalloc.get_traced_memory()[1]
+                if started_tracing:
+                    tracemalloc.stop()
+                self._save(name, volumes, profiler, snapshot, peak, elapsed, error)
+            except Exception as e:
+                logger.error(f"Ошибка при сохранении диагностики операции '{name}': {str(e)}")
+            finally:
+                with self._lock:
+                    self._busy = False
+
+    def _save(self, name: str, volumes: Dict[str, Any], profiler: cProfile.Profile,
+              snapshot: tracemalloc.Snapshot, peak: int, elapsed: float, error: Optional[str]):
+        """Сохранить файлы диагностики одной операции"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        base = os.path.join(self.output_dir, f"{timestamp}_{_safe_name(name)}")
+
+        metadata = {
+            'operation': name,
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'elapsed_seconds': round(elapsed, 3),
+            'peak_memory_bytes': peak,
+            'volumes': {key: value if isinstance(value, (int, float, str, bool)) or value is None else str(value)
+                        for key, value in volumes.items()},
+            'error': error,
+            'files': {'profile': base + '.pstats', 'allocations': base + '_alloc.txt'},
+        }
+
+        profiler.dump_stats(base + '.pstats')
+
+        header = (f"Операция: {name}\n"
+                  f"Время: {metadata['elapsed_seconds']} с, пик памяти: {peak / 1024 / 1024:.1f} МБ\n"
+                  f"Объемы данных: {json.dumps(metadata['volumes'], ensure_ascii=False)}\n\n")
+        with open(base + '_alloc.txt', 'w', encoding='utf-8') as f:
+            f.write(header)
+            f.write(f"Крупнейшие выделения памяти (топ {TOP_ALLOCATIONS}):\n")
+            for index, stat in enumerate(snapshot.statistics('lineno')[:TOP_ALLOCATIONS], start=1):
+                f.write(f"{index}. {stat}\n")
+            f.write("\nСамые затратные функции (cumulative):\n")
+            stats = pstats.Stats(profiler, stream=f)
+            stats.sort_stats('cumulative').print_stats(25)
+
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, indent=2)
+
+        self.captures.append(metadata)
+        logger.info(f"Диагностика операции '{name}' сохранена: {base}.*")
+
+
+_default_recorder: Optional[DiagnosticsRecorder] = None
+_default_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> DiagnosticsRecorder:
+    """Общий экземпляр записи диагностики для процесса"""
+    global _default_recorder
+    with _default_recorder_lock:
+        if _default_recorder is None:
+            _default_recorder = DiagnosticsRecorder()
+        return _default_recorder
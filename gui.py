@@ -6,20 +6,20 @@ import calendar
 from decimal import Decimal
 import os
 import sys
+import threading
 import logging
+import json
 from app import SalaryApp
+from service_client import SalaryServiceClient
 from gui_vacation_tab import VacationTab
+import report_export
+from teacher_directory import TeacherDirectory
+from gui_virtual_tree import VirtualTreeview
+from gui_debounce import TkDebouncer
+from query_stats import format_query_stats
+from diagnostics import get_recorder
 
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('gui.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 # Проверяем наличие tkcalendar, если его нет - выдаем информативное сообщение
@@ -70,9 +70,14 @@ class SalaryCalculatorGUI:
         # Текущий выбранный преподаватель
         self.current_teacher_id = None
         
+        # Задержка поиска преподавателей после последнего нажатия клавиши (мс)
+        self.search_delay_ms = 250
+        self._last_search_term = None
+        
         try:
             # Инициализация приложения
-            self.app = SalaryApp(self.db_config)
+            self.app = self._create_app()
+            self.teacher_directory = TeacherDirectory(self.app)
             
             # Создание основного интерфейса
             self._create_widgets()
@@ -152,8 +157,18 @@ class SalaryCalculatorGUI:
         reports_menu = tk.Menu(menubar, tearoff=0)
         reports_menu.add_command(label="Отчет по зарплате", command=lambda: self._generate_salary_report())
         reports_menu.add_command(label="Отчет по отпускам", command=lambda: self.vacation_tab_manager._export_vacation_report() if hasattr(self, 'vacation_tab_manager') else None)
+        reports_menu.add_separator()
+        reports_menu.add_command(label="Пакетный экспорт отчетов...", command=self._batch_export_reports)
         menubar.add_cascade(label="Отчеты", menu=reports_menu)
         
+        # Меню "Диагностика"
+        diagnostics_menu = tk.Menu(menubar, tearoff=0)
+        diagnostics_menu.add_command(label="Статистика SQL-запросов", command=self._show_query_stats)
+        diagnostics_menu.add_separator()
+        diagnostics_menu.add_command(label="Профилировать следующие операции...", command=self._arm_diagnostics)
+        diagnostics_menu.add_command(label="Остановить профилирование", command=self._disarm_diagnostics)
+        menubar.add_cascade(label="Диагностика", menu=diagnostics_menu)
+        
         # Меню "Справка"
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="Руководство пользователя", command=self._show_user_manual)
@@ -176,7 +191,11 @@ class SalaryCalculatorGUI:
         self.search_var = tk.StringVar()
         search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
         search_entry.pack(side=tk.LEFT, padx=5)
-        search_entry.bind("<KeyRelease>", self._on_search)
+        
+        # Поиск выполняется после паузы во вводе; срабатывает только при изменении текста
+        self.search_debouncer = TkDebouncer(self.master, self._on_search, delay_ms=self.search_delay_ms)
+        self.search_var.trace_add('write', lambda *args: self.search_debouncer())
+        search_entry.bind("<Return>", lambda event: self.search_debouncer.flush())
         
         # Таблица преподавателей
         columns = ('id', 'name', 'position', 'academic_degree', 'qualification_category', 'hourly_rate', 'experience_years')
@@ -206,6 +225,9 @@ class SalaryCalculatorGUI:
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.teachers_tree.pack(fill=tk.BOTH, expand=True)
         
+        # Таблица отображает только видимые строки списка
+        self.teachers_view = VirtualTreeview(self.teachers_tree, scrollbar)
+        
         # Обработчик выбора преподавателя
         self.teachers_tree.bind('<<TreeviewSelect>>', self._on_teacher_select)
         
@@ -285,7 +307,8 @@ class SalaryCalculatorGUI:
     def _get_teachers_list(self):
         """Возвращает список преподавателей в формате для комбобокса"""
         try:
-            teachers = self.app.get_all_teachers()
+            self.teacher_directory.ensure_loaded()
+            teachers = self.teacher_directory.all()
             self.teachers_mapping = {t['name']: t['id'] for t in teachers}
             return [(t['id'], t['name']) for t in teachers]
         except Exception as e:
@@ -496,11 +519,9 @@ class SalaryCalculatorGUI:
     def _setup_vacation_tab(self):
         """Настройка вкладки 'Отпуска' с использованием класса VacationTab"""
         try:
-            # Используем существующее подключение к БД из self.app
-            db_conn = self.app.db_connection
-            
-            # Инициализируем менеджер вкладки отпусков
-            self.vacation_tab_manager = VacationTab(self.notebook, db_conn)
+            # Вкладка работает через тот же фасад, что и остальной интерфейс:
+            # SalaryApp или клиент службы расчета зарплаты
+            self.vacation_tab_manager = VacationTab(self.notebook, self.app)
             
             # Удаляем созданную ранее вкладку, так как VacationTab создаст свою собственную
             self.notebook.forget(self.vacation_frame)
@@ -701,6 +722,21 @@ class SalaryCalculatorGUI:
         else:
             print(f"Статус: {message}")  # Запасной вариант, если status_var не доступен
 
+    def _create_app(self):
+        """
+        Создать объект приложения
+        
+        Если задана переменная окружения SALARY_SERVICE_URL, GUI работает через
+        общую службу расчета зарплаты (service.py), иначе - напрямую с БД.
+        """
+        client = SalaryServiceClient.from_environment()
+        if client is None:
+            return SalaryApp(self.db_config)
+        
+        client.health()
+        logger.info(f"Используется служба расчета зарплаты: {client.base_url}")
+        return client
+    
     def _on_close(self):
         """Обработчик события закрытия окна"""
         try:
@@ -774,7 +810,8 @@ class SalaryCalculatorGUI:
                 
                 # Пересоздаем соединение с базой данных
                 self.app.close()
-                self.app = SalaryApp(self.db_config)
+                self.app = self._create_app()
+                self.teacher_directory = TeacherDirectory(self.app)
                 
                 # Обновляем данные
                 self._load_teachers()
@@ -808,6 +845,79 @@ class SalaryCalculatorGUI:
         ttk.Button(btn_frame, text="Сохранить", command=save_settings).pack(side=tk.LEFT, padx=10)
         ttk.Button(btn_frame, text="Отмена", command=settings_window.destroy).pack(side=tk.LEFT, padx=10)
     
+    def _arm_diagnostics(self):
+        """Включить запись профиля и выделений памяти для следующих операций"""
+        operations = simpledialog.askinteger(
+            "Диагностика",
+            "Сколько следующих операций (экспорт, отчет, расчет, импорт) профилировать?",
+            parent=self.master, initialvalue=3, minvalue=1, maxvalue=100)
+        if not operations:
+            return
+        
+        output_dir = filedialog.askdirectory(title="Каталог для файлов диагностики",
+                                             initialdir=os.path.abspath(get_recorder().output_dir))
+        if not output_dir:
+            output_dir = get_recorder().output_dir
+        
+        get_recorder().arm(operations, output_dir)
+        self.update_status(f"Диагностика: будут записаны следующие {operations} операций в {output_dir}")
+    
+    def _disarm_diagnostics(self):
+        """Выключить запись диагностики"""
+        recorder = get_recorder()
+        recorder.disarm()
+        self.update_status(f"Диагностика выключена. Записано операций: {len(recorder.captures)}")
+    
+    def _show_query_stats(self):
+        """Показать статистику выполнения SQL-запросов"""
+        stats_window = tk.Toplevel(self.master)
+        stats_window.title("Статистика SQL-запросов")
+        stats_window.geometry("900x600")
+        
+        text_frame = ttk.Frame(stats_window)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        text_widget = tk.Text(text_frame, wrap=tk.WORD, font=("Courier New", 9))
+        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text_widget.yview)
+        text_widget.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text_widget.pack(fill=tk.BOTH, expand=True)
+        
+        def refresh():
+            text_widget.config(state=tk.NORMAL)
+            text_widget.delete("1.0", tk.END)
+            text_widget.insert(tk.END, format_query_stats(self.app.query_stats()))
+            text_widget.config(state=tk.DISABLED)
+        
+        def reset():
+            self.app.reset_query_stats()
+            refresh()
+        
+        def save():
+            file_path = filedialog.asksaveasfilename(
+                title="Сохранить статистику запросов",
+                defaultextension=".json",
+                filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+            )
+            if not file_path:
+                return
+            try:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.app.query_stats(), f, ensure_ascii=False, indent=2)
+                self.update_status(f"Статистика запросов сохранена в {file_path}")
+            except Exception as e:
+                logger.error(f"Ошибка при сохранении статистики запросов: {str(e)}")
+                messagebox.showerror("Ошибка", f"Не удалось сохранить статистику: {str(e)}")
+        
+        btn_frame = ttk.Frame(stats_window)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(btn_frame, text="Обновить", command=refresh).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Сбросить", command=reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Сохранить в файл...", command=save).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Закрыть", command=stats_window.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        refresh()
+    
     def _show_about(self):
         """Показать информацию о программе"""
         about_text = """
@@ -881,61 +991,60 @@ class SalaryCalculatorGUI:
     
     # --- Методы для работы с преподавателями ---
     
-# Замените или добавьте этот метод _load_teachers, с проверками на None:
     def _load_teachers(self):
-        """Загрузка списка преподавателей в таблицу"""
-        # Очистить таблицу
-        for item in self.teachers_tree.get_children():
-            self.teachers_tree.delete(item)
-        
+        """Загрузка списка преподавателей из БД в справочник и таблицу"""
         try:
-            # Получить список преподавателей
-            teachers = self.app.get_all_teachers()
+            teachers = self.teacher_directory.load()
             
             if not teachers:
+                self._fill_teachers_tree([])
                 self.update_status("Список преподавателей пуст")
                 return
             
-            # Заполнить таблицу
-            for teacher in teachers:
-                if teacher is None:
-                    continue  # Пропускаем None значения
-                    
-                # Безопасное получение значений из словаря
-                teacher_id = teacher.get('id', '')
-                name = teacher.get('name', '')
-                position = teacher.get('position', '')
-                degree = teacher.get('academic_degree', '')
-                category = teacher.get('qualification_category', '')
-                rate = teacher.get('hourly_rate', '')
-                experience = teacher.get('experience_years', '')
-                
-                self.teachers_tree.insert('', 'end', values=(
-                    teacher_id, name, position, degree, category, rate, experience
-                ))
-            
-            # Обновить комбобоксы
-            teachers_list = [(t.get('id', ''), t.get('name', '')) for t in teachers if t is not None]
-            
-            # Безопасное обновление комбобоксов
-            if hasattr(self, 'salary_teacher_combo'):
-                self.salary_teacher_combo['values'] = [name for _, name in teachers_list]
-        
-            
-            if hasattr(self, 'report_teacher_combo') and self.report_teacher_combo:
-                self.report_teacher_combo['values'] = [name for _, name in teachers_list]
-            
+            self._refresh_teacher_views()
             self.update_status(f"Загружено {len(teachers)} преподавателей")
         except Exception as e:
             logger.error(f"Ошибка при загрузке преподавателей: {str(e)}")
             self.update_status(f"Ошибка: {str(e)}")
             messagebox.showerror("Ошибка", f"Ошибка при загрузке преподавателей: {str(e)}")
 
+    def _refresh_teacher_views(self):
+        """Обновить таблицу (с учетом строки поиска) и комбобоксы из справочника преподавателей"""
+        search_term = self.search_var.get() if hasattr(self, 'search_var') else ''
+        self._fill_teachers_tree(self.teacher_directory.search(search_term))
+        self._last_search_term = search_term
+        
+        # Безопасное обновление комбобоксов
+        names = self.teacher_directory.names()
+        if hasattr(self, 'salary_teacher_combo'):
+            self.salary_teacher_combo['values'] = names
+        
+        if hasattr(self, 'report_teacher_combo') and self.report_teacher_combo:
+            self.report_teacher_combo['values'] = names
+
+    def _fill_teachers_tree(self, teachers, keep_position=True):
+        """
+        Заполнить таблицу преподавателей
+        
+        :param teachers: список преподавателей для отображения
+        :param keep_position: сохранить позицию прокрутки таблицы
+        """
+        self.teachers_view.set_rows(teachers, key=lambda teacher: teacher['id'], keep_position=keep_position, values=lambda teacher: (
+            teacher.get('id', ''),
+            teacher.get('name', ''),
+            teacher.get('position', ''),
+            teacher.get('academic_degree', ''),
+            teacher.get('qualification_category', ''),
+            teacher.get('hourly_rate', ''),
+            teacher.get('experience_years', '')
+        ))
+
     def _update_teacher_comboboxes(self, teachers=None):
         """Обновить списки преподавателей в комбобоксах"""
         if teachers is None:
             try:
-                teachers = self.app.get_all_teachers()
+                self.teacher_directory.ensure_loaded()
+                teachers = self.teacher_directory.all()
             except Exception as e:
                 logger.error(f"Ошибка при получении преподавателей: {str(e)}")
                 return
@@ -1127,8 +1236,9 @@ class SalaryCalculatorGUI:
                 # Добавляем преподавателя
                 teacher_id = self.app.add_teacher(teacher_data)
                 
-                # Обновляем список преподавателей
-                self._load_teachers()
+                # Обновляем справочник и список преподавателей
+                self.teacher_directory.refresh_teacher(teacher_id)
+                self._refresh_teacher_views()
                 
                 messagebox.showinfo("Успех", f"Преподаватель успешно добавлен (ID: {teacher_id})")
                 dialog.destroy()
@@ -1287,8 +1397,9 @@ class SalaryCalculatorGUI:
                     success = self.app.update_teacher(self.current_teacher_id, teacher_data)
                     
                     if success:
-                        # Обновляем список преподавателей
-                        self._load_teachers()
+                        # Обновляем справочник и список преподавателей
+                        self.teacher_directory.refresh_teacher(self.current_teacher_id)
+                        self._refresh_teacher_views()
                         
                         # Обновляем информацию в правой панели
                         self._on_teacher_select(None)
@@ -1335,8 +1446,9 @@ class SalaryCalculatorGUI:
             success = self.app.delete_teacher(self.current_teacher_id)
             
             if success:
-                # Обновляем список преподавателей
-                self._load_teachers()
+                # Обновляем справочник и список преподавателей
+                self.teacher_directory.remove(self.current_teacher_id)
+                self._refresh_teacher_views()
                 
                 # Очищаем информацию в правой панели
                 self.current_teacher_id = None
@@ -1359,36 +1471,17 @@ class SalaryCalculatorGUI:
             logger.error(f"Ошибка при удалении преподавателя: {str(e)}")
             messagebox.showerror("Ошибка", f"Не удалось удалить преподавателя: {str(e)}")
     
-    def _on_search(self, event):
-        """Обработчик поиска преподавателей"""
-        search_term = self.search_var.get().lower()
-        
-        # Очищаем текущий список
-        for item in self.teachers_tree.get_children():
-            self.teachers_tree.delete(item)
+    def _on_search(self, event=None):
+        """Обработчик поиска преподавателей (по справочнику в памяти, без запросов к БД)"""
+        search_term = self.search_var.get()
+        if search_term == self._last_search_term:
+            return
         
         try:
-            # Получаем список всех преподавателей
-            all_teachers = self.app.get_all_teachers()
-            
-            # Фильтруем список по поисковому запросу
-            if search_term:
-                filtered_teachers = [t for t in all_teachers if search_term in t['name'].lower() or 
-                                  (t.get('position') and search_term in t['position'].lower())]
-            else:
-                filtered_teachers = all_teachers
-            
-            # Заполняем таблицу
-            for teacher in filtered_teachers:
-                self.teachers_tree.insert('', tk.END, values=(
-                    teacher['id'],
-                    teacher['name'],
-                    teacher.get('position', ''),
-                    teacher.get('academic_degree', ''),
-                    teacher.get('qualification_category', ''),
-                    teacher.get('hourly_rate', ''),
-                    teacher.get('experience_years', '')
-                ))
+            self.teacher_directory.ensure_loaded()
+            filtered_teachers = self.teacher_directory.search(search_term)
+            self._fill_teachers_tree(filtered_teachers, keep_position=False)
+            self._last_search_term = search_term
             
             self.update_status(f"Найдено преподавателей: {len(filtered_teachers)}")
         except Exception as e:
@@ -1406,51 +1499,16 @@ class SalaryCalculatorGUI:
             return
         
         try:
-            import csv
-            
-            teachers_added = 0
-            teachers_updated = 0
-            errors = []
-            
-            with open(file_path, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
+            with get_recorder().operation('import_teachers_from_csv') as volumes:
+                # Разбор, проверка и загрузка выполняются одной транзакцией на стороне приложения
+                result = self.app.import_teachers_from_csv(file_path)
+                teachers_added = result['added']
+                teachers_updated = result['updated']
+                errors = result['errors']
+                volumes.update(added=teachers_added, updated=teachers_updated, errors=len(errors))
                 
-                for i, row in enumerate(reader, start=2):  # start=2 because row 1 is headers
-                    try:
-                        # Проверка обязательных полей
-                        if not row.get('name') or not row.get('hourly_rate') or not row.get('hire_date'):
-                            errors.append(f"Строка {i}: Отсутствуют обязательные поля")
-                            continue
-                        
-                        # Преобразование типов данных
-                        teacher_data = {
-                            'name': row['name'].strip(),
-                            'position': row.get('position', '').strip(),
-                            'academic_degree': row.get('academic_degree', '').strip(),
-                            'qualification_category': row.get('qualification_category', '').strip(),
-                            'hourly_rate': float(row['hourly_rate']),
-                            'experience_years': int(row.get('experience_years', 0)),
-                            'hire_date': datetime.datetime.strptime(row['hire_date'], "%d.%m.%Y").date(),
-                            'is_young_specialist': row.get('is_young_specialist', '').lower() in ('true', 'yes', '1', 'да'),
-                            'is_union_member': row.get('is_union_member', '').lower() in ('true', 'yes', '1', 'да')
-                        }
-                        
-                        if row.get('birth_date'):
-                            teacher_data['birth_date'] = datetime.datetime.strptime(row['birth_date'], "%d.%m.%Y").date()
-                        
-                        # Если указан ID - обновляем, иначе добавляем
-                        if row.get('id'):
-                            success = self.app.update_teacher(int(row['id']), teacher_data)
-                            if success:
-                                teachers_updated += 1
-                        else:
-                            self.app.add_teacher(teacher_data)
-                            teachers_added += 1
-                    except Exception as e:
-                        errors.append(f"Строка {i}: {str(e)}")
-            
-            # Обновляем список преподавателей
-            self._load_teachers()
+                # Обновляем список преподавателей
+                self._load_teachers()
             
             # Выводим результат
             message = f"Импорт завершен.\nДобавлено: {teachers_added}\nОбновлено: {teachers_updated}"
@@ -1634,14 +1692,15 @@ class SalaryCalculatorGUI:
                 'calculation_date': calculation_date
             }
             
-            # Выполняем расчет
-            result = self.app.calculate_salary(teacher_id, calc_data)
-            
-            # Сохраняем результат для возможного последующего сохранения
-            self.current_calculation = result
-            
-            # Отображаем результаты
-            self._display_salary_calculation(result)
+            with get_recorder().operation('calculate_salary', teacher_id=teacher_id):
+                # Выполняем расчет
+                result = self.app.calculate_salary(teacher_id, calc_data)
+                
+                # Сохраняем результат для возможного последующего сохранения
+                self.current_calculation = result
+                
+                # Отображаем результаты
+                self._display_salary_calculation(result)
             
             self.update_status("Расчет зарплаты выполнен успешно")
         except Exception as e:
@@ -1762,8 +1821,8 @@ class SalaryCalculatorGUI:
                 file_types = [("CSV файлы", "*.csv"), ("Все файлы", "*.*")]
                 default_ext = ".csv"
             else:
-                file_types = [("Все файлы", "*.*")]
-                default_ext = ""
+                messagebox.showerror("Ошибка", f"Неподдерживаемый формат файла: {output_format}")
+                return None
                 
             output_file = filedialog.asksaveasfilename(
                 defaultextension=default_ext,
@@ -1775,37 +1834,38 @@ class SalaryCalculatorGUI:
             if not output_file:  # Пользователь отменил сохранение
                 return None
             
-            # Экспорт в зависимости от формата
-            if output_format.lower() == 'pdf':
-                # Создаем PDF отчет
-                if not self._create_pdf_report(
-                    salary_data=salary_data,
-                    teacher_info=teacher_info,
-                    period_start=start_date,
-                    period_end=end_date,
-                    output_file=output_file,
-                    include_chart=include_chart
-                ):
-                    return None
-            elif output_format.lower() == 'csv':
-                # Экспорт в CSV (можно добавить отдельный метод для этого)
-                with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                    import csv
-                    writer = csv.writer(csvfile)
-                    # Заголовки
-                    writer.writerow(['Дата', 'Отработано часов', 'Ставка', 'Бонус', 'Налог', 'Итого'])
-                    # Данные
-                    for entry in salary_data:
-                        writer.writerow([
-                            entry.get('calculation_date', ''),
-                            entry.get('hours_worked', 0),
-                            entry.get('hourly_rate', 0),
-                            entry.get('bonus_amount', 0),
-                            entry.get('tax_amount', 0),
-                            entry.get('net_salary', 0)
-                        ])
-            else:
-                messagebox.showerror("Ошибка", f"Неподдерживаемый формат файла: {output_format}")
+            # Экспорт в зависимости от формата (диагностика - только формирование файла, без диалогов)
+            with get_recorder().operation('generate_salary_report', calculations=len(salary_data),
+                                          format=output_format.lower()):
+                if output_format.lower() == 'pdf':
+                    # Создаем PDF отчет
+                    created = self._create_pdf_report(
+                        salary_data=salary_data,
+                        teacher_info=teacher_info,
+                        period_start=start_date,
+                        period_end=end_date,
+                        output_file=output_file,
+                        include_chart=include_chart
+                    )
+                else:
+                    # Экспорт в CSV (можно добавить отдельный метод для этого)
+                    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+                        import csv
+                        writer = csv.writer(csvfile)
+                        # Заголовки
+                        writer.writerow(['Дата', 'Отработано часов', 'Ставка', 'Бонус', 'Налог', 'Итого'])
+                        # Данные
+                        for entry in salary_data:
+                            writer.writerow([
+                                entry.get('calculation_date', ''),
+                                entry.get('hours_worked', 0),
+                                entry.get('hourly_rate', 0),
+                                entry.get('bonus_amount', 0),
+                                entry.get('tax_amount', 0),
+                                entry.get('net_salary', 0)
+                            ])
+                    created = True
+            if not created:
                 return None
                 
             messagebox.showinfo("Успех", f"Отчет успешно сохранен в файл:\n{output_file}")
@@ -2328,7 +2388,7 @@ class SalaryCalculatorGUI:
                 return
             
             # Отмечаем отпуск как использованный
-            success = self.app.vacation_processor.mark_vacation_as_used(self.current_vacation_id)
+            success = self.app.mark_vacation_as_used(self.current_vacation_id)
             
             if success:
                 # Обновляем список отпусков
@@ -2460,11 +2520,8 @@ class SalaryCalculatorGUI:
         :return: ID преподавателя или None, если преподаватель не найден
         """
         try:
-            teachers = self._get_teachers_list()
-            for teacher_id, name in teachers:
-                if name == teacher_name:
-                    return teacher_id
-            return None
+            self.teacher_directory.ensure_loaded()
+            return self.teacher_directory.id_by_name(teacher_name)
         except Exception as e:
             logger.error(f"Ошибка при получении ID преподавателя: {str(e)}")
             return None
@@ -2538,6 +2595,62 @@ class SalaryCalculatorGUI:
             messagebox.showerror("Ошибка", f"Не удалось сгенерировать отчет: {str(e)}")
 
 
+    def _batch_export_reports(self):
+        """Пакетный экспорт индивидуальных отчетов по зарплате для всех преподавателей"""
+        try:
+            start_date = datetime.datetime.strptime(self.start_date_var.get(), "%d.%m.%Y").date()
+            end_date = datetime.datetime.strptime(self.end_date_var.get(), "%d.%m.%Y").date()
+        except ValueError:
+            messagebox.showwarning("Предупреждение", "Введите корректный период отчета на вкладке 'Отчеты' (ДД.ММ.ГГГГ)")
+            return
+        
+        output_dir = filedialog.askdirectory(title="Выберите каталог для сохранения отчетов")
+        if not output_dir:
+            return
+        
+        formats = ('pdf', 'excel', 'word')
+        include_details = self.include_details_var.get() if hasattr(self, 'include_details_var') else True
+        
+        def on_progress(completed, total, result):
+            # Вызывается из рабочего потока - обновляем интерфейс через очередь событий Tk
+            self.master.after(0, self.update_status,
+                              f"Пакетный экспорт: {completed} из {total} ({result['teacher_name']})")
+        
+        def on_finished(summary):
+            self.update_status(f"Пакетный экспорт завершен: {summary['succeeded']} из {summary['total']}")
+            message = (f"Сформировано отчетов: {len(summary['files'])}\n"
+                       f"Преподавателей: {summary['succeeded']} из {summary['total']}\n"
+                       f"Время: {summary['elapsed_seconds']} с\n"
+                       f"Каталог: {summary['output_dir']}")
+            if summary['errors']:
+                message += f"\n\nОшибки ({len(summary['errors'])}):\n" + "\n".join(summary['errors'][:10])
+                messagebox.showwarning("Пакетный экспорт", message)
+            else:
+                messagebox.showinfo("Пакетный экспорт", message)
+        
+        def on_error(error):
+            self.update_status("Ошибка пакетного экспорта")
+            messagebox.showerror("Ошибка", f"Не удалось выполнить пакетный экспорт: {error}")
+        
+        def worker():
+            try:
+                # В профиль попадает основной процесс: выборка данных и распределение задач
+                with get_recorder().operation('batch_export_reports', period_start=str(start_date),
+                                              period_end=str(end_date), formats=','.join(formats)) as volumes:
+                    summary = self.app.export_teacher_reports_batch(
+                        output_dir, start_date, end_date, formats=formats,
+                        include_details=include_details, include_chart=True,
+                        progress_callback=on_progress)
+                    volumes['teachers'] = summary['total']
+                    volumes['files'] = len(summary['files'])
+                self.master.after(0, on_finished, summary)
+            except Exception as e:
+                logger.error(f"Ошибка при пакетном экспорте отчетов: {str(e)}", exc_info=True)
+                self.master.after(0, on_error, str(e))
+        
+        self.update_status("Пакетный экспорт отчетов запущен...")
+        threading.Thread(target=worker, daemon=True).start()
+
     def _export_salary_summary(self, start_date=None, end_date=None, output_format='pdf', title='Сводный отчет по зарплате', include_details=True, include_chart=True):
         """
         Экспортирует сводные данные о зарплате всех преподавателей за указанный период в файл.
@@ -2761,6 +2874,15 @@ class SalaryCalculatorGUI:
             messagebox.showerror("Ошибка", f"Не удалось экспортировать данные: {str(e)}")
             return None
 
+    @staticmethod
+    def _report_volumes(data, file_path, is_summary):
+        """Объемы данных отчета для файлов диагностики"""
+        return {
+            'records': len(data) if isinstance(data, (list, tuple)) else 1,
+            'is_summary': is_summary,
+            'file': os.path.basename(file_path),
+        }
+
     def _export_to_pdf(self, data, file_path, title, include_details=True, include_chart=True, is_summary=False):
         """
         Экспорт данных о зарплате в PDF формат
@@ -2773,217 +2895,10 @@ class SalaryCalculatorGUI:
         :param is_summary: Является ли отчет сводным
         """
         try:
-            # Проверка наличия необходимых библиотек
-            try:
-                from reportlab.lib.pagesizes import A4
-                from reportlab.lib import colors
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-                from reportlab.lib.styles import getSampleStyleSheet
-                import matplotlib.pyplot as plt
-                from io import BytesIO
-            except ImportError:
-                messagebox.showerror(
-                    "Ошибка импорта", 
-                    "Отсутствуют необходимые библиотеки для экспорта в PDF. Установите их командой:\n"
-                    "pip install reportlab matplotlib"
-                )
-                return
-            
-            # Создание PDF документа
-            doc = SimpleDocTemplate(file_path, pagesize=A4)
-            styles = getSampleStyleSheet()
-            elements = []
-            
-            # Заголовок отчета
-            elements.append(Paragraph(title, styles['Title']))
-            elements.append(Spacer(1, 12))
-            
-            # Дата создания отчета
-            elements.append(Paragraph(f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}", styles['Normal']))
-            elements.append(Spacer(1, 12))
-            
-            if is_summary:
-                # Сводная таблица для всех преподавателей
-                table_data = [['Преподаватель', 'Валовая зарплата', 'Налоги', 'Чистая зарплата']]
-                
-                for teacher_data in data:
-                    teacher_name = teacher_data.get('teacher_name', '')
-                    gross_salary = f"{teacher_data.get('gross_salary', 0):.2f}"
-                    tax_amount = f"{teacher_data.get('tax_amount', 0):.2f}"
-                    net_salary = f"{teacher_data.get('net_salary', 0):.2f}"
-                    
-                    table_data.append([teacher_name, gross_salary, tax_amount, net_salary])
-                
-                table = Table(table_data)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                
-                elements.append(table)
-                elements.append(Spacer(1, 12))
-                
-                # Добавление суммарных значений
-                total_gross = sum(item.get('gross_salary', 0) for item in data)
-                total_tax = sum(item.get('tax_amount', 0) for item in data)
-                total_net = sum(item.get('net_salary', 0) for item in data)
-                
-                elements.append(Paragraph(f"Итого валовая зарплата: {total_gross:.2f} руб.", styles['Normal']))
-                elements.append(Paragraph(f"Итого налоги: {total_tax:.2f} руб.", styles['Normal']))
-                elements.append(Paragraph(f"Итого чистая зарплата: {total_net:.2f} руб.", styles['Normal']))
-                
-                # Если включены графики, добавляем круговую диаграмму распределения зарплат
-                if include_chart:
-                    plt.figure(figsize=(8, 6))
-                    teacher_names = [item.get('teacher_name', '') for item in data]
-                    net_salaries = [item.get('net_salary', 0) for item in data]
-                    
-                    plt.pie(net_salaries, labels=teacher_names, autopct='%1.1f%%', startangle=90)
-                    plt.axis('equal')
-                    plt.title('Распределение чистой зарплаты')
-                    
-                    buffer = BytesIO()
-                    plt.savefig(buffer, format='png')
-                    plt.close()
-                    
-                    # Добавляем диаграмму в отчет
-                    buffer.seek(0)
-                    img = Image(buffer, width=400, height=300)
-                    elements.append(img)
-            else:
-                # Детальный отчет для одного преподавателя
-                if not data:
-                    elements.append(Paragraph("Нет данных для отображения", styles['Normal']))
-                else:
-                    # Основная информация о преподавателе
-                    teacher_data = data[0] if isinstance(data, list) else data
-                    
-                    elements.append(Paragraph(f"Преподаватель: {teacher_data.get('teacher_name', '')}", styles['Heading2']))
-                    elements.append(Paragraph(f"Должность: {teacher_data.get('position', '')}", styles['Normal']))
-                    elements.append(Paragraph(f"Ставка: {teacher_data.get('hourly_rate', 0):.2f} руб./час", styles['Normal']))
-                    elements.append(Spacer(1, 12))
-                    
-                    # Детали расчета зарплаты
-                    if include_details:
-                        elements.append(Paragraph("Детали расчета", styles['Heading3']))
-                        
-                        details_data = [
-                            ['Параметр', 'Значение'],
-                            ['Отработано часов', str(teacher_data.get('hours_worked', 0))],
-                            ['Базовая зарплата', f"{teacher_data.get('base_salary', 0):.2f} руб."],
-                            ['Надбавка за должность', f"{teacher_data.get('position_bonus', 0):.2f} руб."],
-                            ['Надбавка за степень', f"{teacher_data.get('degree_bonus', 0):.2f} руб."],
-                            ['Надбавка за стаж', f"{teacher_data.get('experience_bonus', 0):.2f} руб."],
-                            ['Надбавка за категорию', f"{teacher_data.get('category_bonus', 0):.2f} руб."],
-                            ['Надбавка молодому специалисту', f"{teacher_data.get('young_specialist_bonus', 0):.2f} руб."],
-                            ['Оплата больничных', f"{teacher_data.get('sick_leave_pay', 0):.2f} руб."],
-                            ['Бонус', f"{teacher_data.get('bonus', 0):.2f} руб."]
-                        ]
-                        
-                        details_table = Table(details_data)
-                        details_table.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                        ]))
-                        
-                        elements.append(details_table)
-                        elements.append(Spacer(1, 12))
-                    
-                    # Итоговые суммы
-                    elements.append(Paragraph("Итоговые суммы", styles['Heading3']))
-                    
-                    totals_data = [
-                        ['Параметр', 'Значение'],
-                        ['Валовая зарплата', f"{teacher_data.get('gross_salary', 0):.2f} руб."],
-                        ['Ставка налога', f"{teacher_data.get('tax_rate', 0):.2f}%"],
-                        ['Сумма налога', f"{teacher_data.get('tax_amount', 0):.2f} руб."],
-                        ['Профсоюзные взносы', f"{teacher_data.get('union_contribution', 0):.2f} руб."],
-                        ['ЧИСТАЯ ЗАРПЛАТА', f"{teacher_data.get('net_salary', 0):.2f} руб."]
-                    ]
-                    
-                    totals_table = Table(totals_data)
-                    totals_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('BACKGROUND', (0, -1), (-1, -1), colors.lightblue),
-                        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
-                    ]))
-                    
-                    elements.append(totals_table)
-                    
-                    # Если включены графики, добавляем диаграмму структуры зарплаты
-                    if include_chart:
-                        plt.figure(figsize=(8, 6))
-                        
-                        # Компоненты зарплаты и их значения
-                        components = [
-                            'Базовая зарплата', 
-                            'Надбавка за должность', 
-                            'Надбавка за степень',
-                            'Надбавка за стаж', 
-                            'Надбавка за категорию', 
-                            'Надбавка молодому специалисту',
-                            'Оплата больничных', 
-                            'Бонус'
-                        ]
-                        
-                        values = [
-                            teacher_data.get('base_salary', 0),
-                            teacher_data.get('position_bonus', 0),
-                            teacher_data.get('degree_bonus', 0),
-                            teacher_data.get('experience_bonus', 0),
-                            teacher_data.get('category_bonus', 0),
-                            teacher_data.get('young_specialist_bonus', 0),
-                            teacher_data.get('sick_leave_pay', 0),
-                            teacher_data.get('bonus', 0)
-                        ]
-                        
-                        # Фильтруем только ненулевые компоненты
-                        non_zero_components = []
-                        non_zero_values = []
-                        
-                        for comp, val in zip(components, values):
-                            if val > 0:
-                                non_zero_components.append(comp)
-                                non_zero_values.append(val)
-                        
-                        if non_zero_values:
-                            plt.pie(non_zero_values, labels=non_zero_components, autopct='%1.1f%%', startangle=90)
-                            plt.axis('equal')
-                            plt.title('Структура зарплаты')
-                            
-                            buffer = BytesIO()
-                            plt.savefig(buffer, format='png')
-                            plt.close()
-                            
-                            # Добавляем диаграмму в отчет
-                            buffer.seek(0)
-                            img = Image(buffer, width=400, height=300)
-                            elements.append(img)
-            
-            # Создаем PDF документ
-            doc.build(elements)
-            
-            logger.info(f"Данные о зарплате успешно экспортированы в PDF: {file_path}")
-            
-        except Exception as e:
-            logger.error(f"Ошибка при экспорте данных в PDF: {str(e)}")
-            raise
+            with get_recorder().operation('export_pdf', **self._report_volumes(data, file_path, is_summary)):
+                report_export.export_to_pdf(data, file_path, title, include_details, include_chart, is_summary)
+        except ImportError as e:
+            messagebox.showerror("Ошибка импорта", str(e))
 
 
     def _export_to_excel(self, data, file_path, title, include_details=True, include_chart=True, is_summary=False):
@@ -2998,253 +2913,10 @@ class SalaryCalculatorGUI:
         :param is_summary: Является ли отчет сводным
         """
         try:
-            # Проверка наличия необходимых библиотек
-            try:
-                import pandas as pd
-                import matplotlib.pyplot as plt
-                from io import BytesIO
-                from openpyxl import Workbook
-                from openpyxl.utils.dataframe import dataframe_to_rows
-                from openpyxl.chart import PieChart, Reference
-                from openpyxl.drawing.image import Image as XlsxImage
-            except ImportError:
-                messagebox.showerror(
-                    "Ошибка импорта", 
-                    "Отсутствуют необходимые библиотеки для экспорта в Excel. Установите их командой:\n"
-                    "pip install pandas openpyxl matplotlib"
-                )
-                return
-            
-            # Создаем новую книгу Excel
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Отчет о зарплате"
-            
-            # Добавляем заголовок
-            ws['A1'] = title
-            ws['A1'].font = ws['A1'].font.copy(size=14, bold=True)
-            
-            # Добавляем дату создания
-            ws['A2'] = f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}"
-            
-            current_row = 4  # Начальная строка для данных
-            
-            if is_summary:
-                # Сводный отчет для всех преподавателей
-                # Создаем DataFrame с данными
-                df = pd.DataFrame(data)
-                
-                # Переименовываем столбцы для понятности
-                columns_mapping = {
-                    'teacher_name': 'Преподаватель',
-                    'gross_salary': 'Валовая зарплата',
-                    'tax_amount': 'Налоги',
-                    'net_salary': 'Чистая зарплата'
-                }
-                
-                df = df[list(columns_mapping.keys())].rename(columns=columns_mapping)
-                
-                # Добавляем данные в Excel
-                for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), start=current_row):
-                    for c_idx, value in enumerate(row, start=1):
-                        cell = ws.cell(row=r_idx, column=c_idx, value=value)
-                        # Форматируем числовые значения
-                        if isinstance(value, (int, float)) and c_idx > 1:
-                            cell.number_format = '#,##0.00'
-                
-                # Добавляем суммарную строку
-                total_row = current_row + len(df) + 1
-                ws.cell(row=total_row, column=1, value="ИТОГО")
-                ws.cell(row=total_row, column=1).font = ws.cell(row=total_row, column=1).font.copy(bold=True)
-                
-                # Формулы суммирования для каждой числовой колонки
-                for col in range(2, 5):
-                    cell = ws.cell(row=total_row, column=col)
-                    start_cell = ws.cell(row=current_row+1, column=col).coordinate
-                    end_cell = ws.cell(row=total_row-1, column=col).coordinate
-                    cell.value = f"=SUM({start_cell}:{end_cell})"
-                    cell.number_format = '#,##0.00'
-                    cell.font = cell.font.copy(bold=True)
-                
-                # Если нужны графики
-                if include_chart and len(df) > 0:
-                    # Добавляем лист для графиков
-                    chart_sheet = wb.create_sheet(title="Графики")
-                    
-                    # Создаем круговую диаграмму распределения чистой зарплаты
-                    pie = PieChart()
-                    pie.title = "Распределение чистой зарплаты"
-                    
-                    # Копируем данные о преподавателях и зарплатах на лист с графиком
-                    chart_sheet['A1'] = "Преподаватель"
-                    chart_sheet['B1'] = "Чистая зарплата"
-                    
-                    for idx, row in enumerate(df.values, start=2):
-                        chart_sheet.cell(row=idx, column=1, value=row[0])  # Имя преподавателя
-                        chart_sheet.cell(row=idx, column=2, value=row[3])  # Чистая зарплата
-                    
-                    # Создаем ссылки на данные для графика
-                    labels = Reference(chart_sheet, min_col=1, min_row=2, max_row=1+len(df))
-                    data = Reference(chart_sheet, min_col=2, min_row=1, max_row=1+len(df))
-                    
-                    pie.add_data(data, titles_from_data=True)
-                    pie.set_categories(labels)
-                    
-                    # Добавляем график на лист
-                    chart_sheet.add_chart(pie, "D2")
-            else:
-                # Детальный отчет для одного преподавателя
-                if not data:
-                    ws['A4'] = "Нет данных для отображения"
-                else:
-                    teacher_data = data[0] if isinstance(data, list) else data
-                    
-                    # Основная информация о преподавателе
-                    ws['A4'] = f"Преподаватель: {teacher_data.get('teacher_name', '')}"
-                    ws['A5'] = f"Должность: {teacher_data.get('position', '')}"
-                    ws['A6'] = f"Ставка: {teacher_data.get('hourly_rate', 0):.2f} руб./час"
-                    
-                    current_row = 8
-                    
-                    # Детали расчета зарплаты
-                    if include_details:
-                        ws.cell(row=current_row, column=1, value="Детали расчета")
-                        ws.cell(row=current_row, column=1).font = ws.cell(row=current_row, column=1).font.copy(bold=True)
-                        
-                        current_row += 1
-                        
-                        # Заголовки таблицы деталей
-                        ws.cell(row=current_row, column=1, value="Параметр")
-                        ws.cell(row=current_row, column=2, value="Значение")
-                        
-                        # Форматирование заголовков
-                        for col in range(1, 3):
-                            cell = ws.cell(row=current_row, column=col)
-                            cell.font = cell.font.copy(bold=True)
-                        
-                        # Добавляем детали расчета
-                        details = [
-                            ('Отработано часов', str(teacher_data.get('hours_worked', 0))),
-                            ('Базовая зарплата', f"{teacher_data.get('base_salary', 0):.2f} руб."),
-                            ('Надбавка за должность', f"{teacher_data.get('position_bonus', 0):.2f} руб."),
-                            ('Надбавка за степень', f"{teacher_data.get('degree_bonus', 0):.2f} руб."),
-                            ('Надбавка за стаж', f"{teacher_data.get('experience_bonus', 0):.2f} руб."),
-                            ('Надбавка за категорию', f"{teacher_data.get('category_bonus', 0):.2f} руб."),
-                            ('Надбавка молодому специалисту', f"{teacher_data.get('young_specialist_bonus', 0):.2f} руб."),
-                            ('Оплата больничных', f"{teacher_data.get('sick_leave_pay', 0):.2f} руб."),
-                            ('Бонус', f"{teacher_data.get('bonus', 0):.2f} руб.")
-                        ]
-                        
-                        for detail in details:
-                            current_row += 1
-                            ws.cell(row=current_row, column=1, value=detail[0])
-                            ws.cell(row=current_row, column=2, value=detail[1])
-                        
-                        current_row += 2
-                    
-                    # Итоговые суммы
-                    ws.cell(row=current_row, column=1, value="Итоговые суммы")
-                    ws.cell(row=current_row, column=1).font = ws.cell(row=current_row, column=1).font.copy(bold=True)
-                    
-                    current_row += 1
-                    
-                    # Заголовки таблицы итогов
-                    ws.cell(row=current_row, column=1, value="Параметр")
-                    ws.cell(row=current_row, column=2, value="Значение")
-                    
-                    # Форматирование заголовков
-                    for col in range(1, 3):
-                        cell = ws.cell(row=current_row, column=col)
-                        cell.font = cell.font.copy(bold=True)
-                    
-                    # Добавляем итоговые значения
-                    totals = [
-                        ('Валовая зарплата', f"{teacher_data.get('gross_salary', 0):.2f} руб."),
-                        ('Ставка налога', f"{teacher_data.get('tax_rate', 0):.2f}%"),
-                        ('Сумма налога', f"{teacher_data.get('tax_amount', 0):.2f} руб."),
-                        ('Профсоюзные взносы', f"{teacher_data.get('union_contribution', 0):.2f} руб."),
-                        ('ЧИСТАЯ ЗАРПЛАТА', f"{teacher_data.get('net_salary', 0):.2f} руб.")
-                    ]
-                    
-                    for i, total in enumerate(totals):
-                        current_row += 1
-                        ws.cell(row=current_row, column=1, value=total[0])
-                        ws.cell(row=current_row, column=2, value=total[1])
-                        
-                        # Выделяем последнюю строку (чистая зарплата)
-                        if i == len(totals) - 1:
-                            for col in range(1, 3):
-                                cell = ws.cell(row=current_row, column=col)
-                                cell.font = cell.font.copy(bold=True)
-                    
-                    # Если нужны графики, добавляем диаграмму структуры зарплаты
-                    if include_chart:
-                        # Создаем лист для графиков
-                        chart_sheet = wb.create_sheet(title="Структура зарплаты")
-                        
-                        # Компоненты зарплаты и их значения
-                        components = [
-                            'Базовая зарплата', 
-                            'Надбавка за должность', 
-                            'Надбавка за степень',
-                            'Надбавка за стаж', 
-                            'Надбавка за категорию', 
-                            'Надбавка молодому специалисту',
-                            'Оплата больничных', 
-                            'Бонус'
-                        ]
-                        
-                        values = [
-                            teacher_data.get('base_salary', 0),
-                            teacher_data.get('position_bonus', 0),
-                            teacher_data.get('degree_bonus', 0),
-                            teacher_data.get('experience_bonus', 0),
-                            teacher_data.get('category_bonus', 0),
-                            teacher_data.get('young_specialist_bonus', 0),
-                            teacher_data.get('sick_leave_pay', 0),
-                            teacher_data.get('bonus', 0)
-                        ]
-                        
-                        # Фильтруем только ненулевые компоненты
-                        non_zero_components = []
-                        non_zero_values = []
-                        
-                        for comp, val in zip(components, values):
-                            if val > 0:
-                                non_zero_components.append(comp)
-                                non_zero_values.append(val)
-                        
-                        if non_zero_values:
-                            # Добавляем данные на лист
-                            chart_sheet['A1'] = "Компонент зарплаты"
-                            chart_sheet['B1'] = "Сумма (руб.)"
-                            
-                            for idx, (comp, val) in enumerate(zip(non_zero_components, non_zero_values), start=2):
-                                chart_sheet.cell(row=idx, column=1, value=comp)
-                                chart_sheet.cell(row=idx, column=2, value=val)
-                            
-                            # Создаем круговую диаграмму
-                            pie = PieChart()
-                            pie.title = "Структура зарплаты"
-                            
-                            # Создаем ссылки на данные для графика
-                            labels = Reference(chart_sheet, min_col=1, min_row=2, max_row=1+len(non_zero_components))
-                            data = Reference(chart_sheet, min_col=2, min_row=1, max_row=1+len(non_zero_components))
-                            
-                            pie.add_data(data, titles_from_data=True)
-                            pie.set_categories(labels)
-                            
-                            # Добавляем график на лист
-                            chart_sheet.add_chart(pie, "D2")
-            
-            # Сохраняем Excel-файл
-            wb.save(file_path)
-            
-            logger.info(f"Данные о зарплате успешно экспортированы в Excel: {file_path}")
-            
-        except Exception as e:
-            logger.error(f"Ошибка при экспорте данных в Excel: {str(e)}")
-            raise
+            with get_recorder().operation('export_excel', **self._report_volumes(data, file_path, is_summary)):
+                report_export.export_to_excel(data, file_path, title, include_details, include_chart, is_summary)
+        except ImportError as e:
+            messagebox.showerror("Ошибка импорта", str(e))
 
     def _export_to_word(self, data, file_path, title, include_details=True, include_chart=True, is_summary=False):
         """
@@ -3258,225 +2930,37 @@ class SalaryCalculatorGUI:
         :param is_summary: Является ли отчет сводным
         """
         try:
-            # Проверка наличия необходимых библиотек
-            try:
-                from docx import Document
-                from docx.shared import Pt, Cm, RGBColor
-                from docx.enum.text import WD_ALIGN_PARAGRAPH
-                from docx.enum.table import WD_TABLE_ALIGNMENT
-                import matplotlib.pyplot as plt
-                from io import BytesIO
-            except ImportError:
-                messagebox.showerror(
-                    "Ошибка импорта", 
-                    "Отсутствуют необходимые библиотеки для экспорта в Word. Установите их командой:\n"
-                    "pip install python-docx matplotlib"
-                )
-                return
-            
-            # Создаем новый документ Word
-            doc = Document()
-            
-            # Заголовок отчета
-            doc.add_heading(title, level=1)
-            
-            # Дата создания отчета
-            p = doc.add_paragraph(f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}")
-            
-            if is_summary:
-                # Сводный отчет для всех преподавателей
-                doc.add_heading("Сводный отчет по зарплате", level=2)
-                
-                # Создаем таблицу
-                table = doc.add_table(rows=1, cols=4)
-                table.style = 'Table Grid'
-                
-                # Заголовки таблицы
-                header_cells = table.rows[0].cells
-                header_cells[0].text = "Преподаватель"
-                header_cells[1].text = "Валовая зарплата"
-                header_cells[2].text = "Налоги"
-                header_cells[3].text = "Чистая зарплата"
-                
-                # Добавляем данные в таблицу
-                for teacher_data in data:
-                    row_cells = table.add_row().cells
-                    row_cells[0].text = teacher_data.get('teacher_name', '')
-                    row_cells[1].text = f"{teacher_data.get('gross_salary', 0):.2f}"
-                    row_cells[2].text = f"{teacher_data.get('tax_amount', 0):.2f}"
-                    row_cells[3].text = f"{teacher_data.get('net_salary', 0):.2f}"
-                
-                # Добавляем итоговые значения
-                total_gross = sum(item.get('gross_salary', 0) for item in data)
-                total_tax = sum(item.get('tax_amount', 0) for item in data)
-                total_net = sum(item.get('net_salary', 0) for item in data)
-                
-                doc.add_paragraph(f"Итого валовая зарплата: {total_gross:.2f} руб.")
-                doc.add_paragraph(f"Итого налоги: {total_tax:.2f} руб.")
-                p = doc.add_paragraph(f"Итого чистая зарплата: {total_net:.2f} руб.")
-                p.runs[0].bold = True
-                
-                # Если включены графики, добавляем круговую диаграмму распределения зарплат
-                if include_chart and data:
-                    doc.add_heading("Распределение чистой зарплаты", level=3)
-                    
-                    plt.figure(figsize=(8, 6))
-                    teacher_names = [item.get('teacher_name', '') for item in data]
-                    net_salaries = [item.get('net_salary', 0) for item in data]
-                    
-                    plt.pie(net_salaries, labels=teacher_names, autopct='%1.1f%%', startangle=90)
-                    plt.axis('equal')
-                    plt.title('Распределение чистой зарплаты')
-                    
-                    # Сохраняем график во временный файл
-                    chart_path = os.path.join(os.path.dirname(file_path), "temp_chart.png")
-                    plt.savefig(chart_path, format='png', dpi=300)
-                    plt.close()
-                    
-                    # Добавляем изображение в документ
-                    doc.add_picture(chart_path, width=Cm(15))
-                    
-                    # Удаляем временный файл
-                    if os.path.exists(chart_path):
-                        os.remove(chart_path)
-            else:
-                # Детальный отчет для одного преподавателя
-                if not data:
-                    doc.add_paragraph("Нет данных для отображения")
-                else:
-                    teacher_data = data[0] if isinstance(data, list) else data
-                    
-                    # Основная информация о преподавателе
-                    doc.add_heading(f"Расчет зарплаты преподавателя: {teacher_data.get('teacher_name', '')}", level=2)
-                    doc.add_paragraph(f"Должность: {teacher_data.get('position', '')}")
-                    doc.add_paragraph(f"Ставка: {teacher_data.get('hourly_rate', 0):.2f} руб./час")
-                    
-                    # Детали расчета зарплаты
-                    if include_details:
-                        doc.add_heading("Детали расчета", level=3)
-                        
-                        # Создаем таблицу для деталей
-                        details_table = doc.add_table(rows=1, cols=2)
-                        details_table.style = 'Table Grid'
-                        
-                        # Заголовки таблицы
-                        header_cells = details_table.rows[0].cells
-                        header_cells[0].text = "Параметр"
-                        header_cells[1].text = "Значение"
-                        
-                        # Добавляем данные в таблицу
-                        details = [
-                            ('Отработано часов', str(teacher_data.get('hours_worked', 0))),
-                            ('Базовая зарплата', f"{teacher_data.get('base_salary', 0):.2f} руб."),
-                            ('Надбавка за должность', f"{teacher_data.get('position_bonus', 0):.2f} руб."),
-                            ('Надбавка за степень', f"{teacher_data.get('degree_bonus', 0):.2f} руб."),
-                            ('Надбавка за стаж', f"{teacher_data.get('experience_bonus', 0):.2f} руб."),
-                            ('Надбавка за категорию', f"{teacher_data.get('category_bonus', 0):.2f} руб."),
-                            ('Надбавка молодому специалисту', f"{teacher_data.get('young_specialist_bonus', 0):.2f} руб."),
-                            ('Оплата больничных', f"{teacher_data.get('sick_leave_pay', 0):.2f} руб."),
-                            ('Бонус', f"{teacher_data.get('bonus', 0):.2f} руб.")
-                        ]
-                        
-                        for param, value in details:
-                            row_cells = details_table.add_row().cells
-                            row_cells[0].text = param
-                            row_cells[1].text = value
-                    
-                    # Итоговые суммы
-                    doc.add_heading("Итоговые суммы", level=3)
-                    
-                    # Создаем таблицу для итогов
-                    totals_table = doc.add_table(rows=1, cols=2)
-                    totals_table.style = 'Table Grid'
-                    
-                    # Заголовки таблицы
-                    header_cells = totals_table.rows[0].cells
-                    header_cells[0].text = "Параметр"
-                    header_cells[1].text = "Значение"
-                    
-                    # Добавляем данные в таблицу
-                    totals = [
-                        ('Валовая зарплата', f"{teacher_data.get('gross_salary', 0):.2f} руб."),
-                        ('Ставка налога', f"{teacher_data.get('tax_rate', 0):.2f}%"),
-                        ('Сумма налога', f"{teacher_data.get('tax_amount', 0):.2f} руб."),
-                        ('Профсоюзные взносы', f"{teacher_data.get('union_contribution', 0):.2f} руб."),
-                        ('ЧИСТАЯ ЗАРПЛАТА', f"{teacher_data.get('net_salary', 0):.2f} руб.")
-                    ]
-                    
-                    for param, value in totals:
-                        row_cells = totals_table.add_row().cells
-                        row_cells[0].text = param
-                        row_cells[1].text = value
-                        
-                        # Выделяем последнюю строку (чистая зарплата)
-                        if param == 'ЧИСТАЯ ЗАРПЛАТА':
-                            for cell in row_cells:
-                                for paragraph in cell.paragraphs:
-                                    for run in paragraph.runs:
-                                        run.bold = True
-                    
-                    # Если включены графики, добавляем диаграмму структуры зарплаты
-                    if include_chart:
-                        doc.add_heading("Структура зарплаты", level=3)
-                        
-                        # Компоненты зарплаты и их значения
-                        components = [
-                            'Базовая зарплата', 
-                            'Надбавка за должность', 
-                            'Надбавка за степень',
-                            'Надбавка за стаж', 
-                            'Надбавка за категорию', 
-                            'Надбавка молодому специалисту',
-                            'Оплата больничных', 
-                            'Бонус'
-                        ]
-                        
-                        values = [
-                            teacher_data.get('base_salary', 0),
-                            teacher_data.get('position_bonus', 0),
-                            teacher_data.get('degree_bonus', 0),
-                            teacher_data.get('experience_bonus', 0),
-                            teacher_data.get('category_bonus', 0),
-                            teacher_data.get('young_specialist_bonus', 0),
-                            teacher_data.get('sick_leave_pay', 0),
-                            teacher_data.get('bonus', 0)
-                        ]
-                        
-                        # Фильтруем только ненулевые компоненты
-                        non_zero_components = []
-                        non_zero_values = []
-                        
-                        for comp, val in zip(components, values):
-                            if val > 0:
-                                non_zero_components.append(comp)
-                                non_zero_values.append(val)
-                        
-                        if non_zero_values:
-                            plt.figure(figsize=(8, 6))
-                            plt.pie(non_zero_values, labels=non_zero_components, autopct='%1.1f%%', startangle=90)
-                            plt.axis('equal')
-                            plt.title('Структура зарплаты')
-                            
-                            # Сохраняем график во временный файл
-                            chart_path = os.path.join(os.path.dirname(file_path), "temp_chart.png")
-                            plt.savefig(chart_path, format='png', dpi=300)
-                            plt.close()
-                            
-                            # Добавляем изображение в документ
-                            doc.add_picture(chart_path, width=Cm(15))
-                            
-                            # Удаляем временный файл
-                            if os.path.exists(chart_path):
-                                os.remove(chart_path)
-            
-            # Сохраняем Word-файл
-            doc.save(file_path)
-            
-            logger.info(f"Данные о зарплате успешно экспортированы в Word: {file_path}")
-            
-        except Exception as e:
-            logger.error(f"Ошибка при экспорте данных в Word: {str(e)}")
-            raise
+            with get_recorder().operation('export_word', **self._report_volumes(data, file_path, is_summary)):
+                report_export.export_to_word(data, file_path, title, include_details, include_chart, is_summary)
+        except ImportError as e:
+            messagebox.showerror("Ошибка импорта", str(e))
+
+    def _export_calendar_to_pdf(self, data, file_path, title, include_chart=True):
+        """Экспорт календарного графика отпусков в PDF формат"""
+        try:
+            with get_recorder().operation('export_calendar_pdf', teachers=len(data['teachers']),
+                                          days=len(data['days']), file=os.path.basename(file_path)):
+                report_export.export_vacation_calendar_to_pdf(data, file_path, title, include_chart)
+        except ImportError as e:
+            messagebox.showerror("Ошибка импорта", str(e))
+
+    def _export_calendar_to_excel(self, data, file_path, title, include_chart=True):
+        """Экспорт календарного графика отпусков в Excel формат"""
+        try:
+            with get_recorder().operation('export_calendar_excel', teachers=len(data['teachers']),
+                                          days=len(data['days']), file=os.path.basename(file_path)):
+                report_export.export_vacation_calendar_to_excel(data, file_path, title, include_chart)
+        except ImportError as e:
+            messagebox.showerror("Ошибка импорта", str(e))
+
+    def _export_calendar_to_word(self, data, file_path, title, include_chart=True):
+        """Экспорт календарного графика отпусков в Word формат"""
+        try:
+            with get_recorder().operation('export_calendar_word', teachers=len(data['teachers']),
+                                          days=len(data['days']), file=os.path.basename(file_path)):
+                report_export.export_vacation_calendar_to_word(data, file_path, title, include_chart)
+        except ImportError as e:
+            messagebox.showerror("Ошибка импорта", str(e))
     
 
 
@@ -3814,42 +3298,29 @@ class SalaryCalculatorGUI:
                 # Если требуется график, добавляем его
                 if include_chart:
                     try:
-                        import matplotlib.pyplot as plt
-                        import numpy as np
                         import io
+                        from chart_service import get_chart_service
                         
-                        # Создаем временный график
-                        plt.figure(figsize=(8, 4))
-                        
-                        # Данные для графика
-                        dates = [row.get('calculation_date') for row in salary_data 
-                                if hasattr(row.get('calculation_date', ''), 'strftime')]
-                        dates = [d.strftime('%d.%m.%Y') for d in dates]
-                        values = [safe_get(row, 'net_salary') for row in salary_data]
+                        # Данные для графика (только расчеты с корректной датой)
+                        chart_rows = [row for row in salary_data
+                                      if hasattr(row.get('calculation_date', ''), 'strftime')]
+                        dates = [row['calculation_date'].strftime('%d.%m.%Y') for row in chart_rows]
+                        values = [safe_get(row, 'net_salary') for row in chart_rows]
                         
                         if dates and values:
-                            plt.bar(dates, values)
-                            plt.title('Динамика заработной платы')
-                            plt.xlabel('Дата')
-                            plt.ylabel('Чистая зарплата (руб)')
-                            plt.xticks(rotation=45)
-                            plt.tight_layout()
-                            
-                            # Сохраняем график во временный буфер
-                            buf = io.BytesIO()
-                            plt.savefig(buf, format='png')
-                            buf.seek(0)
+                            # График строится в потоке сервиса диаграмм и кэшируется
+                            png = get_chart_service().bar_chart(dates, values, 'Динамика заработной платы',
+                                                                xlabel='Дата', ylabel='Чистая зарплата (руб)',
+                                                                figsize=(8, 4))
                             
                             # Добавляем график в отчет
                             elements.append(Spacer(1, 20))
                             elements.append(Paragraph("Динамика заработной платы", styles['Heading3_Cyrillic']))
                             elements.append(Spacer(1, 10))
-                            elements.append(Image(buf, width=500, height=250))
-                            
-                            plt.close()
+                            elements.append(Image(io.BytesIO(png), width=500, height=250))
                     except ImportError:
                         elements.append(Spacer(1, 10))
-                        elements.append(Paragraph("Для отображения графиков требуется установить пакеты matplotlib и numpy", styles['Normal_Cyrillic']))
+                        elements.append(Paragraph("Для отображения графиков требуется установить пакет matplotlib", styles['Normal_Cyrillic']))
                     except Exception as chart_error:
                         logging.error(f"Ошибка при создании графика: {str(chart_error)}")
                         elements.append(Spacer(1, 10))
@@ -0,0 +1,61 @@
+"""
+Отложенный вызов обработчиков событий интерфейса (debounce)
+
+Обработчик вызывается только после паузы во вводе заданной длительности;
+каждый новый вызов отменяет ранее запланированный, поэтому быстрый набор
+текста не ставит работу в очередь.
+"""
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TkDebouncer:
+    """Отложенный вызов функции через цикл событий Tk с отменой предыдущих вызовов"""
+
+    def __init__(self, widget, callback: Callable[..., Any], delay_ms: int = 250):
+        """
+        Инициализация
+
+        :param widget: любой виджет Tk (используется для after/after_cancel)
+        :param callback: вызываемая функция
+        :param delay_ms: задержка после последнего вызова в миллисекундах
+        """
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._after_id: Optional[str] = None
+        self._args = ()
+
+    def __call__(self, *args):
+        """Запланировать вызов, отменив ранее запланированный"""
+        self.cancel()
+        self._args = args
+        if self.delay_ms <= 0:
+            self._fire()
+        else:
+            self._after_id = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        """Отменить запланированный вызов"""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def flush(self):
+        """Немедленно выполнить запланированный вызов (например, по Enter)"""
+        if self._after_id is not None:
+            self.cancel()
+            self._fire()
+
+    def _fire(self):
+        """Выполнить вызов"""
+        self._after_id = None
+        try:
+            self.callback(*self._args)
+        except Exception as e:
+            logger.error(f"Ошибка в отложенном обработчике: {str(e)}")
@@ -6,28 +6,25 @@ from tkcalendar import DateEntry
 from typing import Dict, Any, List, Optional, Callable
 import logging
 
-from vacation_processor import VacationProcessor
-from db_connection import DatabaseConnection, TeacherRepository
+from gui_virtual_tree import VirtualTreeview
+from vacation_bitmap import days_in_year, iter_periods
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class VacationTab:
     """Класс для реализации интерфейса вкладки отпусков"""
     
-    def __init__(self, parent_notebook, db_conn: DatabaseConnection):
+    # Высота полосы года (пикселей)
+    YEAR_STRIP_HEIGHT = 36
+    
+    def __init__(self, parent_notebook, app):
         """
         Инициализация вкладки отпусков
         
         :param parent_notebook: родительский объект notebook
-        :param db_conn: объект подключения к базе данных
+        :param app: фасад приложения - SalaryApp или клиент службы SalaryServiceClient
         """
-        self.db_conn = db_conn
-        self.vacation_processor = VacationProcessor(db_conn)
+        self.app = app
         
         # Создаем вкладку
         self.tab = ttk.Frame(parent_notebook)
@@ -109,6 +106,14 @@ class VacationTab:
         self.remaining_days_label = ttk.Label(teacher_info_frame, text="-")
         self.remaining_days_label.grid(row=6, column=1, sticky=tk.W, padx=5, pady=2)
         
+        # Полоса года: отпуска преподавателя (верхний ряд) и число коллег в отпуске (нижний ряд)
+        year_strip_frame = ttk.LabelFrame(self.left_frame, text="Отпуска за год")
+        year_strip_frame.pack(fill=tk.X, padx=5, pady=5)
+        self.year_strip = tk.Canvas(year_strip_frame, height=self.YEAR_STRIP_HEIGHT, background="white",
+                                    highlightthickness=0)
+        self.year_strip.pack(fill=tk.X, padx=5, pady=5)
+        self.year_strip.bind("<Configure>", lambda event: self._draw_year_strip())
+        
         # Фрейм добавления нового отпуска
         add_vacation_frame = ttk.LabelFrame(self.left_frame, text="Добавить отпуск")
         add_vacation_frame.pack(fill=tk.BOTH, padx=5, pady=5, expand=True)
@@ -230,6 +235,9 @@ class VacationTab:
         self.vacations_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Таблица отображает только видимые строки списка
+        self.vacations_view = VirtualTreeview(self.vacations_tree, scrollbar)
+        
         # Привязываем двойной клик для просмотра деталей
         self.vacations_tree.bind("<Double-1>", self._show_vacation_details)
         
@@ -264,8 +272,7 @@ class VacationTab:
     def _load_teachers(self):
         """Загрузка списка преподавателей в выпадающий список"""
         try:
-            teacher_repo = self.db_conn.get_repository('teacher')
-            teachers = teacher_repo.get_all_teachers()
+            teachers = self.app.get_all_teachers()
             
             self.teachers_data = {}
             self.teacher_names = []
@@ -304,11 +311,11 @@ class VacationTab:
             current_year = datetime.date.today().year
             year_from_combobox = int(self.year_var.get()) if self.year_var.get() else current_year
             
-            total_days = self.vacation_processor.get_teacher_vacation_days(teacher['id'])
-            used_days = self.vacation_processor.get_teacher_used_vacation_days(teacher['id'], year_from_combobox)
-            transferred_in = self.vacation_processor.get_transferred_vacation_days_in(teacher['id'], year_from_combobox)
-            transferred_out = self.vacation_processor.get_transferred_vacation_days_out(teacher['id'], year_from_combobox)
-            remaining_days = self.vacation_processor.get_teacher_remaining_vacation_days(teacher['id'], year_from_combobox)
+            total_days = self.app.get_teacher_vacation_days(teacher['id'])
+            used_days = self.app.get_teacher_used_vacation_days(teacher['id'], year_from_combobox)
+            transferred_in = self.app.get_transferred_vacation_days_in(teacher['id'], year_from_combobox)
+            transferred_out = self.app.get_transferred_vacation_days_out(teacher['id'], year_from_combobox)
+            remaining_days = self.app.get_teacher_remaining_vacation_days(teacher['id'], year_from_combobox)
             
             self.total_days_label.config(text=str(total_days))
             self.used_days_label.config(text=str(used_days))
@@ -317,10 +324,51 @@ class VacationTab:
             self.remaining_days_label.config(text=str(remaining_days))
             
             self._load_vacations()
+            self._draw_year_strip()
         except Exception as e:
             logger.error(f"Ошибка при обновлении информации о преподавателе: {str(e)}")
             messagebox.showerror("Ошибка", f"Не удалось получить данные об отпусках: {str(e)}")
     
+    def _draw_year_strip(self):
+        """Отрисовка полосы года по картам дней отпуска"""
+        canvas = self.year_strip
+        canvas.delete("all")
+        if not getattr(self, 'current_teacher_id', None):
+            return
+        
+        try:
+            year = int(self.year_var.get()) if self.year_var.get() else datetime.date.today().year
+            width = canvas.winfo_width()
+            if width <= 1:
+                # Полоса еще не отображена - будет нарисована по событию <Configure>
+                return
+            scale = width / days_in_year(year)
+            half = self.YEAR_STRIP_HEIGHT // 2
+            
+            # Нижний ряд: насыщенность цвета - доля от максимума отсутствующих за год
+            absences = self.app.get_daily_absences(year)
+            peak = max(absences) or 1
+            for index, count in enumerate(absences):
+                if count:
+                    shade = 230 - int(150 * count / peak)
+                    canvas.create_rectangle(index * scale, half + 2, (index + 1) * scale, self.YEAR_STRIP_HEIGHT,
+                                            fill=f"#{shade:02x}{shade:02x}ff", width=0)
+            
+            # Верхний ряд: периоды отпуска выбранного преподавателя
+            first_day = datetime.date(year, 1, 1)
+            mask = self.app.get_vacation_bitmap(self.current_teacher_id, year)
+            for start, end in iter_periods(year, mask):
+                canvas.create_rectangle((start - first_day).days * scale, 0,
+                                        ((end - first_day).days + 1) * scale, half,
+                                        fill="seagreen", width=0)
+            
+            # Границы месяцев
+            for month in range(2, 13):
+                x = (datetime.date(year, month, 1) - first_day).days * scale
+                canvas.create_line(x, 0, x, self.YEAR_STRIP_HEIGHT, fill="lightgray")
+        except Exception as e:
+            logger.error(f"Ошибка при отрисовке полосы года: {str(e)}")
+    
     def _calculate_days(self, event):
         """Расчет количества дней отпуска между выбранными датами"""
         try:
@@ -339,65 +387,53 @@ class VacationTab:
     
     def _load_vacations(self):
         """Загрузка списка отпусков для выбранного преподавателя"""
-        for item in self.vacations_tree.get_children():
-            self.vacations_tree.delete(item)
-        
         if not self.current_teacher_id:
+            self.vacations_view.clear()
             return
         
         try:
             year = int(self.year_var.get()) if self.year_var.get() else None
             include_cancelled = self.show_cancelled_var.get()
             
-            vacations = self.vacation_processor.get_teacher_vacations(
+            vacations = self.app.get_teacher_vacations(
                 self.current_teacher_id, year, include_cancelled)
             
-            for vacation in vacations:
-                start_date = vacation['start_date'].strftime('%d.%m.%Y')
-                end_date = vacation['end_date'].strftime('%d.%m.%Y')
-                payment_amount = f"{vacation['payment_amount']:.2f}" if vacation['payment_amount'] else "-"
-                
-                self.vacations_tree.insert("", tk.END, values=(
-                    vacation['id'],
-                    vacation['teacher_name'],
-                    start_date,
-                    end_date,
-                    vacation['days_count'],
-                    vacation['vacation_type'],
-                    vacation['status'],
-                    payment_amount
-                ))
+            self.vacations_view.set_rows(vacations, key=lambda vacation: vacation['id'],
+                                         values=self._vacation_row_values)
         except Exception as e:
             logger.error(f"Ошибка при загрузке отпусков: {str(e)}")
             messagebox.showerror("Ошибка", f"Не удалось загрузить отпуска: {str(e)}")
     
     def _show_all_vacations(self):
         """Показать отпуска всех преподавателей"""
-        for item in self.vacations_tree.get_children():
-            self.vacations_tree.delete(item)
-        
         try:
-            vacations = self.vacation_processor.get_all_current_vacations(include_past_days=30)
+            vacations = self.app.get_all_current_vacations(include_past_days=30)
             
-            for vacation in vacations:
-                start_date = vacation['start_date'].strftime('%d.%m.%Y')
-                end_date = vacation['end_date'].strftime('%d.%m.%Y')
-                payment_amount = f"{vacation['payment_amount']:.2f}" if vacation['payment_amount'] else "-"
-                
-                self.vacations_tree.insert("", tk.END, values=(
-                    vacation['id'],
-                    vacation['teacher_name'],
-                    start_date,
-                    end_date,
-                    vacation['days_count'],
-                    vacation['vacation_type'],
-                    vacation['status'],
-                    payment_amount
-                ), tags=('all_vacations',))
+            self.vacations_view.set_rows(vacations, key=lambda vacation: vacation['id'],
+                                         values=self._vacation_row_values, tags=('all_vacations',),
+                                         keep_position=False)
         except Exception as e:
             logger.error(f"Ошибка при загрузке всех отпусков: {str(e)}")
             messagebox.showerror("Ошибка", f"Не удалось загрузить все отпуска: {str(e)}")
     
+    @staticmethod
+    def _vacation_row_values(vacation):
+        """Значения столбцов таблицы для одного отпуска"""
+        start_date = vacation['start_date'].strftime('%d.%m.%Y')
+        end_date = vacation['end_date'].strftime('%d.%m.%Y')
+        payment_amount = f"{vacation['payment_amount']:.2f}" if vacation['payment_amount'] else "-"
+        
+        return (
+            vacation['id'],
+            vacation['teacher_name'],
+            start_date,
+            end_date,
+            vacation['days_count'],
+            vacation['vacation_type'],
+            vacation['status'],
+            payment_amount
+        )
+    
     def _add_vacation(self):
         """Добавление нового отпуска"""
         if not self.current_teacher_id:
@@ -414,7 +450,7 @@ class VacationTab:
                 messagebox.showerror("Ошибка", "Дата начала не может быть позже даты окончания")
                 return
             
-            vacation_id = self.vacation_processor.schedule_vacation(
+            vacation_id = self.app.schedule_vacation(
                 self.current_teacher_id, start_date, end_date, vacation_type, notes)
             
             messagebox.showinfo("Успех", f"Отпуск успешно запланирован (ID: {vacation_id})")
@@ -455,11 +491,12 @@ class VacationTab:
             if not messagebox.askyesno("Подтверждение", "Вы уверены, что хотите отменить выбранный отпуск?"):
                 return
             
-            result = self.vacation_processor.cancel_vacation(vacation_id)
+            result = self.app.cancel_vacation(vacation_id)
             
             if result:
                 messagebox.showinfo("Успех", "Отпуск успешно отменен")
                 self._load_vacations()
+                self._draw_year_strip()
             else:
                 messagebox.showwarning("Предупреждение", "Не удалось отменить отпуск. Возможно, его статус не позволяет отмену.")
         except Exception as e:
@@ -476,7 +513,7 @@ class VacationTab:
             if not messagebox.askyesno("Подтверждение", "Отметить выбранный отпуск как использованный?"):
                 return
             
-            result = self.vacation_processor.mark_vacation_as_used(vacation_id)
+            result = self.app.mark_vacation_as_used(vacation_id)
             
             if result:
                 messagebox.showinfo("Успех", "Отпуск успешно отмечен как использованный")
@@ -498,7 +535,7 @@ class VacationTab:
             if not messagebox.askyesno("Подтверждение", "Выполнить расчет выплаты за отпуск?"):
                 return
             
-            payment_info = self.vacation_processor.calculate_vacation_payment(vacation_id)
+            payment_info = self.app.calculate_vacation_payment(vacation_id)
             
             message = (
                 f"Расчет выплаты за отпуск выполнен успешно:\n\n"
@@ -525,7 +562,7 @@ class VacationTab:
             return
         
         try:
-            vacation = self.vacation_processor.get_vacation_by_id(vacation_id)
+            vacation = self.app.get_vacation_by_id(vacation_id)
             
             if not vacation:
                 messagebox.showwarning("Предупреждение", "Отпуск не найден")
@@ -629,7 +666,7 @@ class VacationTab:
                 if not save_path:
                     return
                 
-                report_data = self.vacation_processor.export_vacation_report(year, selected_format)
+                report_data = self.app.export_vacation_report(year, selected_format)
                 
                 with open(save_path, "w", encoding="utf-8") as f:
                     f.write(report_data)
@@ -648,7 +685,7 @@ class VacationTab:
         try:
             year = int(self.year_var.get()) if self.year_var.get() else datetime.date.today().year
             
-            stats = self.vacation_processor.get_vacation_statistics(year)
+            stats = self.app.get_vacation_statistics(year)
             
             stats_window = tk.Toplevel()
             stats_window.title(f"Статистика отпусков за {year} год")
@@ -786,12 +823,12 @@ class VacationTab:
                 messagebox.showerror("Ошибка", "Количество дней должно быть положительным")
                 return
             
-            remaining_days = self.vacation_processor.get_teacher_remaining_vacation_days(self.current_teacher_id, from_year)
+            remaining_days = self.app.get_teacher_remaining_vacation_days(self.current_teacher_id, from_year)
             if days_count > remaining_days:
                 messagebox.showerror("Ошибка", f"Нельзя перенести больше дней ({days_count}), чем осталось ({remaining_days}) за {from_year} год")
                 return
             
-            transfer_id = self.vacation_processor.transfer_vacation_days(self.current_teacher_id, from_year, to_year, days_count)
+            transfer_id = self.app.transfer_vacation_days(self.current_teacher_id, from_year, to_year, days_count)
             messagebox.showinfo("Успех", f"Дни отпуска успешно перенесены (ID: {transfer_id})")
             self._on_teacher_selected(None)
             self._show_transfer_dialog().destroy()  # Закрываем диалог после успешного переноса
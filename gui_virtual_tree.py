@@ -0,0 +1,270 @@
+"""
+Виртуальный список для ttk.Treeview
+
+ttk.Treeview создает виджетный элемент на каждую вставленную строку, поэтому
+заполнение таблицы тысячами строк занимает секунды и блокирует интерфейс.
+VirtualTreeview держит в таблице только видимое окно строк и небольшой запас,
+запрашивает строки у источника данных постранично при прокрутке и при
+обновлении данных применяет к окну разницу вместо полной перестройки.
+"""
+import tkinter as tk
+from tkinter import ttk
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Строка для отображения: (ключ строки, значения столбцов, теги)
+RowView = Tuple[str, Tuple[Any, ...], Tuple[str, ...]]
+
+
+class ListRowSource:
+    """Источник строк поверх списка в памяти; строки форматируются только при запросе страницы"""
+
+    def __init__(self, rows: Sequence[Any], key: Callable[[Any], Any],
+                 values: Callable[[Any], Sequence[Any]], tags: Sequence[str] = ()):
+        """
+        Инициализация источника
+
+        :param rows: список записей (например, словарей из БД)
+        :param key: функция получения уникального ключа записи (станет iid строки)
+        :param values: функция получения значений столбцов записи
+        :param tags: теги, назначаемые всем строкам
+        """
+        self.rows = rows
+        self.key = key
+        self.values = values
+        self.tags = tuple(tags)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_page(self, start: int, count: int) -> List[RowView]:
+        """
+        Получить страницу строк для отображения
+
+        :param start: индекс первой строки
+        :param count: количество строк
+        :return: список строк (ключ, значения, теги)
+        """
+        return [(str(self.key(row)), tuple(self.values(row)), self.tags)
+                for row in self.rows[start:start + count]]
+
+    def index_of(self, key: str) -> Optional[int]:
+        """Индекс записи по ключу строки или None"""
+        for index, row in enumerate(self.rows):
+            if str(self.key(row)) == key:
+                return index
+        return None
+
+
+class VirtualTreeview:
+    """Адаптер, отображающий в ttk.Treeview только видимую часть источника строк"""
+
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: Optional[tk.Scrollbar] = None, buffer_rows: int = 10):
+        """
+        Инициализация адаптера
+
+        :param tree: таблица, которой управляет адаптер
+        :param scrollbar: вертикальная полоса прокрутки таблицы
+        :param buffer_rows: число строк, отображаемых сверх видимых
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.buffer_rows = buffer_rows
+        self.source = ListRowSource([], key=lambda row: row, values=lambda row: ())
+        self.offset = 0
+        self._visible_rows = max(int(tree.cget('height') or 10), 1)
+        self._row_height = None
+
+        # Прокрутка управляется адаптером, а не встроенным механизмом таблицы
+        if scrollbar is not None:
+            scrollbar.configure(command=self.scroll)
+        tree.configure(yscrollcommand=lambda first, last: None)
+
+        tree.bind('<Configure>', self._on_configure, add='+')
+        tree.bind('<MouseWheel>', self._on_mousewheel)
+        tree.bind('<Button-4>', lambda event: self._scroll_units(-3))
+        tree.bind('<Button-5>', lambda event: self._scroll_units(3))
+        tree.bind('<Up>', lambda event: self._move_selection(-1))
+        tree.bind('<Down>', lambda event: self._move_selection(1))
+        tree.bind('<Prior>', lambda event: self._scroll_units(-self._visible_rows))
+        tree.bind('<Next>', lambda event: self._scroll_units(self._visible_rows))
+        tree.bind('<Home>', lambda event: self.scroll_to(0))
+        tree.bind('<End>', lambda event: self.scroll_to(len(self.source)))
+
+    # --- Данные ---
+
+    def set_source(self, source, keep_position: bool = True):
+        """
+        Установить источник строк и обновить окно таблицы
+
+        :param source: объект с методами __len__ и get_page(start, count)
+        :param keep_position: сохранить текущую позицию прокрутки
+        """
+        self.source = source
+        if not keep_position:
+            self.offset = 0
+        self.refresh()
+
+    def set_rows(self, rows: Sequence[Any], key: Callable[[Any], Any],
+                 values: Callable[[Any], Sequence[Any]], tags: Sequence[str] = (),
+                 keep_position: bool = True):
+        """
+        Отобразить список записей
+
+        :param rows: список записей
+        :param key: функция получения уникального ключа записи
+        :param values: функция получения значений столбцов записи
+        :param tags: теги строк
+        :param keep_position: сохранить текущую позицию прокрутки
+        """
+        self.set_source(ListRowSource(rows, key, values, tags), keep_position)
+
+    def clear(self):
+        """Очистить таблицу"""
+        self.set_rows([], key=lambda row: row, values=lambda row: (), keep_position=False)
+
+    def refresh(self):
+        """Перерисовать окно таблицы по текущему источнику, изменяя только отличающиеся строки"""
+        total = len(self.source)
+        self.offset = max(0, min(self.offset, total - self._visible_rows))
+        page = self.source.get_page(self.offset, self._visible_rows + self.buffer_rows)
+        self._apply(page)
+        self._update_scrollbar()
+
+    # --- Прокрутка ---
+
+    def scroll(self, *args):
+        """Обработчик команд полосы прокрутки ('moveto', доля) и ('scroll', n, 'units'|'pages')"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * len(self.source)))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                step *= self._visible_rows
+            self._scroll_units(step)
+
+    def scroll_to(self, index: int):
+        """
+        Прокрутить таблицу так, чтобы строка с указанным индексом была первой
+
+        :param index: индекс строки в источнике
+        """
+        total = len(self.source)
+        new_offset = max(0, min(index, total - self._visible_rows))
+        if new_offset != self.offset:
+            self.offset = new_offset
+            self.refresh()
+        return 'break'
+
+    def see(self, key) -> bool:
+        """
+        Прокрутить таблицу к строке с указанным ключом
+
+        :param key: ключ строки
+        :return: True, если строка найдена
+        """
+        index_of = getattr(self.source, 'index_of', None)
+        index = index_of(str(key)) if index_of else None
+        if index is None:
+            return False
+        if not self.offset <= index < self.offset + self._visible_rows:
+            self.scroll_to(index - self._visible_rows // 2)
+        return True
+
+    # --- Внутренние методы ---
+
+    def _apply(self, page: List[RowView]):
+        """Привести строки таблицы к странице page, применив минимальные изменения"""
+        tree = self.tree
+        wanted = {iid for iid, _, _ in page}
+
+        for iid in tree.get_children(''):
+            if iid not in wanted:
+                tree.delete(iid)
+
+        for index, (iid, values, tags) in enumerate(page):
+            if tree.exists(iid):
+                item = tree.item(iid)
+                if tree.index(iid) != index:
+                    tree.move(iid, '', index)
+                if tuple(str(v) for v in item['values']) != tuple(str(v) for v in values) \
+                        or tuple(item['tags'] or ()) != tuple(tags):
+                    tree.item(iid, values=values, tags=tags)
+            else:
+                tree.insert('', index, iid=iid, values=values, tags=tags)
+
+        # Окно всегда отображается с первой строки
+        tree.yview_moveto(0)
+
+    def _update_scrollbar(self):
+        """Синхронизировать положение полосы прокрутки с окном"""
+        if self.scrollbar is None:
+            return
+        total = len(self.source)
+        if total <= self._visible_rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self._visible_rows) / total))
+
+    def _scroll_units(self, step: int):
+        """Прокрутить на step строк"""
+        return self.scroll_to(self.offset + step)
+
+    def _on_mousewheel(self, event):
+        """Прокрутка колесом мыши (Windows/macOS)"""
+        return self._scroll_units(-3 if event.delta > 0 else 3)
+
+    def _move_selection(self, step: int):
+        """Перемещение выделения стрелками с прокруткой окна у его границ"""
+        tree = self.tree
+        children = tree.get_children('')
+        if not children:
+            return 'break'
+
+        selection = tree.selection()
+        position = tree.index(selection[0]) if selection else -1
+        target = position + step
+
+        if target < 0:
+            if self.offset == 0:
+                return 'break'
+            self._scroll_units(-1)
+            target = 0
+        elif target >= self._visible_rows:
+            if self.offset + self._visible_rows >= len(self.source):
+                return 'break'
+            self._scroll_units(1)
+            target = self._visible_rows - 1
+
+        children = tree.get_children('')
+        if target < len(children):
+            tree.selection_set(children[target])
+            tree.focus(children[target])
+        return 'break'
+
+    def _on_configure(self, event):
+        """Пересчет числа видимых строк при изменении размера таблицы"""
+        row_height = self._get_row_height()
+        # Заголовок таблицы занимает примерно одну строку
+        visible = max(1, event.height // row_height - 1)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self.refresh()
+
+    def _get_row_height(self) -> int:
+        """Высота строки таблицы в пикселях"""
+        if self._row_height is None:
+            try:
+                style = ttk.Style(self.tree)
+                self._row_height = int(style.lookup(self.tree.cget('style') or 'Treeview', 'rowheight') or 0)
+            except (tk.TclError, ValueError):
+                self._row_height = 0
+            if not self._row_height:
+                self._row_height = self.DEFAULT_ROW_HEIGHT
+        return self._row_height
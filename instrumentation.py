@@ -0,0 +1,190 @@
+"""
+Замеры времени выполнения методов приложения
+
+По умолчанию инструментирование выключено и ничего не оборачивает, поэтому
+не влияет на производительность. Включается переменной окружения
+SALARY_METRICS_FILE (путь к файлу метрик JSONL) или вызовом configure().
+Во включенном режиме публичные методы SalaryApp, SalaryCalculator и
+VacationProcessor оборачиваются замером: число вызовов, общее время,
+время в БД (по данным курсора query_stats) и время Python отдельно.
+Фоновый поток периодически дописывает снимок метрик в файл JSONL.
+"""
+import datetime
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from query_stats import thread_db_time
+
+logger = logging.getLogger(__name__)
+
+# Интервал записи снимков метрик по умолчанию (с)
+DEFAULT_SNAPSHOT_INTERVAL = 60
+
+_lock = threading.Lock()
+_metrics: Dict[str, Dict[str, Any]] = {}
+_config = {'enabled': False, 'metrics_file': None, 'interval': DEFAULT_SNAPSHOT_INTERVAL}
+_writer: Optional['_SnapshotWriter'] = None
+
+
+def configure(metrics_file: Optional[str] = None, interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+              enabled: bool = True):
+    """
+    Включить или выключить инструментирование
+
+    Действует на объекты, инструментируемые после вызова (см. instrument).
+
+    :param metrics_file: файл JSONL для периодических снимков (None - без записи)
+    :param interval: интервал записи снимков (с)
+    :param enabled: включить замеры
+    """
+    global _writer
+    _config.update(enabled=enabled, metrics_file=metrics_file, interval=interval)
+
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+    if enabled and metrics_file:
+        _writer = _SnapshotWriter(metrics_file, interval)
+        _writer.start()
+        logger.info(f"Метрики выполнения записываются в {metrics_file} каждые {interval} с")
+
+
+def configure_from_environment():
+    """Включить инструментирование, если задана переменная окружения SALARY_METRICS_FILE"""
+    metrics_file = os.environ.get('SALARY_METRICS_FILE')
+    if metrics_file and not _config['enabled']:
+        interval = float(os.environ.get('SALARY_METRICS_INTERVAL', DEFAULT_SNAPSHOT_INTERVAL))
+        configure(metrics_file, interval)
+
+
+def is_enabled() -> bool:
+    """Включено ли инструментирование"""
+    return _config['enabled']
+
+
+def _record(name: str, wall: float, db_time: float, failed: bool):
+    """Учесть один вызов"""
+    with _lock:
+        entry = _metrics.get(name)
+        if entry is None:
+            entry = _metrics[name] = {'calls': 0, 'errors': 0, 'wall_time': 0.0,
+                                      'db_time': 0.0, 'max_time': 0.0}
+        entry['calls'] += 1
+        entry['errors'] += int(failed)
+        entry['wall_time'] += wall
+        entry['db_time'] += db_time
+        entry['max_time'] = max(entry['max_time'], wall)
+
+
+def _wrap(func, name: str):
+    """Обертка с замером времени вызова"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        db_started = thread_db_time()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            _record(name, time.perf_counter() - started, thread_db_time() - db_started, failed)
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument(*objects):
+    """
+    Обернуть замером публичные методы объектов (только во включенном режиме)
+
+    :param objects: экземпляры классов (SalaryApp, SalaryCalculator, VacationProcessor)
+    """
+    if not is_enabled():
+        return
+
+    for obj in objects:
+        class_name = type(obj).__name__
+        for attr_name, member in inspect.getmembers(type(obj), inspect.isfunction):
+            if attr_name.startswith('_'):
+                continue
+            bound = getattr(obj, attr_name)
+            if getattr(bound, '__instrumented__', False):
+                continue
+            setattr(obj, attr_name, _wrap(bound, f"{class_name}.{attr_name}"))
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """
+    Текущие значения метрик
+
+    :return: словарь {метод: {calls, errors, wall_ms, db_ms, python_ms, avg_ms, max_ms}}
+    """
+    with _lock:
+        items = {name: dict(entry) for name, entry in _metrics.items()}
+
+    result = {}
+    for name, entry in sorted(items.items(), key=lambda item: item[1]['wall_time'], reverse=True):
+        result[name] = {
+            'calls': entry['calls'],
+            'errors': entry['errors'],
+            'wall_ms': round(entry['wall_time'] * 1000, 3),
+            'db_ms': round(entry['db_time'] * 1000, 3),
+            'python_ms': round((entry['wall_time'] - entry['db_time']) * 1000, 3),
+            'avg_ms': round(entry['wall_time'] * 1000 / entry['calls'], 3),
+            'max_ms': round(entry['max_time'] * 1000, 3),
+        }
+    return result
+
+
+def reset():
+    """Очистить накопленные метрики"""
+    with _lock:
+        _metrics.clear()
+
+
+def flush():
+    """Записать снимок метрик немедленно (например, при закрытии приложения)"""
+    if _writer is not None:
+        _writer.write()
+
+
+class _SnapshotWriter(threading.Thread):
+    """Фоновый поток периодической записи снимков метрик в JSONL"""
+
+    def __init__(self, metrics_file: str, interval: float):
+        super().__init__(name="metrics-writer", daemon=True)
+        self.metrics_file = metrics_file
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def write(self):
+        """Дописать снимок метрик в файл"""
+        metrics = snapshot()
+        if not metrics:
+            return
+        record = {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'pid': os.getpid(),
+            'metrics': metrics,
+        }
+        try:
+            directory = os.path.dirname(self.metrics_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.metrics_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error(f"Ошибка при записи метрик в {self.metrics_file}: {str(e)}")
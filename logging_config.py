@@ -0,0 +1,185 @@
+"""
+Централизованная настройка логирования
+
+Модули приложения только получают логгер (logging.getLogger(__name__)),
+а обработчики настраивает точка входа вызовом setup_logging(). Записи
+попадают в очередь (QueueHandler), а запись в файл и на консоль выполняет
+отдельный поток QueueListener, поэтому файловый ввод-вывод не замедляет
+расчеты. Файл журнала ротируется по размеру, записи в нем - JSON-строки.
+
+Уровни отдельных модулей задаются параметром module_levels или переменной
+окружения SALARY_LOG_LEVELS, например:
+SALARY_LOG_LEVELS="salary_calculator=WARNING,db_connection=WARNING"
+"""
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from typing import Dict, Optional, Union
+
+# Переменные окружения: общий уровень и уровни модулей
+LOG_LEVEL_ENV = 'SALARY_LOG_LEVEL'
+MODULE_LEVELS_ENV = 'SALARY_LOG_LEVELS'
+
+# Формат записей на консоли
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Ротация файла журнала
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+# Стандартные атрибуты LogRecord (остальные считаются полями extra)
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись журнала в виде одной JSON-строки"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName,
+            'process': record.process,
+        }
+        # Дополнительные поля, переданные через extra=
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        # Через очередь трассировка приходит уже в виде текста (exc_text)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ExceptionQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, сохраняющий трассировку исключения отдельным полем
+
+    Стандартный prepare форматирует запись целиком и удаляет exc_info,
+    поэтому трассировка попадает в текст сообщения. Здесь сообщение
+    объединяется с аргументами так же, а трассировка сохраняется в
+    exc_text (в отличие от exc_info - строка, ее можно передать в другой
+    поток или процесс), и обработчики журнала выводят ее сами.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# Форматирование трассировок в ExceptionQueueHandler
+_exception_formatter = logging.Formatter()
+
+
+def _level(value: Union[int, str]) -> Union[int, str]:
+    """Уровень логирования (имена уровней - без учета регистра)"""
+    return value.strip().upper() if isinstance(value, str) else value
+
+
+def parse_module_levels(value: str) -> Dict[str, str]:
+    """
+    Разобрать уровни модулей из строки вида "модуль=УРОВЕНЬ,модуль=УРОВЕНЬ"
+
+    :param value: строка настройки
+    :return: словарь {имя логгера: уровень}
+    """
+    levels = {}
+    for item in (value or '').split(','):
+        if '=' not in item:
+            continue
+        name, level = item.split('=', 1)
+        if name.strip():
+            levels[name.strip()] = _level(level)
+    return levels
+
+
+def setup_logging(log_file: Optional[str] = 'app.log', level: Union[int, str] = logging.INFO,
+                  module_levels: Optional[Dict[str, Union[int, str]]] = None, json_format: bool = True,
+                  console: bool = True, max_bytes: int = DEFAULT_MAX_BYTES,
+                  backup_count: int = DEFAULT_BACKUP_COUNT) -> logging.handlers.QueueListener:
+    """
+    Настроить логирование приложения (повторные вызовы возвращают уже запущенный обработчик)
+
+    :param log_file: файл журнала (None - без записи в файл)
+    :param level: общий уровень (переопределяется переменной SALARY_LOG_LEVEL)
+    :param module_levels: уровни отдельных логгеров {имя: уровень}; дополняются
+                          значениями из переменной SALARY_LOG_LEVELS
+    :param json_format: писать ли файл журнала в формате JSON
+    :param console: выводить ли записи на консоль
+    :param max_bytes: размер файла, после которого выполняется ротация
+    :param backup_count: число хранимых архивных файлов
+    :return: запущенный QueueListener
+    """
+    global _listener, _queue_handler
+
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        handlers = []
+        if log_file:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+            file_handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(file_handler)
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+
+        root = logging.getLogger()
+        root.setLevel(_level(os.environ.get(LOG_LEVEL_ENV) or level))
+
+        levels = dict(module_levels or {})
+        levels.update(parse_module_levels(os.environ.get(MODULE_LEVELS_ENV, '')))
+        for name, module_level in levels.items():
+            logging.getLogger(name).setLevel(_level(module_level))
+
+        _queue_handler = ExceptionQueueHandler(queue.SimpleQueue())
+        root.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Записать оставшиеся записи очереди и остановить поток журнала"""
+    global _listener, _queue_handler
+
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
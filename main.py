@@ -1,8 +1,11 @@
 import tkinter as tk
 from gui import SalaryCalculatorGUI
 from app import SalaryApp
+from logging_config import setup_logging
 
 if __name__ == "__main__":
+    setup_logging('gui.log')
+    
     # Конфигурация подключения к базе данных
     db_config = {
         'host': 'localhost',
@@ -0,0 +1,195 @@
+"""
+Типизированные строки результатов запросов
+
+Репозитории возвращают вместо словаря на каждую строку компактные объекты
+со слотами: Teacher, SalaryCalculation и Vacation. Поля доступны как
+атрибуты (teacher.hourly_rate), а для совместимости с существующим кодом -
+и как ключи словаря (teacher['hourly_rate'], teacher.get('position')).
+Столбцы запроса, для которых нет поля, а также ключи, добавленные
+вызывающим кодом, хранятся в словаре extra.
+
+Объекты строятся фабрикой row_factory, которая сопоставляет столбцы
+курсора с полями один раз для каждого набора столбцов.
+"""
+import datetime
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields
+from decimal import Decimal
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+
+class Row(Mapping):
+    """Базовый класс строк: доступ к полям как к ключам словаря"""
+
+    __slots__ = ()
+    _field_names: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            return getattr(self, key)
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def __contains__(self, key):
+        return key in self._field_set or (self.extra is not None and key in self.extra)
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __iter__(self):
+        yield from self._field_names
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(self._field_names) + (len(self.extra) if self.extra else 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Обычный словарь со всеми полями и дополнительными ключами"""
+        result = {name: getattr(self, name) for name in self._field_names}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    @classmethod
+    def _register_fields(cls):
+        cls._field_names = tuple(f.name for f in fields(cls) if f.name != 'extra')
+        cls._field_set = frozenset(cls._field_names)
+        return cls
+
+
+def _row_type(cls):
+    """Декоратор: dataclass со слотами и списком полей для доступа по ключу"""
+    return dataclass(slots=True, eq=True)(cls)._register_fields()
+
+
+@_row_type
+class Teacher(Row):
+    """Преподаватель (таблица teachers)"""
+    id: Optional[int] = None
+    name: Optional[str] = None
+    hourly_rate: Optional[Decimal] = None
+    is_young_specialist: Optional[bool] = None
+    is_union_member: Optional[bool] = None
+    position: Optional[str] = None
+    academic_degree: Optional[str] = None
+    qualification_category: Optional[str] = None
+    experience_years: Optional[int] = None
+    hire_date: Optional[datetime.date] = None
+    birth_date: Optional[datetime.date] = None
+    extra: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def page_key(self) -> Tuple[Optional[str], Optional[int]]:
+        """Ключ для запроса следующей страницы (параметр after)"""
+        return self.name, self.id
+
+
+@_row_type
+class SalaryCalculation(Row):
+    """Сохраненный расчет зарплаты (таблица salary_calculations)"""
+    id: Optional[int] = None
+    teacher_id: Optional[int] = None
+    calculation_date: Optional[datetime.date] = None
+    hours_worked: Optional[Decimal] = None
+    sick_leave_hours: Optional[Decimal] = None
+    absence_hours: Optional[Decimal] = None
+    bonus: Optional[Decimal] = None
+    tax_rate: Optional[Decimal] = None
+    gross_salary: Optional[Decimal] = None
+    net_salary: Optional[Decimal] = None
+    vacation_days: Optional[int] = None
+    vacation_pay: Optional[Decimal] = None
+    position_bonus: Optional[Decimal] = None
+    degree_bonus: Optional[Decimal] = None
+    experience_bonus: Optional[Decimal] = None
+    category_bonus: Optional[Decimal] = None
+    extra: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def page_key(self) -> Tuple[Optional[datetime.date], Optional[int]]:
+        """Ключ для запроса следующей страницы (параметр after)"""
+        return self.calculation_date, self.id
+
+
+@_row_type
+class Vacation(Row):
+    """Отпуск преподавателя (таблица teacher_vacations)"""
+    id: Optional[int] = None
+    teacher_id: Optional[int] = None
+    teacher_name: Optional[str] = None
+    start_date: Optional[datetime.date] = None
+    end_date: Optional[datetime.date] = None
+    days_count: Optional[int] = None
+    vacation_type: Optional[str] = None
+    status: Optional[str] = None
+    payment_amount: Optional[Decimal] = None
+    payment_date: Optional[datetime.date] = None
+    calculation_date: Optional[datetime.date] = None
+    notes: Optional[str] = None
+    created_at: Optional[datetime.datetime] = None
+    updated_at: Optional[datetime.datetime] = None
+    extra: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def page_key(self) -> Tuple[Optional[datetime.date], Optional[int]]:
+        """Ключ для запроса следующей страницы (параметр after)"""
+        return self.start_date, self.id
+
+
+@lru_cache(maxsize=256)
+def row_factory(cls, columns: Tuple[str, ...]) -> Callable[[Sequence], Row]:
+    """
+    Функция построения объектов cls из строк с заданным набором столбцов
+
+    :param cls: тип строки (Teacher, SalaryCalculation, Vacation)
+    :param columns: имена столбцов курсора
+    :return: функция (кортеж значений) -> объект
+    """
+    positions = {name: index for index, name in enumerate(columns)}
+    field_indexes = [positions.get(name) for name in cls._field_names]
+    extra_columns = [(name, index) for index, name in enumerate(columns) if name not in cls._field_set]
+
+    if None not in field_indexes and len(field_indexes) > 1:
+        values = itemgetter(*field_indexes)
+    else:
+        values = lambda row: [row[index] if index is not None else None for index in field_indexes]
+
+    if not extra_columns:
+        return lambda row: cls(*values(row))
+    return lambda row: cls(*values(row), {name: row[index] for name, index in extra_columns})
+
+
+def cursor_columns(cursor) -> Tuple[str, ...]:
+    """Имена столбцов результата курсора"""
+    return tuple(desc[0] for desc in cursor.description)
+
+
+def fetch_rows(cursor, cls) -> list:
+    """Все строки результата курсора в виде объектов cls"""
+    make = row_factory(cls, cursor_columns(cursor))
+    return [make(row) for row in cursor.fetchall()]
+
+
+def fetch_row(cursor, cls) -> Optional[Row]:
+    """Одна строка результата курсора в виде объекта cls или None"""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row_factory(cls, cursor_columns(cursor))(row)
@@ -0,0 +1,126 @@
+"""
+Денежная арифметика расчетов зарплаты, отпускных и больничных
+
+Константы Decimal создаются один раз при импорте. Округление до копеек
+всегда выполняется с явным ROUND_HALF_UP, а масштабирование - в
+собственном контексте модуля, поэтому результат не зависит от
+глобального контекста decimal. Значения из базы данных и входные данные
+приводятся к Decimal только функцией to_decimal.
+
+Для сумм, которые уже выражены в копейках (начисления из базы данных),
+есть целочисленные функции: деление и умножение на долю с округлением
+половины от нуля дают тот же результат, что и Decimal.quantize с
+ROUND_HALF_UP, но без создания промежуточных объектов Decimal.
+"""
+from decimal import Context, Decimal, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_UP
+from functools import lru_cache
+from typing import Any, Tuple
+
+# Контекст денежных расчетов
+CONTEXT = Context(prec=28, rounding=ROUND_HALF_UP, traps=[InvalidOperation, DivisionByZero, Overflow])
+
+ZERO = Decimal('0')
+ONE = Decimal('1')
+HUNDRED = Decimal('100')
+# Шаг округления денежных сумм (одна копейка)
+CENT = Decimal('0.01')
+# Множитель перевода процентов в доли
+PERCENT = Decimal('0.01')
+
+
+def to_decimal(value: Any) -> Decimal:
+    """
+    Привести значение из базы данных или входных данных к Decimal
+
+    Decimal возвращается как есть, целые числа преобразуются без
+    промежуточной строки, float и строки - через str (без двоичной погрешности).
+
+    :param value: Decimal, int, float, str или None
+    :return: Decimal (None - ноль)
+    """
+    if value is None:
+        return ZERO
+    value_type = type(value)
+    if value_type is Decimal:
+        return value
+    if value_type is int:
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def round_money(value: Decimal) -> Decimal:
+    """Округлить сумму до копеек (половина - от нуля)"""
+    # Явный режим округления заметно быстрее, чем передача context=
+    return value.quantize(CENT, ROUND_HALF_UP)
+
+
+def percent_of(amount: Decimal, percent: Decimal) -> Decimal:
+    """Процент от суммы (без округления)"""
+    return amount * percent * PERCENT
+
+
+def to_kopecks(value: Any) -> int:
+    """
+    Сумма в копейках (целое число) с округлением до копейки
+
+    :param value: сумма в рублях
+    :return: число копеек
+    """
+    return int((to_decimal(value) * HUNDRED).to_integral_value(ROUND_HALF_UP))
+
+
+def from_kopecks(kopecks: int) -> Decimal:
+    """Сумма в рублях с двумя знаками после запятой из числа копеек"""
+    return Decimal(kopecks).scaleb(-2, CONTEXT)
+
+
+def kopecks_to_float(kopecks: int) -> float:
+    """Сумма в рублях (float) из числа копеек - то же, что float(from_kopecks(kopecks))"""
+    return kopecks / 100
+
+
+def div_half_up(numerator: int, denominator: int) -> int:
+    """
+    Целочисленное деление с округлением половины от нуля
+
+    :param numerator: делимое
+    :param denominator: делитель (положительный)
+    :return: округленное частное
+    """
+    if denominator <= 0:
+        raise ValueError("Делитель должен быть положительным числом")
+    if numerator < 0:
+        return -((-2 * numerator + denominator) // (2 * denominator))
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+@lru_cache(maxsize=256)
+def _ratio(factor: Decimal) -> Tuple[int, int]:
+    """Множитель в виде несократимой дроби (числитель, знаменатель)"""
+    return factor.as_integer_ratio()
+
+
+def kopecks_times(kopecks: int, factor: Any) -> int:
+    """
+    Сумма в копейках, умноженная на множитель, с округлением до копейки
+
+    :param kopecks: сумма в копейках
+    :param factor: множитель (например, ставка налога Decimal('0.13'))
+    :return: число копеек
+    """
+    if type(factor) is int:
+        return kopecks * factor
+    numerator, denominator = _ratio(to_decimal(factor))
+    return div_half_up(kopecks * numerator, denominator)
+
+
+def kopecks_percent(kopecks: int, percent: Any) -> int:
+    """
+    Процент от суммы в копейках с округлением до копейки
+
+    :param kopecks: сумма в копейках
+    :param percent: процент (например, Decimal('85.0'))
+    :return: число копеек
+    """
+    numerator, denominator = _ratio(to_decimal(percent))
+    return div_half_up(kopecks * numerator, denominator * 100)
@@ -0,0 +1,589 @@
+"""
+Пакетный расчет зарплаты с журналом запусков
+
+Каждый запуск записывается в таблицу payroll_runs (входные данные, их
+хэш, статус, счетчики), а список преподавателей запуска - в таблицу
+payroll_run_items с состоянием каждого преподавателя. Преподаватели
+обрабатываются порциями; расчеты порции и отметки о них в журнале
+сохраняются в одной транзакции, поэтому после сбоя запуск продолжается
+с первой необработанной порции (resume), а повторный запуск с теми же
+входными данными не создает дублей расчетов.
+
+Строки порции выбираются с блокировкой FOR UPDATE SKIP LOCKED: один
+запуск могут одновременно обрабатывать несколько процессов. При workers > 1
+необработанные преподаватели делятся на диапазоны ID, и каждый диапазон
+рассчитывает отдельный процесс пула со своим соединением с базой данных и
+копией справочников основного процесса; итоги собирает основной процесс.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Callable, Iterable
+
+from psycopg2.extras import execute_values
+
+import db_connection as db
+from models import Teacher, fetch_rows
+from salary_calculator import SalaryCalculator
+from logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Статусы запуска
+RUN_IN_PROGRESS = 'выполняется'
+RUN_COMPLETED = 'завершен'
+
+# Статусы преподавателя в запуске
+ITEM_PENDING = 'ожидает'
+ITEM_DONE = 'рассчитан'
+ITEM_FAILED = 'ошибка'
+
+# Число преподавателей, сохраняемых одной транзакцией
+DEFAULT_CHUNK_SIZE = 100
+
+
+def inputs_fingerprint(inputs: Dict[str, Any]) -> str:
+    """
+    Хэш входных данных запуска (одинаковые данные - один и тот же запуск)
+
+    :param inputs: входные данные запуска
+    :return: шестнадцатеричная строка SHA-256
+    """
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _init_worker():
+    """Инициализация рабочего процесса: журнал выводится только на консоль"""
+    setup_logging(log_file=None)
+
+
+def _process_shard(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Рассчитать диапазон преподавателей запуска (выполняется в рабочем процессе)
+
+    :param task: запуск, границы диапазона, конфигурация БД и снимок справочников
+    :return: итоги обработки диапазона
+    """
+    started = time.perf_counter()
+    db_conn = db.DatabaseConnection(task['db_config'])
+    try:
+        calculator = SalaryCalculator(db_conn, reference_data=task['reference_data'])
+        runner = PayrollRunner(db_conn, calculator, task['chunk_size'])
+        processed = runner._process_range(task['run'], task['after_teacher_id'], task['last_teacher_id'])
+    finally:
+        db_conn.close_all_connections()
+    return {
+        'after_teacher_id': task['after_teacher_id'],
+        'last_teacher_id': task['last_teacher_id'],
+        'processed': processed,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+class PayrollRunner:
+    """Пакетный расчет зарплаты порциями с сохранением прогресса в журнале"""
+
+    def __init__(self, db_conn: db.DatabaseConnection, salary_calculator: SalaryCalculator,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, db_config: Optional[Dict[str, Any]] = None):
+        """
+        Инициализация
+
+        :param db_conn: объект подключения к базе данных
+        :param salary_calculator: калькулятор зарплаты
+        :param chunk_size: число преподавателей в одной транзакции
+        :param db_config: конфигурация БД для рабочих процессов (нужна только при workers > 1)
+        """
+        if chunk_size < 1:
+            raise ValueError("Размер порции должен быть положительным числом")
+        self.db_conn = db_conn
+        self.salary_calculator = salary_calculator
+        self.chunk_size = chunk_size
+        self.db_config = db_config
+        if db_conn.ensure_schema:
+            self._create_journal_if_not_exists()
+
+    def _create_journal_if_not_exists(self):
+        """Создание таблиц журнала запусков, если они не существуют"""
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS payroll_runs (
+                    id SERIAL PRIMARY KEY,
+                    inputs_hash VARCHAR(64) NOT NULL UNIQUE,
+                    calculation_date DATE NOT NULL,
+                    inputs JSONB NOT NULL,
+                    reference_version VARCHAR(64),
+                    status VARCHAR(20) NOT NULL DEFAULT 'выполняется',
+                    total_count INTEGER NOT NULL DEFAULT 0,
+                    done_count INTEGER NOT NULL DEFAULT 0,
+                    failed_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS payroll_run_items (
+                    run_id INTEGER NOT NULL REFERENCES payroll_runs(id) ON DELETE CASCADE,
+                    teacher_id INTEGER NOT NULL,
+                    status VARCHAR(20) NOT NULL DEFAULT 'ожидает',
+                    calculation_id INTEGER REFERENCES salary_calculations(id) ON DELETE SET NULL,
+                    error TEXT,
+                    updated_at TIMESTAMP,
+                    PRIMARY KEY (run_id, teacher_id)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_payroll_run_items_pending
+                ON payroll_run_items(run_id, teacher_id) WHERE status = 'ожидает'
+            """)
+
+            connection.commit()
+            logger.info("Таблицы журнала пакетного расчета проверены/созданы")
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при создании таблиц журнала пакетного расчета: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+    def start(self, calculation_date: datetime.date, calc_data: Optional[Dict[str, Any]] = None,
+              teacher_calc_data: Optional[Dict[int, Dict[str, Any]]] = None,
+              teacher_ids: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """
+        Зарегистрировать запуск (или найти уже зарегистрированный с теми же данными)
+
+        :param calculation_date: дата расчета
+        :param calc_data: данные расчета, общие для всех преподавателей (часы, бонус и т.д.)
+        :param teacher_calc_data: данные расчета отдельных преподавателей {ID: данные},
+                                  дополняют и переопределяют calc_data
+        :param teacher_ids: преподаватели запуска (None - все)
+        :return: запись журнала о запуске
+        """
+        inputs = {
+            'calculation_date': calculation_date.isoformat(),
+            'calc_data': dict(calc_data or {}),
+            # Ключи JSON - строки, поэтому ID приводятся к строкам сразу
+            'teacher_calc_data': {str(int(teacher_id)): dict(data)
+                                  for teacher_id, data in (teacher_calc_data or {}).items()},
+            'teacher_ids': sorted({int(teacher_id) for teacher_id in teacher_ids})
+                           if teacher_ids is not None else None,
+        }
+        inputs_hash = inputs_fingerprint(inputs)
+
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("""
+                INSERT INTO payroll_runs (inputs_hash, calculation_date, inputs, reference_version)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (inputs_hash) DO NOTHING
+                RETURNING id
+            """, (inputs_hash, calculation_date, json.dumps(inputs, ensure_ascii=False, default=str),
+                  self.salary_calculator.reference_version))
+            created = cursor.fetchone()
+
+            if created:
+                run_id = created[0]
+                if inputs['teacher_ids'] is None:
+                    cursor.execute("""
+                        INSERT INTO payroll_run_items (run_id, teacher_id)
+                        SELECT %s, id FROM teachers
+                    """, (run_id,))
+                else:
+                    cursor.execute("""
+                        INSERT INTO payroll_run_items (run_id, teacher_id)
+                        SELECT %s, id FROM teachers WHERE id = ANY(%s)
+                    """, (run_id, inputs['teacher_ids']))
+                cursor.execute("UPDATE payroll_runs SET total_count = %s WHERE id = %s",
+                               (cursor.rowcount, run_id))
+                logger.info(f"Зарегистрирован запуск расчета зарплаты ID {run_id} на {calculation_date}")
+            else:
+                cursor.execute("SELECT id FROM payroll_runs WHERE inputs_hash = %s", (inputs_hash,))
+                run_id = cursor.fetchone()[0]
+                logger.info(f"Запуск с теми же входными данными уже зарегистрирован (ID {run_id})")
+
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при регистрации запуска расчета зарплаты: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+        return self.get_run(run_id)
+
+    def run(self, calculation_date: datetime.date, calc_data: Optional[Dict[str, Any]] = None,
+            teacher_calc_data: Optional[Dict[int, Dict[str, Any]]] = None,
+            teacher_ids: Optional[Iterable[int]] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None,
+            workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Выполнить расчет зарплаты преподавателей
+
+        Повторный вызов с теми же данными продолжает незавершенный запуск
+        или возвращает итоги завершенного, не создавая новых расчетов.
+
+        :param calculation_date: дата расчета
+        :param calc_data: данные расчета, общие для всех преподавателей
+        :param teacher_calc_data: данные расчета отдельных преподавателей {ID: данные}
+        :param teacher_ids: преподаватели запуска (None - все)
+        :param progress_callback: функция progress_callback(обработано, всего)
+        :param workers: число рабочих процессов (None или 1 - расчет в текущем процессе)
+        :return: итоги запуска
+        """
+        run = self.start(calculation_date, calc_data, teacher_calc_data, teacher_ids)
+        return self.resume(run['id'], progress_callback, workers)
+
+    def resume(self, run_id: int, progress_callback: Optional[Callable[[int, int], None]] = None,
+               workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Продолжить запуск с первой необработанной порции
+
+        :param run_id: ID запуска
+        :param progress_callback: функция progress_callback(обработано, всего)
+        :param workers: число рабочих процессов (None или 1 - расчет в текущем процессе)
+        :return: итоги запуска
+        """
+        run = self.get_run(run_id)
+        if run['status'] == RUN_COMPLETED:
+            logger.info(f"Запуск расчета зарплаты ID {run_id} уже завершен")
+            return run
+
+        if run['reference_version'] != self.salary_calculator.reference_version:
+            # Расчеты хранят свою версию справочников, расхождение исправит recalculate_stale
+            logger.warning(f"Справочники изменились с момента регистрации запуска ID {run_id}")
+
+        started = time.perf_counter()
+        processed = run['done_count'] + run['failed_count']
+
+        def report(count):
+            nonlocal processed
+            processed += count
+            if progress_callback:
+                progress_callback(processed, run['total_count'])
+
+        shards = []
+        if workers and workers > 1:
+            shards = self._run_sharded(run, workers, report)
+        else:
+            self._process_range(run, progress=report)
+
+        run = self._finish(run_id)
+        run['shards'] = shards
+        run['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        logger.info(f"Запуск расчета зарплаты ID {run_id}: рассчитано {run['done_count']} из "
+                    f"{run['total_count']}, ошибок {run['failed_count']}, "
+                    f"процессов {max(len(shards), 1)}, {run['elapsed_seconds']} с")
+        return run
+
+    def _run_sharded(self, run: Dict[str, Any], workers: int,
+                     progress: Callable[[int], None]) -> List[Dict[str, Any]]:
+        """
+        Рассчитать необработанных преподавателей запуска в пуле процессов
+
+        :param run: запись журнала о запуске
+        :param workers: число рабочих процессов
+        :param progress: функция progress(число обработанных в завершившемся диапазоне)
+        :return: итоги по диапазонам
+        """
+        if self.db_config is None:
+            raise ValueError("Для расчета в нескольких процессах нужна конфигурация базы данных (db_config)")
+
+        tasks = [{
+            'run': run,
+            'after_teacher_id': after_teacher_id,
+            'last_teacher_id': last_teacher_id,
+            'chunk_size': self.chunk_size,
+            # Каждому процессу - одно соединение; схему уже проверил основной процесс
+            'db_config': dict(self.db_config, pool_min=1, pool_max=1, ensure_schema=False),
+            'reference_data': self.salary_calculator.reference_snapshot(),
+        } for after_teacher_id, last_teacher_id in self._pending_ranges(run['id'], workers)]
+        if not tasks:
+            return []
+
+        logger.info(f"Запуск расчета зарплаты ID {run['id']}: {len(tasks)} диапазонов преподавателей")
+        shards = []
+        # spawn: дочерние процессы не наследуют соединения пула основного процесса
+        with ProcessPoolExecutor(max_workers=len(tasks), mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker) as executor:
+            futures = [executor.submit(_process_shard, task) for task in tasks]
+            for future in as_completed(futures):
+                shard = future.result()
+                shards.append(shard)
+                progress(shard['processed'])
+
+        # Расчеты сохранены другими процессами: кэш истории начислений устарел
+        self.db_conn.salary_history.invalidate()
+        shards.sort(key=lambda shard: shard['last_teacher_id'])
+        return shards
+
+    def _pending_ranges(self, run_id: int, count: int) -> List[tuple]:
+        """
+        Разделить необработанных преподавателей запуска на диапазоны ID равного размера
+
+        :param run_id: ID запуска
+        :param count: число диапазонов
+        :return: список пар (ID после которого начинается диапазон или None, последний ID диапазона)
+        """
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT teacher_id FROM payroll_run_items
+                WHERE run_id = %s AND status = %s
+                ORDER BY teacher_id
+            """, (run_id, ITEM_PENDING))
+            teacher_ids = [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Ошибка при разделении запуска расчета зарплаты ID {run_id}: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+        if not teacher_ids:
+            return []
+        size = math.ceil(len(teacher_ids) / count)
+        return [(teacher_ids[start - 1] if start else None, teacher_ids[min(start + size, len(teacher_ids)) - 1])
+                for start in range(0, len(teacher_ids), size)]
+
+    def _process_range(self, run: Dict[str, Any], after_teacher_id: Optional[int] = None,
+                       last_teacher_id: Optional[int] = None,
+                       progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Рассчитать порциями необработанных преподавателей диапазона
+
+        :param run: запись журнала о запуске
+        :param after_teacher_id: начало диапазона (ID больше указанного; None - с начала)
+        :param last_teacher_id: конец диапазона (включительно; None - до конца)
+        :param progress: функция progress(число обработанных в порции)
+        :return: число обработанных преподавателей
+        """
+        processed = 0
+        while True:
+            count, after_teacher_id = self._process_chunk(run, after_teacher_id, last_teacher_id)
+            if not count:
+                return processed
+            processed += count
+            if progress:
+                progress(count)
+
+    def _teacher_calc_data(self, run: Dict[str, Any], teacher_id: int) -> Dict[str, Any]:
+        """Данные расчета преподавателя: общие, дополненные индивидуальными"""
+        inputs = run['inputs']
+        calc_data = dict(inputs['calc_data'])
+        calc_data.update(inputs['teacher_calc_data'].get(str(teacher_id), {}))
+        calc_data['calculation_date'] = run['calculation_date']
+        return calc_data
+
+    def _process_chunk(self, run: Dict[str, Any], after_teacher_id: Optional[int] = None,
+                       last_teacher_id: Optional[int] = None) -> tuple:
+        """
+        Рассчитать и сохранить одну порцию преподавателей запуска
+
+        :param run: запись журнала о запуске
+        :param after_teacher_id: обрабатывать преподавателей с ID больше указанного
+        :param last_teacher_id: обрабатывать преподавателей с ID не больше указанного
+        :return: (число обработанных преподавателей, ID последнего из них)
+        """
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            conditions = ["i.run_id = %s", "i.status = %s"]
+            params = [run['id'], ITEM_PENDING]
+            if after_teacher_id is not None:
+                conditions.append("i.teacher_id > %s")
+                params.append(after_teacher_id)
+            if last_teacher_id is not None:
+                conditions.append("i.teacher_id <= %s")
+                params.append(last_teacher_id)
+
+            # Строки, заблокированные другим процессом, пропускаются. Преподаватели,
+            # удаленные после создания запуска, тоже выбираются (teacher_deleted) -
+            # иначе их строки навсегда остались бы необработанными
+            cursor.execute(f"""
+                SELECT i.teacher_id AS id, t.name, t.hourly_rate, t.is_young_specialist,
+                       t.is_union_member, t.position, t.academic_degree,
+                       t.qualification_category, t.experience_years,
+                       t.hire_date, t.birth_date, t.id IS NULL AS teacher_deleted
+                FROM payroll_run_items i
+                LEFT JOIN teachers t ON i.teacher_id = t.id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY i.teacher_id
+                LIMIT %s
+                FOR UPDATE OF i SKIP LOCKED
+            """, params + [self.chunk_size])
+            teachers = fetch_rows(cursor, Teacher)
+            if not teachers:
+                connection.rollback()
+                return 0, after_teacher_id
+
+            results = []
+            failures = []
+            for teacher in teachers:
+                if teacher['teacher_deleted']:
+                    failures.append((teacher.id, ITEM_FAILED, None, "Преподаватель удален"))
+                    continue
+                try:
+                    results.append(self.salary_calculator.calculate_salary_for_teacher(
+                        teacher, self._teacher_calc_data(run, teacher.id)))
+                except (ValueError, ArithmeticError, TypeError) as e:
+                    # Ошибка в данных одного преподавателя (в том числе decimal.InvalidOperation
+                    # и отсутствующий стаж) не должна откатывать всю порцию
+                    failures.append((teacher.id, ITEM_FAILED, None, str(e) or type(e).__name__))
+
+            items = [(run['id'], *failure) for failure in failures]
+            if results:
+                saved = execute_values(cursor, """
+                    INSERT INTO salary_calculations (
+                        teacher_id, calculation_date, hours_worked, sick_leave_hours,
+                        absence_hours, bonus, tax_rate, gross_salary, net_salary,
+                        vacation_days, vacation_pay, position_bonus, degree_bonus,
+                        experience_bonus, category_bonus, reference_version, teacher_hash
+                    ) VALUES %s
+                    RETURNING teacher_id, id
+                """, [(
+                    result['teacher_id'], result['calculation_date'], result['hours_worked'],
+                    result['sick_leave_hours'], result['absence_hours'], result['bonus'],
+                    result['tax_rate'], result['gross_salary'], result['net_salary'],
+                    result['vacation_days'], result['vacation_pay'], result['position_bonus'],
+                    result['degree_bonus'], result['experience_bonus'], result['category_bonus'],
+                    result['reference_version'], result['teacher_hash']
+                ) for result in results], fetch=True, page_size=len(results))
+                items.extend((run['id'], teacher_id, ITEM_DONE, calculation_id, None)
+                             for teacher_id, calculation_id in saved)
+
+            execute_values(cursor, """
+                UPDATE payroll_run_items AS i
+                SET status = data.status,
+                    calculation_id = data.calculation_id,
+                    error = data.error,
+                    updated_at = NOW()
+                FROM (VALUES %s) AS data (run_id, teacher_id, status, calculation_id, error)
+                WHERE i.run_id = data.run_id AND i.teacher_id = data.teacher_id
+            """, items, template="(%s, %s, %s, %s::integer, %s)", page_size=len(items))
+
+            cursor.execute("""
+                UPDATE payroll_runs
+                SET done_count = done_count + %s,
+                    failed_count = failed_count + %s,
+                    updated_at = NOW()
+                WHERE id = %s
+            """, (len(results), len(failures), run['id']))
+
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при обработке порции запуска расчета зарплаты ID {run['id']}: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+        for result in results:
+            self.db_conn.salary_history.invalidate(result['teacher_id'])
+        for teacher_id, _, _, error in failures:
+            logger.warning(f"Запуск ID {run['id']}: преподаватель ID {teacher_id} не рассчитан: {error}")
+        return len(teachers), teachers[-1].id
+
+    def _finish(self, run_id: int) -> Dict[str, Any]:
+        """Отметить запуск завершенным, если в нем не осталось необработанных преподавателей"""
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("""
+                UPDATE payroll_runs
+                SET status = %s, finished_at = NOW(), updated_at = NOW()
+                WHERE id = %s AND status <> %s
+                AND NOT EXISTS (
+                    SELECT 1 FROM payroll_run_items
+                    WHERE run_id = %s AND status = %s
+                )
+            """, (RUN_COMPLETED, run_id, RUN_COMPLETED, run_id, ITEM_PENDING))
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при завершении запуска расчета зарплаты ID {run_id}: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+        return self.get_run(run_id)
+
+    def get_run(self, run_id: int) -> Dict[str, Any]:
+        """
+        Получить запись журнала о запуске
+
+        :param run_id: ID запуска
+        :return: словарь с данными запуска
+        """
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT id, inputs_hash, calculation_date, inputs, reference_version, status,
+                       total_count, done_count, failed_count, created_at, updated_at, finished_at
+                FROM payroll_runs
+                WHERE id = %s
+            """, (run_id,))
+            row = cursor.fetchone()
+            if not row:
+                raise ValueError(f"Запуск расчета зарплаты с ID {run_id} не найден")
+            return dict(zip([desc[0] for desc in cursor.description], row))
+        except Exception as e:
+            logger.error(f"Ошибка при получении запуска расчета зарплаты ID {run_id}: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+    def get_run_items(self, run_id: int, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Получить состояние преподавателей запуска
+
+        :param run_id: ID запуска
+        :param status: только преподаватели с указанным статусом (None - все)
+        :return: список словарей teacher_id, teacher_name, status, calculation_id, error
+        """
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            query = """
+                SELECT i.teacher_id, t.name AS teacher_name, i.status,
+                       i.calculation_id, i.error, i.updated_at
+                FROM payroll_run_items i
+                LEFT JOIN teachers t ON i.teacher_id = t.id
+                WHERE i.run_id = %s
+            """
+            params = [run_id]
+            if status is not None:
+                query += " AND i.status = %s"
+                params.append(status)
+            cursor.execute(query + " ORDER BY i.teacher_id", params)
+
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Ошибка при получении состояния запуска расчета зарплаты ID {run_id}: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
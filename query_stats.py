@@ -0,0 +1,217 @@
+"""
+Инструментирование SQL-запросов
+
+Курсор InstrumentedCursor (устанавливается в DatabaseConnection как
+cursor_factory) замеряет каждый выполненный запрос: отпечаток запроса
+(текст с замененными литералами), длительность, число строк и место вызова
+в коде приложения. Медленные запросы записываются в журнал, агрегированная
+статистика с перцентилями доступна через QueryStats.snapshot().
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Порог медленного запроса по умолчанию (мс)
+DEFAULT_SLOW_QUERY_MS = 200
+
+# Число последних замеров для расчета перцентилей по каждому отпечатку
+SAMPLES_PER_QUERY = 1000
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Файлы, кадры которых пропускаются при определении места вызова
+_SKIPPED_FILES = (os.path.abspath(__file__), os.sep + 'psycopg2' + os.sep)
+
+# Время выполнения запросов в текущем потоке (для разделения времени БД и Python)
+_thread_state = threading.local()
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql) -> str:
+    """
+    Отпечаток запроса: текст без литералов и лишних пробелов
+
+    :param sql: текст запроса (str или bytes)
+    :return: нормализованный текст, одинаковый для запросов, отличающихся только параметрами
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', errors='replace')
+    text = _STRING_LITERAL.sub('?', str(sql))
+    text = _PLACEHOLDER.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    text = _VALUE_LIST.sub('(...)', text)
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def thread_db_time() -> float:
+    """Суммарное время выполнения запросов в текущем потоке (с)"""
+    return getattr(_thread_state, 'db_time', 0.0)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Перцентиль отсортированного списка (ближайший ранг)"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _caller() -> str:
+    """Место вызова запроса в коде приложения (файл:строка функция)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        file_name = frame.f_code.co_filename
+        if not any(skipped in file_name for skipped in _SKIPPED_FILES):
+            return f"{os.path.basename(file_name)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return '?'
+
+
+class QueryStats:
+    """Потокобезопасный накопитель статистики запросов по отпечаткам"""
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS, samples: int = SAMPLES_PER_QUERY):
+        """
+        :param slow_query_ms: порог медленного запроса в миллисекундах
+        :param samples: число последних замеров, хранимых для перцентилей
+        """
+        self.slow_query_ms = slow_query_ms
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, sql, duration: float, rowcount: int, caller: str):
+        """
+        Учесть выполненный запрос
+
+        :param sql: текст запроса
+        :param duration: длительность (с)
+        :param rowcount: число строк (cursor.rowcount)
+        :param caller: место вызова
+        """
+        key = fingerprint(sql)
+        _thread_state.db_time = thread_db_time() + duration
+
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    'count': 0,
+                    'total_time': 0.0,
+                    'max_time': 0.0,
+                    'rows': 0,
+                    'durations': deque(maxlen=self.samples),
+                    'callers': Counter(),
+                }
+            entry['count'] += 1
+            entry['total_time'] += duration
+            entry['max_time'] = max(entry['max_time'], duration)
+            entry['rows'] += max(rowcount, 0)
+            entry['durations'].append(duration)
+            entry['callers'][caller] += 1
+
+        duration_ms = duration * 1000
+        if duration_ms >= self.slow_query_ms:
+            logger.warning(f"Медленный запрос ({duration_ms:.1f} мс, строк: {rowcount}, {caller}): {key[:500]}")
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Агрегированная статистика, отсортированная по суммарному времени
+
+        :return: список словарей (query, count, total_ms, avg_ms, p50_ms, p95_ms, p99_ms,
+                 max_ms, rows, callers)
+        """
+        with self._lock:
+            items = [(key, dict(entry, durations=sorted(entry['durations']), callers=entry['callers'].most_common(3)))
+                     for key, entry in self._stats.items()]
+
+        result = []
+        for key, entry in items:
+            durations = entry['durations']
+            result.append({
+                'query': key,
+                'count': entry['count'],
+                'total_ms': round(entry['total_time'] * 1000, 3),
+                'avg_ms': round(entry['total_time'] * 1000 / entry['count'], 3),
+                'p50_ms': round(_percentile(durations, 50) * 1000, 3),
+                'p95_ms': round(_percentile(durations, 95) * 1000, 3),
+                'p99_ms': round(_percentile(durations, 99) * 1000, 3),
+                'max_ms': round(entry['max_time'] * 1000, 3),
+                'rows': entry['rows'],
+                'callers': [f"{caller} ({count})" for caller, count in entry['callers']],
+            })
+        result.sort(key=lambda item: item['total_ms'], reverse=True)
+        return result
+
+    def reset(self):
+        """Очистить накопленную статистику"""
+        with self._lock:
+            self._stats.clear()
+
+
+def make_cursor_factory(stats: QueryStats):
+    """
+    Создать класс курсора psycopg2, записывающий статистику в stats
+
+    :param stats: накопитель статистики
+    :return: класс курсора для параметра cursor_factory
+    """
+    from psycopg2.extensions import cursor as base_cursor
+
+    class InstrumentedCursor(base_cursor):
+        """Курсор с замером времени выполнения запросов"""
+
+        def execute(self, query, vars=None):
+            started = time.perf_counter()
+            try:
+                return super().execute(query, vars)
+            finally:
+                stats.record(query, time.perf_counter() - started, self.rowcount, _caller())
+
+        def executemany(self, query, vars_list):
+            started = time.perf_counter()
+            try:
+                return super().executemany(query, vars_list)
+            finally:
+                stats.record(query, time.perf_counter() - started, self.rowcount, _caller())
+
+        def copy_expert(self, sql, file, size=8192):
+            started = time.perf_counter()
+            try:
+                return super().copy_expert(sql, file, size)
+            finally:
+                stats.record(sql, time.perf_counter() - started, self.rowcount, _caller())
+
+    return InstrumentedCursor
+
+
+def format_query_stats(stats: List[Dict[str, Any]], limit: Optional[int] = None) -> str:
+    """
+    Текстовое представление статистики запросов для журнала или окна диагностики
+
+    :param stats: результат QueryStats.snapshot()
+    :param limit: максимальное число запросов
+    :return: многострочный текст
+    """
+    lines = []
+    for index, item in enumerate(stats[:limit] if limit else stats, start=1):
+        lines.append(
+            f"{index}. вызовов: {item['count']}, всего: {item['total_ms']:.1f} мс, "
+            f"p50: {item['p50_ms']:.1f}, p95: {item['p95_ms']:.1f}, p99: {item['p99_ms']:.1f}, "
+            f"макс.: {item['max_ms']:.1f} мс, строк: {item['rows']}")
+        lines.append(f"   {item['query']}")
+        if item['callers']:
+            lines.append(f"   вызовы из: {', '.join(item['callers'])}")
+    return "\n".join(lines) if lines else "Запросы не выполнялись"
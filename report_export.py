@@ -0,0 +1,846 @@
+"""
+Формирование файлов отчетов о зарплате (PDF, Excel, Word)
+
+Функции модуля не зависят от графического интерфейса и подключения к БД,
+поэтому могут выполняться как в основном процессе, так и в рабочих
+процессах пакетного экспорта.
+"""
+import datetime
+import logging
+
+from chart_service import get_chart_service
+
+logger = logging.getLogger(__name__)
+
+# Компоненты зарплаты для диаграммы структуры: (подпись, поле данных)
+SALARY_COMPONENTS = (
+    ('Базовая зарплата', 'base_salary'),
+    ('Надбавка за должность', 'position_bonus'),
+    ('Надбавка за степень', 'degree_bonus'),
+    ('Надбавка за стаж', 'experience_bonus'),
+    ('Надбавка за категорию', 'category_bonus'),
+    ('Надбавка молодому специалисту', 'young_specialist_bonus'),
+    ('Оплата больничных', 'sick_leave_pay'),
+    ('Бонус', 'bonus'),
+)
+
+
+def _salary_structure(teacher_data):
+    """Ненулевые компоненты зарплаты: (подписи, значения)"""
+    components, values = [], []
+    for label, field in SALARY_COMPONENTS:
+        value = teacher_data.get(field, 0)
+        if value > 0:
+            components.append(label)
+            values.append(value)
+    return components, values
+
+
+def _net_salary_distribution(data):
+    """Распределение чистой зарплаты по преподавателям: (имена, суммы)"""
+    teacher_names = [item.get('teacher_name', '') for item in data]
+    net_salaries = [item.get('net_salary', 0) for item in data]
+    return teacher_names, net_salaries
+
+
+def export_to_pdf(data, file_path, title, include_details=True, include_chart=True, is_summary=False):
+    """
+    Экспорт данных о зарплате в PDF формат
+    
+    :param data: Данные о зарплате
+    :param file_path: Путь к создаваемому файлу
+    :param title: Заголовок отчета
+    :param include_details: Включать ли детализацию
+    :param include_chart: Включать ли графики
+    :param is_summary: Является ли отчет сводным
+    """
+    try:
+        # Проверка наличия необходимых библиотек
+        try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+            from reportlab.lib.styles import getSampleStyleSheet
+            from io import BytesIO
+        except ImportError as e:
+            raise ImportError(
+                "Отсутствуют необходимые библиотеки для экспорта в PDF. Установите их командой:\n"
+                "pip install reportlab matplotlib"
+            ) from e
+        
+        # Создание PDF документа
+        doc = SimpleDocTemplate(file_path, pagesize=A4)
+        styles = getSampleStyleSheet()
+        elements = []
+        
+        # Заголовок отчета
+        elements.append(Paragraph(title, styles['Title']))
+        elements.append(Spacer(1, 12))
+        
+        # Дата создания отчета
+        elements.append(Paragraph(f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}", styles['Normal']))
+        elements.append(Spacer(1, 12))
+        
+        if is_summary:
+            # Сводная таблица для всех преподавателей
+            table_data = [['Преподаватель', 'Валовая зарплата', 'Налоги', 'Чистая зарплата']]
+            
+            for teacher_data in data:
+                teacher_name = teacher_data.get('teacher_name', '')
+                gross_salary = f"{teacher_data.get('gross_salary', 0):.2f}"
+                tax_amount = f"{teacher_data.get('tax_amount', 0):.2f}"
+                net_salary = f"{teacher_data.get('net_salary', 0):.2f}"
+                
+                table_data.append([teacher_name, gross_salary, tax_amount, net_salary])
+            
+            table = Table(table_data)
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            
+            elements.append(table)
+            elements.append(Spacer(1, 12))
+            
+            # Добавление суммарных значений
+            total_gross = sum(item.get('gross_salary', 0) for item in data)
+            total_tax = sum(item.get('tax_amount', 0) for item in data)
+            total_net = sum(item.get('net_salary', 0) for item in data)
+            
+            elements.append(Paragraph(f"Итого валовая зарплата: {total_gross:.2f} руб.", styles['Normal']))
+            elements.append(Paragraph(f"Итого налоги: {total_tax:.2f} руб.", styles['Normal']))
+            elements.append(Paragraph(f"Итого чистая зарплата: {total_net:.2f} руб.", styles['Normal']))
+            
+            # Если включены графики, добавляем круговую диаграмму распределения зарплат
+            if include_chart:
+                teacher_names, net_salaries = _net_salary_distribution(data)
+                png = get_chart_service().pie_chart(net_salaries, teacher_names, 'Распределение чистой зарплаты')
+                
+                # Добавляем диаграмму в отчет
+                img = Image(BytesIO(png), width=400, height=300)
+                elements.append(img)
+        else:
+            # Детальный отчет для одного преподавателя
+            if not data:
+                elements.append(Paragraph("Нет данных для отображения", styles['Normal']))
+            else:
+                # Основная информация о преподавателе
+                teacher_data = data[0] if isinstance(data, list) else data
+                
+                elements.append(Paragraph(f"Преподаватель: {teacher_data.get('teacher_name', '')}", styles['Heading2']))
+                elements.append(Paragraph(f"Должность: {teacher_data.get('position', '')}", styles['Normal']))
+                elements.append(Paragraph(f"Ставка: {teacher_data.get('hourly_rate', 0):.2f} руб./час", styles['Normal']))
+                elements.append(Spacer(1, 12))
+                
+                # Детали расчета зарплаты
+                if include_details:
+                    elements.append(Paragraph("Детали расчета", styles['Heading3']))
+                    
+                    details_data = [
+                        ['Параметр', 'Значение'],
+                        ['Отработано часов', str(teacher_data.get('hours_worked', 0))],
+                        ['Базовая зарплата', f"{teacher_data.get('base_salary', 0):.2f} руб."],
+                        ['Надбавка за должность', f"{teacher_data.get('position_bonus', 0):.2f} руб."],
+                        ['Надбавка за степень', f"{teacher_data.get('degree_bonus', 0):.2f} руб."],
+                        ['Надбавка за стаж', f"{teacher_data.get('experience_bonus', 0):.2f} руб."],
+                        ['Надбавка за категорию', f"{teacher_data.get('category_bonus', 0):.2f} руб."],
+                        ['Надбавка молодому специалисту', f"{teacher_data.get('young_specialist_bonus', 0):.2f} руб."],
+                        ['Оплата больничных', f"{teacher_data.get('sick_leave_pay', 0):.2f} руб."],
+                        ['Бонус', f"{teacher_data.get('bonus', 0):.2f} руб."]
+                    ]
+                    
+                    details_table = Table(details_data)
+                    details_table.setStyle(TableStyle([
+                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+                    ]))
+                    
+                    elements.append(details_table)
+                    elements.append(Spacer(1, 12))
+                
+                # Итоговые суммы
+                elements.append(Paragraph("Итоговые суммы", styles['Heading3']))
+                
+                totals_data = [
+                    ['Параметр', 'Значение'],
+                    ['Валовая зарплата', f"{teacher_data.get('gross_salary', 0):.2f} руб."],
+                    ['Ставка налога', f"{teacher_data.get('tax_rate', 0):.2f}%"],
+                    ['Сумма налога', f"{teacher_data.get('tax_amount', 0):.2f} руб."],
+                    ['Профсоюзные взносы', f"{teacher_data.get('union_contribution', 0):.2f} руб."],
+                    ['ЧИСТАЯ ЗАРПЛАТА', f"{teacher_data.get('net_salary', 0):.2f} руб."]
+                ]
+                
+                totals_table = Table(totals_data)
+                totals_table.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                    ('BACKGROUND', (0, -1), (-1, -1), colors.lightblue),
+                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
+                ]))
+                
+                elements.append(totals_table)
+                
+                # Если включены графики, добавляем диаграмму структуры зарплаты
+                if include_chart:
+                    # Ненулевые компоненты зарплаты и их значения
+                    non_zero_components, non_zero_values = _salary_structure(teacher_data)
+                    
+                    if non_zero_values:
+                        png = get_chart_service().pie_chart(non_zero_values, non_zero_components, 'Структура зарплаты')
+                        
+                        # Добавляем диаграмму в отчет
+                        img = Image(BytesIO(png), width=400, height=300)
+                        elements.append(img)
+        
+        # Создаем PDF документ
+        doc.build(elements)
+        
+        logger.info(f"Данные о зарплате успешно экспортированы в PDF: {file_path}")
+        
+    except Exception as e:
+        logger.error(f"Ошибка при экспорте данных в PDF: {str(e)}")
+        raise
+
+
+def export_to_excel(data, file_path, title, include_details=True, include_chart=True, is_summary=False):
+    """
+    Экспорт данных о зарплате в Excel формат
+    
+    :param data: Данные о зарплате
+    :param file_path: Путь к создаваемому файлу
+    :param title: Заголовок отчета
+    :param include_details: Включать ли детализацию
+    :param include_chart: Включать ли графики
+    :param is_summary: Является ли отчет сводным
+    """
+    try:
+        # Проверка наличия необходимых библиотек
+        try:
+            import pandas as pd
+            from openpyxl import Workbook
+            from openpyxl.utils.dataframe import dataframe_to_rows
+            from openpyxl.chart import PieChart, Reference
+        except ImportError as e:
+            raise ImportError(
+                "Отсутствуют необходимые библиотеки для экспорта в Excel. Установите их командой:\n"
+                "pip install pandas openpyxl matplotlib"
+            ) from e
+        
+        # Создаем новую книгу Excel
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Отчет о зарплате"
+        
+        # Добавляем заголовок
+        ws['A1'] = title
+        ws['A1'].font = ws['A1'].font.copy(size=14, bold=True)
+        
+        # Добавляем дату создания
+        ws['A2'] = f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}"
+        
+        current_row = 4  # Начальная строка для данных
+        
+        if is_summary:
+            # Сводный отчет для всех преподавателей
+            # Создаем DataFrame с данными
+            df = pd.DataFrame(data)
+            
+            # Переименовываем столбцы для понятности
+            columns_mapping = {
+                'teacher_name': 'Преподаватель',
+                'gross_salary': 'Валовая зарплата',
+                'tax_amount': 'Налоги',
+                'net_salary': 'Чистая зарплата'
+            }
+            
+            df = df[list(columns_mapping.keys())].rename(columns=columns_mapping)
+            
+            # Добавляем данные в Excel
+            for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), start=current_row):
+                for c_idx, value in enumerate(row, start=1):
+                    cell = ws.cell(row=r_idx, column=c_idx, value=value)
+                    # Форматируем числовые значения
+                    if isinstance(value, (int, float)) and c_idx > 1:
+                        cell.number_format = '#,##0.00'
+            
+            # Добавляем суммарную строку
+            total_row = current_row + len(df) + 1
+            ws.cell(row=total_row, column=1, value="ИТОГО")
+            ws.cell(row=total_row, column=1).font = ws.cell(row=total_row, column=1).font.copy(bold=True)
+            
+            # Формулы суммирования для каждой числовой колонки
+            for col in range(2, 5):
+                cell = ws.cell(row=total_row, column=col)
+                start_cell = ws.cell(row=current_row+1, column=col).coordinate
+                end_cell = ws.cell(row=total_row-1, column=col).coordinate
+                cell.value = f"=SUM({start_cell}:{end_cell})"
+                cell.number_format = '#,##0.00'
+                cell.font = cell.font.copy(bold=True)
+            
+            # Если нужны графики
+            if include_chart and len(df) > 0:
+                # Добавляем лист для графиков
+                chart_sheet = wb.create_sheet(title="Графики")
+                
+                # Создаем круговую диаграмму распределения чистой зарплаты
+                pie = PieChart()
+                pie.title = "Распределение чистой зарплаты"
+                
+                # Копируем данные о преподавателях и зарплатах на лист с графиком
+                chart_sheet['A1'] = "Преподаватель"
+                chart_sheet['B1'] = "Чистая зарплата"
+                
+                for idx, row in enumerate(df.values, start=2):
+                    chart_sheet.cell(row=idx, column=1, value=row[0])  # Имя преподавателя
+                    chart_sheet.cell(row=idx, column=2, value=row[3])  # Чистая зарплата
+                
+                # Создаем ссылки на данные для графика
+                labels = Reference(chart_sheet, min_col=1, min_row=2, max_row=1+len(df))
+                data = Reference(chart_sheet, min_col=2, min_row=1, max_row=1+len(df))
+                
+                pie.add_data(data, titles_from_data=True)
+                pie.set_categories(labels)
+                
+                # Добавляем график на лист
+                chart_sheet.add_chart(pie, "D2")
+        else:
+            # Детальный отчет для одного преподавателя
+            if not data:
+                ws['A4'] = "Нет данных для отображения"
+            else:
+                teacher_data = data[0] if isinstance(data, list) else data
+                
+                # Основная информация о преподавателе
+                ws['A4'] = f"Преподаватель: {teacher_data.get('teacher_name', '')}"
+                ws['A5'] = f"Должность: {teacher_data.get('position', '')}"
+                ws['A6'] = f"Ставка: {teacher_data.get('hourly_rate', 0):.2f} руб./час"
+                
+                current_row = 8
+                
+                # Детали расчета зарплаты
+                if include_details:
+                    ws.cell(row=current_row, column=1, value="Детали расчета")
+                    ws.cell(row=current_row, column=1).font = ws.cell(row=current_row, column=1).font.copy(bold=True)
+                    
+                    current_row += 1
+                    
+                    # Заголовки таблицы деталей
+                    ws.cell(row=current_row, column=1, value="Параметр")
+                    ws.cell(row=current_row, column=2, value="Значение")
+                    
+                    # Форматирование заголовков
+                    for col in range(1, 3):
+                        cell = ws.cell(row=current_row, column=col)
+                        cell.font = cell.font.copy(bold=True)
+                    
+                    # Добавляем детали расчета
+                    details = [
+                        ('Отработано часов', str(teacher_data.get('hours_worked', 0))),
+                        ('Базовая зарплата', f"{teacher_data.get('base_salary', 0):.2f} руб."),
+                        ('Надбавка за должность', f"{teacher_data.get('position_bonus', 0):.2f} руб."),
+                        ('Надбавка за степень', f"{teacher_data.get('degree_bonus', 0):.2f} руб."),
+                        ('Надбавка за стаж', f"{teacher_data.get('experience_bonus', 0):.2f} руб."),
+                        ('Надбавка за категорию', f"{teacher_data.get('category_bonus', 0):.2f} руб."),
+                        ('Надбавка молодому специалисту', f"{teacher_data.get('young_specialist_bonus', 0):.2f} руб."),
+                        ('Оплата больничных', f"{teacher_data.get('sick_leave_pay', 0):.2f} руб."),
+                        ('Бонус', f"{teacher_data.get('bonus', 0):.2f} руб.")
+                    ]
+                    
+                    for detail in details:
+                        current_row += 1
+                        ws.cell(row=current_row, column=1, value=detail[0])
+                        ws.cell(row=current_row, column=2, value=detail[1])
+                    
+                    current_row += 2
+                
+                # Итоговые суммы
+                ws.cell(row=current_row, column=1, value="Итоговые суммы")
+                ws.cell(row=current_row, column=1).font = ws.cell(row=current_row, column=1).font.copy(bold=True)
+                
+                current_row += 1
+                
+                # Заголовки таблицы итогов
+                ws.cell(row=current_row, column=1, value="Параметр")
+                ws.cell(row=current_row, column=2, value="Значение")
+                
+                # Форматирование заголовков
+                for col in range(1, 3):
+                    cell = ws.cell(row=current_row, column=col)
+                    cell.font = cell.font.copy(bold=True)
+                
+                # Добавляем итоговые значения
+                totals = [
+                    ('Валовая зарплата', f"{teacher_data.get('gross_salary', 0):.2f} руб."),
+                    ('Ставка налога', f"{teacher_data.get('tax_rate', 0):.2f}%"),
+                    ('Сумма налога', f"{teacher_data.get('tax_amount', 0):.2f} руб."),
+                    ('Профсоюзные взносы', f"{teacher_data.get('union_contribution', 0):.2f} руб."),
+                    ('ЧИСТАЯ ЗАРПЛАТА', f"{teacher_data.get('net_salary', 0):.2f} руб.")
+                ]
+                
+                for i, total in enumerate(totals):
+                    current_row += 1
+                    ws.cell(row=current_row, column=1, value=total[0])
+                    ws.cell(row=current_row, column=2, value=total[1])
+                    
+                    # Выделяем последнюю строку (чистая зарплата)
+                    if i == len(totals) - 1:
+                        for col in range(1, 3):
+                            cell = ws.cell(row=current_row, column=col)
+                            cell.font = cell.font.copy(bold=True)
+                
+                # Если нужны графики, добавляем диаграмму структуры зарплаты
+                if include_chart:
+                    # Создаем лист для графиков
+                    chart_sheet = wb.create_sheet(title="Структура зарплаты")
+                    
+                    # Ненулевые компоненты зарплаты и их значения
+                    non_zero_components, non_zero_values = _salary_structure(teacher_data)
+                    
+                    if non_zero_values:
+                        # Добавляем данные на лист
+                        chart_sheet['A1'] = "Компонент зарплаты"
+                        chart_sheet['B1'] = "Сумма (руб.)"
+                        
+                        for idx, (comp, val) in enumerate(zip(non_zero_components, non_zero_values), start=2):
+                            chart_sheet.cell(row=idx, column=1, value=comp)
+                            chart_sheet.cell(row=idx, column=2, value=val)
+                        
+                        # Создаем круговую диаграмму
+                        pie = PieChart()
+                        pie.title = "Структура зарплаты"
+                        
+                        # Создаем ссылки на данные для графика
+                        labels = Reference(chart_sheet, min_col=1, min_row=2, max_row=1+len(non_zero_components))
+                        data = Reference(chart_sheet, min_col=2, min_row=1, max_row=1+len(non_zero_components))
+                        
+                        pie.add_data(data, titles_from_data=True)
+                        pie.set_categories(labels)
+                        
+                        # Добавляем график на лист
+                        chart_sheet.add_chart(pie, "D2")
+        
+        # Сохраняем Excel-файл
+        wb.save(file_path)
+        
+        logger.info(f"Данные о зарплате успешно экспортированы в Excel: {file_path}")
+        
+    except Exception as e:
+        logger.error(f"Ошибка при экспорте данных в Excel: {str(e)}")
+        raise
+
+
+def export_to_word(data, file_path, title, include_details=True, include_chart=True, is_summary=False):
+    """
+    Экспорт данных о зарплате в Word формат
+    
+    :param data: Данные о зарплате
+    :param file_path: Путь к создаваемому файлу
+    :param title: Заголовок отчета
+    :param include_details: Включать ли детализацию
+    :param include_chart: Включать ли графики
+    :param is_summary: Является ли отчет сводным
+    """
+    try:
+        # Проверка наличия необходимых библиотек
+        try:
+            from docx import Document
+            from docx.shared import Cm
+            from io import BytesIO
+        except ImportError as e:
+            raise ImportError(
+                "Отсутствуют необходимые библиотеки для экспорта в Word. Установите их командой:\n"
+                "pip install python-docx matplotlib"
+            ) from e
+        
+        # Создаем новый документ Word
+        doc = Document()
+        
+        # Заголовок отчета
+        doc.add_heading(title, level=1)
+        
+        # Дата создания отчета
+        p = doc.add_paragraph(f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}")
+        
+        if is_summary:
+            # Сводный отчет для всех преподавателей
+            doc.add_heading("Сводный отчет по зарплате", level=2)
+            
+            # Создаем таблицу
+            table = doc.add_table(rows=1, cols=4)
+            table.style = 'Table Grid'
+            
+            # Заголовки таблицы
+            header_cells = table.rows[0].cells
+            header_cells[0].text = "Преподаватель"
+            header_cells[1].text = "Валовая зарплата"
+            header_cells[2].text = "Налоги"
+            header_cells[3].text = "Чистая зарплата"
+            
+            # Добавляем данные в таблицу
+            for teacher_data in data:
+                row_cells = table.add_row().cells
+                row_cells[0].text = teacher_data.get('teacher_name', '')
+                row_cells[1].text = f"{teacher_data.get('gross_salary', 0):.2f}"
+                row_cells[2].text = f"{teacher_data.get('tax_amount', 0):.2f}"
+                row_cells[3].text = f"{teacher_data.get('net_salary', 0):.2f}"
+            
+            # Добавляем итоговые значения
+            total_gross = sum(item.get('gross_salary', 0) for item in data)
+            total_tax = sum(item.get('tax_amount', 0) for item in data)
+            total_net = sum(item.get('net_salary', 0) for item in data)
+            
+            doc.add_paragraph(f"Итого валовая зарплата: {total_gross:.2f} руб.")
+            doc.add_paragraph(f"Итого налоги: {total_tax:.2f} руб.")
+            p = doc.add_paragraph(f"Итого чистая зарплата: {total_net:.2f} руб.")
+            p.runs[0].bold = True
+            
+            # Если включены графики, добавляем круговую диаграмму распределения зарплат
+            if include_chart and data:
+                doc.add_heading("Распределение чистой зарплаты", level=3)
+                
+                teacher_names, net_salaries = _net_salary_distribution(data)
+                png = get_chart_service().pie_chart(net_salaries, teacher_names, 'Распределение чистой зарплаты', dpi=300)
+                
+                # Добавляем изображение в документ (из памяти: общий временный файл
+                # в каталоге отчета конфликтует при параллельном экспорте)
+                doc.add_picture(BytesIO(png), width=Cm(15))
+        else:
+            # Детальный отчет для одного преподавателя
+            if not data:
+                doc.add_paragraph("Нет данных для отображения")
+            else:
+                teacher_data = data[0] if isinstance(data, list) else data
+                
+                # Основная информация о преподавателе
+                doc.add_heading(f"Расчет зарплаты преподавателя: {teacher_data.get('teacher_name', '')}", level=2)
+                doc.add_paragraph(f"Должность: {teacher_data.get('position', '')}")
+                doc.add_paragraph(f"Ставка: {teacher_data.get('hourly_rate', 0):.2f} руб./час")
+                
+                # Детали расчета зарплаты
+                if include_details:
+                    doc.add_heading("Детали расчета", level=3)
+                    
+                    # Создаем таблицу для деталей
+                    details_table = doc.add_table(rows=1, cols=2)
+                    details_table.style = 'Table Grid'
+                    
+                    # Заголовки таблицы
+                    header_cells = details_table.rows[0].cells
+                    header_cells[0].text = "Параметр"
+                    header_cells[1].text = "Значение"
+                    
+                    # Добавляем данные в таблицу
+                    details = [
+                        ('Отработано часов', str(teacher_data.get('hours_worked', 0))),
+                        ('Базовая зарплата', f"{teacher_data.get('base_salary', 0):.2f} руб."),
+                        ('Надбавка за должность', f"{teacher_data.get('position_bonus', 0):.2f} руб."),
+                        ('Надбавка за степень', f"{teacher_data.get('degree_bonus', 0):.2f} руб."),
+                        ('Надбавка за стаж', f"{teacher_data.get('experience_bonus', 0):.2f} руб."),
+                        ('Надбавка за категорию', f"{teacher_data.get('category_bonus', 0):.2f} руб."),
+                        ('Надбавка молодому специалисту', f"{teacher_data.get('young_specialist_bonus', 0):.2f} руб."),
+                        ('Оплата больничных', f"{teacher_data.get('sick_leave_pay', 0):.2f} руб."),
+                        ('Бонус', f"{teacher_data.get('bonus', 0):.2f} руб.")
+                    ]
+                    
+                    for param, value in details:
+                        row_cells = details_table.add_row().cells
+                        row_cells[0].text = param
+                        row_cells[1].text = value
+                
+                # Итоговые суммы
+                doc.add_heading("Итоговые суммы", level=3)
+                
+                # Создаем таблицу для итогов
+                totals_table = doc.add_table(rows=1, cols=2)
+                totals_table.style = 'Table Grid'
+                
+                # Заголовки таблицы
+                header_cells = totals_table.rows[0].cells
+                header_cells[0].text = "Параметр"
+                header_cells[1].text = "Значение"
+                
+                # Добавляем данные в таблицу
+                totals = [
+                    ('Валовая зарплата', f"{teacher_data.get('gross_salary', 0):.2f} руб."),
+                    ('Ставка налога', f"{teacher_data.get('tax_rate', 0):.2f}%"),
+                    ('Сумма налога', f"{teacher_data.get('tax_amount', 0):.2f} руб."),
+                    ('Профсоюзные взносы', f"{teacher_data.get('union_contribution', 0):.2f} руб."),
+                    ('ЧИСТАЯ ЗАРПЛАТА', f"{teacher_data.get('net_salary', 0):.2f} руб.")
+                ]
+                
+                for param, value in totals:
+                    row_cells = totals_table.add_row().cells
+                    row_cells[0].text = param
+                    row_cells[1].text = value
+                    
+                    # Выделяем последнюю строку (чистая зарплата)
+                    if param == 'ЧИСТАЯ ЗАРПЛАТА':
+                        for cell in row_cells:
+                            for paragraph in cell.paragraphs:
+                                for run in paragraph.runs:
+                                    run.bold = True
+                
+                # Если включены графики, добавляем диаграмму структуры зарплаты
+                if include_chart:
+                    doc.add_heading("Структура зарплаты", level=3)
+                    
+                    # Ненулевые компоненты зарплаты и их значения
+                    non_zero_components, non_zero_values = _salary_structure(teacher_data)
+                    
+                    if non_zero_values:
+                        png = get_chart_service().pie_chart(non_zero_values, non_zero_components, 'Структура зарплаты', dpi=300)
+                        
+                        # Добавляем изображение в документ
+                        doc.add_picture(BytesIO(png), width=Cm(15))
+        
+        # Сохраняем Word-файл
+        doc.save(file_path)
+        
+        logger.info(f"Данные о зарплате успешно экспортированы в Word: {file_path}")
+        
+    except Exception as e:
+        logger.error(f"Ошибка при экспорте данных в Word: {str(e)}")
+        raise
+
+
+# Отметки календарного графика отпусков по статусам
+CALENDAR_MARKS = {
+    'запланирован': 'П',
+    'использован': 'О',
+    'оплачен': 'О',
+}
+CALENDAR_LEGEND = "Обозначения: П - запланированный отпуск, О - использованный (оплаченный) отпуск"
+
+MONTH_NAMES = ('Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь', 'Июль',
+               'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь')
+
+
+def _calendar_months(calendar):
+    """Разбиение периода календаря по месяцам: [(название месяца, индексы дней)]"""
+    months = []
+    for index, day in enumerate(calendar['days']):
+        label = f"{MONTH_NAMES[day.month - 1]} {day.year}"
+        if not months or months[-1][0] != label:
+            months.append((label, []))
+        months[-1][1].append(index)
+    return months
+
+
+def _calendar_rows(calendar, indices):
+    """Строки таблицы месяца: имя преподавателя и отметки по дням"""
+    rows = []
+    for teacher in calendar['teachers']:
+        statuses = teacher['statuses']
+        rows.append([teacher['teacher_name']] +
+                    [CALENDAR_MARKS.get(statuses[index], '') for index in indices])
+    return rows
+
+
+def _calendar_chart(calendar):
+    """Диаграмма максимального числа отсутствующих по месяцам (PNG)"""
+    absent = calendar['absent_per_day']
+    months = _calendar_months(calendar)
+    labels = [label for label, _ in months]
+    values = [max(absent[index] for index in indices) for _, indices in months]
+    return get_chart_service().bar_chart(labels, values, 'Максимум преподавателей в отпуске',
+                                         ylabel='Преподавателей', dpi=150)
+
+
+def export_vacation_calendar_to_pdf(calendar, file_path, title, include_chart=True):
+    """
+    Экспорт календарного графика отпусков в PDF формат
+
+    :param calendar: Данные календарного графика (VacationProcessor.get_vacation_calendar)
+    :param file_path: Путь к создаваемому файлу
+    :param title: Заголовок отчета
+    :param include_chart: Включать ли диаграмму отсутствий по месяцам
+    """
+    try:
+        try:
+            from reportlab.lib.pagesizes import A4, landscape
+            from reportlab.lib import colors
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+            from reportlab.lib.styles import getSampleStyleSheet
+            from io import BytesIO
+        except ImportError as e:
+            raise ImportError(
+                "Отсутствуют необходимые библиотеки для экспорта в PDF. Установите их командой:\n"
+                "pip install reportlab matplotlib"
+            ) from e
+
+        doc = SimpleDocTemplate(file_path, pagesize=landscape(A4))
+        styles = getSampleStyleSheet()
+        elements = [Paragraph(title, styles['Title']), Spacer(1, 12),
+                    Paragraph(f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}", styles['Normal']),
+                    Paragraph(CALENDAR_LEGEND, styles['Normal']), Spacer(1, 12)]
+
+        for label, indices in _calendar_months(calendar):
+            elements.append(Paragraph(label, styles['Heading2']))
+            header = ['Преподаватель'] + [str(calendar['days'][index].day) for index in indices]
+            table = Table([header] + _calendar_rows(calendar, indices), repeatRows=1)
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('FONTSIZE', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.25, colors.black)
+            ]))
+            elements.append(table)
+            elements.append(Spacer(1, 12))
+
+        if include_chart and calendar['days']:
+            elements.append(Image(BytesIO(_calendar_chart(calendar)), width=500, height=250))
+
+        doc.build(elements)
+        logger.info(f"Календарный график отпусков экспортирован в PDF: {file_path}")
+    except Exception as e:
+        logger.error(f"Ошибка при экспорте календарного графика в PDF: {str(e)}")
+        raise
+
+
+def export_vacation_calendar_to_excel(calendar, file_path, title, include_chart=True):
+    """
+    Экспорт календарного графика отпусков в Excel формат
+
+    Каждый месяц периода - отдельный лист: строки - преподаватели, столбцы - дни.
+
+    :param calendar: Данные календарного графика (VacationProcessor.get_vacation_calendar)
+    :param file_path: Путь к создаваемому файлу
+    :param title: Заголовок отчета
+    :param include_chart: Включать ли диаграмму отсутствий по месяцам
+    """
+    try:
+        try:
+            from openpyxl import Workbook
+            from openpyxl.styles import PatternFill
+            from openpyxl.chart import BarChart, Reference
+        except ImportError as e:
+            raise ImportError(
+                "Отсутствуют необходимые библиотеки для экспорта в Excel. Установите их командой:\n"
+                "pip install openpyxl"
+            ) from e
+
+        fills = {
+            'П': PatternFill(start_color='FFF2CC', end_color='FFF2CC', fill_type='solid'),
+            'О': PatternFill(start_color='C6E0B4', end_color='C6E0B4', fill_type='solid'),
+        }
+
+        wb = Workbook()
+        wb.remove(wb.active)
+        months = _calendar_months(calendar)
+
+        for label, indices in months:
+            ws = wb.create_sheet(title=label[:31])
+            ws['A1'] = title
+            ws['A1'].font = ws['A1'].font.copy(size=14, bold=True)
+            ws['A2'] = CALENDAR_LEGEND
+
+            ws.cell(row=4, column=1, value='Преподаватель')
+            for column, index in enumerate(indices, start=2):
+                ws.cell(row=4, column=column, value=calendar['days'][index].day)
+                ws.column_dimensions[ws.cell(row=4, column=column).column_letter].width = 4
+
+            for row, values in enumerate(_calendar_rows(calendar, indices), start=5):
+                for column, value in enumerate(values, start=1):
+                    cell = ws.cell(row=row, column=column, value=value or None)
+                    if value in fills:
+                        cell.fill = fills[value]
+            ws.column_dimensions['A'].width = 30
+            ws.freeze_panes = 'B5'
+
+        if include_chart and months:
+            chart_sheet = wb.create_sheet(title="Отсутствия")
+            chart_sheet['A1'] = "Месяц"
+            chart_sheet['B1'] = "Максимум в отпуске"
+            absent = calendar['absent_per_day']
+            for row, (label, indices) in enumerate(months, start=2):
+                chart_sheet.cell(row=row, column=1, value=label)
+                chart_sheet.cell(row=row, column=2, value=max(absent[index] for index in indices))
+
+            bar = BarChart()
+            bar.title = "Максимум преподавателей в отпуске"
+            bar.add_data(Reference(chart_sheet, min_col=2, min_row=1, max_row=1 + len(months)), titles_from_data=True)
+            bar.set_categories(Reference(chart_sheet, min_col=1, min_row=2, max_row=1 + len(months)))
+            chart_sheet.add_chart(bar, "D2")
+
+        if not wb.sheetnames:
+            wb.create_sheet(title="Календарь")
+        wb.save(file_path)
+        logger.info(f"Календарный график отпусков экспортирован в Excel: {file_path}")
+    except Exception as e:
+        logger.error(f"Ошибка при экспорте календарного графика в Excel: {str(e)}")
+        raise
+
+
+def export_vacation_calendar_to_word(calendar, file_path, title, include_chart=True):
+    """
+    Экспорт календарного графика отпусков в Word формат
+
+    :param calendar: Данные календарного графика (VacationProcessor.get_vacation_calendar)
+    :param file_path: Путь к создаваемому файлу
+    :param title: Заголовок отчета
+    :param include_chart: Включать ли диаграмму отсутствий по месяцам
+    """
+    try:
+        try:
+            from docx import Document
+            from docx.shared import Pt, Cm
+            from docx.enum.section import WD_ORIENT
+            from io import BytesIO
+        except ImportError as e:
+            raise ImportError(
+                "Отсутствуют необходимые библиотеки для экспорта в Word. Установите их командой:\n"
+                "pip install python-docx matplotlib"
+            ) from e
+
+        doc = Document()
+        section = doc.sections[0]
+        section.orientation = WD_ORIENT.LANDSCAPE
+        section.page_width, section.page_height = section.page_height, section.page_width
+
+        doc.add_heading(title, level=1)
+        doc.add_paragraph(f"Дата создания: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}")
+        doc.add_paragraph(CALENDAR_LEGEND)
+
+        for label, indices in _calendar_months(calendar):
+            doc.add_heading(label, level=2)
+            table = doc.add_table(rows=1, cols=len(indices) + 1)
+            table.style = 'Table Grid'
+            header_cells = table.rows[0].cells
+            header_cells[0].text = 'Преподаватель'
+            for column, index in enumerate(indices, start=1):
+                header_cells[column].text = str(calendar['days'][index].day)
+            for values in _calendar_rows(calendar, indices):
+                row_cells = table.add_row().cells
+                for column, value in enumerate(values):
+                    row_cells[column].text = value
+            for row in table.rows:
+                for cell in row.cells:
+                    for paragraph in cell.paragraphs:
+                        for run in paragraph.runs:
+                            run.font.size = Pt(6)
+
+        if include_chart and calendar['days']:
+            doc.add_heading("Отсутствия по месяцам", level=2)
+            doc.add_picture(BytesIO(_calendar_chart(calendar)), width=Cm(20))
+
+        doc.save(file_path)
+        logger.info(f"Календарный график отпусков экспортирован в Word: {file_path}")
+    except Exception as e:
+        logger.error(f"Ошибка при экспорте календарного графика в Word: {str(e)}")
+        raise
@@ -1,24 +1,108 @@
 import datetime
+import hashlib
+import json
 from typing import Dict, Any, Optional, List, Tuple
 import logging
-from decimal import Decimal, ROUND_HALF_UP
+from decimal import Decimal
 import db_connection as db
+from models import Teacher
+from money import (ZERO, ONE, HUNDRED, PERCENT, to_decimal, round_money, percent_of, to_kopecks,
+                   kopecks_to_float, kopecks_times, kopecks_percent, div_half_up)
+from utils.date_utils import count_working_days
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Поля преподавателя, от которых зависит расчет зарплаты
+TEACHER_INPUT_FIELDS = ('hourly_rate', 'position', 'academic_degree', 'qualification_category',
+                        'experience_years', 'is_young_specialist', 'is_union_member')
+
+# Справочные данные калькулятора (см. SalaryCalculator.reference_snapshot)
+REFERENCE_FIELDS = ('position_coefficients', 'degree_bonuses', 'experience_bonuses',
+                    'qualification_bonuses', 'vacation_days_info')
+
+# Надбавка молодым специалистам, оплата часа больничного и профсоюзный взнос (доли)
+YOUNG_SPECIALIST_BONUS_RATE = Decimal('0.1')
+SICK_LEAVE_HOUR_RATE = Decimal('0.8')
+UNION_CONTRIBUTION_RATE = Decimal('0.01')
+
+# Процент оплаты больничного по стажу: (стаж меньше, процент); при большем стаже - 100%
+SICK_LEAVE_PERCENTAGES = ((5, Decimal('80.0')), (8, Decimal('85.0')), (15, Decimal('90.0')))
+SICK_LEAVE_FULL_PERCENTAGE = Decimal('100.0')
+SICK_LEAVE_YOUNG_SPECIALIST_PERCENTAGE = Decimal('85.0')
+
+# Дни отпуска для должностей, которых нет в справочнике
+DEFAULT_VACATION_DAYS_INFO = {'base_days': 28, 'additional_days_degree': 0, 'additional_days_experience': 0}
+
+# Сохраняемые результаты расчета, которые сравниваются при пересчете
+RECALCULATED_FIELDS = ('gross_salary', 'net_salary', 'vacation_days', 'position_bonus',
+                       'degree_bonus', 'experience_bonus', 'category_bonus')
+
+
+def _fingerprint(value) -> str:
+    """Короткий хэш JSON-представления значения"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def teacher_fingerprint(teacher: Dict[str, Any]) -> str:
+    """
+    Отпечаток данных преподавателя, используемых в расчете зарплаты
+
+    :param teacher: данные преподавателя
+    :return: строка-хэш (меняется при изменении любого из TEACHER_INPUT_FIELDS)
+    """
+    return _fingerprint([teacher.get(name) for name in TEACHER_INPUT_FIELDS])
+
+
+def reference_fingerprint(reference_data: Dict[str, Any]) -> str:
+    """
+    Версия справочных данных, сохраняемая с каждым расчетом
+
+    :param reference_data: словарь {имя справочника: данные} (REFERENCE_FIELDS)
+    :return: строка-хэш (меняется при изменении любого справочника)
+    """
+    return _fingerprint([reference_data[name] for name in REFERENCE_FIELDS])
+
+
+def vacation_days_for(teacher: Dict[str, Any], vacation_days_info: Dict[str, Dict[str, int]]) -> int:
+    """
+    Положенное количество дней отпуска преподавателя
+    
+    :param teacher: данные преподавателя
+    :param vacation_days_info: справочник дней отпуска {должность: {base_days, additional_days_degree,
+                               additional_days_experience}}
+    :return: количество дней отпуска
+    """
+    position = (teacher.get('position') or '').lower()
+    vacation_info = vacation_days_info.get(position, DEFAULT_VACATION_DAYS_INFO)
+    
+    # Базовое количество дней
+    total_days = vacation_info['base_days']
+    
+    # Дополнительные дни за ученую степень
+    if teacher.get('academic_degree'):
+        total_days += vacation_info['additional_days_degree']
+    
+    # Дополнительные дни за стаж
+    if (teacher.get('experience_years') or 0) >= 5:
+        total_days += vacation_info['additional_days_experience']
+    
+    # Если молодой специалист, то +3 дня
+    if teacher.get('is_young_specialist', False):
+        total_days += 3
+    
+    return total_days
+
+
 class SalaryCalculator:
     """Класс для расчета заработной платы преподавателей в системе образования"""
     
-    def __init__(self, db_conn: db.DatabaseConnection):
+    def __init__(self, db_conn: db.DatabaseConnection, reference_data: Optional[Dict[str, Any]] = None):
         """
         Инициализация калькулятора зарплаты
         
         :param db_conn: объект подключения к базе данных
+        :param reference_data: готовый снимок справочников (reference_snapshot) вместо загрузки из базы
         """
         self.db_conn = db_conn
         self.teacher_repo = db.TeacherRepository(db_conn)
@@ -26,7 +110,10 @@ class SalaryCalculator:
         self.reference_repo = db.ReferenceDataRepository(db_conn)
         
         # Загрузка справочных данных
-        self._load_reference_data()
+        if reference_data is None:
+            self._load_reference_data()
+        else:
+            self._apply_reference_data(reference_data)
         
         # Стандартная ставка налога подоходного налога в РБ - 13%
         #Включёнт подоходный налог, а так же пенсионные взносы
@@ -35,16 +122,44 @@ class SalaryCalculator:
     def _load_reference_data(self):
         """Загрузка справочных данных из базы"""
         try:
-            self.position_coefficients = self.reference_repo.get_position_coefficients()
-            self.degree_bonuses = self.reference_repo.get_academic_degree_bonuses()
-            self.experience_bonuses = self.reference_repo.get_experience_bonuses()
-            self.qualification_bonuses = self.reference_repo.get_qualification_bonuses()
-            self.vacation_days_info = self.reference_repo.get_vacation_days()
+            self._apply_reference_data({
+                'position_coefficients': self.reference_repo.get_position_coefficients(),
+                'degree_bonuses': self.reference_repo.get_academic_degree_bonuses(),
+                'experience_bonuses': self.reference_repo.get_experience_bonuses(),
+                'qualification_bonuses': self.reference_repo.get_qualification_bonuses(),
+                'vacation_days_info': self.reference_repo.get_vacation_days()
+            })
             logger.info("Справочные данные успешно загружены")
         except Exception as e:
             logger.error(f"Ошибка при загрузке справочных данных: {str(e)}")
             raise
     
+    def _apply_reference_data(self, reference_data: Dict[str, Any]):
+        """Установить справочные данные и вычислить их версию"""
+        for name in REFERENCE_FIELDS:
+            setattr(self, name, reference_data[name])
+        # Значения справочников в Decimal: преобразуются один раз, а не при каждом расчете
+        self._position_coefficient_values = {
+            name: to_decimal(value) for name, value in self.position_coefficients.items()}
+        self._degree_bonus_values = {name: to_decimal(value) for name, value in self.degree_bonuses.items()}
+        self._experience_bonus_values = [(min_years, max_years, to_decimal(bonus_percent))
+                                         for min_years, max_years, bonus_percent in self.experience_bonuses]
+        self._qualification_bonus_values = {
+            name: to_decimal(value) for name, value in self.qualification_bonuses.items()}
+        # Версия справочников: сохраняется с каждым расчетом
+        self.reference_version = reference_fingerprint(reference_data)
+    
+    def reference_snapshot(self) -> Dict[str, Any]:
+        """
+        Снимок справочных данных для передачи в другой процесс
+        
+        Рабочий процесс получает копию снимка и создает по ней калькулятор
+        (SalaryCalculator(db_conn, reference_data=...)) без обращения к справочникам.
+        
+        :return: словарь {имя справочника: данные}
+        """
+        return {name: getattr(self, name) for name in REFERENCE_FIELDS}
+    
     def _get_position_coefficient(self, position: str) -> Decimal:
         """
         Получить коэффициент по должности
@@ -53,8 +168,8 @@ class SalaryCalculator:
         :return: коэффициент должности
         """
         if not position:
-            return Decimal('1.0')
-        return Decimal(str(self.position_coefficients.get(position.lower(), 1.0)))
+            return ONE
+        return self._position_coefficient_values.get(position.lower(), ONE)
     
     def _get_degree_bonus_percent(self, degree: Optional[str]) -> Decimal:
         """
@@ -64,8 +179,8 @@ class SalaryCalculator:
         :return: процент надбавки (от 0 до 100)
         """
         if not degree:
-            return Decimal('0.0')
-        return Decimal(str(self.degree_bonuses.get(degree.lower(), 0.0)))
+            return ZERO
+        return self._degree_bonus_values.get(degree.lower(), ZERO)
     
     def _get_experience_bonus_percent(self, years: int) -> Decimal:
         """
@@ -74,13 +189,13 @@ class SalaryCalculator:
         :param years: количество лет стажа
         :return: процент надбавки (от 0 до 100)
         """
-        for min_years, max_years, bonus_percent in self.experience_bonuses:
+        for min_years, max_years, bonus_percent in self._experience_bonus_values:
             if max_years is None:
                 if years >= min_years:
-                    return Decimal(str(bonus_percent))
+                    return bonus_percent
             elif min_years <= years < max_years:
-                return Decimal(str(bonus_percent))
-        return Decimal('0.0')
+                return bonus_percent
+        return ZERO
     
     def _get_qualification_bonus_percent(self, category: Optional[str]) -> Decimal:
         """
@@ -90,8 +205,8 @@ class SalaryCalculator:
         :return: процент надбавки (от 0 до 100)
         """
         if not category:
-            return Decimal('0.0')
-        return Decimal(str(self.qualification_bonuses.get(category.lower(), 0.0)))
+            return ZERO
+        return self._qualification_bonus_values.get(category.lower(), ZERO)
     
     def _get_vacation_days(self, teacher_data: Dict[str, Any]) -> int:
         """
@@ -100,29 +215,7 @@ class SalaryCalculator:
         :param teacher_data: данные преподавателя
         :return: количество дней отпуска
         """
-        position = teacher_data.get('position', '').lower()
-        vacation_info = self.vacation_days_info.get(position, {
-            'base_days': 28,
-            'additional_days_degree': 0,
-            'additional_days_experience': 0
-        })
-        
-        # Базовое количество дней
-        total_days = vacation_info['base_days']
-        
-        # Дополнительные дни за ученую степень
-        if teacher_data.get('academic_degree'):
-            total_days += vacation_info['additional_days_degree']
-        
-        # Дополнительные дни за стаж
-        if teacher_data.get('experience_years', 0) >= 5:
-            total_days += vacation_info['additional_days_experience']
-        
-        # Если молодой специалист, то +3 дня
-        if teacher_data.get('is_young_specialist', False):
-            total_days += 3
-        
-        return total_days
+        return vacation_days_for(teacher_data, self.vacation_days_info)
     
     def calculate_salary(self, teacher_id: int, calc_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -137,16 +230,31 @@ class SalaryCalculator:
         if not teacher:
             raise ValueError(f"Преподаватель с ID {teacher_id} не найден")
         
+        return self.calculate_salary_for_teacher(teacher, calc_data)
+    
+    def calculate_salary_for_teacher(self, teacher: Dict[str, Any], calc_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Рассчитать заработную плату по уже полученным данным преподавателя
+        
+        :param teacher: данные преподавателя
+        :param calc_data: данные для расчета (часы, бонусы и т.д.)
+        :return: полный расчет зарплаты
+        """
+        teacher_id = teacher['id']
+        
         # Преобразование числовых значений в Decimal для точных расчетов
-        hourly_rate = Decimal(str(teacher['hourly_rate']))
+        hourly_rate = to_decimal(teacher['hourly_rate'])
         
         # Базовые параметры расчета
-        hours_worked = Decimal(str(calc_data.get('hours_worked', 0)))
-        sick_leave_hours = Decimal(str(calc_data.get('sick_leave_hours', 0)))
-        absence_hours = Decimal(str(calc_data.get('absence_hours', 0)))
-        bonus = Decimal(str(calc_data.get('bonus', 0)))
-        tax_rate_from_input = Decimal(str(calc_data.get('tax_rate', self.standard_tax_rate * 100)))
-        tax_rate = tax_rate_from_input / Decimal('100.0')
+        hours_worked = to_decimal(calc_data.get('hours_worked', 0))
+        sick_leave_hours = to_decimal(calc_data.get('sick_leave_hours', 0))
+        absence_hours = to_decimal(calc_data.get('absence_hours', 0))
+        bonus = to_decimal(calc_data.get('bonus', 0))
+        # Ставка налога на входе - в процентах
+        if 'tax_rate' in calc_data:
+            tax_rate = to_decimal(calc_data['tax_rate']) * PERCENT
+        else:
+            tax_rate = self.standard_tax_rate
         calculation_date = calc_data.get('calculation_date', datetime.date.today())
         
         # Проверка корректности данных
@@ -158,32 +266,32 @@ class SalaryCalculator:
         
         # Расчет надбавок
         position_coefficient = self._get_position_coefficient(teacher.get('position', ''))
-        position_bonus = base_salary * (position_coefficient - Decimal('1.0'))
+        position_bonus = base_salary * (position_coefficient - ONE)
         
         degree_bonus_percent = self._get_degree_bonus_percent(teacher.get('academic_degree'))
-        degree_bonus = base_salary * (degree_bonus_percent / Decimal('100.0'))
+        degree_bonus = percent_of(base_salary, degree_bonus_percent)
         
         experience_bonus_percent = self._get_experience_bonus_percent(teacher.get('experience_years', 0))
-        experience_bonus = base_salary * (experience_bonus_percent / Decimal('100.0'))
+        experience_bonus = percent_of(base_salary, experience_bonus_percent)
         
         qualification_bonus_percent = self._get_qualification_bonus_percent(teacher.get('qualification_category'))
-        category_bonus = base_salary * (qualification_bonus_percent / Decimal('100.0'))
+        category_bonus = percent_of(base_salary, qualification_bonus_percent)
         
         # Дополнительные надбавки для молодых специалистов (10%)
-        young_specialist_bonus = Decimal('0.0')
+        young_specialist_bonus = ZERO
         if teacher.get('is_young_specialist', False):
-            young_specialist_bonus = base_salary * Decimal('0.1')
+            young_specialist_bonus = base_salary * YOUNG_SPECIALIST_BONUS_RATE
         
         # Учет больничных (80% от ставки)
-        sick_leave_pay = Decimal('0.0')
+        sick_leave_pay = ZERO
         if sick_leave_hours > 0:
-            sick_leave_pay = sick_leave_hours * hourly_rate * Decimal('0.8')
+            sick_leave_pay = sick_leave_hours * hourly_rate * SICK_LEAVE_HOUR_RATE
         
         # Расчет отпускных
         vacation_days = self._get_vacation_days(teacher)
         # В данной реализации просто запоминаем количество дней отпуска
         # Расчет отпускных производится отдельно при взятии отпуска
-        vacation_pay = Decimal(str(calc_data.get('vacation_pay', 0)))
+        vacation_pay = to_decimal(calc_data.get('vacation_pay', 0))
         
         # Расчет валовой (до налогообложения) и чистой (после налогов) зарплаты
         gross_salary = (base_salary + position_bonus + degree_bonus + 
@@ -191,29 +299,26 @@ class SalaryCalculator:
                       young_specialist_bonus + sick_leave_pay + bonus)
         
         # Расчет налога
-        tax_amount = (gross_salary * tax_rate).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        tax_amount = round_money(gross_salary * tax_rate)
         
         # Расчет профсоюзных взносов (1% для членов профсоюза)
-        union_contribution = Decimal('0.0')
+        union_contribution = ZERO
         if teacher.get('is_union_member', False):
-            union_contribution = (gross_salary * Decimal('0.01')).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            union_contribution = round_money(gross_salary * UNION_CONTRIBUTION_RATE)
         
         # Чистая зарплата после вычета налогов и взносов
         net_salary = gross_salary - tax_amount - union_contribution
         
         # Округляем все денежные значения до 2 знаков после запятой
-        def round_decimal(value):
-            return value.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-        
-        base_salary = round_decimal(base_salary)
-        position_bonus = round_decimal(position_bonus)
-        degree_bonus = round_decimal(degree_bonus)
-        experience_bonus = round_decimal(experience_bonus)
-        category_bonus = round_decimal(category_bonus)
-        young_specialist_bonus = round_decimal(young_specialist_bonus)
-        sick_leave_pay = round_decimal(sick_leave_pay)
-        gross_salary = round_decimal(gross_salary)
-        net_salary = round_decimal(net_salary)
+        base_salary = round_money(base_salary)
+        position_bonus = round_money(position_bonus)
+        degree_bonus = round_money(degree_bonus)
+        experience_bonus = round_money(experience_bonus)
+        category_bonus = round_money(category_bonus)
+        young_specialist_bonus = round_money(young_specialist_bonus)
+        sick_leave_pay = round_money(sick_leave_pay)
+        gross_salary = round_money(gross_salary)
+        net_salary = round_money(net_salary)
         
         # Подготовка результата расчета
         calculation_result = {
@@ -238,10 +343,12 @@ class SalaryCalculator:
             'young_specialist_bonus': float(young_specialist_bonus),
             'sick_leave_pay': float(sick_leave_pay),
             'union_contribution': float(union_contribution),
-            'tax_amount': float(tax_amount)
+            'tax_amount': float(tax_amount),
+            'reference_version': self.reference_version,
+            'teacher_hash': teacher_fingerprint(teacher)
         }
         
-        logger.info(f"Выполнен расчет зарплаты для преподавателя {teacher['name']} (ID: {teacher_id})")
+        logger.debug(f"Выполнен расчет зарплаты для преподавателя {teacher['name']} (ID: {teacher_id})")
         return calculation_result
     
     def save_calculation(self, calculation_data: Dict[str, Any]) -> int:
@@ -267,14 +374,115 @@ class SalaryCalculator:
             'position_bonus': calculation_data['position_bonus'],
             'degree_bonus': calculation_data['degree_bonus'],
             'experience_bonus': calculation_data['experience_bonus'],
-            'category_bonus': calculation_data['category_bonus']
+            'category_bonus': calculation_data['category_bonus'],
+            # Входные данные расчета (без них расчет будет проверен при пересчете)
+            'reference_version': calculation_data.get('reference_version'),
+            'teacher_hash': calculation_data.get('teacher_hash')
         }
         
         # Сохраняем расчет в базу данных
         calculation_id = self.salary_repo.add_calculation(db_calculation_data)
-        logger.info(f"Расчет зарплаты сохранен в базу данных с ID: {calculation_id}")
+        logger.debug(f"Расчет зарплаты сохранен в базу данных с ID: {calculation_id}")
         return calculation_id
 
+    def recalculate_stale(self, start_date: datetime.date, end_date: datetime.date,
+                          dry_run: bool = False, include_legacy: bool = False) -> Dict[str, Any]:
+        """
+        Пересчитать только расчеты, входные данные которых изменились
+        
+        Расчет считается устаревшим, если сохраненная вместе с ним версия
+        справочников или отпечаток данных преподавателя отличаются от текущих.
+        Расчеты, сохраненные до появления отпечатков (NULL), по умолчанию не
+        пересчитываются: суммы в них посчитаны по данным на дату расчета, а
+        текущие данные преподавателя могли с тех пор измениться. Им
+        записываются текущие отпечатки без изменения сумм, и дальнейшие
+        изменения справочников и данных преподавателей они уже учитывают.
+        
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :param dry_run: только показать изменения, не записывая их в базу
+        :param include_legacy: пересчитывать и расчеты без сохраненных отпечатков
+        :return: сводка пересчета и список изменений по расчетам
+        """
+        if start_date > end_date:
+            raise ValueError("Дата начала периода не может быть позже даты окончания")
+        
+        # Справочники могли измениться с момента создания калькулятора
+        self._load_reference_data()
+        
+        calculations = self.salary_repo.get_calculations_for_recheck(start_date, end_date)
+        updates = []
+        fingerprints = []
+        changes = []
+        stale = 0
+        
+        for calculation in calculations:
+            teacher = Teacher(id=calculation.teacher_id, name=calculation['teacher_name'],
+                              **{name: calculation[name] for name in TEACHER_INPUT_FIELDS})
+            teacher_hash = teacher_fingerprint(teacher)
+            stored_version, stored_hash = calculation['reference_version'], calculation['teacher_hash']
+            differs = ((stored_version is not None and stored_version != self.reference_version)
+                       or (stored_hash is not None and stored_hash != teacher_hash))
+            legacy = stored_version is None or stored_hash is None
+            if not differs and not (legacy and include_legacy):
+                if legacy:
+                    fingerprints.append((calculation.id, self.reference_version, teacher_hash))
+                continue
+            stale += 1
+            
+            result = self.calculate_salary_for_teacher(teacher, {
+                'hours_worked': calculation.hours_worked or 0,
+                'sick_leave_hours': calculation.sick_leave_hours or 0,
+                'absence_hours': calculation.absence_hours or 0,
+                'bonus': calculation.bonus or 0,
+                # В базе ставка хранится долей, на вход расчета подается в процентах
+                'tax_rate': to_decimal(calculation.tax_rate) * HUNDRED,
+                'vacation_pay': calculation.vacation_pay or 0,
+                'calculation_date': calculation.calculation_date
+            })
+            
+            diff = {}
+            for name in RECALCULATED_FIELDS:
+                old_value, new_value = calculation[name], result[name]
+                if old_value is None or to_decimal(old_value) != to_decimal(new_value):
+                    diff[name] = (old_value, new_value)
+            if diff:
+                changes.append({
+                    'calculation_id': calculation.id,
+                    'teacher_id': calculation.teacher_id,
+                    'teacher_name': calculation['teacher_name'],
+                    'calculation_date': calculation.calculation_date,
+                    'diff': diff
+                })
+            # Отпечатки обновляются и для расчетов без изменений сумм
+            updates.append((calculation.id, *(result[name] for name in RECALCULATED_FIELDS),
+                            result['reference_version'], result['teacher_hash']))
+        
+        updated = 0
+        backfilled = 0
+        if not dry_run:
+            if updates:
+                updated = self.salary_repo.update_recalculated(updates)
+            if fingerprints:
+                backfilled = self.salary_repo.set_fingerprints(fingerprints)
+        
+        logger.info(f"Пересчет за период {start_date} - {end_date}: проверено {len(calculations)}, "
+                    f"устарело {stale}, изменено {len(changes)}, обновлено {updated}, "
+                    f"без отпечатков {len(fingerprints)}, отпечатки записаны {backfilled}"
+                    f"{' (пробный запуск)' if dry_run else ''}")
+        return {
+            'start_date': start_date,
+            'end_date': end_date,
+            'reference_version': self.reference_version,
+            'dry_run': dry_run,
+            'checked': len(calculations),
+            'stale': stale,
+            'updated': updated,
+            'legacy': len(fingerprints),
+            'backfilled': backfilled,
+            'changes': changes
+        }
+
     def calculate_vacation_pay(self, teacher_id: int, start_date: datetime.date, 
                             end_date: datetime.date) -> Dict[str, Any]:
         """
@@ -290,6 +498,23 @@ class SalaryCalculator:
         if not teacher:
             raise ValueError(f"Преподаватель с ID {teacher_id} не найден")
         
+        # Сумма начислений за последние 12 месяцев (из кэша истории начислений)
+        series = self.db_conn.salary_history.series(teacher_id)
+        return self.vacation_pay_from_history(teacher, series, start_date, end_date)
+    
+    def vacation_pay_from_history(self, teacher: Dict[str, Any], series, start_date: datetime.date,
+                                  end_date: datetime.date) -> Dict[str, Any]:
+        """
+        Расчет отпускных по уже загруженной истории начислений (без запросов к БД)
+        
+        :param teacher: данные преподавателя
+        :param series: ряд начислений преподавателя (salary_history.SalarySeries)
+        :param start_date: дата начала отпуска
+        :param end_date: дата окончания отпуска
+        :return: информация о расчете отпускных
+        """
+        teacher_id = teacher['id']
+        
         # Расчет количества дней отпуска
         vacation_days = (end_date - start_date).days + 1
         max_vacation_days = self._get_vacation_days(teacher)
@@ -297,46 +522,33 @@ class SalaryCalculator:
         if vacation_days > max_vacation_days:
             logger.warning(f"Запрошено больше дней отпуска ({vacation_days}), чем положено ({max_vacation_days})")
         
-        # Получаем все расчеты зарплаты за последние 12 месяцев
+        # Сумма начислений за последние 12 месяцев
         year_ago = start_date - datetime.timedelta(days=365)
-        calculations = self.salary_repo.get_calculations_by_teacher_and_period(
-            teacher_id, year_ago, start_date)
+        total_gross, calculations_count = series.window(year_ago, start_date)
         
-        if not calculations:
+        if not calculations_count:
             raise ValueError("Нет данных о зарплате за последние 12 месяцев для расчета отпускных")
         
-        # Рассчитываем среднюю дневную зарплату
-        total_gross = sum(Decimal(str(calc['gross_salary'])) for calc in calculations)
-        
         # Подсчет рабочих дней (без выходных)
-        working_days = 0
-        current_date = year_ago
-        while current_date <= start_date:
-            # Если день не является выходным (суббота или воскресенье)
-            if current_date.weekday() < 5:
-                working_days += 1
-            current_date += datetime.timedelta(days=1)
+        working_days = count_working_days(year_ago, start_date)
         
         # Если нет рабочих дней, используем стандартное количество (250 рабочих дней в году)
         working_days = working_days if working_days > 0 else 250
         
-        avg_daily_salary = (total_gross / Decimal(str(working_days))).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP)
+        # Начисления хранятся с точностью до копейки, поэтому дальше расчет
+        # ведется в целых копейках (округление как у Decimal с ROUND_HALF_UP)
+        avg_daily_salary = div_half_up(to_kopecks(total_gross), working_days)
         
         # Расчет отпускных
-        vacation_pay = (avg_daily_salary * Decimal(str(vacation_days))).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP)
+        vacation_pay = avg_daily_salary * vacation_days
         
         # Расчет налога с отпускных
-        tax_rate = self.standard_tax_rate
-        tax_amount = (vacation_pay * tax_rate).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP)
+        tax_amount = kopecks_times(vacation_pay, self.standard_tax_rate)
         
         # Расчет профсоюзных взносов с отпускных
-        union_contribution = Decimal('0.0')
+        union_contribution = 0
         if teacher.get('is_union_member', False):
-            union_contribution = (vacation_pay * Decimal('0.01')).quantize(
-                Decimal('0.01'), rounding=ROUND_HALF_UP)
+            union_contribution = kopecks_times(vacation_pay, UNION_CONTRIBUTION_RATE)
         
         # Чистая сумма отпускных
         net_vacation_pay = vacation_pay - tax_amount - union_contribution
@@ -348,14 +560,14 @@ class SalaryCalculator:
             'start_date': start_date,
             'end_date': end_date,
             'vacation_days': vacation_days,
-            'avg_daily_salary': float(avg_daily_salary),
-            'gross_vacation_pay': float(vacation_pay),
-            'tax_amount': float(tax_amount),
-            'union_contribution': float(union_contribution),
-            'net_vacation_pay': float(net_vacation_pay)
+            'avg_daily_salary': kopecks_to_float(avg_daily_salary),
+            'gross_vacation_pay': kopecks_to_float(vacation_pay),
+            'tax_amount': kopecks_to_float(tax_amount),
+            'union_contribution': kopecks_to_float(union_contribution),
+            'net_vacation_pay': kopecks_to_float(net_vacation_pay)
         }
         
-        logger.info(f"Рассчитаны отпускные для преподавателя {teacher['name']} (ID: {teacher_id})")
+        logger.debug(f"Рассчитаны отпускные для преподавателя {teacher['name']} (ID: {teacher_id})")
         return result
 
     def calculate_sick_leave(self, teacher_id: int, start_date: datetime.date,
@@ -377,43 +589,36 @@ class SalaryCalculator:
         # Расчет количества дней больничного
         sick_days = (end_date - start_date).days + 1
         
-        # Получаем все расчеты зарплаты за последние 6 месяцев
+        # Сумма начислений за последние 6 месяцев (из кэша истории начислений)
         six_months_ago = start_date - datetime.timedelta(days=180)
-        calculations = self.salary_repo.get_calculations_by_teacher_and_period(
+        total_gross, calculations_count = self.db_conn.salary_history.window(
             teacher_id, six_months_ago, start_date)
         
-        if not calculations:
+        if not calculations_count:
             raise ValueError("Нет данных о зарплате за последние 6 месяцев для р��счета больничных")
         
-        # Рассчитываем среднюю дневную зарплату
-        total_gross = sum(Decimal(str(calc['gross_salary'])) for calc in calculations)
-        working_days = sum(1 for _ in range((start_date - six_months_ago).days + 1) 
-                          if not (_.weekday() >= 5))  # не считаем выходные
+        # Рабочие дни периода (не считаем выходные)
+        working_days = count_working_days(six_months_ago, start_date)
         
         # Если нет рабочих дней, используем стандартное количество (126 рабочих дней в полугодии)
         working_days = working_days if working_days > 0 else 126
         
-        avg_daily_salary = (total_gross / Decimal(str(working_days))).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP)
+        # Расчет в целых копейках, как и для отпускных
+        avg_daily_salary = div_half_up(to_kopecks(total_gross), working_days)
         
         # Определяем процент оплаты в зависимости от стажа и типа больничного
         payment_percentage = self._get_sick_leave_percentage(teacher, is_work_related)
         
         # Расчет оплаты больничного
-        sick_leave_pay = (avg_daily_salary * Decimal(str(sick_days)) * 
-                         (payment_percentage / Decimal('100.0'))).quantize(
-                             Decimal('0.01'), rounding=ROUND_HALF_UP)
+        sick_leave_pay = kopecks_percent(avg_daily_salary * sick_days, payment_percentage)
         
         # Расчет налога с больничных
-        tax_rate = self.standard_tax_rate
-        tax_amount = (sick_leave_pay * tax_rate).quantize(
-            Decimal('0.01'), rounding=ROUND_HALF_UP)
+        tax_amount = kopecks_times(sick_leave_pay, self.standard_tax_rate)
         
         # Расчет профсоюзных взносов с больничных
-        union_contribution = Decimal('0.0')
+        union_contribution = 0
         if teacher.get('is_union_member', False):
-            union_contribution = (sick_leave_pay * Decimal('0.01')).quantize(
-                Decimal('0.01'), rounding=ROUND_HALF_UP)
+            union_contribution = kopecks_times(sick_leave_pay, UNION_CONTRIBUTION_RATE)
         
         # Чистая сумма больничных
         net_sick_leave_pay = sick_leave_pay - tax_amount - union_contribution
@@ -425,16 +630,16 @@ class SalaryCalculator:
             'start_date': start_date,
             'end_date': end_date,
             'sick_days': sick_days,
-            'avg_daily_salary': float(avg_daily_salary),
+            'avg_daily_salary': kopecks_to_float(avg_daily_salary),
             'payment_percentage': float(payment_percentage),
-            'gross_sick_leave_pay': float(sick_leave_pay),
-            'tax_amount': float(tax_amount),
-            'union_contribution': float(union_contribution),
-            'net_sick_leave_pay': float(net_sick_leave_pay),
+            'gross_sick_leave_pay': kopecks_to_float(sick_leave_pay),
+            'tax_amount': kopecks_to_float(tax_amount),
+            'union_contribution': kopecks_to_float(union_contribution),
+            'net_sick_leave_pay': kopecks_to_float(net_sick_leave_pay),
             'is_work_related': is_work_related
         }
         
-        logger.info(f"Рассчитаны больничные для преподавателя {teacher['name']} (ID: {teacher_id})")
+        logger.debug(f"Рассчитаны больничные для преподавателя {teacher['name']} (ID: {teacher_id})")
         return result
     
     def _get_sick_leave_percentage(self, teacher: Dict[str, Any], is_work_related: bool) -> Decimal:
@@ -447,23 +652,19 @@ class SalaryCalculator:
         """
         # Если больничный связан с производственной травмой - 100%
         if is_work_related:
-            return Decimal('100.0')
+            return SICK_LEAVE_FULL_PERCENTAGE
         
         # Для молодых специалис��ов - 85%
         if teacher.get('is_young_specialist', False):
-            return Decimal('85.0')
+            return SICK_LEAVE_YOUNG_SPECIALIST_PERCENTAGE
         
-        # В зависимости от стажа
+        # В зависимости от стажа: менее 5 лет - 80%, от 5 до 8 - 85%, от 8 до 15 - 90%
         experience_years = teacher.get('experience_years', 0)
         
-        if experience_years < 5:
-            return Decimal('80.0')  # менее 5 лет стажа - 80%
-        elif experience_years < 8:
-            return Decimal('85.0')  # от 5 до 8 лет - 85%
-        elif experience_years < 15:
-            return Decimal('90.0')  # от 8 до 15 лет - 90%
-        else:
-            return Decimal('100.0')  # свыше 15 лет - 100%
+        for max_years, percentage in SICK_LEAVE_PERCENTAGES:
+            if experience_years < max_years:
+                return percentage
+        return SICK_LEAVE_FULL_PERCENTAGE  # свыше 15 лет - 100%
 
     def get_teacher_statistics(self, teacher_id: int, year: int) -> Dict[str, Any]:
         """
@@ -555,7 +756,7 @@ class SalaryCalculator:
             'months_data': months_list
         }
         
-        logger.info(f"Сформирована статистика за {year} год для преподавателя {teacher['name']} (ID: {teacher_id})")
+        logger.debug(f"Сформирована статистика за {year} год для преподавателя {teacher['name']} (ID: {teacher_id})")
         return result
     
     def _get_month_name(self, month_number: int) -> str:
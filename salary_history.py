@@ -0,0 +1,161 @@
+"""
+Кэш истории начислений преподавателей для окон усреднения заработка
+
+Для расчета отпускных и больничных нужна сумма начислений (gross_salary)
+за 12 или 6 месяцев до даты. Кэш хранит по каждому преподавателю
+упорядоченный по дате ряд начислений с префиксными суммами, поэтому сумма
+за любое окно вычисляется двумя бинарными поисками.
+
+Расчеты могут сохранять и другие процессы (другие окна GUI, служба,
+AsyncSalaryApp), поэтому перед использованием ряда кэш сверяет его
+отметку - число расчетов, наибольший ID и сумму начислений преподавателя,
+полученные одним агрегатным запросом, - и при расхождении загружает ряд
+заново. Запись преподавателя также сбрасывается при добавлении расчета
+зарплаты в этом процессе (SalaryCalculationRepository.add_calculation) и
+при удалении преподавателя.
+"""
+import bisect
+import datetime
+import logging
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Число преподавателей, история которых хранится в кэше по умолчанию
+DEFAULT_MAX_TEACHERS = 512
+
+
+class SalarySeries:
+    """Ряд начислений одного преподавателя с префиксными суммами"""
+
+    __slots__ = ('dates', 'prefix')
+
+    def __init__(self, rows: List[Tuple[datetime.date, Decimal]]):
+        """
+        :param rows: пары (дата расчета, начислено), в любом порядке
+        """
+        rows = sorted(rows, key=lambda row: row[0])
+        self.dates = [row[0] for row in rows]
+        self.prefix = [Decimal('0')]
+        for _, gross in rows:
+            self.prefix.append(self.prefix[-1] + gross)
+
+    def window(self, start_date: datetime.date, end_date: datetime.date) -> Tuple[Decimal, int]:
+        """
+        Сумма начислений и число расчетов за период (включительно)
+
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: (сумма начислений, число расчетов)
+        """
+        lo = bisect.bisect_left(self.dates, start_date)
+        hi = bisect.bisect_right(self.dates, end_date)
+        if hi <= lo:
+            return Decimal('0'), 0
+        return self.prefix[hi] - self.prefix[lo], hi - lo
+
+
+class SalaryHistoryCache:
+    """LRU-кэш рядов начислений по преподавателям"""
+
+    def __init__(self, loader: Callable[[int], List[Tuple[datetime.date, Decimal]]],
+                 max_teachers: int = DEFAULT_MAX_TEACHERS,
+                 stamp_loader: Optional[Callable[[int], Any]] = None):
+        """
+        :param loader: функция loader(teacher_id), возвращающая пары (дата расчета, начислено)
+        :param max_teachers: максимальное число преподавателей в кэше
+        :param stamp_loader: функция stamp_loader(teacher_id), возвращающая отметку
+                             актуальности истории (None - ряды в кэше не сверяются)
+        """
+        self._loader = loader
+        self._stamp_loader = stamp_loader
+        self.max_teachers = max_teachers
+        # ID преподавателя -> (отметка актуальности, ряд начислений)
+        self._series: 'OrderedDict[int, Tuple[Any, SalarySeries]]' = OrderedDict()
+        # Версии (общая и по преподавателю): ряд, загруженный до сброса, в кэш не попадает
+        self._epoch = 0
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def series(self, teacher_id: int) -> SalarySeries:
+        """
+        Ряд начислений преподавателя (из кэша, если он еще актуален, или из БД)
+
+        :param teacher_id: ID преподавателя
+        :return: ряд начислений
+        """
+        # Отметка читается до загрузки ряда: если расчет сохранят между
+        # запросами, ряд окажется новее отметки и при следующем обращении
+        # будет загружен заново
+        stamp = self._stamp_loader(teacher_id) if self._stamp_loader is not None else None
+
+        with self._lock:
+            entry = self._series.get(teacher_id)
+            if entry is not None and entry[0] == stamp:
+                self._series.move_to_end(teacher_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            version = (self._epoch, self._versions.get(teacher_id, 0))
+
+        series = SalarySeries([(self._as_date(calc_date), Decimal(str(gross)))
+                               for calc_date, gross in self._loader(teacher_id)])
+
+        with self._lock:
+            if (self._epoch, self._versions.get(teacher_id, 0)) == version:
+                self._series[teacher_id] = (stamp, series)
+                self._series.move_to_end(teacher_id)
+                while len(self._series) > self.max_teachers:
+                    self._series.popitem(last=False)
+        return series
+
+    def preload(self, rows_by_teacher: Dict[int, List[Tuple[datetime.date, Decimal]]]) -> Dict[int, SalarySeries]:
+        """
+        Построить ряды по историям, загруженным одним запросом для многих преподавателей
+
+        Ряды используются только вызывающим пакетным расчетом и в кэш не
+        помещаются: для них нет отметки актуальности.
+
+        :param rows_by_teacher: словарь {ID преподавателя: пары (дата расчета, начислено)}
+        :return: словарь {ID преподавателя: ряд начислений}
+        """
+        return {
+            teacher_id: SalarySeries([(self._as_date(calc_date), Decimal(str(gross))) for calc_date, gross in rows])
+            for teacher_id, rows in rows_by_teacher.items()
+        }
+
+    def window(self, teacher_id: int, start_date: datetime.date,
+               end_date: datetime.date) -> Tuple[Decimal, int]:
+        """
+        Сумма начислений и число расчетов преподавателя за период (включительно)
+
+        :param teacher_id: ID преподавателя
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: (сумма начислений, число расчетов)
+        """
+        return self.series(teacher_id).window(self._as_date(start_date), self._as_date(end_date))
+
+    def invalidate(self, teacher_id: Optional[int] = None):
+        """
+        Сбросить историю преподавателя (или всех, если teacher_id не указан)
+
+        :param teacher_id: ID преподавателя
+        """
+        with self._lock:
+            if teacher_id is None:
+                self._series.clear()
+                self._epoch += 1
+            else:
+                self._series.pop(teacher_id, None)
+                self._versions[teacher_id] = self._versions.get(teacher_id, 0) + 1
+
+    @staticmethod
+    def _as_date(value) -> datetime.date:
+        """Дата без времени (datetime приводится к date)"""
+        return value.date() if isinstance(value, datetime.datetime) else value
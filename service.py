@@ -0,0 +1,193 @@
+"""
+Локальная служба расчета зарплаты (HTTP/JSON)
+
+Один процесс службы держит единственный экземпляр SalaryApp: один пул
+соединений с БД и общие для всех клиентов справочники и кэши. Клиенты
+(SalaryServiceClient, в том числе GUI при заданной переменной окружения
+SALARY_SERVICE_URL) вызывают методы приложения запросами POST /api/<метод>,
+см. service_protocol.
+
+Запуск:
+    python service.py --host 127.0.0.1 --port 8765 --pool-size 10
+"""
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+from app import SalaryApp
+from logging_config import setup_logging
+import service_protocol as protocol
+
+logger = logging.getLogger(__name__)
+
+# Максимальный размер тела запроса (байт)
+MAX_REQUEST_SIZE = 10 * 1024 * 1024
+
+# Сколько соединений пула одновременно может занять один вызов метода
+# (например, расчет отпускных: отпуск, преподаватель и история начислений)
+CONNECTIONS_PER_REQUEST = 3
+
+# Сколько запрос ждет очереди на выполнение, прежде чем получить ответ 503 (секунд)
+REQUEST_WAIT_TIMEOUT = 60
+
+
+class SalaryRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов к методам SalaryApp"""
+
+    server_version = 'SalaryService/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'result': {'status': 'ok', 'methods': sorted(protocol.SERVICE_METHODS)}})
+        else:
+            self._send(404, {'error': f"Неизвестный адрес: {self.path}", 'error_type': 'NotFound'})
+
+    def do_POST(self):
+        prefix = '/api/'
+        method_name = self.path[len(prefix):] if self.path.startswith(prefix) else ''
+        if method_name not in protocol.SERVICE_METHODS:
+            self._read_body()
+            self._send(404, {'error': f"Метод недоступен через службу: {method_name or self.path}",
+                             'error_type': 'NotFound'})
+            return
+
+        try:
+            request = self._read_body() or {}
+            args = request.get('args', [])
+            kwargs = request.get('kwargs', {})
+        except ValueError as e:
+            self._send(400, {'error': f"Неверный запрос: {str(e)}", 'error_type': 'ValueError'})
+            return
+
+        # Пул соединений при исчерпании не ждет, а выдает ошибку, поэтому
+        # одновременно выполняется не больше вызовов, чем он выдержит
+        if not self.server.request_slots.acquire(timeout=REQUEST_WAIT_TIMEOUT):
+            self._send(503, {'error': "Служба перегружена, повторите запрос позже",
+                             'error_type': 'ServiceBusy'})
+            return
+        try:
+            result = getattr(self.server.app, method_name)(*args, **kwargs)
+        except (ValueError, KeyError, FileNotFoundError) as e:
+            self._send(400, {'error': str(e), 'error_type': type(e).__name__})
+            return
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении метода {method_name}: {str(e)}")
+            self._send(500, {'error': str(e), 'error_type': type(e).__name__})
+            return
+        finally:
+            self.server.request_slots.release()
+
+        self._send(200, {'result': result})
+
+    def _read_body(self) -> Any:
+        """Прочитать и разобрать тело запроса"""
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_REQUEST_SIZE:
+            raise ValueError("Слишком большой запрос")
+        return protocol.loads(self.rfile.read(length)) if length else None
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        """Отправить ответ JSON"""
+        try:
+            body = protocol.dumps(payload)
+        except (TypeError, ValueError) as e:
+            status = 500
+            body = protocol.dumps({'error': f"Не удалось сериализовать результат: {str(e)}",
+                                   'error_type': 'TypeError'})
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class SalaryService(ThreadingHTTPServer):
+    """HTTP-сервер, обслуживающий клиентов одним экземпляром SalaryApp"""
+
+    daemon_threads = True
+
+    def __init__(self, app: SalaryApp, host: str = protocol.DEFAULT_HOST, port: int = protocol.DEFAULT_PORT,
+                 max_concurrent: Optional[int] = None):
+        """
+        :param app: экземпляр приложения, общий для всех клиентов
+        :param host: адрес для прослушивания
+        :param port: порт
+        :param max_concurrent: число одновременно выполняемых вызовов (по умолчанию -
+                               размер пула соединений приложения / CONNECTIONS_PER_REQUEST)
+        """
+        super().__init__((host, port), SalaryRequestHandler)
+        self.app = app
+        if max_concurrent is None:
+            max_concurrent = app.db_connection.connection_pool.maxconn // CONNECTIONS_PER_REQUEST
+        self.max_concurrent = max(1, max_concurrent)
+        # Остальные запросы ждут в потоках соединений
+        self.request_slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Адрес службы для клиентов"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Запустить обработку запросов в фоновом потоке"""
+        self._thread = threading.Thread(target=self.serve_forever, name='salary-service', daemon=True)
+        self._thread.start()
+        logger.info(f"Служба расчета зарплаты запущена: {self.url} (одновременных вызовов: {self.max_concurrent})")
+
+    def stop(self):
+        """Остановить службу (приложение закрывает вызывающий код)"""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        logger.info("Служба расчета зарплаты остановлена")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальная служба расчета зарплаты")
+    parser.add_argument('--host', default=protocol.DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=protocol.DEFAULT_PORT)
+    parser.add_argument('--db-host', default='localhost')
+    parser.add_argument('--db-name', default='salary_calculator2')
+    parser.add_argument('--db-user', default='postgres')
+    parser.add_argument('--db-password', default='123321445')
+    parser.add_argument('--db-port', default='5432')
+    parser.add_argument('--pool-size', type=int, default=10, help="максимальное число соединений с БД")
+    parser.add_argument('--log-file', default='service.log', help="файл журнала (JSON, с ротацией)")
+    parser.add_argument('--log-level', default='INFO')
+    options = parser.parse_args()
+
+    setup_logging(options.log_file, options.log_level)
+
+    db_config = {
+        'host': options.db_host,
+        'database': options.db_name,
+        'user': options.db_user,
+        'password': options.db_password,
+        'port': options.db_port,
+        'pool_max': options.pool_size,
+    }
+
+    app = SalaryApp(db_config)
+    service = SalaryService(app, options.host, options.port)
+    logger.info(f"Служба расчета зарплаты запущена: {service.url} (одновременных вызовов: {service.max_concurrent})")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.server_close()
+        app.close()
+
+
+if __name__ == '__main__':
+    main()
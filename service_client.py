@@ -0,0 +1,114 @@
+"""
+Клиент локальной службы расчета зарплаты
+
+SalaryServiceClient повторяет интерфейс SalaryApp для методов из
+service_protocol.SERVICE_METHODS, поэтому может заменить его в GUI
+и скриптах: client.get_teacher_by_id(5) выполняет запрос к службе.
+"""
+import http.client
+import logging
+import os
+import threading
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import service_protocol as protocol
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceError(Exception):
+    """Ошибка, возвращенная службой или возникшая при обращении к ней"""
+
+
+class SalaryServiceClient:
+    """Клиент службы расчета зарплаты с интерфейсом SalaryApp"""
+
+    def __init__(self, base_url: str, timeout: float = 60):
+        """
+        :param base_url: адрес службы (например, http://127.0.0.1:8765)
+        :param timeout: тайм-аут запроса (с)
+        """
+        parts = urlsplit(base_url)
+        if parts.scheme != 'http' or not parts.hostname:
+            raise ValueError(f"Неверный адрес службы: {base_url}")
+        self.base_url = base_url
+        self.host = parts.hostname
+        self.port = parts.port or protocol.DEFAULT_PORT
+        self.timeout = timeout
+        # Соединение HTTP/1.1 сохраняется между запросами отдельно для каждого потока
+        self._local = threading.local()
+
+    @classmethod
+    def from_environment(cls) -> Optional['SalaryServiceClient']:
+        """Клиент для адреса из переменной окружения SALARY_SERVICE_URL или None"""
+        url = os.environ.get(protocol.SERVICE_URL_ENV)
+        return cls(url) if url else None
+
+    def __getattr__(self, name: str):
+        if name not in protocol.SERVICE_METHODS:
+            raise AttributeError(f"'{type(self).__name__}' has no attribute '{name}'")
+
+        def call(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+        call.__name__ = name
+        return call
+
+    def call(self, method_name: str, *args, **kwargs) -> Any:
+        """
+        Вызвать метод приложения в службе
+
+        :param method_name: имя метода SalaryApp
+        :return: результат метода
+        """
+        # Функции обратного вызова (progress_callback) через службу не передаются
+        kwargs = {key: value for key, value in kwargs.items() if not callable(value)}
+        body = protocol.dumps({'args': list(args), 'kwargs': kwargs})
+        status, payload = self._request('POST', f"/api/{method_name}", body)
+        if status == 200:
+            return payload['result']
+
+        error = payload.get('error', f"HTTP {status}") if isinstance(payload, dict) else f"HTTP {status}"
+        error_type = protocol.ERROR_TYPES.get(payload.get('error_type') if isinstance(payload, dict) else None)
+        if error_type is not None:
+            raise error_type(error)
+        raise ServiceError(error)
+
+    def health(self) -> Dict[str, Any]:
+        """Проверить доступность службы"""
+        status, payload = self._request('GET', '/health')
+        if status != 200:
+            raise ServiceError(f"Служба недоступна: HTTP {status}")
+        return payload['result']
+
+    def close(self):
+        """Закрыть соединение текущего потока (аналог SalaryApp.close)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def _request(self, verb: str, path: str, body: bytes = None):
+        """Выполнить запрос; если служба закрыла сохраненное соединение, повторить на новом"""
+        headers = {'Content-Type': 'application/json; charset=utf-8'}
+        while True:
+            reused = getattr(self._local, 'connection', None) is not None
+            connection = self._connection()
+            try:
+                connection.request(verb, path, body=body, headers=headers)
+                response = connection.getresponse()
+                return response.status, protocol.loads(response.read())
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self.close()
+                if not reused:
+                    raise ServiceError(f"Служба недоступна ({self.base_url}): {str(e)}")
+            except OSError as e:
+                self.close()
+                raise ServiceError(f"Служба недоступна ({self.base_url}): {str(e)}")
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout)
+        return connection
@@ -0,0 +1,87 @@
+"""
+Протокол обмена между службой расчета зарплаты и клиентами
+
+Вызов метода SalaryApp - запрос POST /api/<метод> с телом
+{"args": [...], "kwargs": {...}}. Ответ - {"result": ...} или
+{"error": "текст", "error_type": "ValueError"}. Даты и Decimal передаются
+в виде помеченных объектов ({"__date__": "2024-01-31"}), чтобы клиент
+получал те же типы, что и при прямом вызове SalaryApp.
+"""
+import datetime
+import json
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any
+
+# Адрес службы по умолчанию
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Переменная окружения с адресом службы для клиентов (например, http://127.0.0.1:8765)
+SERVICE_URL_ENV = 'SALARY_SERVICE_URL'
+
+# Методы SalaryApp, доступные через службу
+SERVICE_METHODS = frozenset({
+    # Преподаватели
+    'get_all_teachers', 'get_teacher_by_id', 'add_teacher', 'update_teacher',
+    'delete_teacher', 'import_teachers_from_csv',
+    # Расчет зарплаты
+    'calculate_salary', 'save_salary_calculation', 'get_teacher_salary_statistics',
+    'get_salary_data_for_period', 'get_all_teachers_salary_data', 'get_calculations_by_teacher',
+    'recalculate_stale', 'run_payroll', 'resume_payroll_run', 'get_payroll_run',
+    # Отпуска
+    'get_teacher_vacation_days', 'get_teacher_remaining_vacation_days', 'get_teacher_used_vacation_days',
+    'get_transferred_vacation_days_in', 'get_transferred_vacation_days_out', 'transfer_vacation_days',
+    'schedule_vacation', 'cancel_vacation', 'mark_vacation_as_used', 'calculate_vacation_payment',
+    'calculate_due_vacation_payments', 'get_max_concurrent_absences', 'set_vacation_coverage_limit',
+    'get_teacher_vacations', 'get_vacation_by_id', 'get_all_current_vacations', 'get_vacation_bitmap',
+    'get_daily_absences', 'get_vacation_statistics',
+    'suggest_optimal_vacation_distribution', 'plan_vacations_for_staff',
+    'get_all_teachers_vacation_data', 'get_vacation_calendar', 'get_all_teachers_sick_leave_data',
+    # Отчеты
+    'export_vacation_report', 'generate_monthly_payroll_report', 'export_teacher_reports_batch',
+    # Диагностика
+    'query_stats', 'reset_query_stats',
+})
+
+# Типы исключений, восстанавливаемые на стороне клиента
+ERROR_TYPES = {'ValueError': ValueError, 'KeyError': KeyError, 'FileNotFoundError': FileNotFoundError}
+
+
+class ServiceJSONEncoder(json.JSONEncoder):
+    """Кодирование дат и Decimal помеченными объектами, строк результатов (models) - словарями"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return {'__datetime__': o.isoformat()}
+        if isinstance(o, datetime.date):
+            return {'__date__': o.isoformat()}
+        if isinstance(o, Decimal):
+            return {'__decimal__': str(o)}
+        if isinstance(o, (set, frozenset)):
+            return list(o)
+        if isinstance(o, Mapping):
+            return dict(o)
+        return super().default(o)
+
+
+def _decode_object(obj: dict) -> Any:
+    """Восстановление помеченных объектов"""
+    if len(obj) == 1:
+        if '__date__' in obj:
+            return datetime.date.fromisoformat(obj['__date__'])
+        if '__datetime__' in obj:
+            return datetime.datetime.fromisoformat(obj['__datetime__'])
+        if '__decimal__' in obj:
+            return Decimal(obj['__decimal__'])
+    return obj
+
+
+def dumps(value: Any) -> bytes:
+    """Сериализовать значение в тело запроса или ответа"""
+    return json.dumps(value, cls=ServiceJSONEncoder, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    """Разобрать тело запроса или ответа"""
+    return json.loads(data.decode('utf-8'), object_hook=_decode_object) if data else None
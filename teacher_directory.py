@@ -0,0 +1,272 @@
+"""
+Справочник преподавателей на стороне клиента
+
+Список преподавателей загружается из БД один раз и далее поддерживается
+в памяти: после добавления, изменения и удаления обновляется только
+затронутая запись. Поиск по ФИО и должности выполняется без обращений к
+БД: по подстроке (как прежний поиск) и по индексу префиксов слов
+(отсортированный список + bisect).
+"""
+import bisect
+import logging
+import re
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Разделители слов в ФИО и названии должности
+_WORD_SPLIT = re.compile(r"[\s.,;:()\-\"']+")
+
+
+def _normalize(value) -> str:
+    """Строка в нижнем регистре для сравнения (ё приравнивается к е)"""
+    if value is None:
+        return ''
+    return str(value).strip().lower().replace('ё', 'е')
+
+
+def _words(value) -> List[str]:
+    """Слова строки в нормализованном виде"""
+    return [word for word in _WORD_SPLIT.split(_normalize(value)) if word]
+
+
+class TeacherDirectory:
+    """Кэш преподавателей с индексами по ID, ФИО и префиксам слов ФИО и должности"""
+
+    def __init__(self, app):
+        """
+        Инициализация справочника
+
+        :param app: экземпляр SalaryApp (или клиент с теми же методами)
+        """
+        self.app = app
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        # ФИО -> отсортированные ID (при совпадении ФИО первым считается меньший ID)
+        self._by_name: Dict[str, List[int]] = {}
+        # ID -> ФИО и должность в нормализованном виде для поиска подстроки
+        self._search_text: Dict[int, Tuple[str, str]] = {}
+        # Отсортированный список (слово, ID) для поиска по префиксу
+        self._tokens: List[Tuple[str, int]] = []
+        # Порядок отображения: (ФИО в нижнем регистре, ID), как ORDER BY name в БД
+        self._order: List[Tuple[str, int]] = []
+        self._loaded = False
+        # Результат последнего поиска: при уточнении запроса
+        # новый результат выбирается только среди этих записей
+        self._last_query: Optional[str] = None
+        self._last_ids: Set[int] = set()
+
+    # --- Загрузка и обновление ---
+
+    @property
+    def loaded(self) -> bool:
+        """Загружен ли справочник из БД"""
+        return self._loaded
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Полностью загрузить справочник из БД
+
+        :return: список преподавателей в порядке отображения
+        """
+        teachers = self.app.get_all_teachers()
+        self._by_id.clear()
+        self._by_name.clear()
+        self._search_text.clear()
+        self._tokens = []
+        self._order = []
+
+        for teacher in teachers:
+            if teacher is None or teacher.get('id') is None:
+                continue
+            self._by_id[teacher['id']] = teacher
+            self._by_name.setdefault(_normalize(teacher.get('name')), []).append(teacher['id'])
+            self._search_text[teacher['id']] = self._teacher_text(teacher)
+            self._tokens.extend(self._teacher_tokens(teacher))
+            self._order.append(self._order_key(teacher))
+
+        for ids in self._by_name.values():
+            ids.sort()
+        self._tokens.sort()
+        self._order.sort()
+        self._loaded = True
+        self._reset_search()
+        logger.info(f"Справочник преподавателей загружен: {len(self._by_id)} записей")
+        return self.all()
+
+    def ensure_loaded(self):
+        """Загрузить справочник, если он еще не загружен"""
+        if not self._loaded:
+            self.load()
+
+    def refresh_teacher(self, teacher_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Перечитать из БД одного преподавателя после добавления или изменения
+
+        :param teacher_id: ID преподавателя
+        :return: данные преподавателя или None, если он удален
+        """
+        teacher = self.app.get_teacher_by_id(teacher_id)
+        if teacher is None:
+            self.remove(teacher_id)
+        else:
+            self.upsert(teacher)
+        return teacher
+
+    def upsert(self, teacher: Dict[str, Any]):
+        """
+        Добавить или заменить запись преподавателя в справочнике
+
+        :param teacher: данные преподавателя (должен содержать 'id')
+        """
+        teacher_id = teacher['id']
+        if teacher_id in self._by_id:
+            self.remove(teacher_id)
+
+        self._by_id[teacher_id] = teacher
+        bisect.insort(self._by_name.setdefault(_normalize(teacher.get('name')), []), teacher_id)
+        self._search_text[teacher_id] = self._teacher_text(teacher)
+        for token in self._teacher_tokens(teacher):
+            bisect.insort(self._tokens, token)
+        bisect.insort(self._order, self._order_key(teacher))
+        self._reset_search()
+
+    def remove(self, teacher_id: int) -> bool:
+        """
+        Удалить преподавателя из справочника
+
+        :param teacher_id: ID преподавателя
+        :return: True, если запись была в справочнике
+        """
+        teacher = self._by_id.pop(teacher_id, None)
+        if teacher is None:
+            return False
+
+        name = _normalize(teacher.get('name'))
+        ids = self._by_name.get(name, [])
+        self._remove_sorted(ids, teacher_id)
+        if not ids:
+            self._by_name.pop(name, None)
+        self._search_text.pop(teacher_id, None)
+        for token in self._teacher_tokens(teacher):
+            self._remove_sorted(self._tokens, token)
+        self._remove_sorted(self._order, self._order_key(teacher))
+        self._reset_search()
+        return True
+
+    # --- Доступ к данным ---
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Все преподаватели в порядке ФИО"""
+        return [self._by_id[teacher_id] for _, teacher_id in self._order]
+
+    def get(self, teacher_id: int) -> Optional[Dict[str, Any]]:
+        """Преподаватель по ID"""
+        return self._by_id.get(teacher_id)
+
+    def id_by_name(self, name: str) -> Optional[int]:
+        """
+        ID преподавателя по ФИО (без учета регистра)
+
+        :param name: ФИО преподавателя
+        :return: ID (при совпадающих ФИО - первого в списке) или None, если преподаватель не найден
+        """
+        ids = self._by_name.get(_normalize(name))
+        return ids[0] if ids else None
+
+    def names(self) -> List[str]:
+        """ФИО всех преподавателей в порядке отображения (для комбобоксов)"""
+        return [self._by_id[teacher_id].get('name', '') for _, teacher_id in self._order]
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Поиск преподавателей по ФИО и должности
+
+        Находятся записи, в ФИО или должности которых есть запрос целиком
+        (как в прежнем поиске), а также записи, у которых каждое слово
+        запроса - начало какого-либо слова ФИО или должности ("ив пет"
+        находит "Иванов Петр"). Если запрос дополняет предыдущий, результат
+        выбирается среди предыдущих найденных записей.
+
+        :param query: поисковый запрос
+        :return: найденные преподаватели в порядке ФИО
+        """
+        words = _words(query)
+        if not words:
+            self._reset_search()
+            return self.all()
+
+        term = _normalize(query)
+        narrowing = self._last_query is not None and term.startswith(self._last_query)
+
+        if narrowing:
+            # Дополненный запрос: оба условия могут выполняться только для
+            # записей предыдущего результата
+            candidates = self._last_ids
+            prefix_matched = {teacher_id for teacher_id in candidates
+                              if all(self._has_prefix(teacher_id, word) for word in words)}
+        else:
+            candidates = self._by_id.keys()
+            prefix_matched = None
+            for word in words:
+                ids = self._prefix_ids(word)
+                prefix_matched = ids if prefix_matched is None else prefix_matched & ids
+                if not prefix_matched:
+                    break
+
+        matched = {teacher_id for teacher_id in candidates
+                   if term in self._search_text[teacher_id][0] or term in self._search_text[teacher_id][1]}
+        matched |= prefix_matched
+
+        self._last_query = term
+        self._last_ids = matched
+
+        ordered = sorted(matched, key=lambda teacher_id: self._order_key(self._by_id[teacher_id]))
+        return [self._by_id[teacher_id] for teacher_id in ordered]
+
+    # --- Внутренние методы ---
+
+    def _reset_search(self):
+        """Сбросить состояние уточняющего поиска"""
+        self._last_query = None
+        self._last_ids = set()
+
+    def _has_prefix(self, teacher_id: int, prefix: str) -> bool:
+        """Есть ли у преподавателя слово ФИО или должности с заданным префиксом"""
+        teacher = self._by_id[teacher_id]
+        return any(word.startswith(prefix)
+                   for word in _words(teacher.get('name')) + _words(teacher.get('position')))
+
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        """ID преподавателей, у которых есть слово с заданным префиксом"""
+        ids = set()
+        index = bisect.bisect_left(self._tokens, (prefix,))
+        while index < len(self._tokens) and self._tokens[index][0].startswith(prefix):
+            ids.add(self._tokens[index][1])
+            index += 1
+        return ids
+
+    @staticmethod
+    def _teacher_tokens(teacher: Dict[str, Any]) -> List[Tuple[str, int]]:
+        """Уникальные слова ФИО и должности преподавателя для индекса"""
+        words = set(_words(teacher.get('name'))) | set(_words(teacher.get('position')))
+        return [(word, teacher['id']) for word in words]
+
+    @staticmethod
+    def _teacher_text(teacher: Dict[str, Any]) -> Tuple[str, str]:
+        """ФИО и должность преподавателя для поиска подстроки"""
+        return _normalize(teacher.get('name')), _normalize(teacher.get('position'))
+
+    @staticmethod
+    def _order_key(teacher: Dict[str, Any]) -> Tuple[str, int]:
+        """Ключ сортировки для порядка отображения"""
+        return (_normalize(teacher.get('name')), teacher['id'])
+
+    @staticmethod
+    def _remove_sorted(items: list, value):
+        """Удалить значение из отсортированного списка"""
+        index = bisect.bisect_left(items, value)
+        if index < len(items) and items[index] == value:
+            del items[index]
@@ -0,0 +1,209 @@
+"""
+Массовый импорт преподавателей из CSV-файла
+
+Файл читается и проверяется за один потоковый проход: корректные строки
+сразу преобразуются в формат COPY и передаются в БД по мере чтения,
+ошибочные строки собираются в список ошибок с номерами строк. Загрузка
+выполняется одной командой COPY во временную таблицу и слиянием с
+таблицей teachers (см. TeacherRepository.bulk_upsert_teachers).
+"""
+import csv
+import datetime
+import io
+import logging
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Порядок столбцов временной таблицы импорта (после номера строки файла)
+IMPORT_COLUMNS = (
+    'id', 'name', 'hourly_rate', 'is_young_specialist', 'is_union_member',
+    'position', 'academic_degree', 'qualification_category',
+    'experience_years', 'hire_date', 'birth_date',
+)
+
+# Маркер NULL в потоке COPY
+COPY_NULL = '\\N'
+
+_TRUE_VALUES = ('true', 'yes', '1', 'да')
+
+
+def _parse_date(value: str, field: str) -> datetime.date:
+    """Дата в формате ДД.ММ.ГГГГ"""
+    try:
+        return datetime.datetime.strptime(value.strip(), "%d.%m.%Y").date()
+    except ValueError:
+        raise ValueError(f"Неверный формат даты в поле {field}: '{value}' (ожидается ДД.ММ.ГГГГ)")
+
+
+def parse_teacher_row(row: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Проверить строку CSV и преобразовать ее в данные преподавателя
+
+    :param row: строка CSV (словарь из csv.DictReader)
+    :return: данные преподавателя ('id' - None для новых записей)
+    """
+    name = (row.get('name') or '').strip()
+    hourly_rate = (row.get('hourly_rate') or '').strip()
+    hire_date = (row.get('hire_date') or '').strip()
+    if not name or not hourly_rate or not hire_date:
+        raise ValueError("Отсутствуют обязательные поля")
+
+    try:
+        rate = Decimal(hourly_rate.replace(',', '.'))
+    except InvalidOperation:
+        raise ValueError(f"Неверное значение часовой ставки: '{hourly_rate}'")
+    if not rate.is_finite():
+        raise ValueError(f"Неверное значение часовой ставки: '{hourly_rate}'")
+    if rate < 0:
+        raise ValueError("Часовая ставка не может быть отрицательной")
+
+    experience = (row.get('experience_years') or '').strip() or '0'
+    try:
+        experience_years = int(experience)
+    except ValueError:
+        raise ValueError(f"Неверное значение стажа: '{experience}'")
+
+    teacher_id = (row.get('id') or '').strip()
+    try:
+        teacher_id = int(teacher_id) if teacher_id else None
+    except ValueError:
+        raise ValueError(f"Неверное значение ID: '{teacher_id}'")
+
+    birth_date = (row.get('birth_date') or '').strip()
+
+    return {
+        'id': teacher_id,
+        'name': name,
+        'position': (row.get('position') or '').strip(),
+        'academic_degree': (row.get('academic_degree') or '').strip(),
+        'qualification_category': (row.get('qualification_category') or '').strip(),
+        'hourly_rate': rate,
+        'experience_years': experience_years,
+        'hire_date': _parse_date(hire_date, 'hire_date'),
+        'birth_date': _parse_date(birth_date, 'birth_date') if birth_date else None,
+        'is_young_specialist': (row.get('is_young_specialist') or '').strip().lower() in _TRUE_VALUES,
+        'is_union_member': (row.get('is_union_member') or '').strip().lower() in _TRUE_VALUES,
+    }
+
+
+def iter_teacher_rows(csv_file) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Потоковый разбор CSV-файла преподавателей
+
+    :param csv_file: открытый текстовый файл
+    :return: генератор (номер строки, данные или None, текст ошибки или None)
+    """
+    reader = csv.DictReader(csv_file)
+    for line_no, row in enumerate(reader, start=2):  # строка 1 - заголовки
+        try:
+            yield line_no, parse_teacher_row(row), None
+        except ValueError as e:
+            yield line_no, None, str(e)
+
+
+def _copy_value(value) -> Any:
+    """Значение поля в текстовом представлении COPY (формат csv)"""
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+class CopyStream:
+    """
+    Файлоподобный поток строк COPY, формируемых при чтении CSV
+
+    Передается в cursor.copy_expert: строки разбираются и проверяются по мере
+    того, как БД читает поток, поэтому файл не загружается в память целиком.
+    """
+
+    def __init__(self, rows: Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]):
+        """
+        :param rows: генератор iter_teacher_rows
+        """
+        self._rows = rows
+        self._buffer = ''
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line, lineterminator='\n')
+        # Ошибки проверки: (номер строки, текст ошибки)
+        self.errors: List[Tuple[int, str]] = []
+        self.rows_total = 0
+        self.rows_valid = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> str:
+        """Прочитать до size символов потока COPY"""
+        while size < 0 or len(self._buffer) < size:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, ''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def readline(self, size: int = -1) -> str:
+        """Прочитать одну строку потока COPY"""
+        if not self._buffer:
+            self._buffer = self._next_chunk()
+        line, sep, rest = self._buffer.partition('\n')
+        self._buffer = rest
+        return line + sep
+
+    def _next_chunk(self, batch: int = 500) -> str:
+        """Сформировать очередную порцию строк COPY (пустая строка - конец потока)"""
+        self._line.seek(0)
+        self._line.truncate()
+        for line_no, teacher, error in self._rows:
+            self.rows_total += 1
+            if error:
+                self.errors.append((line_no, error))
+                continue
+            self.rows_valid += 1
+            self._writer.writerow([line_no] + [_copy_value(teacher[column]) for column in IMPORT_COLUMNS])
+            batch -= 1
+            if batch <= 0:
+                break
+        return self._line.getvalue()
+
+
+def import_teachers_from_csv(teacher_repo, file_path: str, encoding: str = 'utf-8') -> Dict[str, Any]:
+    """
+    Импортировать преподавателей из CSV-файла одной транзакцией
+
+    Строки с ID обновляют существующих преподавателей, строки без ID
+    добавляют новых.
+
+    :param teacher_repo: экземпляр TeacherRepository
+    :param file_path: путь к CSV-файлу
+    :param encoding: кодировка файла
+    :return: словарь с ключами added, updated, errors (список сообщений), rows_total
+    """
+    with open(file_path, 'r', encoding=encoding, newline='') as csv_file:
+        stream = CopyStream(iter_teacher_rows(csv_file))
+        result = teacher_repo.bulk_upsert_teachers(stream, IMPORT_COLUMNS)
+
+    row_errors = stream.errors + [
+        (line_no, f"преподаватель с ID {teacher_id} не найден")
+        for line_no, teacher_id in result['missing_ids']
+    ]
+    errors = [f"Строка {line_no}: {error}" for line_no, error in sorted(row_errors)]
+
+    logger.info(f"Импорт преподавателей из {file_path}: строк {stream.rows_total}, "
+                f"добавлено {result['added']}, обновлено {result['updated']}, ошибок {len(errors)}")
+    return {
+        'added': result['added'],
+        'updated': result['updated'],
+        'errors': errors,
+        'rows_total': stream.rows_total,
+    }
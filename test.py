@@ -2,6 +2,9 @@ import tkinter as tk
 from tkinter import ttk
 from gui_vacation_tab import VacationTab
 from db_connection import DatabaseConnection
+from logging_config import setup_logging
+
+setup_logging('gui.log')
 
 # Тестовая программа для проверки VacationTab
 root = tk.Tk()
@@ -15,4 +15,23 @@ def format_date_for_sql(date_string):
         day, month, year = date_string.split('.')
         return f"{year}-{month}-{day}"
     except Exception as e:
-        raise ValueError(f"Неверный формат даты. Ожидается ДД.ММ.ГГГГ, получено: {date_string}") from e
\ No newline at end of file
+        raise ValueError(f"Неверный формат даты. Ожидается ДД.ММ.ГГГГ, получено: {date_string}") from e
+
+def count_working_days(start_date, end_date):
+    """
+    Count Monday-Friday days between two dates inclusive in constant time
+    
+    Args:
+        start_date (datetime.date): First day of the period
+        end_date (datetime.date): Last day of the period
+        
+    Returns:
+        int: Number of working days (0 if end_date is before start_date)
+    """
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        return 0
+        
+    full_weeks, rest = divmod(days, 7)
+    first_weekday = start_date.weekday()
+    return full_weeks * 5 + sum(1 for offset in range(rest) if (first_weekday + offset) % 7 < 5)
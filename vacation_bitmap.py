@@ -0,0 +1,177 @@
+"""
+Битовые карты дней отпуска преподавателей
+
+Дни отпусков преподавателя за год хранятся целым числом, в котором бит i
+соответствует i-му дню года (366 бит). Проверка пересечения периодов -
+побитовое И, число дней отпуска в году - число установленных бит, а число
+отсутствующих преподавателей по дням - "вертикальная" сумма карт,
+выполняемая поразрядным сложением (счетчики хранятся битовыми слоями).
+
+Карта года занимает 46 байт (mask_to_bytes), поэтому при необходимости ее
+можно хранить в столбце bytea.
+"""
+import datetime
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Размер карты года в байтах (366 бит)
+BITMAP_BYTES = 46
+
+
+def days_in_year(year: int) -> int:
+    """Число дней в году"""
+    return (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days
+
+
+def day_mask(year: int, start_date: datetime.date, end_date: datetime.date) -> int:
+    """
+    Карта дней периода, попадающих в указанный год
+
+    :param year: год
+    :param start_date: дата начала периода
+    :param end_date: дата окончания периода (включительно)
+    :return: целое число с установленными битами дней периода
+    """
+    first_day = datetime.date(year, 1, 1)
+    lo = max((start_date - first_day).days, 0)
+    hi = min((end_date - first_day).days, days_in_year(year) - 1)
+    if lo > hi:
+        return 0
+    return ((1 << (hi - lo + 1)) - 1) << lo
+
+
+def popcount(mask: int) -> int:
+    """Число установленных бит"""
+    return bin(mask).count('1')
+
+
+def mask_to_bytes(mask: int) -> bytes:
+    """Карта года в виде байтов (для хранения в bytea)"""
+    return mask.to_bytes(BITMAP_BYTES, 'little')
+
+
+def mask_from_bytes(data: bytes) -> int:
+    """Карта года из байтов, полученных mask_to_bytes"""
+    return int.from_bytes(bytes(data), 'little')
+
+
+def iter_periods(year: int, mask: int) -> Iterator[Tuple[datetime.date, datetime.date]]:
+    """
+    Непрерывные периоды карты
+
+    :param year: год карты
+    :param mask: карта дней
+    :return: итератор пар (дата начала, дата окончания)
+    """
+    first_day = datetime.date(year, 1, 1)
+    offset = 0
+    while mask:
+        # Пропускаем нулевые биты, затем отсчитываем длину серии единиц
+        skip = (mask & -mask).bit_length() - 1
+        mask >>= skip
+        offset += skip
+        length = (~mask & (mask + 1)).bit_length() - 1
+        yield (first_day + datetime.timedelta(days=offset),
+               first_day + datetime.timedelta(days=offset + length - 1))
+        mask >>= length
+        offset += length
+
+
+def vertical_sum(masks: Iterable[int], size: int) -> List[int]:
+    """
+    Число установленных бит в каждой позиции по всем картам
+
+    Счетчики хранятся битовыми слоями (слой k - k-й разряд счетчиков всех
+    позиций), поэтому добавление карты - несколько операций над целыми числами.
+
+    :param masks: карты
+    :param size: число позиций
+    :return: список счетчиков по позициям
+    """
+    planes: List[int] = []
+    for carry in masks:
+        level = 0
+        while carry:
+            if level == len(planes):
+                planes.append(0)
+            planes[level], carry = planes[level] ^ carry, planes[level] & carry
+            level += 1
+
+    counts = [0] * size
+    for level, plane in enumerate(planes):
+        weight = 1 << level
+        while plane:
+            low = plane & -plane
+            index = low.bit_length() - 1
+            if index < size:
+                counts[index] += weight
+            plane ^= low
+    return counts
+
+
+class VacationBitmaps:
+    """Карты дней отпуска по преподавателям и годам"""
+
+    def __init__(self):
+        # (ID преподавателя, год) -> карта дней
+        self._masks: Dict[Tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, teacher_id: int, start_date: datetime.date, end_date: datetime.date):
+        """Отметить дни отпуска"""
+        with self._lock:
+            for year in range(start_date.year, end_date.year + 1):
+                key = (teacher_id, year)
+                self._masks[key] = self._masks.get(key, 0) | day_mask(year, start_date, end_date)
+
+    def remove(self, teacher_id: int, start_date: datetime.date, end_date: datetime.date):
+        """Снять отметки дней отпуска (например, при отмене)"""
+        with self._lock:
+            for year in range(start_date.year, end_date.year + 1):
+                key = (teacher_id, year)
+                mask = self._masks.get(key, 0) & ~day_mask(year, start_date, end_date)
+                if mask:
+                    self._masks[key] = mask
+                else:
+                    self._masks.pop(key, None)
+
+    def year_mask(self, teacher_id: int, year: int) -> int:
+        """Карта дней отпуска преподавателя за год"""
+        with self._lock:
+            return self._masks.get((teacher_id, year), 0)
+
+    def overlaps(self, teacher_id: int, start_date: datetime.date, end_date: datetime.date) -> bool:
+        """Пересекается ли период с отпусками преподавателя"""
+        with self._lock:
+            return any(self._masks.get((teacher_id, year), 0) & day_mask(year, start_date, end_date)
+                       for year in range(start_date.year, end_date.year + 1))
+
+    def used_days(self, teacher_id: int, year: int) -> int:
+        """Число дней отпуска преподавателя в году"""
+        return popcount(self.year_mask(teacher_id, year))
+
+    def coverage(self, year: int, teacher_ids: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Число отсутствующих преподавателей в каждый день года
+
+        :param year: год
+        :param teacher_ids: учитываемые преподаватели (None - все)
+        :return: список счетчиков по дням года
+        """
+        with self._lock:
+            if teacher_ids is None:
+                masks = [mask for (_, mask_year), mask in self._masks.items() if mask_year == year]
+            else:
+                masks = [self._masks.get((teacher_id, year), 0) for teacher_id in teacher_ids]
+        return vertical_sum(masks, days_in_year(year))
+
+    def load(self, rows: Iterable[Tuple[int, datetime.date, datetime.date]]):
+        """
+        Заполнить карты заново
+
+        :param rows: кортежи (ID преподавателя, дата начала, дата окончания)
+        """
+        with self._lock:
+            self._masks.clear()
+        for teacher_id, start_date, end_date in rows:
+            self.add(teacher_id, start_date, end_date)
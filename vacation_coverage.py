@@ -0,0 +1,136 @@
+"""
+Индекс одновременных отпусков по должностям
+
+Для каждой должности и года хранится дерево отрезков по дням года с
+операциями "прибавить к диапазону" и "максимум на диапазоне" (ленивое
+распространение), поэтому вопрос "сколько преподавателей должности
+максимально отсутствуют одновременно в периоде" решается за O(log n).
+Индекс строится по отпускам должности, пересекающим запрошенный период
+(VacationProcessor._load_coverage_index), при каждом обращении.
+"""
+import datetime
+import threading
+from typing import Dict, Iterable, Tuple
+
+
+class RangeAddMaxTree:
+    """Дерево отрезков: прибавление к диапазону и максимум на диапазоне"""
+
+    __slots__ = ('size', '_max', '_add')
+
+    def __init__(self, size: int):
+        """
+        :param size: число элементов (все равны 0)
+        """
+        self.size = size
+        self._max = [0] * (4 * size)
+        self._add = [0] * (4 * size)
+
+    def add(self, lo: int, hi: int, delta: int):
+        """Прибавить delta к элементам lo..hi (включительно)"""
+        if lo <= hi:
+            self._update(1, 0, self.size - 1, max(lo, 0), min(hi, self.size - 1), delta)
+
+    def max(self, lo: int, hi: int) -> int:
+        """Максимум элементов lo..hi (включительно)"""
+        lo, hi = max(lo, 0), min(hi, self.size - 1)
+        if lo > hi:
+            return 0
+        return self._query(1, 0, self.size - 1, lo, hi)
+
+    def _update(self, node: int, left: int, right: int, lo: int, hi: int, delta: int):
+        if hi < left or right < lo:
+            return
+        if lo <= left and right <= hi:
+            self._max[node] += delta
+            self._add[node] += delta
+            return
+        middle = (left + right) // 2
+        self._update(2 * node, left, middle, lo, hi, delta)
+        self._update(2 * node + 1, middle + 1, right, lo, hi, delta)
+        self._max[node] = max(self._max[2 * node], self._max[2 * node + 1]) + self._add[node]
+
+    def _query(self, node: int, left: int, right: int, lo: int, hi: int) -> int:
+        if lo <= left and right <= hi:
+            return self._max[node]
+        middle = (left + right) // 2
+        result = None
+        if lo <= middle:
+            result = self._query(2 * node, left, middle, lo, hi)
+        if hi > middle:
+            right_max = self._query(2 * node + 1, middle + 1, right, lo, hi)
+            result = right_max if result is None else max(result, right_max)
+        return result + self._add[node]
+
+
+class VacationCoverageIndex:
+    """Число отсутствующих преподавателей каждой должности по дням"""
+
+    def __init__(self):
+        # (должность, год) -> дерево по дням года
+        self._trees: Dict[Tuple[str, int], RangeAddMaxTree] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_position(position) -> str:
+        """Ключ должности (без учета регистра)"""
+        return (position or '').strip().lower()
+
+    @staticmethod
+    def _year_spans(start_date: datetime.date, end_date: datetime.date):
+        """Части периода по годам: (год, индекс начала, индекс окончания)"""
+        for year in range(start_date.year, end_date.year + 1):
+            first_day = datetime.date(year, 1, 1)
+            lo = max(start_date, first_day)
+            hi = min(end_date, datetime.date(year, 12, 31))
+            yield year, (lo - first_day).days, (hi - first_day).days
+
+    def _tree(self, position: str, year: int) -> RangeAddMaxTree:
+        tree = self._trees.get((position, year))
+        if tree is None:
+            days = (datetime.date(year + 1, 1, 1) - datetime.date(year, 1, 1)).days
+            tree = self._trees[(position, year)] = RangeAddMaxTree(days)
+        return tree
+
+    def add(self, position, start_date: datetime.date, end_date: datetime.date, delta: int = 1):
+        """
+        Учесть отпуск (delta=1) или его отмену (delta=-1)
+
+        :param position: должность преподавателя
+        :param start_date: дата начала отпуска
+        :param end_date: дата окончания отпуска
+        :param delta: изменение числа отсутствующих
+        """
+        position = self.normalize_position(position)
+        with self._lock:
+            for year, lo, hi in self._year_spans(start_date, end_date):
+                self._tree(position, year).add(lo, hi, delta)
+
+    def max_concurrent(self, position, start_date: datetime.date, end_date: datetime.date) -> int:
+        """
+        Максимальное число одновременно отсутствующих преподавателей должности в периоде
+
+        :param position: должность
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: максимум по дням периода
+        """
+        position = self.normalize_position(position)
+        result = 0
+        with self._lock:
+            for year, lo, hi in self._year_spans(start_date, end_date):
+                tree = self._trees.get((position, year))
+                if tree is not None:
+                    result = max(result, tree.max(lo, hi))
+        return result
+
+    def load(self, rows: Iterable[Tuple[str, datetime.date, datetime.date]]):
+        """
+        Заполнить индекс заново
+
+        :param rows: кортежи (должность, дата начала, дата окончания)
+        """
+        with self._lock:
+            self._trees.clear()
+        for position, start_date, end_date in rows:
+            self.add(position, start_date, end_date)
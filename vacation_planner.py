@@ -0,0 +1,300 @@
+"""
+Планирование распределения отпусков
+
+Планировщик делит оставшиеся дни отпуска на части и подбирает для каждой
+части период с учетом производственного календаря Республики Беларусь
+(государственные праздники), каникул и уже запланированных отпусков
+коллег: одновременно в отпуске может находиться не более заданного числа
+преподавателей одной группы (должности).
+
+Оценка периода - сумма весов его дней (каникулы выше, праздничные дни,
+попадающие в отпуск, ниже), поэтому лучший период для части длины n
+находится одним проходом по префиксным суммам года. Занятость дней
+хранится массивами по группам, проверка доступности периода - тоже по
+префиксным суммам, так что расписание для всего штата строится за время
+O(число преподавателей x 366).
+"""
+import datetime
+import logging
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Минимальная длина основной части отпуска при разделении (календарных дней)
+MIN_MAIN_PART_DAYS = 14
+
+# Максимальная длина одной части и минимальная длина дополнительной части
+MAX_PART_DAYS = 28
+MIN_PART_DAYS = 7
+
+# Минимальный промежуток между частями отпуска одного преподавателя (дней)
+MIN_GAP_DAYS = 7
+
+# Доля преподавателей группы, которые могут быть в отпуске одновременно
+DEFAULT_MAX_ABSENT_SHARE = 0.5
+
+# Веса дней при выборе периода
+HOLIDAY_WEIGHT = -2.0
+WORKDAY_WEIGHT = 0.0
+# Штраф за уже занятые места группы в этот день (в долях от вместимости)
+OCCUPANCY_PENALTY = 0.5
+
+# Каникулы: (месяц, день начала, месяц, день окончания, вес, название)
+DEFAULT_BREAKS = (
+    (1, 1, 1, 10, 1.5, 'зимние каникулы'),
+    (3, 23, 3, 31, 1.0, 'весенние каникулы'),
+    (6, 25, 8, 31, 3.0, 'летние каникулы'),
+    (10, 28, 11, 5, 1.0, 'осенние каникулы'),
+    (12, 24, 12, 31, 1.5, 'зимние каникулы'),
+)
+
+
+def orthodox_easter(year: int) -> datetime.date:
+    """
+    Дата православной Пасхи (по григорианскому календарю, 1900-2099)
+
+    :param year: год
+    :return: дата Пасхи
+    """
+    a, b, c = year % 4, year % 7, year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month, day = divmod(d + e + 114, 31)
+    return datetime.date(year, month, day + 1) + datetime.timedelta(days=13)
+
+
+def public_holidays(year: int) -> Set[datetime.date]:
+    """
+    Государственные праздники Республики Беларусь, являющиеся нерабочими днями
+
+    :param year: год
+    :return: множество дат
+    """
+    holidays = {
+        datetime.date(year, 1, 1),    # Новый год
+        datetime.date(year, 1, 2),
+        datetime.date(year, 1, 7),    # Рождество Христово (православное)
+        datetime.date(year, 3, 8),    # День женщин
+        datetime.date(year, 5, 1),    # Праздник труда
+        datetime.date(year, 5, 9),    # День Победы
+        datetime.date(year, 7, 3),    # День Независимости
+        datetime.date(year, 11, 7),   # День Октябрьской революции
+        datetime.date(year, 12, 25),  # Рождество Христово (католическое)
+    }
+    # Радуница - вторник через 9 дней после православной Пасхи
+    holidays.add(orthodox_easter(year) + datetime.timedelta(days=9))
+    return holidays
+
+
+def school_breaks(year: int, breaks=DEFAULT_BREAKS) -> List[Tuple[datetime.date, datetime.date, float, str]]:
+    """
+    Каникулы года
+
+    :param year: год
+    :param breaks: описание каникул (см. DEFAULT_BREAKS)
+    :return: список (начало, окончание, вес, название)
+    """
+    return [(datetime.date(year, m1, d1), datetime.date(year, m2, d2), weight, name)
+            for m1, d1, m2, d2, weight, name in breaks]
+
+
+def split_vacation_days(days: int, max_part: int = MAX_PART_DAYS, min_part: int = MIN_PART_DAYS,
+                        min_main: int = MIN_MAIN_PART_DAYS) -> List[int]:
+    """
+    Разделить дни отпуска на части
+
+    Основная часть не короче min_main дней, дополнительные части - не короче
+    min_part (короткий остаток присоединяется к предыдущей части).
+
+    :param days: число дней отпуска
+    :return: длины частей по убыванию
+    """
+    if days <= 0:
+        return []
+    if days <= max(max_part, min_main):
+        return [days]
+
+    parts = []
+    rest = days
+    while rest > 0:
+        part = min(rest, max_part)
+        if parts and part < min_part:
+            parts[-1] += part
+        else:
+            parts.append(part)
+        rest -= part
+    return sorted(parts, reverse=True)
+
+
+def _prefix(values: Iterable[float]) -> List[float]:
+    """Префиксные суммы (prefix[i] - сумма первых i значений)"""
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    return prefix
+
+
+def format_period(start: datetime.date, end: datetime.date) -> str:
+    """Период в виде 'с ДД.ММ.ГГГГ по ДД.ММ.ГГГГ'"""
+    return f"с {start.strftime('%d.%m.%Y')} по {end.strftime('%d.%m.%Y')}"
+
+
+class VacationPlanner:
+    """Подбор периодов отпуска для преподавателей на один год"""
+
+    def __init__(self, year: int, start_from: Optional[datetime.date] = None,
+                 holidays: Optional[Set[datetime.date]] = None, breaks=DEFAULT_BREAKS):
+        """
+        :param year: год планирования
+        :param start_from: первая допустимая дата начала отпуска (например, сегодня)
+        :param holidays: нерабочие праздничные дни (по умолчанию - праздники РБ)
+        :param breaks: описание каникул (см. DEFAULT_BREAKS)
+        """
+        self.year = year
+        self.first_day = datetime.date(year, 1, 1)
+        self.days_in_year = (datetime.date(year + 1, 1, 1) - self.first_day).days
+        self.start_index = 0
+        if start_from is not None and start_from > self.first_day:
+            self.start_index = min(self.days_in_year, (start_from - self.first_day).days)
+
+        self.holidays = public_holidays(year) if holidays is None else holidays
+        self.breaks = school_breaks(year, breaks)
+
+        # Вес каждого дня года
+        self.day_weights = [WORKDAY_WEIGHT] * self.days_in_year
+        for start, end, weight, _ in self.breaks:
+            for index in range(self._index(start), self._index(end) + 1):
+                self.day_weights[index] = max(self.day_weights[index], weight)
+        for holiday in self.holidays:
+            if holiday.year == year:
+                self.day_weights[self._index(holiday)] += HOLIDAY_WEIGHT
+
+        # Занятость по группам: число преподавателей группы в отпуске в каждый день
+        self.capacity: Dict[Any, int] = {}
+        self.occupancy: Dict[Any, List[int]] = {}
+        # Занятые дни каждого преподавателя
+        self.busy: Dict[Any, List[bool]] = {}
+
+    def _index(self, day: datetime.date) -> int:
+        return (day - self.first_day).days
+
+    def _date(self, index: int) -> datetime.date:
+        return self.first_day + datetime.timedelta(days=index)
+
+    def set_capacity(self, group, capacity: int):
+        """
+        Задать максимальное число преподавателей группы в отпуске одновременно
+
+        :param group: группа (должность)
+        :param capacity: вместимость (не меньше 1)
+        """
+        self.capacity[group] = max(1, capacity)
+        self.occupancy.setdefault(group, [0] * self.days_in_year)
+
+    def _clip(self, start: datetime.date, end: datetime.date) -> Optional[Tuple[int, int]]:
+        """Индексы периода в пределах года (включительно) или None"""
+        lo = max(self._index(start), 0)
+        hi = min(self._index(end), self.days_in_year - 1)
+        return (lo, hi) if lo <= hi else None
+
+    def add_existing(self, teacher_id, group, start: datetime.date, end: datetime.date):
+        """
+        Учесть уже запланированный отпуск
+
+        :param teacher_id: ID преподавателя
+        :param group: группа преподавателя
+        :param start: дата начала
+        :param end: дата окончания
+        """
+        span = self._clip(start, end)
+        if span is None:
+            return
+        occupancy = self.occupancy.setdefault(group, [0] * self.days_in_year)
+        busy = self.busy.setdefault(teacher_id, [False] * self.days_in_year)
+        for index in range(span[0], span[1] + 1):
+            occupancy[index] += 1
+        for index in range(max(0, span[0] - MIN_GAP_DAYS), min(self.days_in_year, span[1] + MIN_GAP_DAYS + 1)):
+            busy[index] = True
+
+    def plan_teacher(self, teacher_id, group, days: int) -> List[Dict[str, Any]]:
+        """
+        Подобрать периоды отпуска для одного преподавателя и занять их
+
+        :param teacher_id: ID преподавателя
+        :param group: группа преподавателя
+        :param days: число дней отпуска для распределения
+        :return: список частей ({'start', 'end', 'days', 'description'}) по дате начала
+        """
+        if group not in self.capacity:
+            self.set_capacity(group, 1)
+        capacity = self.capacity[group]
+        occupancy = self.occupancy[group]
+        busy = self.busy.setdefault(teacher_id, [False] * self.days_in_year)
+
+        result = []
+        for length in split_vacation_days(days):
+            placed = self._place(length, capacity, occupancy, busy)
+            if placed is None:
+                logger.warning(f"Не удалось подобрать период из {length} дней для преподавателя ID {teacher_id}")
+                continue
+            start_index, score = placed
+            end_index = start_index + length - 1
+            for index in range(start_index, end_index + 1):
+                occupancy[index] += 1
+            # Дни вокруг части недоступны для следующих частей того же преподавателя
+            for index in range(max(0, start_index - MIN_GAP_DAYS),
+                               min(self.days_in_year, end_index + MIN_GAP_DAYS + 1)):
+                busy[index] = True
+            result.append(self._describe(start_index, end_index, score))
+
+        result.sort(key=lambda part: part['start'])
+        return result
+
+    def plan(self, requests: Iterable[Tuple[Any, Any, int]]) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Распределить отпуска для нескольких преподавателей
+
+        Первыми размещаются преподаватели с наибольшим числом дней.
+
+        :param requests: кортежи (ID преподавателя, группа, число дней)
+        :return: словарь {ID преподавателя: список частей отпуска}
+        """
+        ordered = sorted(requests, key=lambda request: -request[2])
+        return {teacher_id: self.plan_teacher(teacher_id, group, days)
+                for teacher_id, group, days in ordered}
+
+    def _place(self, length: int, capacity: int, occupancy: List[int],
+               busy: List[bool]) -> Optional[Tuple[int, float]]:
+        """Лучшее начало части длины length: (индекс начала, оценка) или None"""
+        if length > self.days_in_year - self.start_index:
+            return None
+
+        scores = _prefix(weight - OCCUPANCY_PENALTY * occupied / capacity
+                         for weight, occupied in zip(self.day_weights, occupancy))
+        blocked = _prefix(1 if (busy[index] or occupancy[index] >= capacity) else 0
+                          for index in range(self.days_in_year))
+
+        best = None
+        for start in range(self.start_index, self.days_in_year - length + 1):
+            end = start + length
+            if blocked[end] - blocked[start]:
+                continue
+            score = scores[end] - scores[start]
+            if best is None or score > best[1] + 1e-9:
+                best = (start, score)
+        return best
+
+    def _describe(self, start_index: int, end_index: int, score: float) -> Dict[str, Any]:
+        """Описание части отпуска"""
+        start, end = self._date(start_index), self._date(end_index)
+        days = end_index - start_index + 1
+        notes = [name for break_start, break_end, _, name in self.breaks
+                 if break_start <= end and break_end >= start]
+        holidays = sum(1 for holiday in self.holidays if start <= holiday <= end)
+
+        description = f"{format_period(start, end)} ({days} дн.)"
+        if notes:
+            description += ", " + ", ".join(dict.fromkeys(notes))
+        if holidays:
+            description += f", праздничных дней: {holidays}"
+        return {'start': start, 'end': end, 'days': days, 'description': description, 'score': round(score, 2)}
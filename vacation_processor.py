@@ -2,27 +2,61 @@ import datetime
 from typing import Dict, Any, List, Optional
 import logging
 from decimal import Decimal, ROUND_HALF_UP
+from psycopg2.extras import execute_values
 import db_connection as db
 from salary_calculator import SalaryCalculator
+from vacation_planner import VacationPlanner, DEFAULT_MAX_ABSENT_SHARE
+from vacation_coverage import VacationCoverageIndex
+from vacation_bitmap import VacationBitmaps
+from models import Teacher, Vacation, fetch_row, fetch_rows
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Часто выполняемые запросы (подготавливаются один раз на соединение)
+db.register_prepared_statement('vacation_used_days', ('integer',), """
+    SELECT COALESCE(SUM(days_count), 0)
+    FROM teacher_vacations
+    WHERE teacher_id = $1
+    AND status IN ('запланирован', 'использован', 'оплачен')
+""")
+
+# Дни отпуска за год: days_count каждого отпуска, начинающегося или заканчивающегося в этом году
+db.register_prepared_statement('vacation_used_days_in_year', ('integer', 'date', 'date'), """
+    SELECT COALESCE(SUM(days_count), 0)
+    FROM teacher_vacations
+    WHERE teacher_id = $1
+    AND status IN ('запланирован', 'использован', 'оплачен')
+    AND (start_date BETWEEN $2 AND $3 OR end_date BETWEEN $2 AND $3)
+""")
+
+db.register_prepared_statement('vacation_days_transferred_in', ('integer', 'integer'), """
+    SELECT COALESCE(SUM(days_count), 0)
+    FROM vacation_days_transfer
+    WHERE teacher_id = $1 AND to_year = $2
+""")
+
+db.register_prepared_statement('vacation_days_transferred_out', ('integer', 'integer'), """
+    SELECT COALESCE(SUM(days_count), 0)
+    FROM vacation_days_transfer
+    WHERE teacher_id = $1 AND from_year = $2
+""")
+
 class VacationProcessor:
     """Класс для обработки отпусков преподавателей"""
     
-    def __init__(self, db_conn: db.DatabaseConnection, salary_calculator: SalaryCalculator = None):
+    def __init__(self, db_conn: db.DatabaseConnection, salary_calculator: SalaryCalculator = None,
+                 coverage_limits: Dict[str, int] = None):
         """
         Инициализация процессора отпусков
         
         :param db_conn: объект подключения к базе данных
         :param salary_calculator: объект калькулятора зарплаты (опционально)
+        :param coverage_limits: максимальное число одновременно отсутствующих
+                                преподавателей по должностям {должность: лимит}
         """
         self.db_conn = db_conn
+        self.coverage_limits = {VacationCoverageIndex.normalize_position(position): limit
+                                for position, limit in (coverage_limits or {}).items()}
         self.teacher_repo = db.TeacherRepository(db_conn)
         self.salary_repo = db.SalaryCalculationRepository(db_conn)
         self.reference_repo = db.ReferenceDataRepository(db_conn)
@@ -34,6 +68,7 @@ class VacationProcessor:
         
         self._create_vacation_table_if_not_exists()
         self._create_vacation_transfer_table_if_not_exists()
+        self._create_vacation_calendar_if_not_exists()
     
     def _create_vacation_table_if_not_exists(self):
         """Создание таблицы для хранения информации об отпусках, если она не существует"""
@@ -71,6 +106,10 @@ class VacationProcessor:
                 CREATE INDEX IF NOT EXISTS idx_vacation_status 
                 ON teacher_vacations(status)
             """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vacation_teacher_start
+                ON teacher_vacations(teacher_id, start_date, id)
+            """)
             
             connection.commit()
             logger.info("Таблица для хранения информации об отпусках проверена/создана")
@@ -120,6 +159,97 @@ class VacationProcessor:
             cursor.close()
             self.db_conn.release_connection(connection)
     
+    def _create_vacation_calendar_if_not_exists(self):
+        """
+        Создание календаря отсутствий: строка на каждый день каждого отпуска
+
+        Календарь поддерживается триггером на teacher_vacations (отмененные
+        отпуска в него не попадают) и при первом создании заполняется из
+        уже существующих отпусков.
+        """
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            cursor.execute("SELECT to_regclass('teacher_vacation_days') IS NOT NULL")
+            calendar_exists = cursor.fetchone()[0]
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS teacher_vacation_days (
+                    vacation_id INTEGER NOT NULL REFERENCES teacher_vacations(id) ON DELETE CASCADE,
+                    teacher_id INTEGER NOT NULL,
+                    day DATE NOT NULL,
+                    status VARCHAR(20) NOT NULL,
+                    PRIMARY KEY (vacation_id, day)
+                )
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vacation_days_teacher_day
+                ON teacher_vacation_days(teacher_id, day)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_vacation_days_day
+                ON teacher_vacation_days(day)
+            """)
+
+            cursor.execute("""
+                CREATE OR REPLACE FUNCTION refresh_teacher_vacation_days() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'UPDATE' THEN
+                        IF NEW.status <> 'отменен' AND OLD.status <> 'отменен'
+                           AND NEW.teacher_id = OLD.teacher_id
+                           AND NEW.start_date = OLD.start_date AND NEW.end_date = OLD.end_date THEN
+                            -- Изменился только статус: дни отпуска остаются прежними
+                            UPDATE teacher_vacation_days SET status = NEW.status
+                            WHERE vacation_id = NEW.id;
+                            RETURN NULL;
+                        END IF;
+                        DELETE FROM teacher_vacation_days WHERE vacation_id = OLD.id;
+                    END IF;
+
+                    IF NEW.status <> 'отменен' THEN
+                        INSERT INTO teacher_vacation_days (vacation_id, teacher_id, day, status)
+                        SELECT NEW.id, NEW.teacher_id, d::date, NEW.status
+                        FROM generate_series(NEW.start_date, NEW.end_date, interval '1 day') AS d;
+                    END IF;
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql
+            """)
+
+            cursor.execute("""
+                SELECT 1 FROM pg_trigger
+                WHERE tgname = 'trg_teacher_vacation_days' AND NOT tgisinternal
+            """)
+            if cursor.fetchone() is None:
+                cursor.execute("""
+                    CREATE TRIGGER trg_teacher_vacation_days
+                    AFTER INSERT OR UPDATE OF teacher_id, start_date, end_date, status
+                    ON teacher_vacations
+                    FOR EACH ROW EXECUTE PROCEDURE refresh_teacher_vacation_days()
+                """)
+
+            if not calendar_exists:
+                cursor.execute("""
+                    INSERT INTO teacher_vacation_days (vacation_id, teacher_id, day, status)
+                    SELECT v.id, v.teacher_id, d::date, v.status
+                    FROM teacher_vacations v,
+                         generate_series(v.start_date, v.end_date, interval '1 day') AS d
+                    WHERE v.status != 'отменен'
+                    ON CONFLICT DO NOTHING
+                """)
+                logger.info(f"Календарь отпусков заполнен: {cursor.rowcount} дней")
+
+            connection.commit()
+            logger.info("Календарь отпусков проверен/создан")
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при создании календаря отпусков: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
     def get_teacher_vacation_days(self, teacher_id: int) -> int:
         """Получить базовое количество дней отпуска для преподавателя"""
         teacher = self.teacher_repo.get_teacher_by_id(teacher_id)
@@ -129,27 +259,21 @@ class VacationProcessor:
         return self.salary_calculator._get_vacation_days(teacher)
     
     def get_teacher_used_vacation_days(self, teacher_id: int, year: int = None) -> int:
-        """Получить количество использованных дней отпуска за год"""
+        """
+        Получить количество использованных дней отпуска за год
+        
+        Отпуск учитывается в году целиком (days_count), если начинается или
+        заканчивается в этом году - так же, как в _remaining_vacation_days_for_staff.
+        """
         connection = self.db_conn.get_connection()
         cursor = connection.cursor()
         
         try:
-            year_condition = ""
-            params = [teacher_id]
-            
             if year is not None:
-                year_start = datetime.date(year, 1, 1)
-                year_end = datetime.date(year, 12, 31)
-                year_condition = "AND (start_date BETWEEN %s AND %s OR end_date BETWEEN %s AND %s)"
-                params.extend([year_start, year_end, year_start, year_end])
-            
-            cursor.execute(f"""
-                SELECT COALESCE(SUM(days_count), 0)
-                FROM teacher_vacations
-                WHERE teacher_id = %s 
-                AND status IN ('запланирован', 'использован', 'оплачен')
-                {year_condition}
-            """, params)
+                self.db_conn.execute_prepared(cursor, 'vacation_used_days_in_year', (
+                    teacher_id, datetime.date(year, 1, 1), datetime.date(year, 12, 31)))
+            else:
+                self.db_conn.execute_prepared(cursor, 'vacation_used_days', (teacher_id,))
             
             used_days = cursor.fetchone()[0]
             return used_days if used_days else 0
@@ -166,11 +290,7 @@ class VacationProcessor:
         cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT COALESCE(SUM(days_count), 0)
-                FROM vacation_days_transfer
-                WHERE teacher_id = %s AND to_year = %s
-            """, (teacher_id, year))
+            self.db_conn.execute_prepared(cursor, 'vacation_days_transferred_in', (teacher_id, year))
             
             transferred_days = cursor.fetchone()[0]
             return transferred_days if transferred_days else 0
@@ -187,11 +307,7 @@ class VacationProcessor:
         cursor = connection.cursor()
         
         try:
-            cursor.execute("""
-                SELECT COALESCE(SUM(days_count), 0)
-                FROM vacation_days_transfer
-                WHERE teacher_id = %s AND from_year = %s
-            """, (teacher_id, year))
+            self.db_conn.execute_prepared(cursor, 'vacation_days_transferred_out', (teacher_id, year))
             
             transferred_days = cursor.fetchone()[0]
             return transferred_days if transferred_days else 0
@@ -269,9 +385,6 @@ class VacationProcessor:
         if start_date > end_date:
             raise ValueError("Дата начала не может быть позже даты окончания")
         
-        if self._has_overlapping_vacations(teacher_id, start_date, end_date):
-            raise ValueError("Указанный период пересекается с другими отпусками")
-        
         days_count = (end_date - start_date).days + 1
         vacation_year = start_date.year
         remaining_days = self.get_teacher_remaining_vacation_days(teacher_id, vacation_year)
@@ -283,6 +396,17 @@ class VacationProcessor:
         cursor = connection.cursor()
         
         try:
+            # Блокировка преподавателя до конца транзакции: параллельные добавления
+            # отпусков одного преподавателя проверяют пересечения по очереди
+            cursor.execute("SELECT id FROM teachers WHERE id = %s FOR UPDATE", (teacher_id,))
+            if cursor.fetchone() is None:
+                raise ValueError(f"Преподаватель с ID {teacher_id} не найден")
+            
+            if self._has_overlapping_vacations(cursor, teacher_id, start_date, end_date):
+                raise ValueError("Указанный период пересекается с другими отпусками")
+            
+            self._check_coverage(cursor, teacher, start_date, end_date)
+            
             cursor.execute("""
                 INSERT INTO teacher_vacations (
                     teacher_id, start_date, end_date, days_count, 
@@ -307,34 +431,182 @@ class VacationProcessor:
             cursor.close()
             self.db_conn.release_connection(connection)
     
-    def _has_overlapping_vacations(self, teacher_id: int, start_date: datetime.date, 
-                                 end_date: datetime.date) -> bool:
-        """Проверка на пересечение с другими отпусками"""
+    def set_coverage_limit(self, position: str, max_absent: Optional[int]):
+        """
+        Задать лимит одновременно отсутствующих преподавателей должности
+        
+        :param position: должность
+        :param max_absent: максимальное число преподавателей в отпуске в один день (None - без лимита)
+        """
+        position = VacationCoverageIndex.normalize_position(position)
+        if max_absent is None:
+            self.coverage_limits.pop(position, None)
+        elif max_absent < 1:
+            raise ValueError("Лимит одновременных отпусков должен быть положительным")
+        else:
+            self.coverage_limits[position] = max_absent
+    
+    def get_max_concurrent_absences(self, position: str, start_date: datetime.date,
+                                    end_date: datetime.date) -> int:
+        """
+        Максимальное число одновременно отсутствующих преподавателей должности в периоде
+        
+        :param position: должность
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: максимум по дням периода
+        """
+        return self._load_coverage_index(position, start_date, end_date).max_concurrent(
+            position, start_date, end_date)
+    
+    def _load_coverage_index(self, position: str, start_date: datetime.date,
+                             end_date: datetime.date) -> VacationCoverageIndex:
+        """
+        Построить индекс одновременных отпусков должности за период по текущим данным БД
+        
+        Индекс строится заново при каждом обращении: отпуска и должности
+        преподавателей изменяют и другие процессы.
+        
+        :param position: должность
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: индекс с отпусками должности, пересекающими период
+        """
         connection = self.db_conn.get_connection()
         cursor = connection.cursor()
         
         try:
             cursor.execute("""
-                SELECT COUNT(*)
-                FROM teacher_vacations
-                WHERE teacher_id = %s
+                SELECT t.position, GREATEST(v.start_date, %s), LEAST(v.end_date, %s)
+                FROM teacher_vacations v
+                JOIN teachers t ON v.teacher_id = t.id
+                WHERE v.status IN ('запланирован', 'использован', 'оплачен')
+                AND v.start_date <= %s AND v.end_date >= %s
+                AND LOWER(TRIM(COALESCE(t.position, ''))) = %s
+            """, (start_date, end_date, end_date, start_date, VacationCoverageIndex.normalize_position(position)))
+            index = VacationCoverageIndex()
+            index.load(cursor.fetchall())
+            return index
+        except Exception as e:
+            logger.error(f"Ошибка при построении индекса одновременных отпусков: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+    
+    def _check_coverage(self, cursor, teacher: Dict[str, Any], start_date: datetime.date,
+                        end_date: datetime.date):
+        """
+        Проверить, что отпуск не превышает лимит одновременных отпусков должности
+        
+        Проверка выполняется по календарю отпусков в транзакции добавления
+        отпуска: отпуска могут добавлять и отменять другие процессы.
+        Рекомендательная блокировка должности до конца транзакции не дает
+        двум параллельным добавлениям одновременно пройти проверку.
+        
+        :param cursor: курсор транзакции добавления отпуска
+        :param teacher: данные преподавателя
+        :param start_date: дата начала отпуска
+        :param end_date: дата окончания отпуска
+        """
+        position = VacationCoverageIndex.normalize_position(teacher.get('position'))
+        limit = self.coverage_limits.get(position)
+        if limit is None:
+            return
+        
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"teacher_vacations:{position}",))
+        cursor.execute("""
+            SELECT COALESCE(MAX(absent), 0)
+            FROM (
+                SELECT COUNT(*) AS absent
+                FROM teacher_vacation_days d
+                JOIN teachers t ON d.teacher_id = t.id
+                WHERE d.day BETWEEN %s AND %s
+                AND d.status IN ('запланирован', 'использован', 'оплачен')
+                AND LOWER(TRIM(COALESCE(t.position, ''))) = %s
+                GROUP BY d.day
+            ) days
+        """, (start_date, end_date, position))
+        absent = cursor.fetchone()[0]
+        if absent >= limit:
+            raise ValueError(f"В указанный период уже в отпуске {absent} преподавателей должности "
+                             f"'{teacher.get('position')}' (допускается не более {limit} одновременно)")
+    
+    def _has_overlapping_vacations(self, cursor, teacher_id: int, start_date: datetime.date,
+                                 end_date: datetime.date) -> bool:
+        """
+        Проверка на пересечение с другими отпусками
+        
+        Проверка выполняется по календарю отпусков (teacher_vacation_days) в
+        транзакции добавления отпуска, а не по картам дней этого процесса:
+        отпуска могут изменять другие процессы.
+        
+        :param cursor: курсор транзакции добавления отпуска
+        :param teacher_id: ID преподавателя
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :return: True, если хотя бы один день периода уже занят отпуском
+        """
+        cursor.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM teacher_vacation_days
+                WHERE teacher_id = %s AND day BETWEEN %s AND %s
                 AND status IN ('запланирован', 'использован', 'оплачен')
-                AND (
-                    (start_date <= %s AND end_date >= %s) OR
-                    (start_date <= %s AND end_date >= %s) OR
-                    (start_date >= %s AND end_date <= %s)
-                )
-            """, (
-                teacher_id, 
-                start_date, start_date,
-                end_date, end_date,
-                start_date, end_date
-            ))
-            
-            count = cursor.fetchone()[0]
-            return count > 0
+            )
+        """, (teacher_id, start_date, end_date))
+        return cursor.fetchone()[0]
+    
+    def get_vacation_bitmap(self, teacher_id: int, year: int) -> int:
+        """
+        Карта дней отпуска преподавателя за год
+        
+        :param teacher_id: ID преподавателя
+        :param year: год
+        :return: целое число, бит i которого соответствует i-му дню года
+        """
+        return self._load_vacation_bitmaps(year, teacher_id).year_mask(teacher_id, year)
+    
+    def get_daily_absences(self, year: int, teacher_ids: List[int] = None) -> List[int]:
+        """
+        Число преподавателей в отпуске в каждый день года
+        
+        :param year: год
+        :param teacher_ids: учитываемые преподаватели (None - все)
+        :return: список счетчиков по дням года
+        """
+        return self._load_vacation_bitmaps(year).coverage(year, teacher_ids)
+    
+    def _load_vacation_bitmaps(self, year: int, teacher_id: Optional[int] = None) -> VacationBitmaps:
+        """
+        Построить карты дней отпуска за год по текущим данным БД
+        
+        Карты строятся заново при каждом обращении: отпуска изменяют и другие
+        процессы (другие окна GUI, клиенты службы, удаление преподавателей).
+        
+        :param year: год
+        :param teacher_id: ID преподавателя (None - все преподаватели)
+        :return: карты дней отпуска
+        """
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            year_start, year_end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+            teacher_condition = "AND v.teacher_id = %s" if teacher_id is not None else ""
+            cursor.execute(f"""
+                SELECT v.teacher_id, GREATEST(v.start_date, %s), LEAST(v.end_date, %s)
+                FROM teacher_vacations v
+                JOIN teachers t ON v.teacher_id = t.id
+                WHERE v.status IN ('запланирован', 'использован', 'оплачен')
+                AND v.start_date <= %s AND v.end_date >= %s
+                {teacher_condition}
+            """, (year_start, year_end, year_end, year_start)
+                 + ((teacher_id,) if teacher_id is not None else ()))
+            bitmaps = VacationBitmaps()
+            bitmaps.load(cursor.fetchall())
+            return bitmaps
         except Exception as e:
-            logger.error(f"Ошибка при проверке пересечения отпусков: {str(e)}")
+            logger.error(f"Ошибка при построении карт дней отпуска: {str(e)}")
             raise
         finally:
             cursor.close()
@@ -347,7 +619,8 @@ class VacationProcessor:
         
         try:
             cursor.execute("""
-                SELECT v.id, t.id as teacher_id, t.name as teacher_name, v.status
+                SELECT v.id, t.id as teacher_id, t.name as teacher_name, v.status,
+                       t.position, v.start_date, v.end_date
                 FROM teacher_vacations v
                 JOIN teachers t ON v.teacher_id = t.id
                 WHERE v.id = %s
@@ -358,7 +631,7 @@ class VacationProcessor:
                 logger.warning(f"Отпуск с ID {vacation_id} не найден")
                 return False
             
-            _, teacher_id, teacher_name, status = result
+            _, teacher_id, teacher_name, status, position, start_date, end_date = result
             
             if status != 'запланирован':
                 logger.warning(f"Невозможно отменить отпуск с ID {vacation_id}, статус: {status}")
@@ -477,10 +750,129 @@ class VacationProcessor:
         finally:
             cursor.close()
             self.db_conn.release_connection(connection)
-    
-    def get_teacher_vacations(self, teacher_id: int, year: int = None, 
-                            include_cancelled: bool = False) -> List[Dict[str, Any]]:
-        """Получить список отпусков преподавателя"""
+
+    def calculate_due_vacation_payments(self, as_of_date: datetime.date = None) -> Dict[str, Any]:
+        """
+        Рассчитать выплаты по всем отпускам, начинающимся не позднее указанной даты
+
+        Отпуска и данные преподавателей выбираются одним запросом, история
+        начислений всех преподавателей - одним запросом, выплаты записываются
+        одной командой UPDATE ... FROM (VALUES ...) в одной транзакции.
+        Отпуска, для которых расчет невозможен (нет начислений), пропускаются
+        и перечисляются в ошибках.
+
+        :param as_of_date: дата, на которую определяются отпуска к оплате (по умолчанию сегодня)
+        :return: словарь с ключами as_of_date, processed, paid, total_amount,
+                 payments (результаты расчета) и errors (список сообщений)
+        """
+        if as_of_date is None:
+            as_of_date = datetime.date.today()
+        payment_date = datetime.date.today()
+
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            # Строки отпусков блокируются до конца транзакции, чтобы не оплатить их повторно
+            cursor.execute("""
+                SELECT v.id, v.teacher_id, v.start_date, v.end_date, v.days_count,
+                       t.name, t.hourly_rate, t.is_young_specialist,
+                       t.is_union_member, t.position, t.academic_degree,
+                       t.qualification_category, t.experience_years,
+                       t.hire_date, t.birth_date
+                FROM teacher_vacations v
+                JOIN teachers t ON v.teacher_id = t.id
+                WHERE v.status IN ('запланирован', 'использован')
+                AND v.start_date <= %s
+                ORDER BY v.start_date, v.id
+                FOR UPDATE OF v
+            """, (as_of_date,))
+
+            # Пары (отпуск, преподаватель)
+            due = []
+            for (vacation_id, teacher_id, start_date, end_date, days_count, name, hourly_rate,
+                 is_young_specialist, is_union_member, position, academic_degree,
+                 qualification_category, experience_years, hire_date, birth_date) in cursor.fetchall():
+                vacation = Vacation(id=vacation_id, teacher_id=teacher_id, teacher_name=name,
+                                    start_date=start_date, end_date=end_date, days_count=days_count)
+                teacher = Teacher(id=teacher_id, name=name, hourly_rate=hourly_rate,
+                                  is_young_specialist=is_young_specialist, is_union_member=is_union_member,
+                                  position=position, academic_degree=academic_degree,
+                                  qualification_category=qualification_category,
+                                  experience_years=experience_years, hire_date=hire_date, birth_date=birth_date)
+                due.append((vacation, teacher))
+
+            teacher_ids = sorted({vacation.teacher_id for vacation, _ in due})
+            history_by_teacher = self.db_conn.salary_history.preload(
+                self.salary_repo.get_gross_series_for_teachers(teacher_ids)) if teacher_ids else {}
+
+            payments = []
+            errors = []
+            for vacation, teacher in due:
+                try:
+                    payment_info = self.salary_calculator.vacation_pay_from_history(
+                        teacher, history_by_teacher[vacation.teacher_id], vacation.start_date, vacation.end_date)
+                except (ValueError, ArithmeticError, TypeError) as e:
+                    # Ошибка в данных одного отпуска не откатывает оплату остальных
+                    errors.append(f"Отпуск ID {vacation.id} ({vacation.teacher_name}): {str(e) or type(e).__name__}")
+                    continue
+
+                payment_info.update({
+                    'vacation_id': vacation.id,
+                    'calculation_date': payment_date,
+                    'days_count': vacation.days_count
+                })
+                payments.append(payment_info)
+
+            if payments:
+                execute_values(cursor, """
+                    UPDATE teacher_vacations AS v
+                    SET payment_amount = data.payment_amount,
+                        status = 'оплачен',
+                        payment_date = data.payment_date,
+                        updated_at = NOW()
+                    FROM (VALUES %s) AS data (id, payment_amount, payment_date)
+                    WHERE v.id = data.id
+                """, [
+                    (payment['vacation_id'], Decimal(str(payment['gross_vacation_pay'])), payment_date)
+                    for payment in payments
+                ], template="(%s, %s::numeric, %s::date)", page_size=1000)
+
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Ошибка при пакетном расчете отпускных: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
+        total_amount = sum(Decimal(str(payment['gross_vacation_pay'])) for payment in payments)
+        logger.info(f"Пакетный расчет отпускных на {as_of_date}: отпусков {len(due)}, "
+                    f"оплачено {len(payments)} на сумму {total_amount}, ошибок {len(errors)}")
+        return {
+            'as_of_date': as_of_date,
+            'processed': len(due),
+            'paid': len(payments),
+            'total_amount': float(total_amount),
+            'payments': payments,
+            'errors': errors,
+        }
+
+    def get_teacher_vacations(self, teacher_id: int, year: int = None,
+                            include_cancelled: bool = False, after: tuple = None,
+                            limit: int = None) -> List[Vacation]:
+        """
+        Получить список отпусков преподавателя (целиком или постранично)
+        
+        :param teacher_id: ID преподавателя
+        :param year: год (None - все годы)
+        :param include_cancelled: включать ли отмененные отпуска
+        :param after: ключ (дата начала, ID) последнего отпуска предыдущей страницы
+        :param limit: размер страницы (None - все отпуска)
+        :return: список отпусков, начиная с последних
+        """
+        page_condition, page_params = db.keyset_condition(('v.start_date', 'v.id'), after, limit, descending=True)
         connection = self.db_conn.get_connection()
         cursor = connection.cursor()
         
@@ -495,6 +887,11 @@ class VacationProcessor:
             if not include_cancelled:
                 conditions.append("status != 'отменен'")
             
+            if page_condition:
+                conditions.append(page_condition)
+                params.extend(page_params)
+            params.append(limit)
+            
             where_clause = " AND ".join(conditions)
             
             cursor.execute(f"""
@@ -506,12 +903,11 @@ class VacationProcessor:
                 FROM teacher_vacations v
                 JOIN teachers t ON v.teacher_id = t.id
                 WHERE {where_clause}
-                ORDER BY v.start_date DESC
+                ORDER BY v.start_date DESC, v.id DESC
+                LIMIT %s
             """, params)
             
-            columns = [desc[0] for desc in cursor.description]
-            vacations = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            return vacations
+            return fetch_rows(cursor, Vacation)
         except Exception as e:
             logger.error(f"Ошибка при получении списка отпусков: {str(e)}")
             raise
@@ -519,7 +915,7 @@ class VacationProcessor:
             cursor.close()
             self.db_conn.release_connection(connection)
     
-    def get_vacation_by_id(self, vacation_id: int) -> Optional[Dict[str, Any]]:
+    def get_vacation_by_id(self, vacation_id: int) -> Optional[Vacation]:
         """Получить информацию об отпуске по ID"""
         connection = self.db_conn.get_connection()
         cursor = connection.cursor()
@@ -536,12 +932,7 @@ class VacationProcessor:
                 WHERE v.id = %s
             """, (vacation_id,))
             
-            result = cursor.fetchone()
-            if not result:
-                return None
-            
-            columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, result))
+            return fetch_row(cursor, Vacation)
         except Exception as e:
             logger.error(f"Ошибка при получении информации об отпуске: {str(e)}")
             raise
@@ -550,7 +941,7 @@ class VacationProcessor:
             self.db_conn.release_connection(connection)
     
     def get_all_current_vacations(self, include_future: bool = True, 
-                                include_past_days: int = 0) -> List[Dict[str, Any]]:
+                                include_past_days: int = 0) -> List[Vacation]:
         """Получить список всех текущих и будущих отпусков"""
         connection = self.db_conn.get_connection()
         cursor = connection.cursor()
@@ -585,9 +976,7 @@ class VacationProcessor:
                 ORDER BY v.start_date
             """, params)
             
-            columns = [desc[0] for desc in cursor.description]
-            vacations = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            return vacations
+            return fetch_rows(cursor, Vacation)
         except Exception as e:
             logger.error(f"Ошибка при получении списка текущих отпусков: {str(e)}")
             raise
@@ -595,6 +984,74 @@ class VacationProcessor:
             cursor.close()
             self.db_conn.release_connection(connection)
     
+    def get_vacation_calendar(self, start_date: datetime.date, end_date: datetime.date,
+                              include_all_teachers: bool = True) -> Dict[str, Any]:
+        """
+        Календарный график отпусков: отсутствия по дням для каждого преподавателя
+
+        Данные читаются одним запросом из календаря teacher_vacation_days.
+
+        :param start_date: дата начала периода
+        :param end_date: дата окончания периода
+        :param include_all_teachers: включать преподавателей без отпусков в периоде
+        :return: словарь с ключами 'start_date', 'end_date', 'days' (даты периода),
+                 'teachers' (для каждого преподавателя 'statuses' - статус отпуска
+                 по дням периода или None) и 'absent_per_day'
+        """
+        if start_date > end_date:
+            raise ValueError("Дата начала периода не может быть позже даты окончания")
+
+        period_days = (end_date - start_date).days + 1
+        days = [start_date + datetime.timedelta(days=offset) for offset in range(period_days)]
+
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+
+        try:
+            join = "LEFT JOIN" if include_all_teachers else "JOIN"
+            cursor.execute(f"""
+                SELECT t.id, t.name, t.position, d.day, d.status
+                FROM teachers t
+                {join} teacher_vacation_days d
+                    ON d.teacher_id = t.id AND d.day BETWEEN %s AND %s
+                ORDER BY t.name, t.id, d.day
+            """, (start_date, end_date))
+
+            teachers = []
+            absent_per_day = [0] * period_days
+            current = None
+            for teacher_id, name, position, day, status in cursor.fetchall():
+                if current is None or current['teacher_id'] != teacher_id:
+                    current = {
+                        'teacher_id': teacher_id,
+                        'teacher_name': name,
+                        'position': position,
+                        'statuses': [None] * period_days,
+                        'absent_days': 0,
+                    }
+                    teachers.append(current)
+                if day is None:
+                    continue
+                offset = (day - start_date).days
+                if current['statuses'][offset] is None:
+                    current['absent_days'] += 1
+                    absent_per_day[offset] += 1
+                current['statuses'][offset] = status
+
+            return {
+                'start_date': start_date,
+                'end_date': end_date,
+                'days': days,
+                'teachers': teachers,
+                'absent_per_day': absent_per_day,
+            }
+        except Exception as e:
+            logger.error(f"Ошибка при получении календарного графика отпусков: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+
     def get_vacation_statistics(self, year: int = None) -> Dict[str, Any]:
         """Получить статистику по отпускам"""
         if year is None:
@@ -747,14 +1204,132 @@ class VacationProcessor:
         return report
 
     def suggest_optimal_vacation_distribution(self, teacher_id: int, year: int = None) -> List[Dict[str, Any]]:
-        """Предложить оптимальное распределение отпуска"""
+        """
+        Предложить распределение оставшихся дней отпуска преподавателя
+        
+        Учитываются праздники, каникулы и отпуска коллег той же должности
+        (см. vacation_planner).
+        
+        :param teacher_id: ID преподавателя
+        :param year: год (если None, то текущий год)
+        :return: список частей отпуска ({'start', 'end', 'days', 'description', 'score'})
+        """
         if year is None:
             year = datetime.date.today().year
         
+        teacher = self.teacher_repo.get_teacher_by_id(teacher_id)
+        if not teacher:
+            raise ValueError(f"Преподаватель с ID {teacher_id} не найден")
+        
         available_days = self.get_teacher_remaining_vacation_days(teacher_id, year)
         if available_days <= 0:
             return []
         
-        # Здесь можно добавить логику для предложения оптимальных периодов,
-        # но для простоты оставим заглушку
-        return [{'start': datetime.date(year, 7, 1), 'end': datetime.date(year, 7, available_days), 'days': available_days}]
\ No newline at end of file
+        teachers = self.teacher_repo.get_all_teachers()
+        planner = self._create_planner(year, teachers)
+        return planner.plan_teacher(teacher_id, self._planning_group(teacher), available_days)
+    
+    def plan_vacations_for_staff(self, year: int = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Распределить оставшиеся дни отпуска всех преподавателей на год
+        
+        Данные загружаются несколькими запросами на весь штат, расписание
+        строится в памяти (преподаватели с наибольшим остатком - первыми).
+        
+        :param year: год (если None, то текущий год)
+        :return: словарь {ID преподавателя: список частей отпуска}
+        """
+        if year is None:
+            year = datetime.date.today().year
+        
+        teachers = self.teacher_repo.get_all_teachers()
+        planner = self._create_planner(year, teachers)
+        remaining = self._remaining_vacation_days_for_staff(teachers, year)
+        
+        plan = planner.plan(
+            (teacher['id'], self._planning_group(teacher), remaining[teacher['id']])
+            for teacher in teachers if remaining[teacher['id']] > 0
+        )
+        logger.info(f"Распределены отпуска на {year} год для {len(plan)} преподавателей")
+        return plan
+    
+    @staticmethod
+    def _planning_group(teacher: Dict[str, Any]) -> str:
+        """Группа преподавателя для ограничения одновременных отпусков (должность)"""
+        return VacationCoverageIndex.normalize_position(teacher.get('position'))
+    
+    def _create_planner(self, year: int, teachers: List[Dict[str, Any]]) -> VacationPlanner:
+        """Планировщик с вместимостью групп и уже запланированными отпусками года"""
+        # Отпуск можно запланировать не раньше завтрашнего дня
+        planner = VacationPlanner(year, start_from=datetime.date.today() + datetime.timedelta(days=1))
+        
+        groups = {}
+        for teacher in teachers:
+            group = self._planning_group(teacher)
+            groups[group] = groups.get(group, 0) + 1
+        for group, size in groups.items():
+            planner.set_capacity(group, self.coverage_limits.get(group, int(size * DEFAULT_MAX_ABSENT_SHARE)))
+        
+        group_by_teacher = {teacher['id']: self._planning_group(teacher) for teacher in teachers}
+        for teacher_id, start_date, end_date in self._vacation_periods(year):
+            planner.add_existing(teacher_id, group_by_teacher.get(teacher_id, ''), start_date, end_date)
+        return planner
+    
+    def _vacation_periods(self, year: int) -> List[tuple]:
+        """Действующие отпуска всех преподавателей, пересекающие год: (ID преподавателя, начало, окончание)"""
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            cursor.execute("""
+                SELECT teacher_id, start_date, end_date
+                FROM teacher_vacations
+                WHERE status IN ('запланирован', 'использован', 'оплачен')
+                AND start_date <= %s AND end_date >= %s
+            """, (datetime.date(year, 12, 31), datetime.date(year, 1, 1)))
+            return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Ошибка при получении отпусков за год: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+    
+    def _remaining_vacation_days_for_staff(self, teachers: List[Dict[str, Any]], year: int) -> Dict[int, int]:
+        """Оставшиеся дни отпуска всех преподавателей (как get_teacher_remaining_vacation_days)"""
+        connection = self.db_conn.get_connection()
+        cursor = connection.cursor()
+        
+        try:
+            year_start, year_end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+            cursor.execute("""
+                SELECT teacher_id, COALESCE(SUM(days_count), 0)
+                FROM teacher_vacations
+                WHERE status IN ('запланирован', 'использован', 'оплачен')
+                AND (start_date BETWEEN %s AND %s OR end_date BETWEEN %s AND %s)
+                GROUP BY teacher_id
+            """, (year_start, year_end, year_start, year_end))
+            used = dict(cursor.fetchall())
+            
+            cursor.execute("""
+                SELECT teacher_id,
+                       COALESCE(SUM(days_count) FILTER (WHERE to_year = %s), 0),
+                       COALESCE(SUM(days_count) FILTER (WHERE from_year = %s), 0)
+                FROM vacation_days_transfer
+                WHERE to_year = %s OR from_year = %s
+                GROUP BY teacher_id
+            """, (year, year, year, year))
+            transfers = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Ошибка при получении оставшихся дней отпуска преподавателей: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+            self.db_conn.release_connection(connection)
+        
+        remaining = {}
+        for teacher in teachers:
+            transferred_in, transferred_out = transfers.get(teacher['id'], (0, 0))
+            remaining[teacher['id']] = max(0, self.salary_calculator._get_vacation_days(teacher)
+                                           - used.get(teacher['id'], 0) + transferred_in - transferred_out)
+        return remaining
\ No newline at end of file